@@ -0,0 +1,35 @@
+"""enable_incremental_auto_vacuum
+
+Switch the database to incremental auto-vacuum so that free pages left by
+bulk deletes can be reclaimed in small batches by the maintenance task.
+Changing auto_vacuum on an existing database only takes effect after a
+VACUUM, which cannot run inside a transaction.
+
+Revision ID: c4d1e8f2a9b3
+Revises: 9548ad40c2e4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "c4d1e8f2a9b3"
+down_revision: Union[str, None] = "9548ad40c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enable incremental auto-vacuum and rebuild the file to apply it."""
+    with op.get_context().autocommit_block():
+        op.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        op.execute("VACUUM")
+
+
+def downgrade() -> None:
+    """Disable auto-vacuum and rebuild the file to apply it."""
+    with op.get_context().autocommit_block():
+        op.execute("PRAGMA auto_vacuum = NONE")
+        op.execute("VACUUM")
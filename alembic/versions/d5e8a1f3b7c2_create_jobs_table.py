@@ -0,0 +1,54 @@
+"""create_jobs_table
+
+Background jobs for LLM extraction and modification, kept in the database
+so that they survive client disconnects and container restarts.
+
+Revision ID: d5e8a1f3b7c2
+Revises: c4d1e8f2a9b3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "d5e8a1f3b7c2"
+down_revision: Union[str, None] = "c4d1e8f2a9b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the jobs table and its status index."""
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_index("ix_jobs_status_created_at", "jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    """Drop the jobs table."""
+    op.drop_index("ix_jobs_status_created_at", table_name="jobs")
+    op.drop_table("jobs")
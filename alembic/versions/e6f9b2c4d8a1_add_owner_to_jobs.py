@@ -0,0 +1,34 @@
+"""add_owner_to_jobs
+
+Records which process claimed a running job, so that a starting container
+only resumes jobs whose owner stopped sending heartbeats instead of every
+running job on the shared volume.
+
+Revision ID: e6f9b2c4d8a1
+Revises: d5e8a1f3b7c2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e6f9b2c4d8a1"
+down_revision: Union[str, None] = "d5e8a1f3b7c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the owner column to the jobs table."""
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("owner", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the owner column from the jobs table."""
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("owner")
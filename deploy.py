@@ -9,8 +9,10 @@ from meal_planner.config import (
     ALEMBIC_DIR_NAME,
     ALEMBIC_DIR_PATH_IN_CONTAINER,
     ALEMBIC_INI_PATH_IN_CONTAINER,
+    BACKUP_INTERVAL_HOURS,
     CONTAINER_DATA_DIR,
     CONTAINER_DB_FULL_PATH,
+    MAINTENANCE_INTERVAL_SECONDS,
 )
 
 app = modal.App("meal-planner")
@@ -64,6 +66,52 @@ def alembic_env():
 
 @app.function(
     image=base_image,
+    volumes={str(CONTAINER_DATA_DIR): volume},
+    schedule=modal.Period(hours=BACKUP_INTERVAL_HOURS),
+)
+def backup_database():
+    """Take an online backup of the database and prune old snapshots.
+
+    Runs on a schedule and can be triggered on demand with
+    `modal run deploy.py::backup_database`.
+    """
+    from meal_planner.services.db_backup import backup_database as run_backup
+
+    volume.reload()
+    result = run_backup()
+    volume.commit()
+    logging.info(
+        "Backup written to %s in %.3fs, longest writer stall %.4fs",
+        result.path,
+        result.duration_seconds,
+        result.longest_writer_stall_seconds,
+    )
+
+
+@app.function(
+    image=base_image,
+    volumes={str(CONTAINER_DATA_DIR): volume},
+    schedule=modal.Period(seconds=MAINTENANCE_INTERVAL_SECONDS),
+)
+def maintain_database():
+    """Run a database maintenance pass unless the database is in use.
+
+    The web container scales to zero when idle, so maintenance runs here on
+    a schedule rather than inside it. Can be triggered on demand with
+    `modal run deploy.py::maintain_database`.
+    """
+    from meal_planner.services.db_maintenance import run_maintenance_if_idle
+
+    volume.reload()
+    result = run_maintenance_if_idle()
+    if result is None:
+        logging.info("Database in use or missing; maintenance skipped.")
+        return
+    volume.commit()
+
+
+@app.function(
+    image=base_image.env({"MEAL_PLANNER_MAINTENANCE_IN_PROCESS": "false"}),
     secrets=[create_google_api_key_secret()],
     volumes={str(CONTAINER_DATA_DIR): volume},
 )
@@ -0,0 +1,22 @@
+"""REST API endpoint exposing in-process metrics."""
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from meal_planner.services.metrics import metrics_registry
+
+API_ROUTER = APIRouter()
+
+
+@API_ROUTER.get("/v0/metrics")
+async def get_metrics() -> dict[str, dict[str, Any]]:
+    """Report the current value of every registered metrics source.
+
+    Metrics are kept in memory per process and reset on restart.
+
+    Returns:
+        Mapping of metrics source name (e.g. `single_flight.recipe_list_page`)
+        to its counters.
+    """
+    return metrics_registry.snapshot()
@@ -1,23 +1,48 @@
-"""REST API endpoints for recipe CRUD operations."""
+"""REST API endpoints for recipe CRUD operations and bulk extraction."""
 
+import asyncio
 import logging
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from fastapi.responses import JSONResponse
-from sqlmodel import Session, select
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlmodel import Session
 
+from meal_planner.config import BULK_EXTRACT_MAX_ITEMS
 from meal_planner.database import get_session
 from meal_planner.models import (
     Recipe,
     RecipeBase,
 )
+from meal_planner.services.bulk_extract import (
+    BulkExtractItem,
+    extract_recipes,
+    save_to_database,
+)
+from meal_planner.services.recipes import (
+    RecipeNotFoundError,
+    RecipeService,
+    RecipeStorageError,
+)
+from meal_planner.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 API_ROUTER = APIRouter()
 
+recipe_reads = SingleFlight("recipe_api_reads")
+
+
+class BulkExtractRequest(BaseModel):
+    """Body of a bulk extraction request."""
+
+    items: list[BulkExtractItem] = Field(
+        min_length=1, max_length=BULK_EXTRACT_MAX_ITEMS
+    )
+    save: bool = False
+
 
 @API_ROUTER.post(
     "/v0/recipes",
@@ -32,7 +57,8 @@ async def create_recipe(
 
     Validates the recipe data and persists it to the database. Returns
     the created recipe with its assigned ID and sets the Location header
-    for the new resource.
+    for the new resource. Publishes a "created" recipe event for open list
+    views.
 
     Args:
         recipe_data: Recipe information to create (name, ingredients, instructions,
@@ -48,30 +74,10 @@ async def create_recipe(
     Response Headers:
         Location: URL path to the newly created recipe resource.
     """
-    db_recipe = Recipe.model_validate(recipe_data)
-
-    # Set timestamps for new recipes since SQLite doesn't auto-populate server defaults
-    now = datetime.now(timezone.utc)
-    db_recipe.created_at = now
-    db_recipe.updated_at = now
-
     try:
-        session.add(db_recipe)
-        session.commit()
-        session.refresh(db_recipe)
-    except Exception as e:
-        session.rollback()
-        logger.error("Database error inserting recipe: %s", e, exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error creating recipe",
-        ) from e
-
-    logger.info(
-        "Created recipe with ID: %s, Name: %s",
-        db_recipe.id,
-        db_recipe.name,
-    )
+        db_recipe = RecipeService(session).create(recipe_data)
+    except RecipeStorageError as e:
+        raise _internal_error(e) from e
 
     location_path = f"/api/v0/recipes/{str(db_recipe.id)}"
 
@@ -87,7 +93,9 @@ async def get_all_recipes(session: Annotated[Session, Depends(get_session)]):
     """Retrieve all recipes from the database.
 
     Fetches the complete list of recipes without pagination. For production
-    use with large datasets, pagination should be implemented.
+    use with large datasets, pagination should be implemented. Concurrent
+    requests share a single query, which runs in a worker thread and
+    returns plain data, since joining requests outlive its session.
 
     Args:
         session: Database session from dependency injection.
@@ -99,15 +107,11 @@ async def get_all_recipes(session: Annotated[Session, Depends(get_session)]):
         HTTPException: 500 if database query fails.
     """
     try:
-        statement = select(Recipe)
-        all_recipes = session.exec(statement).all()
-        return all_recipes
-    except Exception as e:
-        logger.error("Database error querying all recipes: %s", e, exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error retrieving recipes",
-        ) from e
+        return await recipe_reads.do(
+            ("list",), lambda: asyncio.to_thread(_list_recipe_data, session)
+        )
+    except RecipeStorageError as e:
+        raise _internal_error(e) from e
 
 
 @API_ROUTER.get("/v0/recipes/{recipe_id}", response_model=Recipe)
@@ -117,7 +121,9 @@ async def get_recipe_by_id(
     """Retrieve a specific recipe by its ID.
 
     Fetches a single recipe from the database using its primary key.
-    Returns 404 if the recipe doesn't exist.
+    Returns 404 if the recipe doesn't exist. Concurrent requests for the
+    same recipe share a single query, which runs in a worker thread and
+    returns plain data, since joining requests outlive its session.
 
     Args:
         recipe_id: Unique identifier of the recipe to retrieve.
@@ -130,24 +136,14 @@ async def get_recipe_by_id(
         HTTPException: 404 if recipe not found, 500 if database error.
     """
     try:
-        statement = select(Recipe).where(Recipe.id == recipe_id)
-        recipe = session.exec(statement).first()
-    except Exception as e:
-        logger.error(
-            "Database error fetching recipe ID %s: %s", recipe_id, e, exc_info=True
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error retrieving recipe",
-        ) from e
-
-    if recipe is None:
-        logger.warning("Recipe with ID %s not found.", recipe_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
+        return await recipe_reads.do(
+            ("get", recipe_id),
+            lambda: asyncio.to_thread(_get_recipe_data, session, recipe_id),
         )
-
-    return recipe
+    except RecipeNotFoundError as e:
+        raise _not_found_error() from e
+    except RecipeStorageError as e:
+        raise _internal_error(e) from e
 
 
 @API_ROUTER.put("/v0/recipes/{recipe_id}", response_model=Recipe)
@@ -159,7 +155,8 @@ async def update_recipe(
     """Update an existing recipe in the database.
 
     Replaces all recipe fields with the provided data. Returns the updated recipe with a
-    Last-Modified header for caching support.
+    Last-Modified header for caching support. Publishes an "updated" recipe event
+    for open list views.
 
     Args:
         recipe_id: Unique identifier of the recipe to update.
@@ -177,53 +174,11 @@ async def update_recipe(
         Last-Modified: Timestamp of when the recipe was last updated.
     """
     try:
-        recipe = session.get(Recipe, recipe_id)
-    except Exception as e:
-        logger.error(
-            "Database error fetching recipe ID %s for update: %s",
-            recipe_id,
-            e,
-            exc_info=True,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error retrieving recipe",
-        ) from e
-
-    if recipe is None:
-        logger.warning("Recipe with ID %s not found for update.", recipe_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
-        )
-
-    recipe.name = recipe_data.name
-    recipe.ingredients = recipe_data.ingredients
-    recipe.instructions = recipe_data.instructions
-    recipe.makes_min = recipe_data.makes_min
-    recipe.makes_max = recipe_data.makes_max
-    recipe.makes_unit = recipe_data.makes_unit
-
-    recipe.updated_at = datetime.now(timezone.utc)
-
-    try:
-        session.add(recipe)
-        session.commit()
-        session.refresh(recipe)
-    except Exception as e:
-        session.rollback()
-        logger.error(
-            "Database error updating recipe ID %s: %s", recipe_id, e, exc_info=True
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error updating recipe",
-        ) from e
-
-    logger.info(
-        "Updated recipe with ID: %s, Name: %s",
-        recipe.id,
-        recipe.name,
-    )
+        recipe = RecipeService(session).update(recipe_id, recipe_data)
+    except RecipeNotFoundError as e:
+        raise _not_found_error() from e
+    except RecipeStorageError as e:
+        raise _internal_error(e) from e
 
     last_modified = recipe.updated_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
@@ -241,7 +196,8 @@ async def delete_recipe(
     """Delete a recipe from the database.
 
     Permanently removes a recipe. Returns 204 No Content on success.
-    Includes HX-Trigger header to notify HTMX clients of the change.
+    Includes HX-Trigger header to notify HTMX clients of the change and
+    publishes a "deleted" recipe event for open list views.
 
     Args:
         recipe_id: Unique identifier of the recipe to delete.
@@ -257,40 +213,61 @@ async def delete_recipe(
         HX-Trigger: "recipeListChanged" event for HTMX updates.
     """
     try:
-        recipe = session.get(Recipe, recipe_id)
-    except Exception as e:
-        logger.error(
-            "Database error fetching recipe ID %s for deletion: %s",
-            recipe_id,
-            e,
-            exc_info=True,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error fetching recipe for deletion",
-        ) from e
-
-    if recipe is None:
-        logger.warning("Recipe with ID %s not found for deletion.", recipe_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
-        )
-
-    try:
-        session.delete(recipe)
-        session.commit()
-    except Exception as e:
-        session.rollback()
-        logger.error(
-            "Database error deleting recipe ID %s: %s", recipe_id, e, exc_info=True
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error deleting recipe",
-        ) from e
+        RecipeService(session).delete(recipe_id)
+    except RecipeNotFoundError as e:
+        raise _not_found_error() from e
+    except RecipeStorageError as e:
+        raise _internal_error(e) from e
 
-    logger.info("Deleted recipe with ID: %s", recipe_id)
     return Response(
         status_code=status.HTTP_204_NO_CONTENT,
         headers={"HX-Trigger": "recipeListChanged"},
     )
+
+
+@API_ROUTER.post("/v0/recipes/extract")
+async def bulk_extract_recipes(request: BulkExtractRequest) -> StreamingResponse:
+    """Extract recipes from many texts or URLs in one request.
+
+    Items are processed in parallel, up to `MEAL_PLANNER_BULK_EXTRACT_CONCURRENCY`
+    at a time. Results are streamed back as newline-delimited JSON in
+    completion order, one object per item. Items that could not be
+    extracted have an `error` and the failed `stage` instead of a `recipe`.
+    With `save` set, extracted recipes are also created in the database and
+    their `recipe_id` is included. Each save uses its own session, since the
+    response outlives the request's dependencies.
+
+    Args:
+        request: Items to extract, each with either `text` or `url`, and
+            whether to save the results.
+
+    Returns:
+        Streaming `application/x-ndjson` response.
+    """
+    save = save_to_database if request.save else None
+
+    async def lines() -> AsyncIterator[str]:
+        async for result in extract_recipes(request.items, save=save):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _list_recipe_data(session: Session) -> list[dict]:
+    return [recipe.model_dump() for recipe in RecipeService(session).list_all()]
+
+
+def _get_recipe_data(session: Session, recipe_id: str) -> dict:
+    return RecipeService(session).get(recipe_id).model_dump()
+
+
+def _not_found_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
+    )
+
+
+def _internal_error(error: RecipeStorageError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error)
+    )
@@ -1,5 +1,6 @@
 """Configuration settings and constants for the Meal Planner application."""
 
+import os
 from pathlib import Path
 
 DB_FILENAME = "meal_planner.db"
@@ -12,3 +13,205 @@ ALEMBIC_INI_FILENAME = "alembic.ini"
 ALEMBIC_DIR_NAME = "alembic"
 ALEMBIC_INI_PATH_IN_CONTAINER = APP_ROOT_IN_CONTAINER / ALEMBIC_INI_FILENAME
 ALEMBIC_DIR_PATH_IN_CONTAINER = APP_ROOT_IN_CONTAINER / ALEMBIC_DIR_NAME
+
+CONTAINER_BACKUP_DIR = CONTAINER_DATA_DIR / "backups"
+BACKUP_INTERVAL_HOURS = int(os.environ.get("MEAL_PLANNER_BACKUP_INTERVAL_HOURS", "6"))
+BACKUP_RETENTION = int(os.environ.get("MEAL_PLANNER_BACKUP_RETENTION", "28"))
+BACKUP_COMPRESS = os.environ.get("MEAL_PLANNER_BACKUP_COMPRESS", "true") == "true"
+BACKUP_PAGES_PER_STEP = 64
+BACKUP_STEP_PAUSE_SECONDS = 0.005
+
+MAINTENANCE_IDLE_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_MAINTENANCE_IDLE_SECONDS", "300")
+)
+MAINTENANCE_INTERVAL_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_MAINTENANCE_INTERVAL_SECONDS", "21600")
+)
+MAINTENANCE_BUDGET_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_MAINTENANCE_BUDGET_SECONDS", "2")
+)
+MAINTENANCE_CHECK_SECONDS = 60.0
+# Run maintenance from the app process when it has been idle. Off on Modal,
+# where the web container scales to zero and the scheduled
+# `maintain_database` function in deploy.py runs it instead.
+MAINTENANCE_IN_PROCESS = (
+    os.environ.get("MEAL_PLANNER_MAINTENANCE_IN_PROCESS", "true") == "true"
+)
+
+LLM_CACHE_ENABLED = os.environ.get("MEAL_PLANNER_LLM_CACHE_ENABLED", "true") == "true"
+LLM_CACHE_PATH = Path(
+    os.environ.get("MEAL_PLANNER_LLM_CACHE_PATH", CONTAINER_DATA_DIR / "llm_cache.db")
+)
+LLM_CACHE_TTL_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+)
+LLM_CACHE_MAX_ENTRIES = int(
+    os.environ.get("MEAL_PLANNER_LLM_CACHE_MAX_ENTRIES", "5000")
+)
+
+# Reuse of extractions for near-duplicate page text (near_duplicates); stored
+# alongside the LLM cache and disabled with it.
+NEAR_DUPLICATE_ENABLED = LLM_CACHE_ENABLED and (
+    os.environ.get("MEAL_PLANNER_NEAR_DUPLICATE_ENABLED", "true") == "true"
+)
+NEAR_DUPLICATE_THRESHOLD = float(
+    os.environ.get("MEAL_PLANNER_NEAR_DUPLICATE_THRESHOLD", "0.9")
+)
+NEAR_DUPLICATE_MAX_ENTRIES = int(
+    os.environ.get("MEAL_PLANNER_NEAR_DUPLICATE_MAX_ENTRIES", "5000")
+)
+
+PROMPT_DIR = Path(
+    os.environ.get(
+        "MEAL_PLANNER_PROMPT_DIR",
+        Path(__file__).resolve().parent.parent / "prompt_templates",
+    )
+)
+PROMPT_RELOAD_CHECK_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_PROMPT_RELOAD_CHECK_SECONDS", "5")
+)
+RECIPE_EXTRACTION_PROMPT = os.environ.get(
+    "MEAL_PLANNER_RECIPE_EXTRACTION_PROMPT", "20250623_fix_serves_unit"
+)
+RECIPE_MODIFICATION_PROMPT = os.environ.get(
+    "MEAL_PLANNER_RECIPE_MODIFICATION_PROMPT",
+    "20250525_174436__string_template_syntax",
+)
+RECIPE_PATCH_PROMPT = os.environ.get(
+    "MEAL_PLANNER_RECIPE_PATCH_PROMPT", "20261018_090000__initial"
+)
+# "rewrite" has the LLM return the whole modified recipe; "patch" has it
+# return only the edits, which are applied locally.
+RECIPE_MODIFICATION_MODE = os.environ.get(
+    "MEAL_PLANNER_RECIPE_MODIFICATION_MODE", "rewrite"
+)
+
+LLM_MAX_CONCURRENCY = int(os.environ.get("MEAL_PLANNER_LLM_MAX_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = 1
+LLM_REQUESTS_PER_MINUTE = float(
+    os.environ.get("MEAL_PLANNER_LLM_REQUESTS_PER_MINUTE", "2000")
+)
+LLM_TOKENS_PER_MINUTE = float(
+    os.environ.get("MEAL_PLANNER_LLM_TOKENS_PER_MINUTE", "4000000")
+)
+
+LLM_RETRY_MAX_ATTEMPTS = int(os.environ.get("MEAL_PLANNER_LLM_RETRY_MAX_ATTEMPTS", "3"))
+LLM_RETRY_BASE_DELAY_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_LLM_RETRY_BASE_DELAY_SECONDS", "0.5")
+)
+LLM_RETRY_MAX_DELAY_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_LLM_RETRY_MAX_DELAY_SECONDS", "8")
+)
+LLM_DEADLINE_SECONDS = float(os.environ.get("MEAL_PLANNER_LLM_DEADLINE_SECONDS", "60"))
+LLM_HEDGE_ENABLED = os.environ.get("MEAL_PLANNER_LLM_HEDGE_ENABLED", "false") == "true"
+LLM_HEDGE_QUANTILE = float(os.environ.get("MEAL_PLANNER_LLM_HEDGE_QUANTILE", "0.95"))
+LLM_HEDGE_MIN_DELAY_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_LLM_HEDGE_MIN_DELAY_SECONDS", "1")
+)
+
+# Connection pool of the shared LLM HTTP client (see llm_client). Hedged
+# calls can double the in-flight requests, hence twice the concurrency.
+LLM_POOL_MAX_CONNECTIONS = int(
+    os.environ.get(
+        "MEAL_PLANNER_LLM_POOL_MAX_CONNECTIONS", str(2 * LLM_MAX_CONCURRENCY)
+    )
+)
+LLM_POOL_MAX_KEEPALIVE = int(
+    os.environ.get("MEAL_PLANNER_LLM_POOL_MAX_KEEPALIVE", str(LLM_MAX_CONCURRENCY))
+)
+LLM_POOL_KEEPALIVE_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_LLM_POOL_KEEPALIVE_SECONDS", "120")
+)
+LLM_HTTP2_ENABLED = os.environ.get("MEAL_PLANNER_LLM_HTTP2_ENABLED", "true") == "true"
+LLM_PRECONNECT_ENABLED = (
+    os.environ.get("MEAL_PLANNER_LLM_PRECONNECT_ENABLED", "true") == "true"
+)
+LLM_PRECONNECT_TIMEOUT_SECONDS = 5.0
+
+EXTRACTION_STREAM_TTL_SECONDS = 60.0
+EXTRACTION_STREAM_MAX_PENDING = 100
+SPECULATIVE_EXTRACTION_ENABLED = (
+    os.environ.get("MEAL_PLANNER_SPECULATIVE_EXTRACTION_ENABLED", "true") == "true"
+)
+SPECULATIVE_EXTRACTION_TTL_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_SPECULATIVE_EXTRACTION_TTL_SECONDS", "600")
+)
+SPECULATIVE_EXTRACTION_MAX_PENDING = int(
+    os.environ.get("MEAL_PLANNER_SPECULATIVE_EXTRACTION_MAX_PENDING", "50")
+)
+
+# Durable background jobs for LLM extraction and modification (job_queue).
+JOB_QUEUE_ENABLED = os.environ.get("MEAL_PLANNER_JOB_QUEUE_ENABLED", "false") == "true"
+JOB_WORKER_CONCURRENCY = int(os.environ.get("MEAL_PLANNER_JOB_WORKER_CONCURRENCY", "4"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("MEAL_PLANNER_JOB_MAX_ATTEMPTS", "3"))
+JOB_RETENTION_SECONDS = float(
+    os.environ.get("MEAL_PLANNER_JOB_RETENTION_SECONDS", "86400")
+)
+# Running jobs are touched every JOB_HEARTBEAT_SECONDS by the process running
+# them; another process only resumes them once the heartbeat is stale.
+JOB_HEARTBEAT_SECONDS = 15.0
+JOB_STALE_SECONDS = float(os.environ.get("MEAL_PLANNER_JOB_STALE_SECONDS", "120"))
+JOB_POLL_SECONDS = 1.0
+JOB_IDLE_CHECK_SECONDS = 30.0
+
+BULK_EXTRACT_CONCURRENCY = int(
+    os.environ.get("MEAL_PLANNER_BULK_EXTRACT_CONCURRENCY", "8")
+)
+BULK_EXTRACT_MAX_ITEMS = int(
+    os.environ.get("MEAL_PLANNER_BULK_EXTRACT_MAX_ITEMS", "500")
+)
+
+RECIPE_REGION_ENABLED = (
+    os.environ.get("MEAL_PLANNER_RECIPE_REGION_ENABLED", "true") == "true"
+)
+RECIPE_REGION_MAX_TOKENS = int(
+    os.environ.get("MEAL_PLANNER_RECIPE_REGION_MAX_TOKENS", "6000")
+)
+RECIPE_REGION_MARGIN_TOKENS = int(
+    os.environ.get("MEAL_PLANNER_RECIPE_REGION_MARGIN_TOKENS", "300")
+)
+
+# Pages with several recipes are extracted per section (multi_recipe).
+MULTI_RECIPE_ENABLED = (
+    os.environ.get("MEAL_PLANNER_MULTI_RECIPE_ENABLED", "true") == "true"
+)
+MULTI_RECIPE_MAX_CHUNKS = int(
+    os.environ.get("MEAL_PLANNER_MULTI_RECIPE_MAX_CHUNKS", "30")
+)
+
+# USD per million tokens, for cost estimates (Gemini 2.0 Flash list prices).
+LLM_INPUT_COST_PER_MILLION_TOKENS = float(
+    os.environ.get("MEAL_PLANNER_LLM_INPUT_COST_PER_MILLION_TOKENS", "0.10")
+)
+LLM_OUTPUT_COST_PER_MILLION_TOKENS = float(
+    os.environ.get("MEAL_PLANNER_LLM_OUTPUT_COST_PER_MILLION_TOKENS", "0.40")
+)
+LLM_CALL_LOG_PATH = (
+    Path(os.environ["MEAL_PLANNER_LLM_CALL_LOG"])
+    if os.environ.get("MEAL_PLANNER_LLM_CALL_LOG")
+    else None
+)
+
+# Any OpenAI-compatible endpoint works, e.g. `python -m meal_planner.fake_llm`.
+LLM_BASE_URL = os.environ.get(
+    "MEAL_PLANNER_LLM_BASE_URL",
+    "https://generativelanguage.googleapis.com/v1beta/openai/",
+)
+LLM_MODEL = os.environ.get("MEAL_PLANNER_LLM_MODEL", "gemini-2.0-flash")
+
+# Model tiers: short extraction prompts go to the small model, very long ones
+# to the large model; failures fall back to the next tier (see model_router).
+# Off until the extraction evals pass on the small model.
+LLM_ROUTER_ENABLED = (
+    os.environ.get("MEAL_PLANNER_LLM_ROUTER_ENABLED", "false") == "true"
+)
+LLM_SMALL_MODEL = os.environ.get(
+    "MEAL_PLANNER_LLM_SMALL_MODEL", "gemini-2.0-flash-lite"
+)
+LLM_LARGE_MODEL = os.environ.get("MEAL_PLANNER_LLM_LARGE_MODEL", "gemini-2.5-flash")
+LLM_ROUTER_SMALL_MAX_TOKENS = int(
+    os.environ.get("MEAL_PLANNER_LLM_ROUTER_SMALL_MAX_TOKENS", "2000")
+)
+LLM_ROUTER_LARGE_MIN_TOKENS = int(
+    os.environ.get("MEAL_PLANNER_LLM_ROUTER_LARGE_MIN_TOKENS", "16000")
+)
@@ -1,32 +1,76 @@
 """Core application components for Meal Planner."""
 
+import asyncio
+import contextlib
 import logging
 from pathlib import Path
 
 import httpx
 from fastapi import FastAPI
-from fasthtml.common import FastHTMLWithLiveReload
+from fasthtml.common import FastHTMLWithLiveReload, Script
 from httpx import ASGITransport
 from monsterui.all import Theme
+from starlette.middleware import Middleware
 
+from meal_planner.api.metrics import API_ROUTER as METRICS_API_ROUTER
 from meal_planner.api.recipes import API_ROUTER as RECIPES_API_ROUTER
+from meal_planner.config import MAINTENANCE_IN_PROCESS
+from meal_planner.services.db_maintenance import (
+    ActivityMiddleware,
+    app_activity,
+    maintenance_scheduler,
+)
+from meal_planner.services.job_queue import job_queue
+from meal_planner.services.llm_client import llm_http_client
+from meal_planner.services.prompt_registry import prompt_registry
 
 logger = logging.getLogger(__name__)
 
 STATIC_DIR = Path(__file__).resolve().parent / "static"
+HTMX_SSE_EXTENSION_URL = "https://cdn.jsdelivr.net/npm/htmx-ext-sse@2.2.2/sse.js"
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Set up shared state and run background tasks for the app's lifetime.
+
+    Prompt templates are preloaded so requests never read them from disk,
+    and the background job workers run in the background, as does idle-time
+    database maintenance if `MAINTENANCE_IN_PROCESS` is set. A connection to
+    the LLM host is opened in the background too, so the first LLM call does
+    not pay for the handshake, and the pooled LLM HTTP client is closed on
+    shutdown.
+    """
+    prompt_registry.load()
+    tasks = [
+        asyncio.create_task(job_queue.run_forever()),
+        asyncio.create_task(llm_http_client.preconnect()),
+    ]
+    if MAINTENANCE_IN_PROCESS:
+        tasks.append(asyncio.create_task(maintenance_scheduler.run_forever()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await llm_http_client.close()
 
-app = FastHTMLWithLiveReload(hdrs=(Theme.blue.headers()))
+
+app = FastHTMLWithLiveReload(
+    hdrs=(*Theme.blue.headers(), Script(src=HTMX_SSE_EXTENSION_URL)),
+    middleware=[Middleware(ActivityMiddleware, tracker=app_activity)],
+    lifespan=lifespan,
+)
 rt = app.route
 
 api_app = FastAPI()
 api_app.include_router(RECIPES_API_ROUTER)
+api_app.include_router(METRICS_API_ROUTER)
 
 internal_client = httpx.AsyncClient(
     transport=ASGITransport(app=app),
     base_url="http://internal",  # arbitrary
 )
-
-internal_api_client = httpx.AsyncClient(
-    transport=ASGITransport(app=api_app),
-    base_url="http://internal-api",  # arbitrary
-)
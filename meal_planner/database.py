@@ -1,5 +1,8 @@
 """Database connection and session management for the Meal Planner application."""
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 from sqlmodel import Session, create_engine
 
 from meal_planner.config import CONTAINER_MAIN_DATABASE_URL
@@ -28,3 +31,17 @@ def get_session():
     """
     with Session(ENGINE) as session:
         yield session
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Provide a database session outside of dependency injection.
+
+    Used by the UI routers, which call the service layer directly instead
+    of going through the REST API.
+
+    Yields:
+        Session: A SQLModel database session that is closed on exit.
+    """
+    with Session(ENGINE) as session:
+        yield session
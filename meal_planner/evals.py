@@ -0,0 +1,637 @@
+"""Concurrent, incremental eval runner for recipe extraction.
+
+Extracts every eval fixture in a directory (tests/data/recipes/processed in
+a checkout) with the app's extraction pipeline, a bounded number of pages at
+a time, and checks the result against the fixture's expectations (the same
+checks as the slow `test_ml_evals` tests). Each result is cached by the
+fixture's content, the prompt template's content hash and the model the
+page is routed to, so a re-run only calls the LLM for cases where one of
+these changed; cached results are re-checked, so edits to the expectations
+or post-processing apply at once. The report lists, per fixture, whether it passed, its
+latency and token usage, and whether it came from the cache.
+
+Evaluate the configured prompt, or another version while iterating on it:
+
+    python -m meal_planner.evals --fixtures tests/data/recipes/processed
+    python -m meal_planner.evals --fixtures tests/data/recipes/processed \
+        --prompt 20250623_fix_serves_unit --concurrency 4
+
+To choose between template versions on cost and speed as well as quality,
+`--compare` runs every version (or the ones named) and prints a table of
+accuracy, average prompt and completion tokens, estimated cost and latency
+per template:
+
+    python -m meal_planner.evals --fixtures tests/data/recipes/processed \
+        --compare
+    python -m meal_planner.evals --fixtures tests/data/recipes/processed \
+        --compare 20250623_fix_serves_unit --replay
+
+The cache doubles as a store of recorded responses: with `--replay` nothing
+is sent to the LLM, and cases without a recorded result are reported as
+missing. The app's LLM cache and near-duplicate index are bypassed, so
+cases that are run are extracted by the LLM.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from meal_planner.config import (
+    LLM_INPUT_COST_PER_MILLION_TOKENS,
+    LLM_OUTPUT_COST_PER_MILLION_TOKENS,
+    RECIPE_EXTRACTION_PROMPT,
+)
+from meal_planner.models import RecipeBase
+from meal_planner.services.call_llm import generate_recipe_from_text
+from meal_planner.services.extract_webpage_text import clean_html_text
+from meal_planner.services.llm_limiter import estimate_tokens
+from meal_planner.services.llm_telemetry import llm_telemetry
+from meal_planner.services.model_router import model_router
+from meal_planner.services.process_recipe import postprocess_recipe
+from meal_planner.services.prompt_registry import PromptTemplate, prompt_registry
+from meal_planner.services.recipe_region import recipe_region_reducer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(".eval_cache") / "extraction.json"
+DEFAULT_CONCURRENCY = 8
+EXTRACTION_TASK = "recipe_extraction"
+NOT_RECORDED_MESSAGE = "No recorded result to replay."
+
+Extractor = Callable[[str], Awaitable[RecipeBase]]
+
+
+@dataclass(frozen=True)
+class EvalCase:
+    """A recipe page and the extraction expected from it.
+
+    Attributes:
+        html_path: The page's HTML file.
+        page_text: The page's cleaned text, as the app extracts from it.
+        expected: The fixture's expectations ("expected_names", ...).
+        fixture_hash: Hex SHA-256 of the HTML and the expectations.
+    """
+
+    html_path: Path
+    page_text: str
+    expected: dict[str, Any]
+    fixture_hash: str
+
+    @property
+    def name(self) -> str:
+        """File name of the page."""
+        return self.html_path.name
+
+
+@dataclass
+class EvalResult:
+    """Outcome of one eval case.
+
+    Attributes:
+        case: Name of the case.
+        passed: Whether the extraction met every expectation.
+        failures: What did not match, one message per check.
+        cached: Whether the extraction came from the eval cache.
+        latency_seconds: Time the extraction took when it was run.
+        prompt_tokens: Prompt tokens of its LLM calls, if reported.
+        completion_tokens: Completion tokens of its LLM calls, if reported.
+        error: Error message, if the extraction failed.
+    """
+
+    case: str
+    passed: bool
+    failures: list[str]
+    cached: bool
+    latency_seconds: float | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class TemplateSummary:
+    """Eval results of one prompt template, aggregated for comparison.
+
+    Attributes:
+        version: Template version.
+        cases: Number of cases.
+        passed: Cases whose extraction met every expectation.
+        errors: Cases whose extraction failed.
+        missing: Cases without a recorded result, when replaying.
+        prompt_tokens_avg: Average prompt tokens per extraction.
+        completion_tokens_avg: Average completion tokens per extraction.
+        cost_usd_avg: Estimated average cost per extraction.
+        latency_p50_seconds: Median extraction latency.
+        latency_p95_seconds: 95th percentile extraction latency.
+    """
+
+    version: str
+    cases: int
+    passed: int
+    errors: int
+    missing: int
+    prompt_tokens_avg: float | None
+    completion_tokens_avg: float | None
+    cost_usd_avg: float | None
+    latency_p50_seconds: float | None
+    latency_p95_seconds: float | None
+
+    @property
+    def accuracy(self) -> float | None:
+        """Share of the cases with a result that passed."""
+        evaluated = self.cases - self.missing
+        return self.passed / evaluated if evaluated else None
+
+    @classmethod
+    def from_results(cls, version: str, results: list[EvalResult]) -> "TemplateSummary":
+        """Aggregate a template's results.
+
+        Args:
+            version: Template version the results are for.
+            results: Its results, one per case.
+
+        Returns:
+            The summary; averages and latencies cover completed extractions.
+        """
+        missing = sum(result.error == NOT_RECORDED_MESSAGE for result in results)
+        completed = [result for result in results if result.error is None]
+        prompt_tokens = _average(result.prompt_tokens for result in completed)
+        completion_tokens = _average(result.completion_tokens for result in completed)
+        cost = None
+        if prompt_tokens is not None or completion_tokens is not None:
+            cost = (
+                (prompt_tokens or 0) * LLM_INPUT_COST_PER_MILLION_TOKENS
+                + (completion_tokens or 0) * LLM_OUTPUT_COST_PER_MILLION_TOKENS
+            ) / 1e6
+        latencies = sorted(
+            result.latency_seconds
+            for result in completed
+            if result.latency_seconds is not None
+        )
+        return cls(
+            version=version,
+            cases=len(results),
+            passed=sum(result.passed for result in results),
+            errors=len(results) - len(completed) - missing,
+            missing=missing,
+            prompt_tokens_avg=prompt_tokens,
+            completion_tokens_avg=completion_tokens,
+            cost_usd_avg=cost,
+            latency_p50_seconds=_quantile(latencies, 0.5),
+            latency_p95_seconds=_quantile(latencies, 0.95),
+        )
+
+
+def load_eval_cases(fixture_dir: Path) -> list[EvalCase]:
+    """Load the eval fixtures and the pages they describe.
+
+    Args:
+        fixture_dir: Directory of processed eval fixtures (*.json), each
+            naming its HTML file in "html_file".
+
+    Returns:
+        One case per fixture, in file name order.
+    """
+    cases = []
+    for json_file in sorted(fixture_dir.glob("*.json")):
+        expected = json.loads(json_file.read_text())
+        html_path = (json_file.parent / expected["html_file"]).resolve()
+        html = html_path.read_text()
+        digest = hashlib.sha256(html.encode("utf-8"))
+        digest.update(json.dumps(expected, sort_keys=True).encode("utf-8"))
+        cases.append(
+            EvalCase(
+                html_path=html_path,
+                page_text=clean_html_text(html),
+                expected=expected,
+                fixture_hash=digest.hexdigest(),
+            )
+        )
+    return cases
+
+
+def check_recipe(recipe: RecipeBase, expected: dict[str, Any]) -> list[str]:
+    """Compare a post-processed extraction with a fixture's expectations.
+
+    Ingredients are compared ignoring case and order, instructions exactly.
+
+    Args:
+        recipe: The extracted, post-processed recipe.
+        expected: The fixture's expectations.
+
+    Returns:
+        A message per expectation that is not met; empty if all are.
+    """
+    failures = []
+    if recipe.name not in expected["expected_names"]:
+        failures.append(
+            f"Recipe name '{recipe.name}' not in expected names "
+            f"{expected['expected_names']}"
+        )
+    expected_ingredients = sorted(i.lower() for i in expected["expected_ingredients"])
+    actual_ingredients = sorted(i.lower() for i in recipe.ingredients)
+    if actual_ingredients != expected_ingredients:
+        failures.append(
+            f"Ingredients don't match.\n"
+            f"Expected: {expected_ingredients}\n"
+            f"Actual: {actual_ingredients}"
+        )
+    if recipe.instructions != expected["expected_instructions"]:
+        failures.append(
+            f"Instructions don't match.\n"
+            f"Expected: {expected['expected_instructions']}\n"
+            f"Actual: {recipe.instructions}"
+        )
+    for field in ("makes_min", "makes_max"):
+        expected_value = expected.get(f"expected_{field}")
+        actual_value = getattr(recipe, field)
+        if actual_value != expected_value:
+            failures.append(
+                f"{field} doesn't match.\n"
+                f"Expected: {expected_value}\n"
+                f"Actual: {actual_value}"
+            )
+    expected_units = expected.get("expected_makes_units")
+    if expected_units is None and recipe.makes_unit is not None:
+        failures.append(f"Makes unit should be None.\nActual: {recipe.makes_unit}")
+    elif expected_units is not None and recipe.makes_unit not in expected_units:
+        failures.append(
+            f"Makes unit not in expected units.\n"
+            f"Expected one of: {expected_units}\n"
+            f"Actual: {recipe.makes_unit}"
+        )
+    return failures
+
+
+class EvalRunner:
+    """Runs eval cases concurrently, reusing cached results of unchanged cases.
+
+    Cache entries hold the raw extraction with its latency and token usage
+    and are keyed by (fixture hash, prompt template hash, model). Failed
+    extractions are not cached.
+    """
+
+    def __init__(
+        self,
+        template: PromptTemplate,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache_path: Path | None = DEFAULT_CACHE_PATH,
+        extract: Extractor | None = None,
+        model: str | None = None,
+        retry_failed: bool = False,
+        replay: bool = False,
+    ):
+        """Initialize the runner.
+
+        Args:
+            template: Extraction prompt template to evaluate.
+            concurrency: Maximum number of extractions run at once.
+            cache_path: JSON file of cached results; None disables caching.
+            extract: Coroutine function extracting a recipe from page text;
+                defaults to the app's extraction with `template`.
+            model: Model name for the cache key; defaults to the model the
+                model router picks for each page.
+            retry_failed: Re-run cached cases whose result fails the checks.
+            replay: Only report cached results; never call the LLM.
+        """
+        self.template = template
+        self.concurrency = concurrency
+        self.cache_path = cache_path
+        self.extract = extract or (
+            lambda text: generate_recipe_from_text(
+                text, prompt_version=template.version
+            )
+        )
+        self.model = model
+        self.retry_failed = retry_failed
+        self.replay = replay
+        self._cache: dict[str, dict[str, Any]] = {}
+
+    def cache_key(self, case: EvalCase) -> str:
+        """Key of a case's result for this runner's template and model."""
+        model = self.model or self._routed_model(case)
+        return hashlib.sha256(
+            f"{case.fixture_hash}:{self.template.content_hash}:{model}".encode()
+        ).hexdigest()
+
+    async def run(self, cases: list[EvalCase]) -> list[EvalResult]:
+        """Run the cases, at most `concurrency` at a time.
+
+        Args:
+            cases: Cases to evaluate.
+
+        Returns:
+            A result per case, in the order of `cases`.
+        """
+        self._cache = self._load_cache()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_case(case: EvalCase) -> EvalResult:
+            key = self.cache_key(case)
+            entry = self._cache.get(key)
+            if entry is not None:
+                result = self._result(case, entry, cached=True)
+                if result.passed or not self.retry_failed or self.replay:
+                    return result
+            if self.replay:
+                return EvalResult(
+                    case=case.name,
+                    passed=False,
+                    failures=[],
+                    cached=False,
+                    error=NOT_RECORDED_MESSAGE,
+                )
+            async with semaphore:
+                return await self._run_case(case, key)
+
+        return list(await asyncio.gather(*(run_case(case) for case in cases)))
+
+    async def _run_case(self, case: EvalCase, key: str) -> EvalResult:
+        started = time.perf_counter()
+        with llm_telemetry.collect_calls() as calls:
+            try:
+                recipe = await self.extract(case.page_text)
+            except Exception as e:
+                logger.warning("Eval case %s failed: %s", case.name, e)
+                return EvalResult(
+                    case=case.name,
+                    passed=False,
+                    failures=[],
+                    cached=False,
+                    latency_seconds=time.perf_counter() - started,
+                    error=str(e) or type(e).__name__,
+                )
+        entry = {
+            "case": case.name,
+            "recipe": recipe.model_dump(),
+            "latency_seconds": round(time.perf_counter() - started, 3),
+            "prompt_tokens": _total(call.prompt_tokens for call in calls),
+            "completion_tokens": _total(call.completion_tokens for call in calls),
+        }
+        self._cache[key] = entry
+        self._save_cache()
+        return self._result(case, entry, cached=False)
+
+    def _result(
+        self, case: EvalCase, entry: dict[str, Any], cached: bool
+    ) -> EvalResult:
+        recipe = postprocess_recipe(RecipeBase.model_validate(entry["recipe"]))
+        failures = check_recipe(recipe, case.expected)
+        return EvalResult(
+            case=case.name,
+            passed=not failures,
+            failures=failures,
+            cached=cached,
+            latency_seconds=entry["latency_seconds"],
+            prompt_tokens=entry["prompt_tokens"],
+            completion_tokens=entry["completion_tokens"],
+        )
+
+    def _routed_model(self, case: EvalCase) -> str:
+        prompt = self.template.render(
+            page_text=recipe_region_reducer.reduce(case.page_text)
+        )
+        return model_router.route(EXTRACTION_TASK, estimate_tokens(prompt)).model
+
+    def _load_cache(self) -> dict[str, dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable eval cache %s: %s", self.cache_path, e)
+            return {}
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._cache, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.cache_path)
+
+
+def _total(values: Any) -> int | None:
+    reported = [value for value in values if value is not None]
+    return sum(reported) if reported else None
+
+
+def _average(values: Any) -> float | None:
+    reported = [value for value in values if value is not None]
+    return sum(reported) / len(reported) if reported else None
+
+
+def _quantile(ordered: list[float], q: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def format_report(results: list[EvalResult], wall_seconds: float) -> str:
+    """Render results as a table with a summary line.
+
+    Args:
+        results: Results to report.
+        wall_seconds: Wall time of the whole run.
+
+    Returns:
+        The report, including the failure messages of failed cases.
+    """
+    width = max([len(result.case) for result in results] + [4])
+    lines = [
+        f"{'case':{width}} {'result':6} {'source':6} {'latency':>8} "
+        f"{'in tok':>7} {'out tok':>7}"
+    ]
+    for result in results:
+        status = "pass" if result.passed else ("error" if result.error else "FAIL")
+        latency = (
+            f"{result.latency_seconds:7.2f}s"
+            if result.latency_seconds is not None
+            else f"{'-':>8}"
+        )
+        lines.append(
+            f"{result.case:{width}} {status:6} "
+            f"{'cache' if result.cached else 'llm':6} {latency} "
+            f"{_format_tokens(result.prompt_tokens):>7} "
+            f"{_format_tokens(result.completion_tokens):>7}"
+        )
+    run = [result for result in results if not result.cached]
+    lines.append(
+        f"{sum(result.passed for result in results)}/{len(results)} passed; "
+        f"{len(run)} run, {len(results) - len(run)} cached, "
+        f"{wall_seconds:.1f}s wall"
+    )
+    for result in results:
+        if result.error or result.failures:
+            lines.append(f"\n{result.case}:")
+            lines.extend([result.error] if result.error else result.failures)
+    return "\n".join(lines)
+
+
+def format_comparison(summaries: list[TemplateSummary], active: str | None) -> str:
+    """Render template summaries as a comparison table, one row per template.
+
+    Args:
+        summaries: Summaries to compare.
+        active: Version of the configured template, marked with "*".
+
+    Returns:
+        The table. Cost is per 1000 extractions.
+    """
+    width = max([len(summary.version) for summary in summaries] + [8]) + 2
+    lines = [
+        f"{'template':{width}} {'accuracy':>12} {'errors':>6} {'missing':>7} "
+        f"{'in tok':>7} {'out tok':>7} {'$/1k':>7} {'p50':>7} {'p95':>7}"
+    ]
+    for summary in summaries:
+        marker = "*" if summary.version == active else " "
+        accuracy = (
+            f"{summary.passed}/{summary.cases - summary.missing} "
+            f"{summary.accuracy:4.0%}"
+            if summary.accuracy is not None
+            else "-"
+        )
+        cost = (
+            f"{summary.cost_usd_avg * 1000:7.3f}"
+            if summary.cost_usd_avg is not None
+            else f"{'-':>7}"
+        )
+        lines.append(
+            f"{marker}{summary.version:{width - 1}} {accuracy:>12} "
+            f"{summary.errors:6} {summary.missing:7} "
+            f"{_format_average(summary.prompt_tokens_avg):>7} "
+            f"{_format_average(summary.completion_tokens_avg):>7} {cost} "
+            f"{_format_seconds(summary.latency_p50_seconds)} "
+            f"{_format_seconds(summary.latency_p95_seconds)}"
+        )
+    return "\n".join(lines)
+
+
+def _format_tokens(tokens: int | None) -> str:
+    return "-" if tokens is None else str(tokens)
+
+
+def _format_average(value: float | None) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+def _format_seconds(seconds: float | None) -> str:
+    return f"{'-':>7}" if seconds is None else f"{seconds:6.2f}s"
+
+
+def _bypass_app_caches() -> None:
+    # Imported here to keep them out of the library API above.
+    from meal_planner.services.llm_cache import llm_cache
+    from meal_planner.services.near_duplicates import near_duplicates
+
+    llm_cache.enabled = False
+    near_duplicates.enabled = False
+
+
+def _runner(args: argparse.Namespace, version: str) -> EvalRunner:
+    return EvalRunner(
+        prompt_registry.get(EXTRACTION_TASK, version),
+        concurrency=args.concurrency,
+        cache_path=None if args.no_cache else args.cache,
+        retry_failed=args.retry_failed,
+        replay=args.replay,
+    )
+
+
+async def run_evals(args: argparse.Namespace) -> list[EvalResult]:
+    """Run the evals selected on the command line and print the report."""
+    from meal_planner.services.llm_client import llm_http_client
+
+    _bypass_app_caches()
+    cases = [case for case in load_eval_cases(args.fixtures) if args.only in case.name]
+    started = time.perf_counter()
+    try:
+        results = await _runner(args, args.prompt).run(cases)
+    finally:
+        await llm_http_client.close()
+    print(format_report(results, time.perf_counter() - started))
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2))
+    return results
+
+
+async def compare_templates(args: argparse.Namespace) -> list[TemplateSummary]:
+    """Run the evals for each template to compare and print the table.
+
+    Templates are run one after another, so their latencies are measured
+    under the same load.
+    """
+    from meal_planner.services.llm_client import llm_http_client
+
+    _bypass_app_caches()
+    cases = [case for case in load_eval_cases(args.fixtures) if args.only in case.name]
+    summaries = []
+    try:
+        for version in args.compare or prompt_registry.versions(EXTRACTION_TASK):
+            results = await _runner(args, version).run(cases)
+            summaries.append(TemplateSummary.from_results(version, results))
+    finally:
+        await llm_http_client.close()
+    print(format_comparison(summaries, active=RECIPE_EXTRACTION_PROMPT))
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                [
+                    asdict(summary) | {"accuracy": summary.accuracy}
+                    for summary in summaries
+                ],
+                indent=2,
+            )
+        )
+    return summaries
+
+
+def main() -> None:
+    """Run the evals from the command line; exit with 1 if any case fails."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompt", default=RECIPE_EXTRACTION_PROMPT)
+    parser.add_argument(
+        "--compare",
+        nargs="*",
+        default=None,
+        metavar="VERSION",
+        help="Compare these template versions (default: all)",
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--only", default="", help="Run cases whose name has this")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE_PATH)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--replay", action="store_true", help="Never call the LLM")
+    parser.add_argument("--retry-failed", action="store_true")
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        required=True,
+        help="Directory of eval fixtures, e.g. tests/data/recipes/processed",
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Write results")
+    args = parser.parse_args()
+
+    for version in args.compare or [args.prompt]:
+        try:
+            prompt_registry.get(EXTRACTION_TASK, version)
+        except FileNotFoundError as e:
+            parser.error(f"{e.strerror}: {e.filename}")
+    if args.compare is not None:
+        asyncio.run(compare_templates(args))
+        return
+    results = asyncio.run(run_evals(args))
+    sys.exit(0 if all(result.passed for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
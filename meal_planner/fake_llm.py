@@ -0,0 +1,372 @@
+"""Local OpenAI-compatible stand-in for the LLM, for offline load testing.
+
+Serves `POST /v1/chat/completions` the way instructor calls it (tool calls,
+JSON content or streamed tool-call deltas) and answers every request with a
+`RecipeBase` built from a directory of eval fixtures (tests/data/recipes/
+processed in a checkout), or with a one-edit `RecipePatch` when that is the
+requested tool. The recipe is chosen deterministically from the prompt: the
+fixture whose name appears in it, otherwise one picked by a hash of the
+prompt. Latency is drawn from a configurable distribution, optionally plus
+a time per completion token, and a configurable share of requests fail with
+HTTP 500 or are rate limited with HTTP 429, so retries, hedging and the LLM
+limiter can be exercised without spending quota.
+
+Run it and point the app at it:
+
+    python -m meal_planner.fake_llm --fixtures tests/data/recipes/processed \
+        --port 8001 --latency-median 1.5
+    MEAL_PLANNER_LLM_BASE_URL=http://127.0.0.1:8001/v1/ \
+        MEAL_PLANNER_LLM_API_KEY=fake MEAL_PLANNER_LLM_MODEL=fake ...
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import secrets
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from meal_planner.models import RecipeBase, RecipeEdit, RecipePatch
+from meal_planner.services.llm_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "lognormal")
+STREAM_CHUNK_CHARS = 40
+
+
+@dataclass
+class FakeLLMSettings:
+    """Behaviour of the fake LLM server.
+
+    Attributes:
+        latency_distribution: "constant", "uniform" or "lognormal".
+        latency_median_seconds: Median response latency.
+        latency_spread: For "uniform", the relative half-width of the range
+            around the median; for "lognormal", sigma of the underlying
+            normal distribution. Ignored for "constant".
+        error_rate: Share of requests answered with HTTP 500 after the
+            sampled latency.
+        rate_limit_rate: Share of requests answered at once with HTTP 429.
+        retry_after_seconds: Retry-After header sent with 429 responses.
+        stream_chunk_seconds: Delay between chunks of streamed responses,
+            after the sampled latency has passed.
+        completion_token_seconds: Extra latency per completion token, so
+            that long answers take longer, as they do with a real model.
+        seed: Seed for latency and failure sampling, for reproducible runs.
+    """
+
+    latency_distribution: str = "lognormal"
+    latency_median_seconds: float = 1.0
+    latency_spread: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    stream_chunk_seconds: float = 0.02
+    completion_token_seconds: float = 0.0
+    seed: int | None = None
+
+    def __post_init__(self):
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {self.latency_distribution!r}; "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        if not 0 <= self.error_rate + self.rate_limit_rate <= 1:
+            raise ValueError("error_rate plus rate_limit_rate must be in [0, 1]")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw one response latency in seconds."""
+        median = self.latency_median_seconds
+        if self.latency_distribution == "uniform":
+            return max(
+                0.0,
+                rng.uniform(1 - self.latency_spread, 1 + self.latency_spread) * median,
+            )
+        if self.latency_distribution == "lognormal":
+            return rng.lognormvariate(0, self.latency_spread) * median
+        return median
+
+
+@dataclass(frozen=True)
+class FixtureRecipe:
+    """A recipe the fake server can answer with, and the names it goes by."""
+
+    names: tuple[str, ...]
+    recipe: RecipeBase
+
+
+def load_fixture_recipes(fixture_dir: Path) -> list[FixtureRecipe]:
+    """Build the server's recipes from the eval expectations in `fixture_dir`.
+
+    Args:
+        fixture_dir: Directory of processed eval fixtures (*.json).
+
+    Returns:
+        One recipe per fixture, in file name order.
+
+    Raises:
+        FileNotFoundError: If `fixture_dir` holds no fixtures.
+    """
+    recipes = []
+    for path in sorted(fixture_dir.glob("*.json")):
+        expected = json.loads(path.read_text())
+        unit = expected.get("expected_makes_units") or [None]
+        recipe = RecipeBase(
+            name=expected["expected_names"][0],
+            ingredients=expected["expected_ingredients"],
+            instructions=expected["expected_instructions"],
+            makes_min=expected.get("expected_makes_min"),
+            makes_max=expected.get("expected_makes_max"),
+            makes_unit=unit[0],
+        )
+        recipes.append(FixtureRecipe(tuple(expected["expected_names"]), recipe))
+    if not recipes:
+        raise FileNotFoundError(f"No recipe fixtures found in {fixture_dir}")
+    return recipes
+
+
+def pick_recipe(prompt: str, recipes: list[FixtureRecipe]) -> RecipeBase:
+    """Choose the recipe to answer `prompt` with.
+
+    Args:
+        prompt: Text of all messages in the request.
+        recipes: Candidate recipes.
+
+    Returns:
+        The recipe with the longest name found in the prompt, or one picked
+        by a hash of the prompt if no name matches.
+    """
+    lowered = prompt.lower()
+    matches = [
+        (len(name), fixture.recipe)
+        for fixture in recipes
+        for name in fixture.names
+        if name.lower() in lowered
+    ]
+    if matches:
+        return max(matches, key=lambda match: match[0])[1]
+    digest = hashlib.sha256(prompt.encode()).digest()
+    return recipes[int.from_bytes(digest[:8], "big") % len(recipes)].recipe
+
+
+def _answer(tool_name: str | None, prompt: str, recipes: list[FixtureRecipe]) -> str:
+    """JSON of the response model the request asks for."""
+    recipe = pick_recipe(prompt, recipes)
+    if tool_name == RecipePatch.__name__:
+        edit = RecipeEdit(
+            op="replace", section="ingredients", index=0, text=recipe.ingredients[0]
+        )
+        return RecipePatch(edits=[edit]).model_dump_json()
+    return recipe.model_dump_json()
+
+
+def _prompt_text(body: dict[str, Any]) -> str:
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(part.get("text", "") for part in content)
+    return "\n".join(parts)
+
+
+def _tool_name(body: dict[str, Any]) -> str | None:
+    tools = body.get("tools")
+    if not tools:
+        return None
+    choice = body.get("tool_choice")
+    if isinstance(choice, dict) and "function" in choice:
+        return choice["function"]["name"]
+    return tools[0]["function"]["name"]
+
+
+def _error(status_code: int, message: str, kind: str, **headers: str) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": message, "type": kind, "code": status_code}},
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def create_app(
+    settings: FakeLLMSettings | None = None,
+    recipes: list[FixtureRecipe] | None = None,
+) -> FastAPI:
+    """Create the fake LLM server.
+
+    Args:
+        settings: Latency and failure behaviour; defaults to `FakeLLMSettings()`.
+        recipes: Recipes to answer with; defaults to the eval fixtures.
+
+    Returns:
+        The ASGI application. Request counts by outcome are served at
+        `GET /stats`.
+    """
+    settings = settings or FakeLLMSettings()
+    recipes = recipes if recipes is not None else load_fixture_recipes()
+    rng = random.Random(settings.seed)  # noqa: S311 - simulation, not security
+    stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0}
+    app = FastAPI(title="Fake LLM")
+
+    @app.get("/stats")
+    async def get_stats() -> dict[str, int]:
+        return stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        draw = rng.random()
+        if draw < settings.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return _error(
+                429,
+                "Rate limit exceeded (injected).",
+                "rate_limit_error",
+                **{"retry-after": str(settings.retry_after_seconds)},
+            )
+        prompt = _prompt_text(body)
+        tool_name = _tool_name(body)
+        content = _answer(tool_name, prompt, recipes)
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(content),
+        }
+        await asyncio.sleep(
+            settings.sample_latency(rng)
+            + usage["completion_tokens"] * settings.completion_token_seconds
+        )
+        if draw < settings.rate_limit_rate + settings.error_rate:
+            stats["errors"] += 1
+            return _error(500, "Internal error (injected).", "server_error")
+
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        stats["ok"] += 1
+        completion_id = f"chatcmpl-{secrets.token_hex(8)}"
+        model = body.get("model", "fake")
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(completion_id, model, tool_name, content, settings),
+                media_type="text/event-stream",
+            )
+        if tool_name is not None:
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{secrets.token_hex(8)}",
+                        "type": "function",
+                        "function": {"name": tool_name, "arguments": content},
+                    }
+                ],
+            }
+        else:
+            message = {"role": "assistant", "content": content}
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if tool_name else "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    return app
+
+
+async def _stream_chunks(
+    completion_id: str,
+    model: str,
+    tool_name: str | None,
+    content: str,
+    settings: FakeLLMSettings,
+) -> AsyncIterator[str]:
+    """Server-sent chat.completion.chunk events carrying `content` in pieces."""
+    for i in range(0, len(content), STREAM_CHUNK_CHARS):
+        piece = content[i : i + STREAM_CHUNK_CHARS]
+        if tool_name is None:
+            delta: dict[str, Any] = {"content": piece}
+        else:
+            call: dict[str, Any] = {"index": 0, "function": {"arguments": piece}}
+            if i == 0:
+                call.update(id=f"call_{secrets.token_hex(8)}", type="function")
+                call["function"]["name"] = tool_name
+            delta = {"tool_calls": [call]}
+        if i == 0:
+            delta["role"] = "assistant"
+        yield _chunk(completion_id, model, delta, None)
+        await asyncio.sleep(settings.stream_chunk_seconds)
+    yield _chunk(completion_id, model, {}, "tool_calls" if tool_name else "stop")
+    yield "data: [DONE]\n\n"
+
+
+def _chunk(
+    completion_id: str, model: str, delta: dict[str, Any], finish_reason: str | None
+) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def main() -> None:
+    """Run the fake LLM server from the command line."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-median", type=float, default=1.0)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--completion-token-seconds", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        required=True,
+        help="Directory of eval fixtures, e.g. tests/data/recipes/processed",
+    )
+    args = parser.parse_args()
+
+    settings = FakeLLMSettings(
+        latency_distribution=args.latency,
+        latency_median_seconds=args.latency_median,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        completion_token_seconds=args.completion_token_seconds,
+        seed=args.seed,
+    )
+    app = create_app(settings, load_fixture_recipes(args.fixtures))
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,11 @@ including both database models (SQLModel) and API request/response models.
 """
 
 from datetime import datetime, timezone
-from typing import Annotated, Optional
+from typing import Annotated, Literal, Optional
 from uuid import uuid4
 
 from pydantic import model_validator
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.types import JSON
 from sqlmodel import Field, SQLModel
 
@@ -168,6 +168,104 @@ class Recipe(RecipeBase, table=True):
     updated_at: UpdatedAt
 
 
+class RecipeEdit(SQLModel):
+    """One change to a recipe's ingredient or instruction list.
+
+    Indexes refer to the list as it was before any edit of the patch is
+    applied, so the edits of one patch do not shift each other.
+
+    Attributes:
+        op: "replace" or "delete" the item at `index`, or "insert" `text`
+            before it.
+        section: The list edited, "ingredients" or "instructions".
+        index: 0-based position in the list. For "insert" it may equal the
+            list's length, to append.
+        text: The new item, for "replace" and "insert".
+    """
+
+    op: Literal["replace", "insert", "delete"] = Field(
+        ..., description="replace, insert (before index) or delete"
+    )
+    section: Literal["ingredients", "instructions"] = Field(
+        ..., description="The list to edit"
+    )
+    index: int = Field(
+        ...,
+        ge=0,
+        description="0-based index in the list before any edits; "
+        "insert may use the list length to append",
+    )
+    text: Optional[str] = Field(
+        default=None, description="New item text, for replace and insert"
+    )
+
+
+class RecipePatch(SQLModel):
+    """Changes to a recipe, as returned by the LLM in patch modification mode.
+
+    Fields left as None are unchanged.
+
+    Attributes:
+        name: New recipe name.
+        makes_min: New minimum yield.
+        makes_max: New maximum yield.
+        makes_unit: New yield unit.
+        edits: Changes to the ingredient and instruction lists.
+    """
+
+    name: Optional[str] = Field(default=None, description="New name, if changed")
+    makes_min: Optional[int] = Field(
+        default=None, description="New minimum yield, if changed", ge=1
+    )
+    makes_max: Optional[int] = Field(
+        default=None, description="New maximum yield, if changed", ge=1
+    )
+    makes_unit: Optional[str] = Field(
+        default=None, description="New yield unit, if changed"
+    )
+    edits: list[RecipeEdit] = Field(
+        default_factory=list, description="Ingredient and instruction edits"
+    )
+
+
+class Job(SQLModel, table=True):
+    """Database model for a background job, such as an LLM recipe extraction.
+
+    Jobs are stored so that they survive client disconnects and restarts;
+    see `meal_planner.services.job_queue`.
+
+    Attributes:
+        id: Primary key UUID, automatically generated on creation.
+        kind: Name of the handler that runs the job, e.g. "extract".
+        status: "pending", "running", "succeeded" or "failed".
+        payload: JSON input passed to the handler.
+        result: JSON output of the handler, once succeeded.
+        error: User-facing error message, once failed.
+        attempts: Number of times a worker has started the job.
+        owner: ID of the `JobQueue` that claimed the job last.
+        created_at: Timestamp of when the job was submitted (UTC).
+        updated_at: Timestamp of the job's last status change, or last
+            heartbeat while it is running (UTC).
+    """
+
+    __tablename__ = "jobs"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_jobs_status_created_at", "status", "created_at"),)
+    id: EntityId
+    kind: str = Field(..., description="Handler that runs the job")
+    status: str = Field(
+        default="pending", description="pending, running, succeeded or failed"
+    )
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    result: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = Field(default=None, description="Failure message")
+    attempts: int = Field(default=0, description="Times a worker started the job")
+    owner: Optional[str] = Field(
+        default=None, description="Job queue that claimed the job last"
+    )
+    created_at: CreatedAt
+    updated_at: UpdatedAt
+
+
 class UserBase(SQLModel):
     """Base user model with validation.
 
@@ -1,40 +1,82 @@
 """Routers for actions that process data or perform operations, often via POST."""
 
 import logging
+from collections.abc import AsyncIterator, Callable
 
-import httpx
 from fastapi import Request, Response
 from fasthtml.common import *
-from pydantic import ValidationError
-from starlette import status
+from pydantic import TypeAdapter, ValidationError
 from starlette.datastructures import FormData
 
-from meal_planner.core import (
-    internal_api_client,
-    rt,
-)
+from meal_planner.config import JOB_QUEUE_ENABLED
+from meal_planner.core import rt
+from meal_planner.database import session_scope
 from meal_planner.form_processing import parse_recipe_form_data
 from meal_planner.models import RecipeBase
 from meal_planner.services.call_llm import (
     generate_modified_recipe,
     generate_recipe_from_text,
+    stream_recipe_from_text,
+)
+from meal_planner.services.extraction_streams import extraction_streams
+from meal_planner.services.job_queue import (
+    FINISHED,
+    JobError,
+    job_queue,
 )
+from meal_planner.services.multi_recipe import multi_recipe_extractor
+from meal_planner.services.near_duplicates import allow_near_duplicate_reuse
 from meal_planner.services.process_recipe import postprocess_recipe
-from meal_planner.ui.common import CSS_ERROR_CLASS, CSS_SUCCESS_CLASS
+from meal_planner.services.recipes import (
+    RecipeNotFoundError,
+    RecipeService,
+    RecipeStorageError,
+)
+from meal_planner.services.speculative_extraction import (
+    speculative_extractions,
+    text_key,
+)
+from meal_planner.services.unit_conversion import (
+    convert_recipe,
+    detect_conversion_request,
+)
+from meal_planner.ui.common import (
+    CSS_ERROR_CLASS,
+    CSS_SUCCESS_CLASS,
+    JOBS_URL,
+    build_job_poller,
+)
 from meal_planner.ui.edit_recipe import (
     build_edit_review_form,
     build_modify_form_response,
 )
+from meal_planner.ui.extract_recipe import (
+    EXTRACT_PICK_URL,
+    EXTRACT_RUN_URL,
+    EXTRACT_STREAM_URL,
+    EXTRACTION_DONE_EVENT,
+    EXTRACTION_PARTIAL_EVENT,
+    build_extraction_preview,
+    build_extraction_stream,
+    build_multi_extraction_progress,
+    build_recipe_picker,
+)
 
 logger = logging.getLogger(__name__)
 
+EXTRACTION_FAILED_MESSAGE = (
+    "Recipe extraction failed. Please try again or check the input text."
+)
+
+_recipe_list = TypeAdapter(list[RecipeBase])
+
 
 @rt("/recipes/save")
 async def post_save_recipe(request: Request):
     """Handles saving a new recipe.
 
-    Parses recipe data from the form, validates it, and attempts to save it
-    by making a POST request to the internal `/api/v0/recipes` endpoint.
+    Parses recipe data from the form, validates it, and saves it through the
+    recipe service.
 
     Args:
         request: The FastAPI request object, containing the form data for
@@ -53,11 +95,14 @@ async def post_save_recipe(request: Request):
         recipe_obj = RecipeBase(**parsed_data)
     except ValidationError as e:
         logger.warning("Validation error saving recipe: %s", e, exc_info=False)
-        result = Span(
-            "Invalid recipe data. Please check the fields.",
-            cls=CSS_ERROR_CLASS,
-            id="save-button-container",
-        )
+        if all(
+            error["loc"] == ("instructions",) and error["type"] == "too_short"
+            for error in e.errors()
+        ):
+            message = "Please add at least one instruction to the recipe."
+        else:
+            message = "Invalid recipe data. Please check the fields."
+        result = Span(message, cls=CSS_ERROR_CLASS, id="save-button-container")
     except Exception as e:
         logger.error("Error parsing form data during save: %s", e, exc_info=True)
         result = Span(
@@ -67,61 +112,18 @@ async def post_save_recipe(request: Request):
         )
     else:
         try:
-            response = await internal_api_client.post(
-                "/v0/recipes", json=recipe_obj.model_dump()
-            )
-            response.raise_for_status()
-            logger.info("Saved recipe via API call from UI, Name: %s", recipe_obj.name)
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "API error saving recipe: Status %s, Response: %s",
-                e.response.status_code,
-                e.response.text,
-                exc_info=True,
-            )
-            if e.response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
-                try:
-                    error_detail = e.response.json().get("detail", [])
-                    for error in error_detail:
-                        if (
-                            isinstance(error, dict)
-                            and error.get("loc") == ["body", "instructions"]
-                            and error.get("type") == "too_short"
-                        ):
-                            result = Span(
-                                "Please add at least one instruction to the recipe.",
-                                cls=CSS_ERROR_CLASS,
-                                id="save-button-container",
-                            )
-                            break
-                    else:
-                        result = Span(
-                            "Could not save recipe: Invalid data for some fields.",
-                            cls=CSS_ERROR_CLASS,
-                            id="save-button-container",
-                        )
-                except Exception:
-                    result = Span(
-                        "Could not save recipe: Invalid data for some fields.",
-                        cls=CSS_ERROR_CLASS,
-                        id="save-button-container",
-                    )
-            else:
-                result = Span(
-                    "Could not save recipe. Please check input and try again.",
-                    cls=CSS_ERROR_CLASS,
-                    id="save-button-container",
-                )
-        except httpx.RequestError as e:
-            logger.error("Network error saving recipe: %s", e, exc_info=True)
+            with session_scope() as session:
+                RecipeService(session).create(recipe_obj)
+            logger.info("Saved recipe from UI, Name: %s", recipe_obj.name)
+        except RecipeStorageError as e:
+            logger.error("Storage error saving recipe: %s", e, exc_info=True)
             result = Span(
-                "Could not save recipe due to a network issue. Please try again.",
+                "Could not save recipe. Please try again.",
                 cls=CSS_ERROR_CLASS,
                 id="save-button-container",
             )
-
         except Exception as e:
-            logger.error("Unexpected error saving recipe via API: %s", e, exc_info=True)
+            logger.error("Unexpected error saving recipe: %s", e, exc_info=True)
             result = Span(
                 "An unexpected error occurred while saving the recipe.",
                 cls=CSS_ERROR_CLASS,
@@ -172,7 +174,13 @@ async def post_modify_recipe(request: Request):
             initial parsing), the form is re-rendered with the error message
             "Please enter modification instructions." The current recipe data
             remains in the form.
-        -   If a 'modification_prompt' is provided:
+        -   If a 'modification_prompt' only asks for a unit conversion
+            (e.g. "Convert to metric"), the recipe is converted locally
+            without calling the LLM.
+        -   If the job queue is enabled, any other modification is submitted
+            as a background job and the form is re-rendered with a
+            placeholder that polls `get_job_status` for the result.
+        -   If any other 'modification_prompt' is provided:
             -   The LLM service is called to generate a modified recipe.
             -   **On Successful LLM Modification:**
                 -   The form is re-rendered, showing the new `modified_recipe`
@@ -226,12 +234,33 @@ async def post_modify_recipe(request: Request):
             ),
         )
 
-    try:
-        modified_recipe: RecipeBase = await generate_modified_recipe(
-            current_recipe=current_recipe, modification_request=modification_prompt
+    unit_system = detect_conversion_request(modification_prompt)
+    if JOB_QUEUE_ENABLED and unit_system is None:
+        job_id = job_queue.submit(
+            "modify",
+            {
+                "current_recipe": current_recipe.model_dump(),
+                "original_recipe": original_recipe.model_dump(),
+                "modification_prompt": modification_prompt,
+            },
         )
+        return build_modify_form_response(
+            current_recipe=current_recipe,
+            original_recipe=original_recipe,
+            modification_prompt_value=modification_prompt,
+            error_message_content=build_job_poller(job_id, "#edit-form-target"),
+        )
+
+    try:
+        if unit_system is not None:
+            modified_recipe = convert_recipe(current_recipe, unit_system)
+            logger.info("Converted recipe to %s units locally.", unit_system)
+        else:
+            modified_recipe = await generate_modified_recipe(
+                current_recipe=current_recipe, modification_request=modification_prompt
+            )
+            logger.info("LLM modification successful. Building success response.")
         processed_recipe = postprocess_recipe(modified_recipe)
-        logger.info("LLM modification successful. Building success response.")
         result = build_modify_form_response(
             current_recipe=processed_recipe,
             original_recipe=original_recipe,
@@ -297,18 +326,30 @@ async def post_modify_recipe(request: Request):
     return result
 
 
-@rt("/recipes/extract/run")
+@rt(EXTRACT_RUN_URL)
 async def post_extract_recipe_run(
     recipe_text: str | None = None,
+    speculation_key: str | None = None,
+    fetched_text_key: str | None = None,
 ):
     """Handles recipe extraction from text.
 
     This endpoint takes raw text, attempts to extract a recipe from it using an
     LLM service, and then populates the recipe editing form with the
-    extracted data.
+    extracted data. If the text was fetched from a URL and is unchanged, the
+    extraction started speculatively by the fetch is used. Pages holding
+    several recipes are extracted section by section (see `multi_recipe`),
+    and a picker listing the recipes is shown above the edit form, which
+    holds the first one. If the job queue is enabled, the extraction is
+    submitted as a background job instead and a placeholder polling
+    `get_job_status` is returned. Only unedited fetched text may reuse the
+    extraction of a near-duplicate page (see `near_duplicates`).
 
     Args:
         recipe_text: The raw text input by the user, expected to contain a recipe.
+        speculation_key: Key of the speculative extraction started when the
+            text was fetched, if any.
+        fetched_text_key: `text_key` of the text fetched from a URL, if any.
 
     Returns:
         A Group of Divs for OOB swaps updating '#edit-form-target',
@@ -323,60 +364,306 @@ async def post_extract_recipe_run(
     """
     if not recipe_text:
         logger.warning("Recipe extraction called with no text provided.")
-        return Div(
-            "No text content provided for extraction.",
-            id="error-message-container",
-            hx_swap_oob="innerHTML",
-            cls=CSS_ERROR_CLASS,
+        return _extraction_error("No text content provided for extraction.")
+
+    speculative_extractions.discard_if_changed(speculation_key, recipe_text)
+    unedited = _is_unedited_fetched_text(fetched_text_key, recipe_text)
+    if JOB_QUEUE_ENABLED:
+        job_id = job_queue.submit(
+            "extract",
+            {"recipe_text": recipe_text, "reuse_near_duplicates": unedited},
         )
-
+        return build_job_poller(job_id, "this")
     try:
-        extracted_recipe: RecipeBase = await generate_recipe_from_text(text=recipe_text)
+        with allow_near_duplicate_reuse(unedited):
+            extracted_recipes = await _extract_recipes(recipe_text)
         logger.info(
-            "LLM successfully generated recipe from text. Name: %s",
-            extracted_recipe.name,
+            "LLM successfully generated recipes from text. Names: %s",
+            [recipe.name for recipe in extracted_recipes],
         )
-
-        if not extracted_recipe.instructions:
-            logger.warning(
-                "Recipe extracted from text is missing instructions. Recipe name: %s",
-                extracted_recipe.name,
-            )
-            return Div(
-                (
-                    "Recipe extraction resulted in missing instructions. "
-                    "Please refine your input or try a different recipe text."
-                ),
-                id="error-message-container",
-                hx_swap_oob="innerHTML",
-                cls=f"{CSS_ERROR_CLASS} mt-2",
+        return _render_extracted_recipes(extracted_recipes, recipe_text)
+    except Exception as e:
+        logger.error(
+            "LLM service failed to generate recipe from text: %s. Text: '%s'",
+            e,
+            recipe_text[:100],
+            exc_info=True,
+        )
+        if not isinstance(e, (RuntimeError, FileNotFoundError)):
+            logger.error(
+                "Error during recipe extraction processing: %s", e, exc_info=True
             )
+        return _extraction_error(EXTRACTION_FAILED_MESSAGE)
 
-        recipe = postprocess_recipe(extracted_recipe)
-        logger.info("Recipe postprocessing successful. Name: %s", recipe.name)
 
-        edit_form_card, review_section_card = build_edit_review_form(
-            current_recipe=recipe,
-            original_recipe=recipe,
-            error_message_content=None,
-        )
+def _is_unedited_fetched_text(fetched_text_key: str | None, recipe_text: str) -> bool:
+    """Whether `recipe_text` is the text fetched from a URL, unedited."""
+    return bool(fetched_text_key) and fetched_text_key == text_key(recipe_text)
+
+
+async def _extract_recipes(recipe_text: str) -> list[RecipeBase]:
+    """Extract the recipes in `recipe_text`.
+
+    Pages with several recipe sections are extracted by the multi-recipe
+    extractor; any other text as one recipe, using its speculative
+    extraction if there is one.
+
+    Returns:
+        The extracted recipes, in page order; at least one.
+
+    Raises:
+        RuntimeError: If the LLM calls fail.
+        FileNotFoundError: If the extraction prompt template is missing.
+    """
+    chunks = multi_recipe_extractor.split(recipe_text)
+    if chunks:
+        return await multi_recipe_extractor.extract_chunks(chunks)
+    extracted_recipe = await _claim_speculative_extraction(recipe_text)
+    if extracted_recipe is None:
+        extracted_recipe = await generate_recipe_from_text(text=recipe_text)
+    return [extracted_recipe]
+
+
+async def _claim_speculative_extraction(recipe_text: str) -> RecipeBase | None:
+    """Await the speculative extraction of `recipe_text`, if there is one.
+
+    Returns:
+        The extracted recipe, or None if there was no speculative
+        extraction or it failed, in which case the caller extracts afresh.
+    """
+    task = speculative_extractions.claim(recipe_text)
+    if task is None:
+        return None
+    try:
+        return await task
+    except Exception as e:
+        logger.warning("Speculative extraction failed, extracting again: %s", e)
+        return None
+
+
+@rt(EXTRACT_STREAM_URL)
+async def post_extract_recipe_stream(
+    recipe_text: str | None = None,
+    speculation_key: str | None = None,
+    fetched_text_key: str | None = None,
+):
+    """Starts a streamed recipe extraction from text.
+
+    Streaming counterpart of `post_extract_recipe_run`. The text is parked
+    under a single-use stream ID and the returned element opens a
+    Server-Sent Events connection to `get_extract_recipe_stream`, which
+    renders the recipe into '#edit-form-target' while it is being extracted.
+    A speculative extraction of a fetched text is cancelled here if the text
+    was edited since, and near-duplicate reuse is only allowed if it was not.
+
+    Args:
+        recipe_text: The raw text input by the user, expected to contain a recipe.
+        speculation_key: Key of the speculative extraction started when the
+            text was fetched, if any.
+        fetched_text_key: `text_key` of the text fetched from a URL, if any.
+
+    Returns:
+        The SSE connection element, or an error message Div for OOB swap to
+        '#error-message-container' if `recipe_text` is missing.
+    """
+    if not recipe_text:
+        logger.warning("Streamed recipe extraction called with no text provided.")
+        return _extraction_error("No text content provided for extraction.")
+
+    speculative_extractions.discard_if_changed(speculation_key, recipe_text)
+    stream_id = extraction_streams.add(recipe_text)
+    url = f"{EXTRACT_STREAM_URL}/{stream_id}"
+    if _is_unedited_fetched_text(fetched_text_key, recipe_text):
+        url += "?fetched=true"
+    return build_extraction_stream(url)
+
+
+@rt(f"{EXTRACT_STREAM_URL}/{{stream_id}}")
+async def get_extract_recipe_stream(stream_id: str, fetched: bool = False):
+    """Streams a recipe extraction to the browser as it progresses.
+
+    Each partial result is sent as an `EXTRACTION_PARTIAL_EVENT` message that
+    re-renders a read-only preview into '#edit-form-target'. If a speculative
+    extraction of the text is pending, it is awaited instead and no partial
+    results are sent. Pages holding several recipes are not streamed: a
+    single progress message is sent while their sections are extracted in
+    parallel, and the result includes a recipe picker. The final
+    `EXTRACTION_DONE_EVENT` message carries the same swaps as
+    `post_extract_recipe_run` (edit and review forms), or an error message
+    in place of the preview.
+
+    Args:
+        stream_id: ID returned when the extraction was started.
+        fetched: Whether the text is unedited fetched text, which may reuse
+            the extraction of a near-duplicate page.
+
+    Returns:
+        A `text/event-stream` response that ends after the done event.
+    """
+    return EventStream(
+        _extraction_event_stream(extraction_streams.claim(stream_id), fetched)
+    )
+
+
+async def _extraction_event_stream(
+    recipe_text: str | None, reuse_near_duplicates: bool = False
+) -> AsyncIterator[str]:
+    """Yield SSE messages for a streamed extraction of `recipe_text`.
+
+    Args:
+        recipe_text: Text to extract from, or None if the stream ID was
+            unknown or expired.
+        reuse_near_duplicates: Whether the extraction of a near-duplicate
+            page may be reused.
 
-        edit_oob_div = Div(
-            edit_form_card,
-            id="edit-form-target",
-            hx_swap_oob="innerHTML",
+    Yields:
+        Encoded SSE messages: previews, then exactly one done event.
+    """
+    if recipe_text is None:
+        yield sse_message(
+            _extraction_stream_error(
+                "This extraction has expired. Please extract the recipe again."
+            ),
+            event=EXTRACTION_DONE_EVENT,
+        )
+        return
+
+    chunks = multi_recipe_extractor.split(recipe_text)
+    if chunks:
+        yield sse_message(
+            Div(
+                build_multi_extraction_progress(len(chunks)),
+                id="edit-form-target",
+                hx_swap_oob="innerHTML",
+            ),
+            event=EXTRACTION_PARTIAL_EVENT,
         )
-        review_oob_div = Div(
-            review_section_card,
-            id="review-section-target",
-            hx_swap_oob="innerHTML",
+        try:
+            with allow_near_duplicate_reuse(reuse_near_duplicates):
+                extracted_recipes = await multi_recipe_extractor.extract_chunks(chunks)
+            result = _render_extracted_recipes(
+                extracted_recipes, recipe_text, error=_extraction_stream_error
+            )
+        except Exception as e:
+            logger.error(
+                "LLM service failed to extract recipes from text: %s. Text: '%s'",
+                e,
+                recipe_text[:100],
+                exc_info=True,
+            )
+            result = _extraction_stream_error(EXTRACTION_FAILED_MESSAGE)
+        yield sse_message(result, event=EXTRACTION_DONE_EVENT)
+        return
+
+    last_preview = None
+    try:
+        extracted_recipe = await _claim_speculative_extraction(recipe_text)
+        if extracted_recipe is None:
+            with allow_near_duplicate_reuse(reuse_near_duplicates):
+                async for extracted_recipe in stream_recipe_from_text(recipe_text):
+                    preview = extracted_recipe.model_dump()
+                    if preview == last_preview:
+                        continue
+                    last_preview = preview
+                    yield sse_message(
+                        Div(
+                            build_extraction_preview(extracted_recipe),
+                            id="edit-form-target",
+                            hx_swap_oob="innerHTML",
+                        ),
+                        event=EXTRACTION_PARTIAL_EVENT,
+                    )
+        # The stream's last item is the complete, validated recipe.
+        result = _render_extracted_recipe(
+            extracted_recipe, recipe_text, error=_extraction_stream_error
         )
-        clear_error_message_div = Div(
-            id="error-message-container", hx_swap_oob="innerHTML"
+    except Exception as e:
+        logger.error(
+            "LLM service failed to stream recipe from text: %s. Text: '%s'",
+            e,
+            recipe_text[:100],
+            exc_info=True,
         )
+        result = _extraction_stream_error(EXTRACTION_FAILED_MESSAGE)
+    yield sse_message(result, event=EXTRACTION_DONE_EVENT)
+
+
+def _extraction_error(message: str, cls: str = CSS_ERROR_CLASS) -> FT:
+    """Error message Div for OOB swap to '#error-message-container'."""
+    return Div(
+        message,
+        id="error-message-container",
+        hx_swap_oob="innerHTML",
+        cls=cls,
+    )
 
-        return Group(edit_oob_div, review_oob_div, clear_error_message_div)
 
+def _extraction_stream_error(message: str, cls: str = CSS_ERROR_CLASS) -> FT:
+    """Error message replacing the streamed preview in '#edit-form-target'."""
+    return Div(
+        P(message, cls=cls),
+        id="edit-form-target",
+        hx_swap_oob="innerHTML",
+    )
+
+
+def _render_extracted_recipes(
+    extracted_recipes: list[RecipeBase],
+    recipe_text: str,
+    error: Callable[..., FT] = _extraction_error,
+) -> FT:
+    """Render the first extracted recipe, with a picker if there are several.
+
+    Args:
+        extracted_recipes: Recipes returned by `_extract_recipes`.
+        recipe_text: The text they were extracted from, for logging.
+        error: Builds the error fragment from a message and CSS classes.
+
+    Returns:
+        The fragments `_render_extracted_recipe` returns for the first recipe.
+    """
+    picker = None
+    if len(extracted_recipes) > 1:
+        picker = build_recipe_picker(extracted_recipes)
+    return _render_extracted_recipe(
+        extracted_recipes[0], recipe_text, error=error, picker=picker
+    )
+
+
+def _render_extracted_recipe(
+    extracted_recipe: RecipeBase,
+    recipe_text: str,
+    error: Callable[..., FT] = _extraction_error,
+    picker: FT | None = None,
+) -> FT:
+    """Postprocess an extracted recipe and render it into the edit form.
+
+    Args:
+        extracted_recipe: Recipe returned by the LLM.
+        recipe_text: The text it was extracted from, for logging.
+        error: Builds the error fragment from a message and CSS classes.
+        picker: Recipe picker to show above the edit form, if the page
+            held several recipes.
+
+    Returns:
+        A Group of Divs for OOB swaps updating '#edit-form-target',
+        '#review-section-target', and clearing '#error-message-container'.
+        If the recipe has no instructions or fails validation after
+        postprocessing, the error fragment instead.
+    """
+    if not extracted_recipe.instructions:
+        logger.warning(
+            "Recipe extracted from text is missing instructions. Recipe name: %s",
+            extracted_recipe.name,
+        )
+        return error(
+            "Recipe extraction resulted in missing instructions. "
+            "Please refine your input or try a different recipe text.",
+            cls=f"{CSS_ERROR_CLASS} mt-2",
+        )
+
+    try:
+        recipe = postprocess_recipe(extracted_recipe)
     except ValidationError as ve:
         logger.error(
             (
@@ -387,36 +674,158 @@ async def post_extract_recipe_run(
             recipe_text[:100],
             exc_info=True,
         )
-        return Div(
-            "Recipe data is invalid after extraction. Please check the input text.",
-            id="error-message-container",
-            hx_swap_oob="innerHTML",
-            cls=CSS_ERROR_CLASS,
+        return error(
+            "Recipe data is invalid after extraction. Please check the input text."
         )
-    except Exception as e:
-        logger.error(
-            "LLM service failed to generate recipe from text: %s. Text: '%s'",
-            e,
-            recipe_text[:100],
-            exc_info=True,
+    logger.info("Recipe postprocessing successful. Name: %s", recipe.name)
+
+    edit_form_card, review_section_card = build_edit_review_form(
+        current_recipe=recipe,
+        original_recipe=recipe,
+        error_message_content=None,
+    )
+
+    edit_oob_div = Div(
+        picker,
+        edit_form_card,
+        id="edit-form-target",
+        hx_swap_oob="innerHTML",
+    )
+    review_oob_div = Div(
+        review_section_card,
+        id="review-section-target",
+        hx_swap_oob="innerHTML",
+    )
+    clear_error_message_div = Div(id="error-message-container", hx_swap_oob="innerHTML")
+
+    return Group(edit_oob_div, review_oob_div, clear_error_message_div)
+
+
+@rt(EXTRACT_PICK_URL)
+async def post_pick_extracted_recipe(recipes: str, choice: int):
+    """Handles picking one of several recipes extracted from a page.
+
+    Posted by the buttons of `build_recipe_picker`, which carries the
+    extracted recipes, so no LLM call is made.
+
+    Args:
+        recipes: JSON list of the recipes extracted from the page.
+        choice: Index of the recipe to edit.
+
+    Returns:
+        The same swaps as `post_extract_recipe_run`, with the chosen recipe
+        in the edit form and the picker above it. If `recipes` is invalid
+        or `choice` out of range, an error message Div for OOB swap to
+        '#error-message-container'.
+    """
+    try:
+        extracted_recipes = _recipe_list.validate_json(recipes)
+        extracted_recipe = extracted_recipes[choice]
+    except (ValidationError, IndexError) as e:
+        logger.warning("Invalid recipe picked: %s", e)
+        return _extraction_error("Invalid recipe choice. Please extract again.")
+    return _render_extracted_recipe(
+        extracted_recipe,
+        extracted_recipe.name,
+        picker=build_recipe_picker(extracted_recipes, selected=choice),
+    )
+
+
+@rt(f"{JOBS_URL}/{{job_id}}")
+async def get_job_status(job_id: str):
+    """Reports on a background extraction or modification job.
+
+    Polled by the placeholder from `build_job_poller`.
+
+    Args:
+        job_id: ID of the job, from the placeholder.
+
+    Returns:
+        204 No Content while the job is pending or running. Once it has
+        finished, the same fragments `post_extract_recipe_run` or
+        `post_modify_recipe` would have returned for the job's result or
+        error. If the job no longer exists, an error message replacing the
+        placeholder.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return FtResponse(
+            P("This job has expired. Please try again.", cls=CSS_ERROR_CLASS),
+            headers={"HX-Retarget": f"#job-{job_id}"},
         )
-        if not isinstance(e, (RuntimeError, FileNotFoundError)):
-            logger.error(
-                "Error during recipe extraction processing: %s", e, exc_info=True
-            )
-        return Div(
-            "Recipe extraction failed. Please try again or check the input text.",
-            id="error-message-container",
-            hx_swap_oob="innerHTML",
-            cls=CSS_ERROR_CLASS,
+    if job.status not in FINISHED:
+        return Response(status_code=204)
+    if job.kind == "extract":
+        return _render_extraction_job(job.payload, job.result, job.error)
+    return _render_modification_job(job.payload, job.result, job.error)
+
+
+async def _run_extraction_job(payload: dict) -> dict:
+    """Job handler extracting the recipes in `payload["recipe_text"]`."""
+    try:
+        with allow_near_duplicate_reuse(payload.get("reuse_near_duplicates", False)):
+            extracted_recipes = await _extract_recipes(payload["recipe_text"])
+    except (RuntimeError, FileNotFoundError) as e:
+        raise JobError(EXTRACTION_FAILED_MESSAGE) from e
+    return {"recipes": [recipe.model_dump() for recipe in extracted_recipes]}
+
+
+async def _run_modification_job(payload: dict) -> dict:
+    """Job handler applying `payload["modification_prompt"]` with the LLM."""
+    try:
+        modified_recipe = await generate_modified_recipe(
+            current_recipe=RecipeBase(**payload["current_recipe"]),
+            modification_request=payload["modification_prompt"],
         )
+    except FileNotFoundError as e:
+        raise JobError("Service configuration error. Please try again later.") from e
+    except RuntimeError as e:
+        raise JobError(str(e)) from e
+    return {"recipe": modified_recipe.model_dump()}
+
+
+job_queue.register("extract", _run_extraction_job)
+job_queue.register("modify", _run_modification_job)
+
+
+def _render_extraction_job(payload: dict, result: dict | None, error: str | None):
+    """Render a finished extraction job like `post_extract_recipe_run`."""
+    if result is None:
+        return _extraction_error(error or EXTRACTION_FAILED_MESSAGE)
+    # Jobs finished before multi-recipe extraction stored a single recipe.
+    recipes = result["recipes"] if "recipes" in result else [result["recipe"]]
+    return _render_extracted_recipes(
+        [RecipeBase.model_construct(**recipe) for recipe in recipes],
+        payload["recipe_text"],
+    )
+
+
+def _render_modification_job(payload: dict, result: dict | None, error: str | None):
+    """Render a finished modification job like `post_modify_recipe`."""
+    current_recipe = RecipeBase(**payload["current_recipe"])
+    original_recipe = RecipeBase(**payload["original_recipe"])
+    modification_prompt = payload["modification_prompt"]
+    if result is not None:
+        try:
+            current_recipe = postprocess_recipe(RecipeBase(**result["recipe"]))
+        except ValidationError as ve:
+            logger.error("Validation error after LLM modification job: %s", ve)
+            error = "Invalid recipe data after modification attempt."
+    return build_modify_form_response(
+        current_recipe=current_recipe,
+        original_recipe=original_recipe,
+        modification_prompt_value=modification_prompt,
+        error_message_content=(
+            None if error is None else Div(error, cls=f"{CSS_ERROR_CLASS} mt-2")
+        ),
+    )
 
 
 @rt("/recipes/delete")
 async def post_delete_recipe(recipe_id: str):
     """Handles recipe deletion requests, typically initiated from the UI.
 
-    This endpoint attempts to delete a recipe by its ID using an internal API call.
+    This endpoint deletes a recipe by its ID through the recipe service.
     On successful deletion, it returns an empty response with an HX-Trigger header
     to signal a change in the recipe list for UI updates.
 
@@ -427,26 +836,16 @@ async def post_delete_recipe(recipe_id: str):
         A FastAPI `Response` object.
         - On success: HTTP 200 with `HX-Trigger: recipeListChanged` header.
         - On failure (recipe not found): HTTP 404.
-        - On other API or unexpected errors: HTTP 500.
+        - On storage or unexpected errors: HTTP 500.
     """
     try:
-        response = await internal_api_client.delete(f"/v0/recipes/{recipe_id}")
-        response.raise_for_status()
-        logger.info("Successfully deleted recipe ID %s", recipe_id)
-        return Response(headers={"HX-Trigger": "recipeListChanged"})
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            logger.warning("Recipe ID %s not found for deletion", recipe_id)
-            return Response(status_code=404)
-        else:
-            logger.error(
-                "API error deleting recipe ID %s: Status %s, Response: %s",
-                recipe_id,
-                e.response.status_code,
-                e.response.text,
-                exc_info=True,
-            )
-            return Response(status_code=500)
+        with session_scope() as session:
+            RecipeService(session).delete(recipe_id)
+    except RecipeNotFoundError:
+        logger.warning("Recipe ID %s not found for deletion", recipe_id)
+        return Response(status_code=404)
     except Exception as e:
         logger.error("Error deleting recipe ID %s: %s", recipe_id, e, exc_info=True)
         return Response(status_code=500)
+    logger.info("Successfully deleted recipe ID %s", recipe_id)
+    return Response(headers={"HX-Trigger": "recipeListChanged"})
@@ -1,21 +1,30 @@
 """Routers for user-facing HTML pages that render full page layouts."""
 
+import asyncio
 import logging
 
-import httpx
 from fastapi import Request
 from fasthtml.common import *
 from monsterui.all import *
 
-from meal_planner.core import internal_api_client, rt
+from meal_planner.core import rt
+from meal_planner.database import session_scope
+from meal_planner.services.recipes import (
+    RecipeNotFoundError,
+    RecipeService,
+    RecipeStorageError,
+)
+from meal_planner.services.single_flight import SingleFlight
 from meal_planner.ui.common import CSS_ERROR_CLASS
 from meal_planner.ui.edit_recipe import build_recipe_display
 from meal_planner.ui.extract_recipe import create_extraction_form
 from meal_planner.ui.layout import is_htmx, with_layout
-from meal_planner.ui.list_recipes import format_recipe_list
+from meal_planner.ui.list_recipes import format_recipe_list, recipe_list_area
 
 logger = logging.getLogger(__name__)
 
+recipe_list_flight = SingleFlight("recipe_list_page")
+
 
 @rt("/")
 def get():
@@ -57,9 +66,8 @@ def get_recipe_extraction_page():
 async def get_recipe_list_page(request: Request):
     """Display all recipes in a paginated list view.
 
-    Fetches recipes from the API and renders them in a list format.
-    Supports both full page loads and HTMX partial updates when the
-    recipe list changes (via HX-Trigger events).
+    Fetches recipes through the recipe service and renders them in a list format.
+    Supports both full page loads and HTMX partial requests.
 
     Args:
         request: FastAPI request object to detect HTMX requests.
@@ -69,21 +77,18 @@ async def get_recipe_list_page(request: Request):
         list div for HTMX requests.
 
     Note:
-        The response includes HTMX attributes for automatic refresh
-        when recipes are added, updated, or deleted.
+        The list subscribes to recipe events over Server-Sent Events, so
+        individual items are patched in place when recipes are added,
+        updated, or deleted instead of the whole list being re-fetched.
+        Concurrent requests share a single query and render.
     """
     try:
-        response = await internal_api_client.get("/v0/recipes")
-        response.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        logger.error(
-            "API error fetching recipes: %s Response: %s",
-            e,
-            e.response.text,
-            exc_info=True,
+        list_html = await recipe_list_flight.do(
+            "all", lambda: asyncio.to_thread(_render_recipe_list)
         )
+    except RecipeStorageError:
         title = "Error"
-        content = Div("Error fetching recipes from API.", cls=f"{TextT.error} mb-4")
+        content = Div("Error fetching recipes.", cls=f"{TextT.error} mb-4")
     except Exception as e:
         logger.error("Error fetching recipes: %s", e, exc_info=True)
         title = "Error"
@@ -93,15 +98,9 @@ async def get_recipe_list_page(request: Request):
         )
     else:
         title = "All Recipes"
-        content = format_recipe_list(response.json())
-
-    content_with_attrs = Div(
-        content,
-        id="recipe-list-area",
-        hx_trigger="recipeListChanged from:body",
-        hx_get="/recipes",
-        hx_swap="outerHTML",
-    )
+        content = list_html
+
+    content_with_attrs = recipe_list_area(content)
 
     return (
         with_layout(title, content_with_attrs)
@@ -110,6 +109,16 @@ async def get_recipe_list_page(request: Request):
     )
 
 
+def _render_recipe_list() -> NotStr:
+    """Fetch all recipes and render the recipe list to HTML."""
+    with session_scope() as session:
+        recipes_data = [
+            {"id": str(recipe.id), "name": recipe.name}
+            for recipe in RecipeService(session).list_all()
+        ]
+    return NotStr(to_xml(format_recipe_list(recipes_data)))
+
+
 @rt("/recipes/{recipe_id}")
 async def get_single_recipe_page(recipe_id: str):
     """Display a single recipe's details page.
@@ -126,26 +135,14 @@ async def get_single_recipe_page(recipe_id: str):
         if the recipe is not found or an error occurs.
     """
     try:
-        response = await internal_api_client.get(f"/v0/recipes/{recipe_id}")
-        response.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            logger.warning("Recipe ID %s not found when loading page.", recipe_id)
-            title = "Recipe Not Found"
-            content = P("The requested recipe does not exist.")
-        else:
-            logger.error(
-                "API error fetching recipe ID %s: Status %s, Response: %s",
-                recipe_id,
-                e.response.status_code,
-                e.response.text,
-                exc_info=True,
-            )
-            title = "Error"
-            content = P(
-                "Error fetching recipe from API.",
-                cls=CSS_ERROR_CLASS,
-            )
+        with session_scope() as session:
+            recipe_data = RecipeService(session).get(recipe_id).model_dump(mode="json")
+    except RecipeNotFoundError:
+        title = "Recipe Not Found"
+        content = P("The requested recipe does not exist.")
+    except RecipeStorageError:
+        title = "Error"
+        content = P("Error fetching recipe.", cls=CSS_ERROR_CLASS)
     except Exception as e:
         logger.error(
             "Unexpected error fetching recipe ID %s for page: %s",
@@ -159,7 +156,6 @@ async def get_single_recipe_page(recipe_id: str):
             cls=CSS_ERROR_CLASS,
         )
     else:
-        recipe_data = response.json()
         title = recipe_data["name"]
         content = build_recipe_display(recipe_data)
 
@@ -1,8 +1,8 @@
 """Routers for generating and returning HTML UI fragments, often for HTMX swaps."""
 
-import ipaddress
+import asyncio
 import logging
-from urllib.parse import urlparse
+from collections.abc import AsyncIterator
 
 import httpx
 from fastapi import Request
@@ -14,8 +14,18 @@ from starlette.datastructures import FormData
 from meal_planner.core import rt
 from meal_planner.form_processing import parse_recipe_form_data
 from meal_planner.models import MakesRangeValidationError, RecipeBase
+from meal_planner.services.call_llm import generate_recipe_from_text
 from meal_planner.services.extract_webpage_text import (
     fetch_and_clean_text_from_url,
+    validate_url_for_ssrf,
+)
+from meal_planner.services.multi_recipe import multi_recipe_extractor
+from meal_planner.services.near_duplicates import allow_near_duplicate_reuse
+from meal_planner.services.recipe_events import RecipeEventBroker, recipe_events
+from meal_planner.services.recipe_scaling import RecipeScalingError, scale_recipe
+from meal_planner.services.speculative_extraction import (
+    speculative_extractions,
+    text_key,
 )
 from meal_planner.ui.common import CSS_ERROR_CLASS
 from meal_planner.ui.edit_recipe import (
@@ -24,84 +34,15 @@ from meal_planner.ui.edit_recipe import (
     render_ingredient_list_items,
     render_instruction_list_items,
 )
+from meal_planner.ui.list_recipes import (
+    RECIPE_EVENT_NAME,
+    RECIPE_EVENTS_URL,
+    build_recipe_event_fragment,
+)
 
 logger = logging.getLogger(__name__)
 
-
-def _validate_url_for_ssrf(url: str) -> tuple[bool, str]:
-    """Validate URL to prevent SSRF attacks.
-
-    Checks for:
-    - Valid HTTP/HTTPS scheme
-    - Non-empty domain
-    - Blocks private IP ranges and localhost
-
-    Args:
-        url: The URL to validate
-
-    Returns:
-        Tuple of (is_valid: bool, error_message: str)
-    """
-    try:
-        parsed = urlparse(url)
-
-        if parsed.scheme not in ("http", "https"):
-            return False, "Only HTTP and HTTPS URLs are allowed"
-
-        if not parsed.netloc:
-            return False, "Invalid URL: missing domain"
-
-        hostname = parsed.hostname
-        if not hostname:
-            return False, "Invalid URL: could not extract hostname"
-
-        ip = _try_parse_ip(hostname)
-        if ip:
-            if ip.is_loopback:
-                return False, "Loopback addresses are not allowed"
-
-            if ip.is_link_local:
-                return False, "Link-local addresses are not allowed"
-
-            if ip.is_multicast:
-                return False, "Multicast addresses are not allowed"
-
-            if ip.is_private:
-                return False, "Private IP addresses are not allowed"
-        else:
-            internal_hostnames = {
-                "localhost",
-                "localhost.localdomain",
-                "metadata",
-                "metadata.google.internal",
-                "instance-data",
-                "link-local",
-            }
-            if hostname.lower() in internal_hostnames:
-                return False, "Internal hostnames are not allowed"
-
-        return True, ""
-
-    except Exception as e:
-        logger.warning("URL validation error for %s: %s", url, e)
-        return False, "Invalid URL format"
-
-
-def _try_parse_ip(
-    hostname: str,
-) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
-    """Attempt to parse a hostname as an IP address.
-
-    Args:
-        hostname: The hostname string to parse.
-
-    Returns:
-        An ipaddress object if parsing succeeds, otherwise None.
-    """
-    try:
-        return ipaddress.ip_address(hostname)
-    except ValueError:
-        return None
+RECIPE_EVENTS_KEEPALIVE_SECONDS = 15.0
 
 
 async def _delete_list_item(request: Request, index: int, item_type: str) -> FT:
@@ -374,6 +315,12 @@ async def post_fetch_text(request: Request):
 
     HTMX endpoint that retrieves webpage content, cleans it, and populates
     the recipe text area. Handles various error cases with appropriate messages.
+    On success, extraction of the fetched text is started speculatively, and
+    its key is sent back in a hidden `speculation_key` field submitted with
+    the text. Pages holding several recipes are not extracted speculatively,
+    as they are extracted section by section instead. The fetched text's
+    key is sent back in a hidden `fetched_text_key` field, so that only
+    unedited fetched text may reuse the extraction of a near-duplicate page.
 
     Args:
         request: FastAPI request containing form data with input_url.
@@ -407,7 +354,7 @@ async def post_fetch_text(request: Request):
         logger.error("Fetch text called without URL.")
         return _prepare_error_response("Please provide a Recipe URL to fetch.")
 
-    is_valid, error_message = _validate_url_for_ssrf(input_url)
+    is_valid, error_message = validate_url_for_ssrf(input_url)
     if not is_valid:
         logger.warning(
             "Blocked potentially unsafe URL: %s - %s", input_url, error_message
@@ -449,6 +396,13 @@ async def post_fetch_text(request: Request):
             "An unexpected error occurred while fetching text."
         )
     else:
+        speculation_key = None
+        if not multi_recipe_extractor.split(cleaned_text):
+            # The task copies the current context, reuse switch included.
+            with allow_near_duplicate_reuse():
+                speculation_key = speculative_extractions.start(
+                    cleaned_text, generate_recipe_from_text
+                )
         text_area = Div(
             TextArea(
                 cleaned_text,
@@ -458,6 +412,8 @@ async def post_fetch_text(request: Request):
                 rows=15,
                 cls="mb-4",
             ),
+            Hidden(name="speculation_key", value=speculation_key or ""),
+            Hidden(name="fetched_text_key", value=text_key(cleaned_text)),
             id="recipe_text_container",
         )
         clear_error_oob = Div(
@@ -567,17 +523,7 @@ def _build_sortable_list_with_oob_diff(
     Returns:
         Group containing the sortable list and OOB diff update components.
     """
-    list_component = Div(
-        *rendered_list_items,
-        id=list_id,
-        cls="mb-4",
-        uk_sortable="handle: .drag-handle",
-        hx_trigger="moved",
-        hx_post="/recipes/ui/update-diff",
-        hx_target="#diff-content-wrapper",
-        hx_swap="innerHTML",
-        hx_include="closest form",
-    )
+    list_component = _build_sortable_list(list_id, rendered_list_items)
 
     before_notstr, after_notstr = build_diff_content_children(
         original_recipe, current_recipe.markdown
@@ -590,6 +536,22 @@ def _build_sortable_list_with_oob_diff(
     return Group(list_component, oob_diff_component)
 
 
+def _build_sortable_list(list_id: str, rendered_list_items: list[FT], **attrs) -> FT:
+    """Build a draggable list of recipe items that updates the diff when reordered."""
+    return Div(
+        *rendered_list_items,
+        id=list_id,
+        cls="mb-4",
+        uk_sortable="handle: .drag-handle",
+        hx_trigger="moved",
+        hx_post="/recipes/ui/update-diff",
+        hx_target="#diff-content-wrapper",
+        hx_swap="innerHTML",
+        hx_include="closest form",
+        **attrs,
+    )
+
+
 def _adjust_makes_values(
     makes_min: int | None,
     makes_max: int | None,
@@ -693,3 +655,112 @@ async def adjust_makes(request: Request, changed: str | None = None) -> FT:
     except Exception as e:
         logger.error("Error building diff component: %s", e, exc_info=True)
         return updated_makes_section
+
+
+@rt("/recipes/ui/scale")
+async def post_scale_recipe(request: Request) -> FT:
+    """Scale the recipe in the edit form to the yield entered in 'Scale to'.
+
+    Ingredient quantities are scaled locally by the ratio of the new yield
+    to the current one (see `recipe_scaling`); the LLM is not involved.
+
+    Args:
+        request: FastAPI request containing the form data, including
+            `scale_to` and the original recipe fields.
+
+    Returns:
+        Updated makes section, with the scaled ingredient list and diff as
+        OOB swaps, or the makes section with an error message if the
+        recipe cannot be scaled.
+    """
+    form_data = await request.form()
+    current_data = parse_recipe_form_data(form_data)
+    makes_min = current_data["makes_min"]
+    makes_max = current_data["makes_max"]
+    makes_unit = current_data["makes_unit"]
+
+    try:
+        target = int(str(form_data.get("scale_to", "")).strip())
+    except ValueError:
+        return build_makes_section(
+            makes_min,
+            makes_max,
+            makes_unit,
+            error_message="Enter the amount to scale the recipe to",
+        )
+
+    try:
+        current_recipe = RecipeBase(**current_data)
+        original_recipe = RecipeBase(
+            **parse_recipe_form_data(form_data, prefix="original_")
+        )
+        scaled_recipe = scale_recipe(current_recipe, target)
+    except RecipeScalingError as e:
+        return build_makes_section(
+            makes_min, makes_max, makes_unit, error_message=str(e)
+        )
+    except ValidationError as e:
+        logger.warning("Validation error during scaling: %s", e, exc_info=False)
+        error_message = "Please check your recipe fields - there may be invalid values."
+        return build_makes_section(
+            makes_min, makes_max, makes_unit, error_message=error_message
+        )
+
+    logger.info(
+        "Scaled recipe %r to %d %s", scaled_recipe.name, target, makes_unit or ""
+    )
+    return (
+        build_makes_section(
+            scaled_recipe.makes_min, scaled_recipe.makes_max, makes_unit
+        ),
+        _build_sortable_list(
+            "ingredients-list",
+            render_ingredient_list_items(scaled_recipe.ingredients),
+            hx_swap_oob="true",
+        ),
+        _build_diff_oob_component(original_recipe, scaled_recipe),
+    )
+
+
+async def _recipe_event_stream(
+    broker: RecipeEventBroker = recipe_events,
+    keepalive_seconds: float = RECIPE_EVENTS_KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """Yield Server-Sent Events messages for recipe changes.
+
+    Subscribes to the broker for as long as the client stays connected and
+    renders each event as out-of-band list item swaps. A comment line is sent
+    when no event arrives within `keepalive_seconds` so that idle connections
+    are not closed by proxies.
+
+    Args:
+        broker: Source of recipe events.
+        keepalive_seconds: Maximum idle time before sending a keepalive.
+
+    Yields:
+        Encoded SSE messages.
+    """
+    async with broker.subscribe() as queue:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive_seconds)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield sse_message(
+                build_recipe_event_fragment(event), event=RECIPE_EVENT_NAME
+            )
+
+
+@rt(RECIPE_EVENTS_URL)
+async def get_recipe_events():
+    """Stream fine-grained recipe list updates to the browser.
+
+    HTMX endpoint consumed by the `sse` extension on the recipe list page.
+    Each message patches only the affected `recipe-item-{id}` element.
+
+    Returns:
+        A `text/event-stream` response that stays open until the client
+        disconnects.
+    """
+    return EventStream(_recipe_event_stream())
@@ -0,0 +1,203 @@
+"""Bulk recipe extraction from many texts or URLs with bounded parallelism.
+
+`extract_recipes` runs each item through the same steps as the extraction
+form (fetch and clean for URLs, LLM extraction, `postprocess_recipe`) and
+optionally saves the result. At most `concurrency` items are worked on at a
+time, and results are yielded as soon as each item finishes, so a large
+import reports progress while it runs. A failing item produces a result
+with an error instead of aborting the batch.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, model_validator
+
+from meal_planner.config import BULK_EXTRACT_CONCURRENCY
+from meal_planner.database import session_scope
+from meal_planner.models import Recipe, RecipeBase
+from meal_planner.services.call_llm import generate_recipe_from_text
+from meal_planner.services.extract_webpage_text import (
+    fetch_and_clean_text_from_url,
+    validate_url_for_ssrf,
+)
+from meal_planner.services.near_duplicates import allow_near_duplicate_reuse
+from meal_planner.services.process_recipe import postprocess_recipe
+from meal_planner.services.recipes import RecipeService
+
+logger = logging.getLogger(__name__)
+
+BulkExtractStage = Literal["fetch", "extract", "postprocess", "save"]
+
+
+class BulkExtractItem(BaseModel):
+    """One recipe to extract, given either as text or as a URL to fetch."""
+
+    text: str | None = None
+    url: str | None = None
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self) -> "BulkExtractItem":
+        if (self.text is None) == (self.url is None):
+            raise ValueError("Provide exactly one of 'text' or 'url'")
+        return self
+
+
+class BulkExtractResult(BaseModel):
+    """Outcome of extracting one item.
+
+    Attributes:
+        index: Position of the item in the request.
+        url: The item's URL, if it was given as one.
+        recipe: The extracted, post-processed recipe on success.
+        recipe_id: ID of the saved recipe, if saving was requested.
+        stage: Step that failed, on error.
+        error: Description of the failure, on error.
+    """
+
+    index: int
+    url: str | None = None
+    recipe: RecipeBase | None = None
+    recipe_id: UUID | None = None
+    stage: BulkExtractStage | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was extracted (and saved, if requested)."""
+        return self.error is None
+
+
+class _ItemError(Exception):
+    def __init__(self, stage: BulkExtractStage, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+def save_to_database(recipe: RecipeBase) -> Recipe:
+    """Save an extracted recipe in its own database session.
+
+    Args:
+        recipe: Recipe to create.
+
+    Returns:
+        The created recipe.
+
+    Raises:
+        RecipeStorageError: If the database operation fails.
+    """
+    with session_scope() as session:
+        return RecipeService(session).create(recipe)
+
+
+async def extract_recipes(
+    items: Sequence[BulkExtractItem],
+    concurrency: int = BULK_EXTRACT_CONCURRENCY,
+    save: Callable[[RecipeBase], Recipe] | None = None,
+) -> AsyncIterator[BulkExtractResult]:
+    """Extract recipes from `items`, yielding results as they complete.
+
+    Args:
+        items: Texts or URLs to extract recipes from.
+        concurrency: Maximum number of items processed at once. LLM calls
+            are additionally bounded by the shared LLM limiter.
+        save: Called with each successfully extracted recipe, e.g.
+            `save_to_database`. Not called if None.
+
+    Yields:
+        One result per item, in completion order. Use `index` to match
+        results to items.
+    """
+    results: asyncio.Queue[BulkExtractResult] = asyncio.Queue()
+    pending = iter(enumerate(items))
+
+    async def worker() -> None:
+        for index, item in pending:
+            await results.put(await _extract_item(index, item, save))
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(min(max(1, concurrency), len(items)))
+    ]
+    try:
+        for _ in range(len(items)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _extract_item(
+    index: int,
+    item: BulkExtractItem,
+    save: Callable[[RecipeBase], Recipe] | None,
+) -> BulkExtractResult:
+    stage: BulkExtractStage = "fetch"
+    try:
+        text = await _fetch_text(item)
+        stage = "extract"
+        extracted = await _extract(text, reuse_near_duplicates=item.url is not None)
+        stage = "postprocess"
+        recipe = _postprocess(extracted)
+        recipe_id = None
+        if save is not None:
+            stage = "save"
+            try:
+                recipe_id = save(recipe).id
+            except Exception as e:
+                raise _ItemError("save", "Failed to save recipe") from e
+    except _ItemError as e:
+        logger.warning("Bulk extraction of item %d failed at %s: %s", index, e.stage, e)
+        return BulkExtractResult(index=index, url=item.url, stage=e.stage, error=str(e))
+    except Exception as e:
+        # Any other failure must still produce a result, or the consumer of
+        # `extract_recipes` would wait for it forever.
+        logger.error(
+            "Bulk extraction of item %d failed unexpectedly at %s: %s",
+            index,
+            stage,
+            e,
+            exc_info=True,
+        )
+        return BulkExtractResult(
+            index=index, url=item.url, stage=stage, error=f"Unexpected error: {e}"
+        )
+    return BulkExtractResult(
+        index=index, url=item.url, recipe=recipe, recipe_id=recipe_id
+    )
+
+
+async def _fetch_text(item: BulkExtractItem) -> str | None:
+    if item.url is None:
+        return item.text
+    is_valid, error_message = validate_url_for_ssrf(item.url)
+    if not is_valid:
+        raise _ItemError("fetch", f"Invalid URL: {error_message}")
+    try:
+        return await fetch_and_clean_text_from_url(item.url)
+    except Exception as e:
+        raise _ItemError("fetch", f"Failed to fetch URL: {e}") from e
+
+
+async def _extract(text: str | None, reuse_near_duplicates: bool) -> RecipeBase:
+    if not text or not text.strip():
+        raise _ItemError("extract", "No recipe text to extract from")
+    try:
+        # Only text fetched here, never edited, may reuse near-duplicates.
+        with allow_near_duplicate_reuse(reuse_near_duplicates):
+            return await generate_recipe_from_text(text)
+    except Exception as e:
+        raise _ItemError("extract", "Recipe extraction failed") from e
+
+
+def _postprocess(extracted: RecipeBase) -> RecipeBase:
+    if not extracted.instructions:
+        raise _ItemError("postprocess", "No instructions found in the recipe text")
+    try:
+        return postprocess_recipe(extracted)
+    except ValueError as e:
+        raise _ItemError("postprocess", str(e)) from e
@@ -3,52 +3,95 @@
 import asyncio
 import logging
 import os
-import string
-from pathlib import Path
+import time
+from collections.abc import AsyncIterator
 from typing import TypeVar
 
 import instructor
 from openai import AsyncOpenAI
 from pydantic import BaseModel
 
-from meal_planner.models import RecipeBase
-
-MODEL_NAME = "gemini-2.0-flash"
-PROMPT_DIR = Path(__file__).resolve().parent.parent.parent / "prompt_templates"
-ACTIVE_RECIPE_EXTRACTION_PROMPT_FILE = "20250623_fix_serves_unit.txt"
-ACTIVE_RECIPE_MODIFICATION_PROMPT_FILE = "20250525_174436__string_template_syntax.txt"
+from meal_planner.config import (
+    LLM_BASE_URL,
+    LLM_MODEL,
+    RECIPE_EXTRACTION_PROMPT,
+    RECIPE_MODIFICATION_MODE,
+    RECIPE_MODIFICATION_PROMPT,
+    RECIPE_PATCH_PROMPT,
+)
+from meal_planner.models import RecipeBase, RecipePatch
+from meal_planner.services.llm_cache import llm_cache, llm_cache_key
+from meal_planner.services.llm_client import llm_http_client
+from meal_planner.services.llm_limiter import estimate_tokens, llm_limiter
+from meal_planner.services.llm_retry import llm_retry_policy
+from meal_planner.services.llm_telemetry import llm_call_labels, llm_telemetry
+from meal_planner.services.model_router import model_router
+from meal_planner.services.near_duplicates import near_duplicates
+from meal_planner.services.prompt_registry import prompt_registry
+from meal_planner.services.recipe_patch import (
+    RecipePatchError,
+    apply_recipe_patch,
+    indexed_markdown,
+)
+from meal_planner.services.recipe_region import recipe_region_reducer
+
+MODEL_NAME = LLM_MODEL
+MODIFICATION_MODES = ("rewrite", "patch")
 
 logger = logging.getLogger(__name__)
 
 _openai_client = None
 _aclient = None
+_http_client = None
 
 T = TypeVar("T", bound=BaseModel)
 
 
-_client_lock = asyncio.Lock()
-
-
 async def _get_aclient():
-    """Lazy initialization of the instructor client."""
-    global _openai_client, _aclient
-    if _aclient is None:
-        async with _client_lock:
-            if _aclient is None:  # Double-check pattern
-                _openai_client = AsyncOpenAI(
-                    api_key=os.environ["GOOGLE_API_KEY"],
-                    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-                )
-                _aclient = instructor.from_openai(_openai_client)
+    """Return the instructor client, creating it on first use.
+
+    The endpoint and key default to Gemini's OpenAI-compatible API and
+    `GOOGLE_API_KEY`; `MEAL_PLANNER_LLM_BASE_URL` and
+    `MEAL_PLANNER_LLM_API_KEY` point the app at another endpoint, such as
+    the local fake LLM server. Requests go through the pooled
+    `llm_http_client`, and the client is rebuilt if that was closed and
+    replaced, e.g. by a restarted app lifespan.
+    """
+    global _openai_client, _aclient, _http_client
+    http_client = llm_http_client.get()
+    # Nothing below awaits, so concurrent callers cannot build two clients.
+    if _aclient is None or _http_client is not http_client:
+        _openai_client = AsyncOpenAI(
+            api_key=os.environ.get("MEAL_PLANNER_LLM_API_KEY")
+            or os.environ["GOOGLE_API_KEY"],
+            base_url=LLM_BASE_URL,
+            # Retries are handled by llm_retry_policy.
+            max_retries=0,
+            http_client=http_client,
+        )
+        _aclient = instructor.from_openai(_openai_client)
+        _http_client = http_client
+        llm_telemetry.instrument(_aclient)
     return _aclient
 
 
-async def get_structured_llm_response(prompt: str, response_model: type[T]) -> T:
+async def get_structured_llm_response(
+    prompt: str, response_model: type[T], task: str | None = None
+) -> T:
     """Queries the LLM with a prompt and returns a Pydantic model instance.
 
+    The model is chosen by the model router from the task and prompt size,
+    and a call that times out or fails validation is repeated once with the
+    route's fallback model. Calls pass through the LLM limiter, so they may
+    wait for a concurrency slot or rate budget before being sent, and are
+    retried (and optionally hedged) according to the LLM retry policy. Each
+    model's call is recorded by the LLM telemetry, labelled by the caller's
+    `llm_call_labels`.
+
     Args:
         prompt: The prompt to send to the LLM.
         response_model: The Pydantic model to structure the LLM's response.
+        task: What the call is for, e.g. "recipe_extraction", for routing.
 
     Returns:
         An instance of the provided Pydantic model.
@@ -56,22 +99,35 @@ async def get_structured_llm_response(prompt: str, response_model: type[T]) -> T
     Raises:
         Exception: If the LLM call fails or the response cannot be parsed.
     """
+    prompt_tokens = estimate_tokens(prompt)
+    route = model_router.route(task, prompt_tokens)
     try:
         logger.info(
-            "LLM Call: model=%s, response_model=%s", MODEL_NAME, response_model.__name__
+            "LLM Call: model=%s, response_model=%s",
+            route.model,
+            response_model.__name__,
         )
         aclient = await _get_aclient()
-        response = await aclient.chat.completions.create(
-            model=MODEL_NAME,
-            response_model=response_model,
-            messages=[{"role": "user", "content": prompt}],
-        )
+
+        async def call(model: str) -> T:
+            async def attempt() -> T:
+                async with llm_limiter.slot(prompt_tokens):
+                    return await aclient.chat.completions.create(
+                        model=model,
+                        response_model=response_model,
+                        messages=[{"role": "user", "content": prompt}],
+                    )
+
+            with llm_telemetry.record_call(model, response_model.__name__):
+                return await llm_retry_policy.run(attempt)
+
+        response = await model_router.run(route, call)
         logger.debug("LLM Response: %s", response)
         return response
     except Exception as e:
         logger.error(
             "LLM Call Error: model=%s, response_model=%s, error=%s",
-            MODEL_NAME,
+            route.model,
             response_model.__name__,
             e,
             exc_info=True,
@@ -79,28 +135,74 @@ async def get_structured_llm_response(prompt: str, response_model: type[T]) -> T
         raise
 
 
-def _get_llm_prompt_path(category: str, filename: str) -> Path:
-    """Constructs the full path to a prompt file for LLM services."""
-    return PROMPT_DIR / category / filename
+async def get_cached_structured_llm_response(
+    prompt: str, response_model: type[T], template_name: str, task: str | None = None
+) -> T:
+    """Like `get_structured_llm_response`, but served from the LLM cache if possible.
+
+    Byte-identical requests (same routed model, prompt template, rendered
+    prompt and response schema) are answered from the persistent LLM cache,
+    and concurrent identical requests share a single LLM call. Responses
+    from the route's fallback model are not cached, as they would be stored
+    under the routed model's key.
+
+    Args:
+        prompt: The prompt to send to the LLM.
+        response_model: The Pydantic model to structure the LLM's response.
+        template_name: File name of the prompt template `prompt` was rendered
+            from.
+        task: What the call is for, e.g. "recipe_extraction", for routing.
 
+    Returns:
+        An instance of the provided Pydantic model.
 
-async def generate_recipe_from_text(text: str) -> RecipeBase:
+    Raises:
+        Exception: If the LLM call fails or the response cannot be parsed.
+    """
+    route = model_router.route(task, estimate_tokens(prompt))
+    key = llm_cache_key(route.model, template_name, prompt, response_model)
+    fallback_models: list[str] = []
+
+    async def compute() -> T:
+        with model_router.collect_fallbacks() as models:
+            response = await get_structured_llm_response(
+                prompt=prompt, response_model=response_model, task=task
+            )
+        fallback_models.extend(models)
+        return response
+
+    return await llm_cache.get_or_compute(
+        key, response_model, compute, store=lambda _: not fallback_models
+    )
+
+
+async def generate_recipe_from_text(
+    text: str, prompt_version: str | None = None
+) -> RecipeBase:
     """Extracts a structured recipe from a given block of text using an LLM.
 
     This function takes unstructured text, presumably containing a recipe,
     formats it into a prompt using a predefined template, and then queries
     an LLM to parse this text into a structured `RecipeBase` object.
+    Long page text is first cut down to its recipe region (see
+    `recipe_region`) to save prompt tokens. Repeated extractions of
+    identical text are served from the LLM cache, and of nearly identical
+    text with the same numbers (e.g. the same recipe syndicated with other
+    ads) from the near-duplicate index, if the caller allowed it with
+    `allow_near_duplicate_reuse` because the text is unedited fetched text.
 
     Args:
         text: A string containing the raw text of the recipe to be extracted.
+        prompt_version: Version of the extraction prompt template to use
+            instead of the configured one, e.g. to evaluate a new prompt.
 
     Returns:
         A `RecipeBase` Pydantic model instance populated with the extracted
         recipe data (name, ingredients, instructions).
 
     Raises:
-        FileNotFoundError: If the configured prompt template file for recipe
-            extraction cannot be found at the expected path.
+        FileNotFoundError: If the configured recipe extraction prompt template
+            is not in the prompt registry.
         RuntimeError: If any other error occurs during the LLM call or
             response processing, wrapping the original exception. This typically
             indicates an issue with the LLM service itself or an unexpected
@@ -108,18 +210,27 @@ async def generate_recipe_from_text(text: str) -> RecipeBase:
     """
     logger.info("Starting recipe generation from text.")
     try:
-        prompt_file_path = _get_llm_prompt_path(
-            "recipe_extraction", ACTIVE_RECIPE_EXTRACTION_PROMPT_FILE
+        prompt_template = prompt_registry.get(
+            "recipe_extraction", prompt_version or RECIPE_EXTRACTION_PROMPT
         )
-        logger.info("Using extraction prompt file: %s", prompt_file_path.name)
-        prompt_template = prompt_file_path.read_text(encoding="utf-8")
-        formatted_prompt = string.Template(prompt_template).safe_substitute(
-            page_text=text
+        logger.info("Using extraction prompt file: %s", prompt_template.name)
+        page_text = recipe_region_reducer.reduce(text)
+        reused_recipe = await asyncio.to_thread(
+            near_duplicates.find, page_text, prompt_template.name
         )
-
-        extracted_recipe: RecipeBase = await get_structured_llm_response(
-            prompt=formatted_prompt,
-            response_model=RecipeBase,
+        if reused_recipe is not None:
+            return reused_recipe
+        formatted_prompt = prompt_template.render(page_text=page_text)
+
+        with llm_call_labels("recipe_extraction", prompt_template.name):
+            extracted_recipe: RecipeBase = await get_cached_structured_llm_response(
+                prompt=formatted_prompt,
+                response_model=RecipeBase,
+                template_name=prompt_template.name,
+                task="recipe_extraction",
+            )
+        await asyncio.to_thread(
+            near_duplicates.add, page_text, prompt_template.name, extracted_recipe
         )
         logger.info("LLM successfully generated recipe: %s", extracted_recipe.name)
         return extracted_recipe
@@ -135,15 +246,140 @@ async def generate_recipe_from_text(text: str) -> RecipeBase:
         ) from e
 
 
+async def stream_recipe_from_text(text: str) -> AsyncIterator[RecipeBase]:
+    """Extracts a recipe like `generate_recipe_from_text`, yielding partial results.
+
+    Uses instructor's partial streaming: every item is a `RecipeBase`-shaped
+    partial whose fields fill in as tokens arrive. Fields not reached yet are
+    None, and the last list entry or string may still be incomplete. The
+    final item is the complete, validated `RecipeBase`.
+
+    The LLM cache and near-duplicate index are shared with
+    `generate_recipe_from_text`: a cached extraction is yielded at once as a
+    single complete recipe, and a completed stream is stored in both.
+    Streams go through the LLM limiter and are routed like
+    `generate_recipe_from_text`, but are neither retried nor sent to a
+    fallback model, since partial output may already have been shown. The
+    provider stream is read by a task of its own, which holds the limiter
+    slot only until the stream ends; closing the generator early cancels it.
+
+    Args:
+        text: A string containing the raw text of the recipe to be extracted.
+
+    Yields:
+        Increasingly complete partial recipes, then the complete recipe.
+
+    Raises:
+        FileNotFoundError: If the configured recipe extraction prompt template
+            is not in the prompt registry.
+        RuntimeError: If the LLM call fails or its final output is not a valid
+            recipe, wrapping the original exception.
+    """
+    logger.info("Starting streaming recipe generation from text.")
+    try:
+        prompt_template = prompt_registry.get(
+            "recipe_extraction", RECIPE_EXTRACTION_PROMPT
+        )
+        logger.info("Using extraction prompt file: %s", prompt_template.name)
+        page_text = recipe_region_reducer.reduce(text)
+        reused_recipe = await asyncio.to_thread(
+            near_duplicates.find, page_text, prompt_template.name
+        )
+        if reused_recipe is not None:
+            yield reused_recipe
+            return
+        formatted_prompt = prompt_template.render(page_text=page_text)
+        prompt_tokens = estimate_tokens(formatted_prompt)
+        route = model_router.route("recipe_extraction", prompt_tokens)
+        key = llm_cache_key(
+            route.model, prompt_template.name, formatted_prompt, RecipeBase
+        )
+        cached = await asyncio.to_thread(llm_cache.get, key)
+        if cached is not None:
+            yield RecipeBase.model_validate_json(cached)
+            return
+
+        model_router.record_decision(route)
+        started = time.perf_counter()
+        aclient = await _get_aclient()
+        partials: asyncio.Queue[RecipeBase | None] = asyncio.Queue()
+
+        async def read_stream() -> None:
+            # Reads the provider stream at its own pace, so the limiter slot
+            # and the call record are released as soon as it ends, however
+            # slowly the caller consumes the partials.
+            try:
+                with llm_telemetry.record_call(
+                    route.model,
+                    RecipeBase.__name__,
+                    streamed=True,
+                    operation="recipe_extraction",
+                    template=prompt_template.name,
+                ):
+                    async with llm_limiter.slot(prompt_tokens):
+                        async for item in aclient.chat.completions.create_partial(
+                            model=route.model,
+                            response_model=RecipeBase,
+                            messages=[{"role": "user", "content": formatted_prompt}],
+                        ):
+                            partials.put_nowait(item)
+            finally:
+                partials.put_nowait(None)
+
+        reader = asyncio.create_task(read_stream())
+        partial = None
+        try:
+            while (item := await partials.get()) is not None:
+                partial = item
+                yield partial
+            await reader
+        finally:
+            # Stop the LLM call if the caller stops consuming the stream.
+            reader.cancel()
+        if partial is None:
+            raise ValueError("LLM stream ended without any output.")
+
+        extracted_recipe = RecipeBase.model_validate(partial.model_dump())
+        await asyncio.to_thread(
+            llm_cache.put,
+            key,
+            extracted_recipe.model_dump_json(),
+            time.perf_counter() - started,
+        )
+        await asyncio.to_thread(
+            near_duplicates.add, page_text, prompt_template.name, extracted_recipe
+        )
+        logger.info("LLM successfully streamed recipe: %s", extracted_recipe.name)
+        yield extracted_recipe
+    except FileNotFoundError as e:
+        logger.error("Prompt file not found: %s", e, exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(
+            "Error during streaming LLM recipe generation from text: %s",
+            e,
+            exc_info=True,
+        )
+        raise RuntimeError(
+            "LLM service error during streaming recipe generation from text."
+        ) from e
+
+
 async def generate_modified_recipe(
-    current_recipe: RecipeBase, modification_request: str
+    current_recipe: RecipeBase, modification_request: str, mode: str | None = None
 ) -> RecipeBase:
     """Modifies an existing recipe based on a textual request using an LLM.
 
     This function takes a current `RecipeBase` object and a natural language
     modification request. It formats these into a prompt using a predefined
     template, then queries an LLM to generate a new `RecipeBase` object
-    reflecting the requested modifications.
+    reflecting the requested modifications. Repeated identical requests are
+    served from the LLM cache.
+
+    In "patch" mode the LLM is asked only for the edits (a `RecipePatch`),
+    which are applied to `current_recipe` locally; this needs far fewer
+    completion tokens than a full rewrite. If the patch does not fit the
+    recipe, the full rewrite prompt is used instead.
 
     Args:
         current_recipe: The `RecipeBase` Pydantic model instance representing
@@ -151,39 +387,55 @@ async def generate_modified_recipe(
             the prompt.
         modification_request: A string containing the user's instructions
             on how to modify the `current_recipe`.
+        mode: "rewrite" or "patch"; defaults to `RECIPE_MODIFICATION_MODE`.
 
     Returns:
         A new `RecipeBase` Pydantic model instance representing the recipe
         after the LLM has applied the requested modifications.
 
     Raises:
-        FileNotFoundError: If the configured prompt template file for recipe
-            modification cannot be found at the expected path.
+        ValueError: If `mode` is not one of `MODIFICATION_MODES`.
+        FileNotFoundError: If the configured recipe modification prompt
+            template is not in the prompt registry.
         RuntimeError: If any other error occurs during the LLM call or
             response processing, wrapping the original exception. This typically
             indicates an issue with the LLM service itself or an unexpected
             problem formatting the prompt or parsing the response.
     """
+    mode = mode or RECIPE_MODIFICATION_MODE
+    if mode not in MODIFICATION_MODES:
+        raise ValueError(
+            f"Unknown modification mode {mode!r}; "
+            f"expected one of {', '.join(MODIFICATION_MODES)}"
+        )
     logger.info(
         "Starting recipe modification. Original: %s, Request: %s",
         current_recipe.name,
         modification_request,
     )
     try:
-        prompt_file_path = _get_llm_prompt_path(
-            "recipe_modification", ACTIVE_RECIPE_MODIFICATION_PROMPT_FILE
-        )
-        logger.info("Using modification prompt file: %s", prompt_file_path.name)
-        modification_template = prompt_file_path.read_text()
-        formatted_prompt = string.Template(modification_template).safe_substitute(
-            current_recipe_markdown=current_recipe.markdown,
-            modification_prompt=modification_request,
-        )
-
-        modified_recipe: RecipeBase = await get_structured_llm_response(
-            prompt=formatted_prompt,
-            response_model=RecipeBase,
-        )
+        modified_recipe = None
+        if mode == "patch":
+            modified_recipe = await _generate_patched_recipe(
+                current_recipe, modification_request
+            )
+        if modified_recipe is None:
+            prompt_template = prompt_registry.get(
+                "recipe_modification", RECIPE_MODIFICATION_PROMPT
+            )
+            logger.info("Using modification prompt file: %s", prompt_template.name)
+            formatted_prompt = prompt_template.render(
+                current_recipe_markdown=current_recipe.markdown,
+                modification_prompt=modification_request,
+            )
+
+            with llm_call_labels("recipe_modification", prompt_template.name):
+                modified_recipe = await get_cached_structured_llm_response(
+                    prompt=formatted_prompt,
+                    response_model=RecipeBase,
+                    template_name=prompt_template.name,
+                    task="recipe_modification",
+                )
         logger.info(
             "LLM successfully generated modified recipe: %s", modified_recipe.name
         )
@@ -194,3 +446,33 @@ async def generate_modified_recipe(
     except Exception as e:
         logger.error("Error during LLM recipe modification: %s", e, exc_info=True)
         raise RuntimeError("LLM service error during recipe modification.") from e
+
+
+async def _generate_patched_recipe(
+    current_recipe: RecipeBase, modification_request: str
+) -> RecipeBase | None:
+    """Ask the LLM for a `RecipePatch` and apply it.
+
+    Returns:
+        The modified recipe, or None if the patch could not be applied.
+    """
+    prompt_template = prompt_registry.get("recipe_patch", RECIPE_PATCH_PROMPT)
+    logger.info("Using patch prompt file: %s", prompt_template.name)
+    formatted_prompt = prompt_template.render(
+        current_recipe_markdown=indexed_markdown(current_recipe),
+        modification_prompt=modification_request,
+    )
+    with llm_call_labels("recipe_modification", prompt_template.name):
+        patch = await get_cached_structured_llm_response(
+            prompt=formatted_prompt,
+            response_model=RecipePatch,
+            template_name=prompt_template.name,
+            task="recipe_modification",
+        )
+    try:
+        modified_recipe = apply_recipe_patch(current_recipe, patch)
+    except RecipePatchError as e:
+        logger.warning("Could not apply LLM patch, rewriting the recipe: %s", e)
+        return None
+    logger.info("Applied LLM patch with %d edits", len(patch.edits))
+    return modified_recipe
@@ -0,0 +1,309 @@
+"""Online backups of the SQLite database to the persistent volume.
+
+Snapshots are taken with SQLite's online backup API a few pages at a time,
+releasing the source database between steps so that writers are only ever
+blocked for the duration of a single step.
+"""
+
+import argparse
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import zstandard
+
+from meal_planner.config import (
+    BACKUP_COMPRESS,
+    BACKUP_PAGES_PER_STEP,
+    BACKUP_RETENTION,
+    BACKUP_STEP_PAUSE_SECONDS,
+    CONTAINER_BACKUP_DIR,
+    CONTAINER_DB_FULL_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "meal_planner-"
+SNAPSHOT_SUFFIXES = (".db", ".db.zst")
+ZSTD_LEVEL = 10
+MAX_BACKUP_RESTARTS = 5
+
+
+@dataclass(frozen=True)
+class BackupResult:
+    """Outcome of a single backup run.
+
+    Attributes:
+        path: Location of the finished snapshot.
+        duration_seconds: Wall time of the whole run, including compression
+            and pruning.
+        longest_writer_stall_seconds: Longest single backup step. Each step
+            holds a read lock on the source, so this bounds how long any
+            writer had to wait for the backup.
+        steps: Number of backup steps taken.
+        pages: Number of database pages copied.
+        restarts: Times the backup started over because another connection
+            wrote to the database between steps.
+        size_bytes: Size of the snapshot on disk.
+        compressed: Whether the snapshot is zstd-compressed.
+        removed: Older snapshots deleted by the retention policy.
+    """
+
+    path: Path
+    duration_seconds: float
+    longest_writer_stall_seconds: float
+    steps: int
+    pages: int
+    restarts: int
+    size_bytes: int
+    compressed: bool
+    removed: list[Path] = field(default_factory=list)
+
+
+def backup_database(
+    source_path: Path = CONTAINER_DB_FULL_PATH,
+    backup_dir: Path = CONTAINER_BACKUP_DIR,
+    *,
+    pages_per_step: int = BACKUP_PAGES_PER_STEP,
+    step_pause_seconds: float = BACKUP_STEP_PAUSE_SECONDS,
+    compress: bool = BACKUP_COMPRESS,
+    retention: int = BACKUP_RETENTION,
+    max_restarts: int = MAX_BACKUP_RESTARTS,
+) -> BackupResult:
+    """Take a consistent snapshot of a live SQLite database.
+
+    The snapshot is written to a temporary file and renamed into place only
+    once complete, so a partially written backup never looks like a valid
+    snapshot.
+
+    SQLite restarts an online backup whenever another connection writes to
+    the source between steps. To guarantee progress under a steady write
+    load, after `max_restarts` restarts the rest of the copy is done in a
+    single step.
+
+    Args:
+        source_path: Database file to back up.
+        backup_dir: Directory holding the snapshots. Created if missing.
+        pages_per_step: Pages copied per backup step. Smaller values shorten
+            writer stalls at the cost of a longer overall backup.
+        step_pause_seconds: Pause between steps, giving writers a window to
+            acquire the lock.
+        compress: Whether to zstd-compress the snapshot.
+        retention: Number of most recent snapshots to keep. Older ones are
+            deleted after a successful backup.
+        max_restarts: Restarts tolerated before falling back to a single-step
+            copy.
+
+    Returns:
+        A `BackupResult` describing the snapshot and its timings.
+
+    Raises:
+        FileNotFoundError: If `source_path` does not exist.
+        sqlite3.Error: If the backup itself fails.
+    """
+    if not source_path.exists():
+        raise FileNotFoundError(f"Database file not found: {source_path}")
+
+    started = time.perf_counter()
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    snapshot_path = backup_dir / f"{SNAPSHOT_PREFIX}{timestamp}.db"
+    partial_path = snapshot_path.with_name(snapshot_path.name + ".partial")
+
+    step_timings = _StepTimings(
+        pause_seconds=step_pause_seconds, max_restarts=max_restarts
+    )
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    try:
+        destination = sqlite3.connect(partial_path)
+        try:
+            try:
+                step_timings.start()
+                source.backup(
+                    destination, pages=pages_per_step, progress=step_timings.record
+                )
+            except _TooManyRestartsError:
+                logger.warning(
+                    "Backup of %s restarted %d times due to concurrent writes; "
+                    "copying in a single step",
+                    source_path,
+                    step_timings.restarts,
+                )
+                step_timings.start()
+                source.backup(destination, pages=-1, progress=step_timings.record)
+        finally:
+            destination.close()
+    except Exception:
+        partial_path.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+
+    if compress:
+        snapshot_path = snapshot_path.with_name(snapshot_path.name + ".zst")
+        _compress_file(partial_path, snapshot_path)
+        partial_path.unlink()
+    else:
+        partial_path.rename(snapshot_path)
+
+    removed = prune_snapshots(backup_dir, retention)
+    result = BackupResult(
+        path=snapshot_path,
+        duration_seconds=time.perf_counter() - started,
+        longest_writer_stall_seconds=step_timings.longest_step_seconds,
+        steps=step_timings.steps,
+        pages=step_timings.pages,
+        restarts=step_timings.restarts,
+        size_bytes=snapshot_path.stat().st_size,
+        compressed=compress,
+        removed=removed,
+    )
+    logger.info(
+        "Backed up %s to %s in %.3fs (%d pages, %d steps, longest writer stall "
+        "%.4fs, %d restarts, %d bytes, %d old snapshots removed)",
+        source_path,
+        result.path,
+        result.duration_seconds,
+        result.pages,
+        result.steps,
+        result.longest_writer_stall_seconds,
+        result.restarts,
+        result.size_bytes,
+        len(result.removed),
+    )
+    return result
+
+
+def list_snapshots(backup_dir: Path) -> list[Path]:
+    """List finished snapshots in a backup directory, oldest first.
+
+    Args:
+        backup_dir: Directory holding the snapshots.
+
+    Returns:
+        Snapshot paths sorted by the timestamp embedded in their names.
+    """
+    if not backup_dir.exists():
+        return []
+    return sorted(
+        path
+        for path in backup_dir.iterdir()
+        if path.name.startswith(SNAPSHOT_PREFIX)
+        and path.name.endswith(SNAPSHOT_SUFFIXES)
+    )
+
+
+def prune_snapshots(backup_dir: Path, retention: int) -> list[Path]:
+    """Delete all but the most recent `retention` snapshots.
+
+    Args:
+        backup_dir: Directory holding the snapshots.
+        retention: Number of snapshots to keep. Values below 1 keep one.
+
+    Returns:
+        The deleted snapshot paths.
+    """
+    snapshots = list_snapshots(backup_dir)
+    to_remove = snapshots[: max(len(snapshots) - max(retention, 1), 0)]
+    for path in to_remove:
+        path.unlink()
+        logger.info("Removed old database snapshot %s", path)
+    return to_remove
+
+
+class _TooManyRestartsError(Exception):
+    """Aborts a paged backup that keeps restarting because of writes."""
+
+
+class _StepTimings:
+    """Progress callback that measures each backup step.
+
+    `sqlite3.Connection.backup` invokes the callback after every step, once
+    the step has released its lock on the source, so the time between calls
+    is the time writers were locked out. A remaining page count that does not
+    shrink means SQLite restarted the backup after a concurrent write.
+    """
+
+    def __init__(self, pause_seconds: float, max_restarts: int):
+        self.pause_seconds = pause_seconds
+        self.max_restarts = max_restarts
+        self.steps = 0
+        self.pages = 0
+        self.restarts = 0
+        self.longest_step_seconds = 0.0
+        self._step_started = 0.0
+        self._last_remaining: int | None = None
+
+    def start(self) -> None:
+        self._step_started = time.perf_counter()
+
+    def record(self, status: int, remaining: int, total: int) -> None:
+        self.steps += 1
+        self.pages = total
+        self.longest_step_seconds = max(
+            self.longest_step_seconds, time.perf_counter() - self._step_started
+        )
+        if self._last_remaining is not None and remaining >= self._last_remaining:
+            self.restarts += 1
+            if self.restarts > self.max_restarts:
+                raise _TooManyRestartsError
+        self._last_remaining = remaining
+        if remaining and self.pause_seconds > 0:
+            time.sleep(self.pause_seconds)
+        self._step_started = time.perf_counter()
+
+
+def _compress_file(source: Path, destination: Path) -> None:
+    """Write a zstd-compressed copy of `source` to `destination` atomically."""
+    partial_destination = destination.with_name(destination.name + ".partial")
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    with source.open("rb") as reader, partial_destination.open("wb") as writer:
+        compressor.copy_stream(reader, writer)
+    partial_destination.rename(destination)
+
+
+def main(argv: list[str] | None = None) -> BackupResult:
+    """Run a backup from the command line.
+
+    Args:
+        argv: Command-line arguments, defaulting to `sys.argv[1:]`.
+
+    Returns:
+        The result of the backup, which is also printed as a summary.
+    """
+    parser = argparse.ArgumentParser(
+        description="Take an online backup of the Meal Planner database."
+    )
+    parser.add_argument("--source", type=Path, default=CONTAINER_DB_FULL_PATH)
+    parser.add_argument("--dest", type=Path, default=CONTAINER_BACKUP_DIR)
+    parser.add_argument("--retention", type=int, default=BACKUP_RETENTION)
+    parser.add_argument("--pages-per-step", type=int, default=BACKUP_PAGES_PER_STEP)
+    parser.add_argument(
+        "--compress", action=argparse.BooleanOptionalAction, default=BACKUP_COMPRESS
+    )
+    args = parser.parse_args(argv)
+
+    result = backup_database(
+        args.source,
+        args.dest,
+        pages_per_step=args.pages_per_step,
+        compress=args.compress,
+        retention=args.retention,
+    )
+    print(
+        f"Snapshot: {result.path}\n"
+        f"Duration: {result.duration_seconds:.3f}s\n"
+        f"Longest writer stall: {result.longest_writer_stall_seconds:.4f}s "
+        f"({result.steps} steps, {result.pages} pages)\n"
+        f"Size: {result.size_bytes} bytes\n"
+        f"Removed: {len(result.removed)} old snapshots"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,268 @@
+"""Idle-time SQLite maintenance: planner statistics and incremental vacuum.
+
+Bulk deletes and JSON rewrites leave free pages behind and make the query
+planner's statistics stale. This module runs a time-budgeted maintenance
+pass (`PRAGMA optimize`, `ANALYZE` and `PRAGMA incremental_vacuum`) when the
+database is not in use. On Modal the pass runs as a scheduled function (see
+`run_maintenance_if_idle`), because the web container scales to zero long
+before it has been idle for `MAINTENANCE_IDLE_SECONDS`; local runs of the
+app use the in-process `MaintenanceScheduler` instead.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from meal_planner.config import (
+    CONTAINER_DB_FULL_PATH,
+    MAINTENANCE_BUDGET_SECONDS,
+    MAINTENANCE_CHECK_SECONDS,
+    MAINTENANCE_IDLE_SECONDS,
+    MAINTENANCE_INTERVAL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_LIMIT = 1000
+VACUUM_PAGES_PER_STEP = 100
+LOCK_TIMEOUT_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class MaintenanceResult:
+    """Outcome of a single maintenance pass.
+
+    Attributes:
+        duration_seconds: Wall time of the pass.
+        completed: Names of the steps that ran to completion.
+        skipped: Names of the steps not run because the time budget ran out
+            or the database was locked.
+        pages_reclaimed: Free pages returned to the filesystem.
+        bytes_reclaimed: Space returned to the filesystem, in bytes.
+        free_pages_remaining: Free pages still in the file afterwards.
+    """
+
+    duration_seconds: float
+    completed: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    pages_reclaimed: int = 0
+    bytes_reclaimed: int = 0
+    free_pages_remaining: int = 0
+
+
+def run_maintenance(
+    db_path: Path = CONTAINER_DB_FULL_PATH,
+    budget_seconds: float = MAINTENANCE_BUDGET_SECONDS,
+    vacuum_pages_per_step: int = VACUUM_PAGES_PER_STEP,
+) -> MaintenanceResult:
+    """Run one time-budgeted maintenance pass over the database.
+
+    `PRAGMA optimize` always runs because it is cheap and only does work
+    SQLite considers worthwhile. `ANALYZE` (bounded by `analysis_limit`) and
+    incremental vacuum steps run only while the budget lasts, so a pass may
+    reclaim free pages over several runs. Lock waits are kept short so that
+    maintenance gives way to real traffic.
+
+    Args:
+        db_path: Database file to maintain.
+        budget_seconds: Time after which no further steps are started.
+        vacuum_pages_per_step: Free pages released per incremental vacuum
+            step.
+
+    Returns:
+        A `MaintenanceResult` with the steps run and the space reclaimed.
+    """
+    started = time.perf_counter()
+    deadline = started + budget_seconds
+    completed: list[str] = []
+    pending = ["optimize", "analyze", "incremental_vacuum"]
+
+    conn = sqlite3.connect(db_path, timeout=LOCK_TIMEOUT_SECONDS, isolation_level=None)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        free_pages_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        free_pages = free_pages_before
+        try:
+            conn.execute("PRAGMA optimize")
+            completed.append(pending.pop(0))
+
+            if time.perf_counter() < deadline:
+                conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+                conn.execute("ANALYZE")
+                completed.append(pending.pop(0))
+
+            while free_pages and time.perf_counter() < deadline:
+                conn.execute(
+                    f"PRAGMA incremental_vacuum({vacuum_pages_per_step})"
+                ).fetchall()
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free_pages:
+                completed.append(pending.pop(0))
+        except sqlite3.OperationalError as e:
+            logger.warning("Database maintenance interrupted: %s", e)
+    finally:
+        conn.close()
+
+    pages_reclaimed = max(free_pages_before - free_pages, 0)
+    result = MaintenanceResult(
+        duration_seconds=time.perf_counter() - started,
+        completed=completed,
+        skipped=pending,
+        pages_reclaimed=pages_reclaimed,
+        bytes_reclaimed=pages_reclaimed * page_size,
+        free_pages_remaining=free_pages,
+    )
+    logger.info(
+        "Database maintenance finished in %.3fs: completed=%s skipped=%s, "
+        "reclaimed %d bytes (%d pages), %d free pages remaining",
+        result.duration_seconds,
+        result.completed,
+        result.skipped,
+        result.bytes_reclaimed,
+        result.pages_reclaimed,
+        result.free_pages_remaining,
+    )
+    return result
+
+
+def run_maintenance_if_idle(
+    db_path: Path = CONTAINER_DB_FULL_PATH,
+    budget_seconds: float = MAINTENANCE_BUDGET_SECONDS,
+) -> MaintenanceResult | None:
+    """Run a maintenance pass unless the database is in use.
+
+    For scheduled runs outside the app process, which cannot see the app's
+    request activity. The database counts as in use while background jobs
+    are pending or running, or while another connection holds its write
+    lock.
+
+    Args:
+        db_path: Database file to maintain.
+        budget_seconds: Time after which no further steps are started.
+
+    Returns:
+        The result of the pass, or None if the database was missing or in
+        use.
+    """
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(db_path, timeout=LOCK_TIMEOUT_SECONDS, isolation_level=None)
+    try:
+        active_jobs = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')"
+        ).fetchone()[0]
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("ROLLBACK")
+    except sqlite3.OperationalError as e:
+        logger.info("Skipping database maintenance, database is busy: %s", e)
+        return None
+    finally:
+        conn.close()
+    if active_jobs:
+        logger.info("Skipping database maintenance, %d jobs are active", active_jobs)
+        return None
+    return run_maintenance(db_path, budget_seconds)
+
+
+class ActivityTracker:
+    """Remembers when the app last started or finished handling a request."""
+
+    def __init__(self):
+        self._last_activity = time.monotonic()
+
+    def touch(self) -> None:
+        """Record activity now."""
+        self._last_activity = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        """Seconds since the last recorded activity."""
+        return time.monotonic() - self._last_activity
+
+
+class ActivityMiddleware:
+    """ASGI middleware that records HTTP activity on an `ActivityTracker`.
+
+    Activity is recorded when a request starts and when it finishes, so a
+    long-lived streaming response does not keep the app looking busy.
+    """
+
+    def __init__(self, app, tracker: ActivityTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        """Record activity around each HTTP request and pass it on."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.tracker.touch()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.touch()
+
+
+class MaintenanceScheduler:
+    """Runs `run_maintenance` in the background when the app is idle.
+
+    Used when the app runs as one long-lived process, as it does locally;
+    see `MAINTENANCE_IN_PROCESS`. A pass is started at most once per
+    `interval_seconds`, and only after no request has been seen for
+    `idle_seconds`. The pass itself runs in a worker thread so that it never
+    blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        activity: ActivityTracker,
+        db_path: Path = CONTAINER_DB_FULL_PATH,
+        idle_seconds: float = MAINTENANCE_IDLE_SECONDS,
+        interval_seconds: float = MAINTENANCE_INTERVAL_SECONDS,
+        budget_seconds: float = MAINTENANCE_BUDGET_SECONDS,
+        check_seconds: float = MAINTENANCE_CHECK_SECONDS,
+    ):
+        self.activity = activity
+        self.db_path = db_path
+        self.idle_seconds = idle_seconds
+        self.interval_seconds = interval_seconds
+        self.budget_seconds = budget_seconds
+        self.check_seconds = check_seconds
+        self._last_run: float | None = None
+
+    async def maybe_run(self) -> MaintenanceResult | None:
+        """Run a maintenance pass if one is due and the app is idle.
+
+        Returns:
+            The result of the pass, or None if no pass was run.
+        """
+        if not self.db_path.exists():
+            return None
+        if (
+            self._last_run is not None
+            and time.monotonic() - self._last_run < self.interval_seconds
+        ):
+            return None
+        if self.activity.idle_seconds() < self.idle_seconds:
+            return None
+
+        self._last_run = time.monotonic()
+        try:
+            return await asyncio.to_thread(
+                run_maintenance, self.db_path, self.budget_seconds
+            )
+        except Exception as e:
+            logger.error("Database maintenance failed: %s", e, exc_info=True)
+            return None
+
+    async def run_forever(self) -> None:
+        """Check for idle periods every `check_seconds` until cancelled."""
+        while True:
+            await asyncio.sleep(self.check_seconds)
+            await self.maybe_run()
+
+
+app_activity = ActivityTracker()
+maintenance_scheduler = MaintenanceScheduler(app_activity)
@@ -1,6 +1,8 @@
 """Web page content extraction service for the Meal Planner application."""
 
+import ipaddress
 import logging
+from urllib.parse import urlparse
 
 import html2text
 import httpx
@@ -8,6 +10,82 @@ import httpx
 logger = logging.getLogger(__name__)
 
 
+def validate_url_for_ssrf(url: str) -> tuple[bool, str]:
+    """Validate URL to prevent SSRF attacks.
+
+    Checks for:
+    - Valid HTTP/HTTPS scheme
+    - Non-empty domain
+    - Blocks private IP ranges and localhost
+
+    Args:
+        url: The URL to validate
+
+    Returns:
+        Tuple of (is_valid: bool, error_message: str)
+    """
+    try:
+        parsed = urlparse(url)
+
+        if parsed.scheme not in ("http", "https"):
+            return False, "Only HTTP and HTTPS URLs are allowed"
+
+        if not parsed.netloc:
+            return False, "Invalid URL: missing domain"
+
+        hostname = parsed.hostname
+        if not hostname:
+            return False, "Invalid URL: could not extract hostname"
+
+        ip = _try_parse_ip(hostname)
+        if ip:
+            if ip.is_loopback:
+                return False, "Loopback addresses are not allowed"
+
+            if ip.is_link_local:
+                return False, "Link-local addresses are not allowed"
+
+            if ip.is_multicast:
+                return False, "Multicast addresses are not allowed"
+
+            if ip.is_private:
+                return False, "Private IP addresses are not allowed"
+        else:
+            internal_hostnames = {
+                "localhost",
+                "localhost.localdomain",
+                "metadata",
+                "metadata.google.internal",
+                "instance-data",
+                "link-local",
+            }
+            if hostname.lower() in internal_hostnames:
+                return False, "Internal hostnames are not allowed"
+
+        return True, ""
+
+    except Exception as e:
+        logger.warning("URL validation error for %s: %s", url, e)
+        return False, "Invalid URL format"
+
+
+def _try_parse_ip(
+    hostname: str,
+) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    """Attempt to parse a hostname as an IP address.
+
+    Args:
+        hostname: The hostname string to parse.
+
+    Returns:
+        An ipaddress object if parsing succeeds, otherwise None.
+    """
+    try:
+        return ipaddress.ip_address(hostname)
+    except ValueError:
+        return None
+
+
 async def fetch_and_clean_text_from_url(url: str) -> str:
     """Fetch and process a webpage into clean text for recipe extraction.
 
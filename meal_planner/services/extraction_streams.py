@@ -0,0 +1,77 @@
+"""Hand-off of recipe text from the extraction form to its SSE stream.
+
+Browsers open Server-Sent Events connections with a plain GET request, so
+the (potentially long) recipe text cannot travel with it. The form instead
+POSTs the text, which is parked here under a random stream ID, and the SSE
+endpoint claims it by that ID.
+"""
+
+import secrets
+import time
+from collections import OrderedDict
+
+from meal_planner.config import (
+    EXTRACTION_STREAM_MAX_PENDING,
+    EXTRACTION_STREAM_TTL_SECONDS,
+)
+
+
+class ExtractionStreamStore:
+    """Short-lived, single-use storage for texts awaiting streamed extraction.
+
+    Entries expire after `ttl_seconds`, and at most `max_pending` are kept;
+    the oldest entries are dropped first. Each entry can be claimed once.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = EXTRACTION_STREAM_TTL_SECONDS,
+        max_pending: int = EXTRACTION_STREAM_MAX_PENDING,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_pending = max_pending
+        self._pending: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, recipe_text: str) -> str:
+        """Park `recipe_text` for a stream.
+
+        Args:
+            recipe_text: Text to extract a recipe from.
+
+        Returns:
+            Unguessable stream ID to claim the text with.
+        """
+        self._expire()
+        stream_id = secrets.token_urlsafe(16)
+        self._pending[stream_id] = (time.monotonic(), recipe_text)
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+        return stream_id
+
+    def claim(self, stream_id: str) -> str | None:
+        """Remove and return the text parked under `stream_id`.
+
+        Args:
+            stream_id: ID returned by `add`.
+
+        Returns:
+            The recipe text, or None if the ID is unknown, expired or was
+            already claimed.
+        """
+        self._expire()
+        entry = self._pending.pop(stream_id, None)
+        return entry[1] if entry is not None else None
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._pending:
+            stream_id, (created, _) = next(iter(self._pending.items()))
+            if created > cutoff:
+                break
+            del self._pending[stream_id]
+
+
+extraction_streams = ExtractionStreamStore()
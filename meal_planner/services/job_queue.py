@@ -0,0 +1,353 @@
+"""Durable background jobs, stored in SQLite and run by in-process workers.
+
+LLM calls made inside a request handler tie up the request for as long as
+the provider takes, and their result is lost if the client disconnects or
+the container is recycled. Work submitted to the `JobQueue` is written to
+the `jobs` table first and then picked up by a pool of async workers
+started in the app's lifespan; the client polls the job by ID.
+
+Handlers are registered per job kind and map the job's JSON payload to a
+JSON result. A handler raises `JobError` with a message for the user when
+the job fails in an expected way.
+
+Several containers may share the database. Each queue claims jobs under an
+owner ID of its own and refreshes `updated_at` of the jobs it is running
+every `heartbeat_seconds`. Running jobs whose heartbeat is older than
+`stale_seconds` were left by a process that stopped; any queue makes them
+pending again, at startup and when idle, up to `max_attempts` starts in
+total, so a job that keeps crashing the process is eventually given up.
+Finished jobs are deleted after `retention_seconds`.
+"""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, update
+from sqlmodel import col, select
+
+from meal_planner.config import (
+    JOB_HEARTBEAT_SECONDS,
+    JOB_IDLE_CHECK_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETENTION_SECONDS,
+    JOB_STALE_SECONDS,
+    JOB_WORKER_CONCURRENCY,
+)
+from meal_planner.database import session_scope
+from meal_planner.models import Job
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+UNEXPECTED_ERROR_MESSAGE = "An unexpected error occurred. Please try again."
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+class JobError(Exception):
+    """Raised by a job handler; the message is shown to the user."""
+
+
+class JobQueue:
+    """Submits jobs to the database and runs them with a pool of workers."""
+
+    def __init__(
+        self,
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retention_seconds: float = JOB_RETENTION_SECONDS,
+        idle_check_seconds: float = JOB_IDLE_CHECK_SECONDS,
+        heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+        stale_seconds: float = JOB_STALE_SECONDS,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.idle_check_seconds = idle_check_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.owner = uuid.uuid4().hex
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.resumed = 0
+        self.running = 0
+        self._running_ids: set[str] = set()
+        self._handlers: dict[str, JobHandler] = {}
+        self._wakeup = asyncio.Event()
+        if registry is not None:
+            registry.register("job_queue", self.metrics)
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register the handler that runs jobs of a kind.
+
+        Args:
+            kind: Job kind, as passed to `submit`.
+            handler: Coroutine function from the job's payload to its result.
+        """
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, payload: dict[str, Any]) -> str:
+        """Store a new pending job and wake a worker.
+
+        Args:
+            kind: Job kind with a registered handler.
+            payload: JSON-serializable input for the handler.
+
+        Returns:
+            The job's ID.
+
+        Raises:
+            ValueError: If no handler is registered for `kind`.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        job = Job(kind=kind, payload=payload)
+        with session_scope() as session:
+            session.add(job)
+            session.commit()
+            job_id = job.id
+        self.submitted += 1
+        self._wakeup.set()
+        logger.info("Submitted %s job %s", kind, job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Job | None:
+        """Load a job by ID.
+
+        Args:
+            job_id: ID returned by `submit`.
+
+        Returns:
+            The job, or None if it does not exist (or was deleted).
+        """
+        with session_scope() as session:
+            return session.get(Job, job_id)
+
+    def recover(self) -> int:
+        """Make jobs left running by a stopped process pending again.
+
+        Only running jobs without a heartbeat for `stale_seconds` are
+        touched, so this is safe while this or other processes run jobs.
+        Jobs already started `max_attempts` times are failed instead.
+        Expired finished jobs are deleted too.
+
+        Returns:
+            The number of jobs resumed.
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.stale_seconds)
+        with session_scope() as session:
+            session.execute(
+                update(Job)
+                .where(col(Job.status) == RUNNING)
+                .where(col(Job.updated_at) < stale_before)
+                .where(col(Job.attempts) >= self.max_attempts)
+                .values(
+                    status=FAILED,
+                    error="The job was interrupted too many times.",
+                    owner=None,
+                    updated_at=now,
+                )
+            )
+            resumed = session.execute(
+                update(Job)
+                .where(col(Job.status) == RUNNING)
+                .where(col(Job.updated_at) < stale_before)
+                .values(status=PENDING, owner=None, updated_at=now)
+            ).rowcount
+            session.commit()
+        self.prune()
+        if resumed:
+            self.resumed += resumed
+            logger.info("Resuming %d interrupted jobs", resumed)
+            self._wakeup.set()
+        return resumed
+
+    def heartbeat(self) -> int:
+        """Refresh `updated_at` of the jobs this queue is running.
+
+        Returns:
+            The number of jobs refreshed.
+        """
+        if not self._running_ids:
+            return 0
+        with session_scope() as session:
+            refreshed = session.execute(
+                update(Job)
+                .where(col(Job.id).in_(self._running_ids))
+                .where(col(Job.status) == RUNNING, col(Job.owner) == self.owner)
+                .values(updated_at=datetime.now(timezone.utc))
+            ).rowcount
+            session.commit()
+        return refreshed
+
+    def prune(self) -> int:
+        """Delete finished jobs older than `retention_seconds`.
+
+        Returns:
+            The number of jobs deleted.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        with session_scope() as session:
+            deleted = session.execute(
+                delete(Job)
+                .where(col(Job.status).in_(FINISHED))
+                .where(col(Job.updated_at) < cutoff)
+            ).rowcount
+            session.commit()
+        return deleted
+
+    async def run_next(self) -> bool:
+        """Claim the oldest pending job and run it to completion.
+
+        Returns:
+            True if a job was run, False if none was pending.
+        """
+        claimed = self._claim_next()
+        if claimed is None:
+            return False
+        job_id, kind, payload = claimed
+        self.running += 1
+        self._running_ids.add(job_id)
+        try:
+            result = await self._handlers[kind](payload)
+        except JobError as e:
+            logger.warning("%s job %s failed: %s", kind, job_id, e)
+            self._finish(job_id, FAILED, error=str(e))
+        except Exception as e:
+            logger.error("%s job %s failed: %s", kind, job_id, e, exc_info=True)
+            self._finish(job_id, FAILED, error=UNEXPECTED_ERROR_MESSAGE)
+        else:
+            self._finish(job_id, SUCCEEDED, result=result)
+        finally:
+            self.running -= 1
+            self._running_ids.discard(job_id)
+        return True
+
+    async def run_forever(self) -> None:
+        """Resume interrupted jobs and run `concurrency` workers until cancelled.
+
+        A job interrupted by cancellation stays running in the database and
+        is resumed by `recover` once its heartbeat is stale.
+        """
+        try:
+            self.recover()
+        except Exception as e:
+            logger.error("Could not resume interrupted jobs: %s", e, exc_info=True)
+        await asyncio.gather(
+            self._beat(), *(self._work() for _ in range(self.concurrency))
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        """Job counters, for the metrics registry."""
+        return {
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "running": self.running,
+        }
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                if await self.run_next():
+                    continue
+            except Exception as e:
+                # E.g. the database is locked or not migrated; try again later.
+                logger.error("Job worker error: %s", e, exc_info=True)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.idle_check_seconds
+                )
+            except TimeoutError:
+                with contextlib.suppress(Exception):
+                    self.recover()
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error("Job heartbeat failed: %s", e, exc_info=True)
+
+    def _claim_next(self) -> tuple[str, str, dict[str, Any]] | None:
+        """Mark the oldest pending job running and return it.
+
+        The status is only changed if the job is still pending, so two
+        workers never claim the same job.
+        """
+        while True:
+            with session_scope() as session:
+                job = session.exec(
+                    select(Job)
+                    .where(col(Job.status) == PENDING)
+                    .order_by(col(Job.created_at))
+                    .limit(1)
+                ).first()
+                if job is None:
+                    return None
+                job_id, kind, payload = job.id, job.kind, job.payload
+                claimed = session.execute(
+                    update(Job)
+                    .where(col(Job.id) == job_id, col(Job.status) == PENDING)
+                    .values(
+                        status=RUNNING,
+                        attempts=col(Job.attempts) + 1,
+                        owner=self.owner,
+                        updated_at=datetime.now(timezone.utc),
+                    )
+                ).rowcount
+                session.commit()
+            if not claimed:
+                continue
+            if kind in self._handlers:
+                return job_id, kind, payload
+            logger.error("No handler for %s job %s", kind, job_id)
+            self._finish(job_id, FAILED, error=UNEXPECTED_ERROR_MESSAGE)
+
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        with session_scope() as session:
+            finished = session.execute(
+                update(Job)
+                .where(col(Job.id) == job_id, col(Job.owner) == self.owner)
+                .values(
+                    status=status,
+                    result=result,
+                    error=error,
+                    updated_at=datetime.now(timezone.utc),
+                )
+            ).rowcount
+            session.commit()
+        if not finished:
+            # Another queue resumed the job after missed heartbeats.
+            logger.warning("Job %s was taken over, dropping its result", job_id)
+            return
+        if status == SUCCEEDED:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+
+job_queue = JobQueue()
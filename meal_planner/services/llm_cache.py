@@ -0,0 +1,264 @@
+"""Persistent, content-addressed cache for structured LLM responses.
+
+Responses are stored in a small SQLite database of their own, separate from
+the app database, keyed by a hash of everything that determines the
+response: model, prompt template, rendered prompt and response schema.
+Database work runs in worker threads (see `get_or_compute`), so a slow disk
+does not stall the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from meal_planner.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+)
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+from meal_planner.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed_at REAL NOT NULL,
+    latency_seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_llm_cache_last_accessed_at
+    ON llm_cache (last_accessed_at);
+"""
+
+
+def llm_cache_key(
+    model: str, template_name: str, prompt: str, response_model: type[BaseModel]
+) -> str:
+    """Hash the inputs that determine an LLM response.
+
+    Args:
+        model: Name of the LLM.
+        template_name: File name of the prompt template the prompt was
+            rendered from.
+        prompt: The fully rendered prompt.
+        response_model: Pydantic model the response is parsed into. Its JSON
+            schema is part of the key, so schema changes invalidate entries.
+
+    Returns:
+        Hex SHA-256 digest identifying the request.
+    """
+    payload = json.dumps(
+        [model, template_name, prompt, response_model.model_json_schema()],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed cache of LLM responses with TTL and LRU eviction.
+
+    Entries older than `ttl_seconds` are treated as misses and removed.
+    Once the cache holds more than `max_entries`, the least recently used
+    entries are evicted. Concurrent misses for the same key share a single
+    LLM call. `get` and `put` block on SQLite and may be called from any
+    thread; async code should run them with `asyncio.to_thread`.
+
+    If the cache database cannot be opened (e.g. the data volume is not
+    mounted in local development), caching is disabled with a warning and
+    every call goes straight to the LLM.
+    """
+
+    def __init__(
+        self,
+        path: Path = LLM_CACHE_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        enabled: bool = LLM_CACHE_ENABLED,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved_seconds = 0.0
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("llm_cache", registry=registry)
+        if registry is not None:
+            registry.register("llm_cache", self.metrics)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        response_model: type[T],
+        compute: Callable[[], Awaitable[T]],
+        store: Callable[[T], bool] | None = None,
+    ) -> T:
+        """Return the cached response for `key`, calling `compute` on a miss.
+
+        The lookup and the store run in a worker thread.
+
+        Args:
+            key: Cache key from `llm_cache_key`.
+            response_model: Pydantic model to parse the cached response into.
+            compute: Zero-argument coroutine function making the LLM call.
+            store: Called with each computed response; it is only cached if
+                this returns True. Every response is cached if None.
+
+        Returns:
+            A fresh `response_model` instance for every caller.
+
+        Raises:
+            Exception: Whatever `compute` raised. Failures are not cached.
+        """
+        if not self.enabled:
+            return await compute()
+
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return response_model.model_validate_json(cached)
+
+        async def compute_and_store() -> str:
+            started = time.perf_counter()
+            result = await compute()
+            response_json = result.model_dump_json()
+            if store is None or store(result):
+                await asyncio.to_thread(
+                    self.put, key, response_json, time.perf_counter() - started
+                )
+            return response_json
+
+        return response_model.model_validate_json(
+            await self._flight.do(key, compute_and_store)
+        )
+
+    def get(self, key: str) -> str | None:
+        """Look up a cached response and record a hit or miss.
+
+        Args:
+            key: Cache key from `llm_cache_key`.
+
+        Returns:
+            The cached response JSON, or None if absent, expired or the cache
+            is unavailable.
+        """
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> str | None:
+        conn = self._connect()
+        if conn is None:
+            return None
+        now = time.time()
+        row = conn.execute(
+            "SELECT response_json, created_at, latency_seconds FROM llm_cache "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is not None and now - row[1] > self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            conn.commit()
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        conn.execute(
+            "UPDATE llm_cache SET last_accessed_at = ? WHERE key = ?", (now, key)
+        )
+        conn.commit()
+        self.hits += 1
+        self.latency_saved_seconds += row[2]
+        logger.info("LLM cache hit for %s (saved %.2fs)", key[:12], row[2])
+        return row[0]
+
+    def put(self, key: str, response_json: str, latency_seconds: float) -> None:
+        """Store a response and evict least recently used entries over the bound.
+
+        Args:
+            key: Cache key from `llm_cache_key`.
+            response_json: Serialized response to cache.
+            latency_seconds: How long the LLM call took, credited as saved
+                time on later hits.
+        """
+        with self._lock:
+            self._put(key, response_json, latency_seconds)
+
+    def _put(self, key: str, response_json: str, latency_seconds: float) -> None:
+        conn = self._connect()
+        if conn is None:
+            return
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache "
+            "(key, response_json, created_at, last_accessed_at, latency_seconds) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, response_json, now, now, latency_seconds),
+        )
+        conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY last_accessed_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def metrics(self) -> dict[str, Any]:
+        """Current counters, for the metrics registry."""
+        with self._lock:
+            enabled = self.enabled and self._connect() is not None
+        return {
+            "enabled": enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "latency_saved_seconds": round(self.latency_saved_seconds, 3),
+        }
+
+    def close(self) -> None:
+        """Close the cache database connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is None and self.enabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(
+                    "LLM cache unavailable at %s, disabling it: %s", self.path, e
+                )
+                self.enabled = False
+                return None
+            self._conn = conn
+        return self._conn
+
+
+llm_cache = LLMCache()
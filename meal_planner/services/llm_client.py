@@ -0,0 +1,186 @@
+"""Shared HTTP client for LLM API calls, kept warm across requests.
+
+All LLM calls go through one `httpx.AsyncClient` with a bounded connection
+pool, so they reuse open connections to the provider instead of paying a
+TCP and TLS handshake each, and calls are multiplexed over HTTP/2 (through
+the `httpx[http2]` dependency) unless that is disabled. Idle connections are
+kept for `keepalive_seconds`, well beyond httpx's 5 second default, because
+LLM calls are often minutes apart.
+
+The app's lifespan calls `preconnect` at startup, so the first LLM call
+after a cold start finds an open connection, and `close` on shutdown. The
+metrics count the calls that had to open a connection ("cold") and those
+that reused one ("warm"), with their latency until the response headers.
+"""
+
+import importlib.util
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from meal_planner.config import (
+    LLM_BASE_URL,
+    LLM_HTTP2_ENABLED,
+    LLM_POOL_KEEPALIVE_SECONDS,
+    LLM_POOL_MAX_CONNECTIONS,
+    LLM_POOL_MAX_KEEPALIVE,
+    LLM_PRECONNECT_ENABLED,
+    LLM_PRECONNECT_TIMEOUT_SECONDS,
+)
+from meal_planner.services.llm_retry import LatencyTracker
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Request extensions used to trace calls; httpcore ignores unknown keys.
+_CALL_EXTENSION = "meal_planner.llm_call"
+_PRECONNECT_EXTENSION = "meal_planner.preconnect"
+
+
+class _CallTrace:
+    """httpcore trace callback noting whether a request opened a connection."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.opened_connection = False
+
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.opened_connection = True
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class LLMHTTPClient:
+    """Owns the pooled HTTP client used by the OpenAI-compatible LLM client."""
+
+    def __init__(
+        self,
+        base_url: str = LLM_BASE_URL,
+        max_connections: int = LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = LLM_POOL_MAX_KEEPALIVE,
+        keepalive_seconds: float = LLM_POOL_KEEPALIVE_SECONDS,
+        http2: bool = LLM_HTTP2_ENABLED,
+        preconnect_enabled: bool = LLM_PRECONNECT_ENABLED,
+        preconnect_timeout_seconds: float = LLM_PRECONNECT_TIMEOUT_SECONDS,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_seconds,
+        )
+        self.http2 = http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("The h2 package is not installed; using HTTP/1.1 for LLM")
+            self.http2 = False
+        self.preconnect_enabled = preconnect_enabled
+        self.preconnect_timeout_seconds = preconnect_timeout_seconds
+        self.connections_opened = 0
+        self.cold_calls = 0
+        self.warm_calls = 0
+        self.preconnect_seconds: float | None = None
+        self.first_call_seconds: float | None = None
+        self.first_call_warm: bool | None = None
+        self.cold_latencies = LatencyTracker()
+        self.warm_latencies = LatencyTracker()
+        self._client: httpx.AsyncClient | None = None
+        if registry is not None:
+            registry.register("llm_http_client", self.metrics)
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it if it is missing or closed."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                # Like the OpenAI SDK's default client.
+                follow_redirects=True,
+                event_hooks={
+                    "request": [self._on_request],
+                    "response": [self._on_response],
+                },
+            )
+        return self._client
+
+    async def preconnect(self) -> bool:
+        """Open a connection to the LLM host so the first call finds it warm.
+
+        Sends a HEAD request to the base URL; any response will do, since
+        only the connection it leaves in the pool matters. Failures are
+        logged, not raised: the first call then simply connects itself.
+
+        Returns:
+            True if the connection was opened.
+        """
+        if not self.preconnect_enabled:
+            return False
+        started = time.perf_counter()
+        try:
+            await self.get().head(
+                self.base_url,
+                timeout=self.preconnect_timeout_seconds,
+                extensions={_PRECONNECT_EXTENSION: True},
+            )
+        except httpx.HTTPError as e:
+            logger.warning("Could not pre-connect to %s: %s", self.base_url, e)
+            return False
+        self.preconnect_seconds = time.perf_counter() - started
+        logger.info(
+            "Pre-connected to the LLM endpoint in %.0f ms",
+            self.preconnect_seconds * 1000,
+        )
+        return True
+
+    async def close(self) -> None:
+        """Close the client and its pooled connections, if open."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def metrics(self) -> dict[str, Any]:
+        """Connection reuse and cold vs warm call latency, for the registry."""
+        return {
+            "http2": self.http2,
+            "connections_opened": self.connections_opened,
+            "preconnect_ms": _ms(self.preconnect_seconds),
+            "first_call_ms": _ms(self.first_call_seconds),
+            "first_call_warm": self.first_call_warm,
+            "cold_calls": self.cold_calls,
+            "warm_calls": self.warm_calls,
+            "cold_call_p50_ms": _ms(self.cold_latencies.quantile(0.5)),
+            "warm_call_p50_ms": _ms(self.warm_latencies.quantile(0.5)),
+        }
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        trace = _CallTrace()
+        request.extensions["trace"] = trace
+        request.extensions[_CALL_EXTENSION] = trace
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        trace = response.request.extensions.get(_CALL_EXTENSION)
+        if trace is None:
+            return
+        if trace.opened_connection:
+            self.connections_opened += 1
+        if response.request.extensions.get(_PRECONNECT_EXTENSION):
+            return
+        elapsed = time.perf_counter() - trace.started
+        warm = not trace.opened_connection
+        if self.first_call_seconds is None:
+            self.first_call_seconds = elapsed
+            self.first_call_warm = warm
+        if warm:
+            self.warm_calls += 1
+            self.warm_latencies.record(elapsed)
+        else:
+            self.cold_calls += 1
+            self.cold_latencies.record(elapsed)
+
+
+llm_http_client = LLMHTTPClient()
@@ -0,0 +1,257 @@
+"""Client-side admission control for LLM calls.
+
+`AdaptiveLimiter` bounds the number of LLM requests in flight and paces them
+with requests-per-minute and tokens-per-minute buckets, so bursts of traffic
+queue inside the app instead of turning into provider 429s. The concurrency
+limit adapts AIMD-style: it grows slowly while calls succeed and is cut
+multiplicatively when the provider reports overload (HTTP 429 or 5xx).
+"""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from meal_planner.config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_MIN_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+)
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+MAX_CAUSE_DEPTH = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens in `text`.
+
+    Args:
+        text: Prompt text.
+
+    Returns:
+        Estimated token count, at least 1.
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an error means the LLM provider is overloaded or rate limiting.
+
+    Provider errors may arrive wrapped (e.g. by instructor's retry logic), so
+    the exception's cause chain is searched for an HTTP status code.
+
+    Args:
+        error: Exception raised by an LLM call.
+
+    Returns:
+        True for HTTP 429 and 5xx responses.
+    """
+    current: BaseException | None = error
+    for _ in range(MAX_CAUSE_DEPTH):
+        if current is None:
+            break
+        status_code = getattr(current, "status_code", None)
+        if isinstance(status_code, int) and (status_code == 429 or status_code >= 500):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`.
+
+    The bucket holds at most one minute's worth of tokens, so an idle period
+    allows a burst of up to the per-minute rate. A non-positive rate
+    disables the bucket. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = max(rate_per_minute, 0.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket."""
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until `amount` tokens are available and take them.
+
+        Args:
+            amount: Tokens to take. Amounts above the capacity are capped to
+                it, so a single oversized request cannot block forever.
+        """
+        if self.rate_per_minute <= 0:
+            return
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                deficit = amount - self._tokens
+                await asyncio.sleep(deficit * 60 / self.rate_per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(
+            self.capacity, self._tokens + elapsed * self.rate_per_minute / 60
+        )
+
+
+class AdaptiveLimiter:
+    """Concurrency limit with AIMD adaptation, plus request and token buckets.
+
+    Each successful call raises the concurrency limit by `increase / limit`
+    (about `increase` per limit's worth of calls) up to `max_concurrency`.
+    An overload error multiplies it by `decrease_factor`, down to
+    `min_concurrency`. Only one decrease happens per round of calls: errors
+    from calls that started before the last decrease are ignored, so a
+    burst of 429s from one wave of requests halves the limit once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        min_concurrency: int = LLM_MIN_CONCURRENCY,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.limit = float(max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.in_flight = 0
+        self.acquired = 0
+        self.overloads = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+        self._last_decrease = float("-inf")
+        if registry is not None:
+            registry.register(f"llm_limiter.{name}", self.metrics)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, estimated_tokens: int = 1) -> AsyncIterator[None]:
+        """Hold a concurrency slot and rate budget for one LLM call.
+
+        Args:
+            estimated_tokens: Tokens the call is expected to use, taken from
+                the tokens-per-minute bucket.
+
+        Yields:
+            Once the call may proceed. Overload errors raised inside the
+            block reduce the concurrency limit; successes increase it.
+        """
+        started = time.monotonic()
+        await self._acquire_slot()
+        try:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            self._record_wait(time.monotonic() - started)
+            yield
+        except Exception as e:
+            if is_overload_error(e):
+                self._on_overload(started)
+            raise
+        else:
+            self._on_success()
+        finally:
+            self._release_slot()
+
+    @property
+    def queued(self) -> int:
+        """Callers waiting for a concurrency slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def metrics(self) -> dict[str, Any]:
+        """Current gauges and counters, for the metrics registry."""
+        return {
+            "limit": round(self.limit, 2),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "acquired": self.acquired,
+            "overloads": self.overloads,
+            "queue_wait_seconds_avg": (
+                round(self.wait_seconds_total / self.acquired, 4)
+                if self.acquired
+                else 0.0
+            ),
+            "queue_wait_seconds_max": round(self.wait_seconds_max, 4),
+        }
+
+    async def _acquire_slot(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as we were cancelled; hand it on.
+                self._release_slot()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _record_wait(self, wait_seconds: float) -> None:
+        self.acquired += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def _on_success(self) -> None:
+        self.limit = min(
+            float(self.max_concurrency), self.limit + self.increase / self.limit
+        )
+        self._wake_waiters()
+
+    def _on_overload(self, started: float) -> None:
+        self.overloads += 1
+        if started < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+        logger.warning(
+            "LLM provider overloaded; reducing %s concurrency limit to %.2f",
+            self.name,
+            self.limit,
+        )
+
+
+llm_limiter = AdaptiveLimiter("gemini")
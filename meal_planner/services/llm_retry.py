@@ -0,0 +1,256 @@
+"""Retries with jittered backoff, deadlines and request hedging for LLM calls.
+
+A `RetryPolicy` wraps a zero-argument coroutine function that makes one LLM
+request. Transient failures (overload, timeouts, dropped connections) are
+retried with full-jitter exponential backoff as long as the overall
+deadline allows. Optionally, a request that is slower than the recent p95
+latency is hedged: a second identical request is sent and whichever
+finishes first wins, which trims the latency tail at the cost of a few
+extra calls.
+"""
+
+import asyncio
+import collections
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import openai
+
+from meal_planner.config import (
+    LLM_DEADLINE_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_MIN_DELAY_SECONDS,
+    LLM_HEDGE_QUANTILE,
+    LLM_RETRY_BASE_DELAY_SECONDS,
+    LLM_RETRY_MAX_ATTEMPTS,
+    LLM_RETRY_MAX_DELAY_SECONDS,
+)
+from meal_planner.services.llm_limiter import MAX_CAUSE_DEPTH, is_overload_error
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+WIN_PATHS = ("primary", "hedge", "retry")
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether an LLM call that failed with `error` is worth retrying.
+
+    Args:
+        error: Exception raised by an LLM call.
+
+    Returns:
+        True for provider overload (HTTP 429/5xx) and for timeouts or
+        connection failures, anywhere in the exception's cause chain.
+    """
+    if is_overload_error(error):
+        return True
+    current: BaseException | None = error
+    for _ in range(MAX_CAUSE_DEPTH):
+        if current is None:
+            break
+        if isinstance(current, openai.APIConnectionError):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: collections.deque[float] = collections.deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample, dropping the oldest once the window is full."""
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """Latency at quantile `q` (0-1) of the window, or None if empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RetryPolicy:
+    """Runs an LLM request with retries, an overall deadline and hedging.
+
+    Attempts are retried only for retryable errors (see
+    `is_retryable_error`), up to `max_attempts` in total. Before retry `n`
+    the policy sleeps a random delay between 0 and
+    `min(max_delay_seconds, base_delay_seconds * 2**(n - 1))`. No retry is
+    started if the backoff would end past the deadline, and an attempt
+    still running at the deadline is cancelled.
+
+    With hedging enabled, once `HEDGE_MIN_SAMPLES` latencies have been
+    seen, an attempt that has not finished after the `hedge_quantile`
+    latency (at least `hedge_min_delay_seconds`) gets a second, identical
+    request; the first to succeed wins and the other is cancelled.
+
+    Which path produced each result is counted: "primary" (first request
+    of the first attempt), "hedge" (a hedged request) or "retry" (a later
+    attempt).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = LLM_RETRY_MAX_ATTEMPTS,
+        base_delay_seconds: float = LLM_RETRY_BASE_DELAY_SECONDS,
+        max_delay_seconds: float = LLM_RETRY_MAX_DELAY_SECONDS,
+        deadline_seconds: float = LLM_DEADLINE_SECONDS,
+        hedge: bool = LLM_HEDGE_ENABLED,
+        hedge_quantile: float = LLM_HEDGE_QUANTILE,
+        hedge_min_delay_seconds: float = LLM_HEDGE_MIN_DELAY_SECONDS,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.deadline_seconds = deadline_seconds
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.latencies = LatencyTracker()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.hedges_sent = 0
+        self.failures = 0
+        self.deadline_exceeded = 0
+        self.wins = dict.fromkeys(WIN_PATHS, 0)
+        if registry is not None:
+            registry.register(f"llm_retry.{name}", self.metrics)
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Call `fn` under this policy.
+
+        Args:
+            fn: Zero-argument coroutine function making one LLM request. It
+                may be called several times, concurrently when hedging.
+
+        Returns:
+            The first successful result.
+
+        Raises:
+            TimeoutError: If the deadline passed while an attempt was running.
+            Exception: The last attempt's error, if it was not retryable or
+                no attempts or time were left.
+        """
+        self.calls += 1
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            attempt += 1
+            self.attempts += 1
+            try:
+                async with asyncio.timeout(deadline - time.monotonic()):
+                    result, path = await self._hedged(fn)
+            except TimeoutError:
+                self.deadline_exceeded += 1
+                self.failures += 1
+                logger.warning(
+                    "LLM call exceeded its %.1fs deadline after %d attempt(s)",
+                    self.deadline_seconds,
+                    attempt,
+                )
+                raise
+            except Exception as e:
+                if not is_retryable_error(e) or attempt == self.max_attempts:
+                    self.failures += 1
+                    raise
+                delay = self.backoff_seconds(attempt)
+                if time.monotonic() + delay >= deadline:
+                    self.deadline_exceeded += 1
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                logger.warning(
+                    "LLM call attempt %d failed (%s); retrying in %.2fs",
+                    attempt,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            if path == "primary" and attempt > 1:
+                path = "retry"
+            self.wins[path] += 1
+            return result
+
+    def backoff_seconds(self, attempt: int) -> float:
+        """Full-jitter backoff before the retry following attempt `attempt`."""
+        cap = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1))
+        return random.uniform(0, cap)  # noqa: S311 - jitter, not security
+
+    def hedge_delay_seconds(self) -> float | None:
+        """How long to wait before hedging, or None if hedging is off."""
+        if not self.hedge or len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(
+            self.hedge_min_delay_seconds, self.latencies.quantile(self.hedge_quantile)
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        """Current counters, for the metrics registry."""
+        p50 = self.latencies.quantile(0.5)
+        p95 = self.latencies.quantile(0.95)
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "hedges_sent": self.hedges_sent,
+            "wins": dict(self.wins),
+            "failures": self.failures,
+            "deadline_exceeded": self.deadline_exceeded,
+            "latency_p50_seconds": round(p50, 3) if p50 is not None else None,
+            "latency_p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> tuple[T, str]:
+        started = {"primary": time.monotonic()}
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary: "primary"}
+        try:
+            hedge_delay = self.hedge_delay_seconds()
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+                if not done:
+                    self.hedges_sent += 1
+                    logger.info(
+                        "LLM call slower than %.2fs; sending hedged request",
+                        hedge_delay,
+                    )
+                    started["hedge"] = time.monotonic()
+                    tasks[asyncio.ensure_future(fn())] = "hedge"
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda t: tasks[t] != "primary"):
+                    if task.exception() is None:
+                        path = tasks[task]
+                        self.latencies.record(time.monotonic() - started[path])
+                        return task.result(), path
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+llm_retry_policy = RetryPolicy("gemini")
@@ -0,0 +1,317 @@
+"""Per-call instrumentation of LLM requests.
+
+Every call made through `get_structured_llm_response` (and every streamed
+extraction) produces an `LLMCallRecord` with its wall time, attempts,
+token usage, estimated cost and outcome. Records are aggregated per
+operation and prompt template for the metrics endpoint and can also be
+appended to a JSONL log for offline analysis. The log is written by a
+background thread, so recording a call never blocks the event loop on
+file I/O.
+
+Token usage and attempt counts come from instructor's client hooks, which
+fire once per request sent. The record of the call in progress is kept in
+a context variable, so hooks from concurrent calls, retries and hedged
+requests are attributed to the right call. Callers label their calls with
+`llm_call_labels` so spend can be split by operation and prompt template.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from meal_planner.config import (
+    LLM_CALL_LOG_PATH,
+    LLM_INPUT_COST_PER_MILLION_TOKENS,
+    LLM_OUTPUT_COST_PER_MILLION_TOKENS,
+)
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+UNLABELLED = "unlabelled"
+
+
+@dataclass
+class LLMCallRecord:
+    """Measurements of one logical LLM call.
+
+    Attributes:
+        operation: What the call was for, e.g. "recipe_extraction".
+        template: Name of the prompt template used, if any.
+        model: Model name.
+        response_model: Name of the Pydantic response model.
+        streamed: Whether the response was streamed.
+        started_at: UTC time the call started (ISO 8601).
+        attempts: Requests sent, including retries, instructor's
+            validation re-asks and hedged requests.
+        validation_errors: Responses that failed schema validation.
+        prompt_tokens: Prompt tokens over all attempts, if reported.
+        completion_tokens: Completion tokens over all attempts, if reported.
+        cost_usd: Estimated cost from the configured per-token prices.
+        wall_seconds: Time from start to result or failure.
+        outcome: "success" or "error".
+        error: Exception class name, for failed calls.
+    """
+
+    operation: str
+    template: str | None
+    model: str
+    response_model: str
+    streamed: bool = False
+    started_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    attempts: int = 0
+    validation_errors: int = 0
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    cost_usd: float | None = None
+    wall_seconds: float = 0.0
+    outcome: str = "success"
+    error: str | None = None
+
+    def add_usage(self, usage: Any) -> None:
+        """Add a response's token usage to the totals."""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        if isinstance(prompt_tokens, int):
+            self.prompt_tokens = (self.prompt_tokens or 0) + prompt_tokens
+        if isinstance(completion_tokens, int):
+            self.completion_tokens = (self.completion_tokens or 0) + completion_tokens
+
+
+_labels: contextvars.ContextVar[tuple[str, str | None]] = contextvars.ContextVar(
+    "llm_call_labels", default=(UNLABELLED, None)
+)
+_current: contextvars.ContextVar[LLMCallRecord | None] = contextvars.ContextVar(
+    "llm_call_record", default=None
+)
+_collected: contextvars.ContextVar[list[LLMCallRecord] | None] = contextvars.ContextVar(
+    "llm_call_collector", default=None
+)
+
+
+@contextlib.contextmanager
+def llm_call_labels(operation: str, template: str | None = None) -> Iterator[None]:
+    """Label LLM calls made inside the block.
+
+    Args:
+        operation: What the calls are for, e.g. "recipe_extraction".
+        template: Name of the prompt template the calls use.
+    """
+    token = _labels.set((operation, template))
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+class LLMTelemetry:
+    """Records LLM calls and aggregates them per operation and template."""
+
+    def __init__(
+        self,
+        log_path: Path | None = LLM_CALL_LOG_PATH,
+        input_cost_per_million_tokens: float = LLM_INPUT_COST_PER_MILLION_TOKENS,
+        output_cost_per_million_tokens: float = LLM_OUTPUT_COST_PER_MILLION_TOKENS,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.log_path = log_path
+        self.input_cost_per_million_tokens = input_cost_per_million_tokens
+        self.output_cost_per_million_tokens = output_cost_per_million_tokens
+        self._totals: dict[str, dict[str, Any]] = {}
+        # One worker, so log lines are appended in the order calls finish.
+        self._log_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="llm-call-log"
+        )
+        if registry is not None:
+            registry.register("llm_calls", self.metrics)
+
+    def instrument(self, client: Any) -> None:
+        """Register hooks on an instructor client to collect per-attempt data.
+
+        Args:
+            client: Instructor client whose requests should be measured.
+        """
+        client.on("completion:kwargs", _on_attempt)
+        client.on("completion:response", _on_response)
+        client.on("parse:error", _on_parse_error)
+
+    @contextlib.contextmanager
+    def record_call(
+        self,
+        model: str,
+        response_model: str,
+        streamed: bool = False,
+        operation: str | None = None,
+        template: str | None = None,
+    ) -> Iterator[LLMCallRecord]:
+        """Measure one logical LLM call made inside the block.
+
+        Args:
+            model: Model name.
+            response_model: Name of the Pydantic response model.
+            streamed: Whether the response is streamed.
+            operation: Label for the call; defaults to the `llm_call_labels`
+                in effect.
+            template: Prompt template name; defaults to the `llm_call_labels`
+                in effect.
+
+        Yields:
+            The record, which is completed and stored when the block exits.
+            Exceptions propagate after being recorded as the call's outcome.
+        """
+        if operation is None:
+            operation, template = _labels.get()
+        record = LLMCallRecord(
+            operation=operation,
+            template=template,
+            model=model,
+            response_model=response_model,
+            streamed=streamed,
+        )
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.outcome = "error"
+            record.error = type(e).__name__
+            raise
+        finally:
+            try:
+                _current.reset(token)
+            except ValueError:
+                # An async generator finalized outside the context it ran in.
+                _current.set(None)
+            record.wall_seconds = round(time.perf_counter() - started, 4)
+            self._finish(record)
+
+    @contextlib.contextmanager
+    def collect_calls(self) -> Iterator[list[LLMCallRecord]]:
+        """Collect the records of LLM calls finished inside the block.
+
+        Calls are attributed through a context variable, so concurrent
+        tasks each collecting their own calls do not see each other's.
+
+        Yields:
+            The list the records are appended to.
+        """
+        records: list[LLMCallRecord] = []
+        token = _collected.set(records)
+        try:
+            yield records
+        finally:
+            _collected.reset(token)
+
+    def flush_log(self) -> None:
+        """Wait until the calls finished so far have been written to the log."""
+        self._log_writer.submit(lambda: None).result()
+
+    def metrics(self) -> dict[str, Any]:
+        """Totals per "operation/template", for the metrics registry."""
+        return {
+            key: {
+                **totals,
+                "cost_usd": round(totals["cost_usd"], 6),
+                "wall_seconds_total": round(totals["wall_seconds_total"], 3),
+                "wall_seconds_avg": round(
+                    totals["wall_seconds_total"] / totals["calls"], 3
+                ),
+                "wall_seconds_max": round(totals["wall_seconds_max"], 3),
+            }
+            for key, totals in self._totals.items()
+        }
+
+    def _finish(self, record: LLMCallRecord) -> None:
+        if record.prompt_tokens is not None or record.completion_tokens is not None:
+            record.cost_usd = round(
+                (record.prompt_tokens or 0) * self.input_cost_per_million_tokens / 1e6
+                + (record.completion_tokens or 0)
+                * self.output_cost_per_million_tokens
+                / 1e6,
+                8,
+            )
+        collected = _collected.get()
+        if collected is not None:
+            collected.append(record)
+        key = f"{record.operation}/{record.template or '-'}"
+        totals = self._totals.setdefault(
+            key,
+            {
+                "calls": 0,
+                "errors": 0,
+                "attempts": 0,
+                "validation_errors": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "wall_seconds_total": 0.0,
+                "wall_seconds_max": 0.0,
+            },
+        )
+        totals["calls"] += 1
+        totals["errors"] += record.outcome == "error"
+        totals["attempts"] += record.attempts
+        totals["validation_errors"] += record.validation_errors
+        totals["prompt_tokens"] += record.prompt_tokens or 0
+        totals["completion_tokens"] += record.completion_tokens or 0
+        totals["cost_usd"] += record.cost_usd or 0.0
+        totals["wall_seconds_total"] += record.wall_seconds
+        totals["wall_seconds_max"] = max(
+            totals["wall_seconds_max"], record.wall_seconds
+        )
+        logger.info(
+            "LLM call %s: outcome=%s attempts=%d tokens=%s/%s wall=%.2fs",
+            key,
+            record.outcome,
+            record.attempts,
+            record.prompt_tokens,
+            record.completion_tokens,
+            record.wall_seconds,
+        )
+        self._write_log(record)
+
+    def _write_log(self, record: LLMCallRecord) -> None:
+        if self.log_path is None:
+            return
+        line = json.dumps(asdict(record)) + "\n"
+        self._log_writer.submit(_append_line, self.log_path, line)
+
+
+def _append_line(path: Path, line: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as log:
+            log.write(line)
+    except OSError as e:
+        logger.warning("Could not write LLM call log %s: %s", path, e)
+
+
+def _on_attempt(*args: Any, **kwargs: Any) -> None:
+    record = _current.get()
+    if record is not None:
+        record.attempts += 1
+
+
+def _on_response(response: Any) -> None:
+    record = _current.get()
+    if record is not None:
+        record.add_usage(getattr(response, "usage", None))
+
+
+def _on_parse_error(error: Exception) -> None:
+    record = _current.get()
+    if record is not None:
+        record.validation_errors += 1
+
+
+llm_telemetry = LLMTelemetry()
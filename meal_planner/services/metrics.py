@@ -0,0 +1,38 @@
+"""Registry of in-process metrics exposed through the metrics API."""
+
+from collections.abc import Callable
+from typing import Any
+
+MetricsSource = Callable[[], dict[str, Any]]
+
+
+class MetricsRegistry:
+    """Collects named metric sources and snapshots them on demand.
+
+    A source is any callable returning a JSON-serializable dict, so
+    components keep their own counters and are only read when metrics are
+    requested.
+    """
+
+    def __init__(self):
+        self._sources: dict[str, MetricsSource] = {}
+
+    def register(self, name: str, source: MetricsSource) -> None:
+        """Register a metrics source, replacing any source with the same name.
+
+        Args:
+            name: Key under which the source's metrics are reported.
+            source: Callable returning the current metrics.
+        """
+        self._sources[name] = source
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Read all registered sources.
+
+        Returns:
+            Mapping of source name to its current metrics, sorted by name.
+        """
+        return {name: self._sources[name]() for name in sorted(self._sources)}
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,225 @@
+"""Choice of LLM model per call, with fallback to another model on failure.
+
+Calls are routed to one of three model tiers. Recipe extraction prompts
+vary from a pasted snippet of a few hundred tokens to whole blog pages of
+tens of thousands: short ones go to the cheaper, faster small model and
+very long ones to the large model, which copes better with long, noisy
+input. Modification prompts (a recipe and a short request) and untagged
+calls use the default model.
+
+If the chosen model times out or its output fails validation, the call is
+made once more with the fallback model, which is the next tier up (the
+default model for the large tier). Other errors, such as authentication
+failures, are not worth a second model and propagate unchanged.
+"""
+
+import contextlib
+import contextvars
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import openai
+import pydantic
+from instructor.exceptions import InstructorRetryException
+
+from meal_planner.config import (
+    LLM_LARGE_MODEL,
+    LLM_MODEL,
+    LLM_ROUTER_ENABLED,
+    LLM_ROUTER_LARGE_MIN_TOKENS,
+    LLM_ROUTER_SMALL_MAX_TOKENS,
+    LLM_SMALL_MODEL,
+)
+from meal_planner.services.llm_limiter import MAX_CAUSE_DEPTH
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TIERS = ("small", "default", "large")
+SIZE_ROUTED_TASKS = frozenset({"recipe_extraction"})
+
+_answered_by_fallback: contextvars.ContextVar[list[str] | None] = (
+    contextvars.ContextVar("llm_fallback_collector", default=None)
+)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Where a call goes.
+
+    Attributes:
+        task: What the call is for, e.g. "recipe_extraction", if known.
+        tier: "small", "default" or "large".
+        model: Model to call first.
+        fallback_model: Model to retry with on timeout or validation
+            failure, or None for no fallback.
+    """
+
+    task: str | None
+    tier: str
+    model: str
+    fallback_model: str | None
+
+
+def fallback_reason(error: BaseException) -> str | None:
+    """Why an error from one model warrants trying another.
+
+    Args:
+        error: Exception raised by an LLM call, after retries.
+
+    Returns:
+        "timeout" for deadlines and request timeouts, "validation" for
+        output that failed schema validation (anywhere in the cause chain),
+        or None if another model would not help.
+    """
+    current: BaseException | None = error
+    for _ in range(MAX_CAUSE_DEPTH):
+        if current is None:
+            break
+        if isinstance(current, (TimeoutError, openai.APITimeoutError)):
+            return "timeout"
+        if isinstance(current, (InstructorRetryException, pydantic.ValidationError)):
+            return "validation"
+        current = current.__cause__ or current.__context__
+    return None
+
+
+class ModelRouter:
+    """Picks a model tier per call and falls back to another on failure.
+
+    With routing disabled every call goes to the default model without
+    fallback, as before routing existed.
+    """
+
+    def __init__(
+        self,
+        default_model: str = LLM_MODEL,
+        small_model: str = LLM_SMALL_MODEL,
+        large_model: str = LLM_LARGE_MODEL,
+        small_max_tokens: int = LLM_ROUTER_SMALL_MAX_TOKENS,
+        large_min_tokens: int = LLM_ROUTER_LARGE_MIN_TOKENS,
+        enabled: bool = LLM_ROUTER_ENABLED,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.models = {
+            "small": small_model,
+            "default": default_model,
+            "large": large_model,
+        }
+        self.small_max_tokens = small_max_tokens
+        self.large_min_tokens = large_min_tokens
+        self.enabled = enabled
+        self.routed: dict[str, dict[str, int]] = {}
+        self.fallbacks = {"timeout": 0, "validation": 0}
+        self.fallback_successes = 0
+        self.fallback_failures = 0
+        if registry is not None:
+            registry.register("llm_router", self.metrics)
+
+    def route(self, task: str | None, prompt_tokens: int) -> ModelRoute:
+        """Choose the model for a call. Has no side effects.
+
+        Args:
+            task: What the call is for, e.g. "recipe_extraction".
+            prompt_tokens: Estimated size of the prompt.
+
+        Returns:
+            The route to take.
+        """
+        if not self.enabled:
+            return ModelRoute(task, "default", self.models["default"], None)
+        tier = "default"
+        if task in SIZE_ROUTED_TASKS:
+            if prompt_tokens <= self.small_max_tokens:
+                tier = "small"
+            elif prompt_tokens >= self.large_min_tokens:
+                tier = "large"
+        fallback_tier = "default" if tier == "large" else TIERS[TIERS.index(tier) + 1]
+        model = self.models[tier]
+        fallback_model = self.models[fallback_tier]
+        return ModelRoute(
+            task, tier, model, fallback_model if fallback_model != model else None
+        )
+
+    async def run(self, route: ModelRoute, call: Callable[[str], Awaitable[T]]) -> T:
+        """Make a call along `route`, falling back to its fallback model.
+
+        The routing decision is counted in the metrics.
+
+        Args:
+            route: Route from `route`.
+            call: Coroutine function making the call with the given model.
+
+        Returns:
+            The result from the first model that succeeds.
+
+        Raises:
+            Exception: The routed model's error, if it does not warrant a
+                fallback or there is no fallback model, otherwise the
+                fallback model's error.
+        """
+        self.record_decision(route)
+        try:
+            return await call(route.model)
+        except Exception as e:
+            reason = fallback_reason(e)
+            if reason is None or route.fallback_model is None:
+                raise
+            self.fallbacks[reason] += 1
+            logger.warning(
+                "LLM call to %s failed (%s); falling back to %s",
+                route.model,
+                reason,
+                route.fallback_model,
+            )
+        try:
+            result = await call(route.fallback_model)
+        except Exception:
+            self.fallback_failures += 1
+            raise
+        self.fallback_successes += 1
+        collected = _answered_by_fallback.get()
+        if collected is not None:
+            collected.append(route.fallback_model)
+        return result
+
+    @contextlib.contextmanager
+    def collect_fallbacks(self) -> Iterator[list[str]]:
+        """Collect the fallback models that answered calls inside the block.
+
+        Callers caching a response under the routed model use this to tell
+        whether another model produced it. Fallbacks are attributed through
+        a context variable, so concurrent tasks do not see each other's.
+
+        Yields:
+            The list the fallback models are appended to.
+        """
+        models: list[str] = []
+        token = _answered_by_fallback.set(models)
+        try:
+            yield models
+        finally:
+            _answered_by_fallback.reset(token)
+
+    def record_decision(self, route: ModelRoute) -> None:
+        """Count a routing decision in the metrics."""
+        task_counts = self.routed.setdefault(route.task or "-", dict.fromkeys(TIERS, 0))
+        task_counts[route.tier] += 1
+
+    def metrics(self) -> dict[str, Any]:
+        """Routing decisions and fallbacks, for the metrics registry."""
+        return {
+            "enabled": self.enabled,
+            "models": dict(self.models),
+            "routed": {task: dict(counts) for task, counts in self.routed.items()},
+            "fallbacks": dict(self.fallbacks),
+            "fallback_successes": self.fallback_successes,
+            "fallback_failures": self.fallback_failures,
+        }
+
+
+model_router = ModelRouter()
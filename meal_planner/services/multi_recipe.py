@@ -0,0 +1,271 @@
+"""Map-reduce extraction of pages holding several recipes.
+
+Roundup pages ("25 weeknight dinners") hold one recipe per section, so a
+single extraction returns one of them at best, and the page text is often
+longer than the recipe region budget. Such pages are split on the headings
+that start each recipe (the shallowest heading level used at least twice,
+ignoring "Ingredients", "Instructions" and the like). Every section that
+looks like a whole recipe, with both ingredient lines and steps, is
+extracted on its own, all at once, so the page takes about as long as its
+slowest section rather than growing with its length. The results are then
+reduced to a list of recipes: a section that produced only part of a recipe
+(ingredients without steps, or steps without ingredients) is merged into
+the previous one, as are repeats of a recipe's name.
+
+Pages with fewer than two recipe sections are left to the usual single
+extraction, so recipe pages with a "Notes" or "Reviews" heading are not
+affected.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from meal_planner.config import MULTI_RECIPE_ENABLED, MULTI_RECIPE_MAX_CHUNKS
+from meal_planner.models import RecipeBase
+from meal_planner.services.call_llm import generate_recipe_from_text
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+from meal_planner.services.recipe_region import (
+    HEADING_SCORE,
+    IMPERATIVE_SCORE,
+    MIN_REGION_SCORE,
+    QUANTITY_SCORE,
+    QUANTITY_UNIT_SCORE,
+    best_region,
+    score_line,
+    score_lines,
+)
+
+logger = logging.getLogger(__name__)
+
+MIN_SECTIONS = 2
+
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+\S")
+_NAME_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def split_sections(text: str) -> list[str]:
+    """Split page text into sections at the headings that start recipes.
+
+    Args:
+        text: Page text, as produced by `clean_html_text`.
+
+    Returns:
+        The sections in page order, the text before the first recipe
+        heading included as the first one, or `[text]` if no heading
+        level is used at least twice.
+    """
+    lines = text.splitlines()
+    headings = []
+    for i, line in enumerate(lines):
+        match = _MARKDOWN_HEADING.match(line)
+        if match and score_line(line) != HEADING_SCORE:
+            headings.append((i, len(match.group(1))))
+    counts = Counter(level for _, level in headings)
+    level = min((level for level, count in counts.items() if count >= 2), default=None)
+    if level is None:
+        return [text]
+    starts = [i for i, heading_level in headings if heading_level == level]
+    bounds = zip([0, *starts], [*starts, len(lines)], strict=True)
+    sections = ["\n".join(lines[start:end]).strip() for start, end in bounds]
+    return [section for section in sections if section]
+
+
+def is_recipe_section(section: str) -> bool:
+    """Whether a section looks like a whole recipe.
+
+    Args:
+        section: One section from `split_sections`.
+
+    Returns:
+        True if its best region (see `best_region`) scores at least
+        `MIN_REGION_SCORE` and holds both an ingredient line and an
+        imperative step, so that, say, a nutrition table is not mistaken
+        for a recipe.
+    """
+    scores = score_lines(section.splitlines())
+    score, start, end = best_region(scores)
+    region = scores[start : end + 1]
+    return (
+        score >= MIN_REGION_SCORE
+        and any(line in (QUANTITY_UNIT_SCORE, QUANTITY_SCORE) for line in region)
+        and IMPERATIVE_SCORE in region
+    )
+
+
+def merge_recipes(recipes: list[RecipeBase]) -> list[RecipeBase]:
+    """Reduce per-section extractions to the distinct recipes on a page.
+
+    A recipe is merged into the previous one if it has the same name
+    (ignoring case and punctuation), or if it lacks ingredients or
+    instructions and the previous one lacks the other. When merging, the
+    previous recipe's non-empty fields win. Recipes that still have no
+    instructions are dropped, unless that would leave none.
+
+    Args:
+        recipes: Extracted recipes in page order.
+
+    Returns:
+        The merged recipes, in page order.
+    """
+    merged: list[RecipeBase] = []
+    for recipe in recipes:
+        previous = merged[-1] if merged else None
+        if previous is not None and (
+            _name_key(recipe.name) == _name_key(previous.name)
+            or (not recipe.ingredients and not previous.instructions)
+            or (not recipe.instructions and not previous.ingredients)
+        ):
+            merged[-1] = _merge(previous, recipe)
+        else:
+            merged.append(recipe)
+    complete = [recipe for recipe in merged if recipe.instructions]
+    return complete or merged[:1]
+
+
+def _merge(first: RecipeBase, second: RecipeBase) -> RecipeBase:
+    fields = first.model_dump()
+    for field, value in second.model_dump().items():
+        if not fields[field]:
+            fields[field] = value
+    return RecipeBase.model_construct(**fields)
+
+
+def _name_key(name: str) -> str:
+    return _NAME_SEPARATORS.sub(" ", name.lower()).strip()
+
+
+class MultiRecipeExtractor:
+    """Extracts every recipe from pages that hold several, in parallel.
+
+    Sections are extracted with `extract`, which defaults to
+    `generate_recipe_from_text`, so each goes through the recipe region
+    reducer, the LLM cache, the near-duplicate index and the LLM
+    concurrency limit like any other extraction. At most `max_chunks`
+    sections are extracted, the highest-scoring ones.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = MULTI_RECIPE_ENABLED,
+        max_chunks: int = MULTI_RECIPE_MAX_CHUNKS,
+        extract: Callable[[str], Awaitable[RecipeBase]] = generate_recipe_from_text,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.enabled = enabled
+        self.max_chunks = max_chunks
+        self.extract = extract
+        self.pages = 0
+        self.chunks = 0
+        self.chunk_errors = 0
+        self.failed_pages = 0
+        self.recipes = 0
+        self.wall_seconds = 0.0
+        self.slowest_chunk_seconds = 0.0
+        if registry is not None:
+            registry.register("multi_recipe", self.metrics)
+
+    def split(self, text: str) -> list[str]:
+        """The recipe sections of `text` to extract separately.
+
+        Args:
+            text: Page text, as produced by `clean_html_text`, or pasted text.
+
+        Returns:
+            The recipe sections in page order, or an empty list if the
+            text should be extracted as one recipe: chunking is disabled
+            or fewer than `MIN_SECTIONS` sections look like recipes.
+        """
+        if not self.enabled:
+            return []
+        sections = [s for s in split_sections(text) if is_recipe_section(s)]
+        if len(sections) < MIN_SECTIONS:
+            return []
+        if len(sections) > self.max_chunks:
+            logger.info(
+                "Extracting %d of %d recipe sections", self.max_chunks, len(sections)
+            )
+            scores = {s: best_region(score_lines(s.splitlines()))[0] for s in sections}
+            kept = set(
+                sorted(sections, key=scores.get, reverse=True)[: self.max_chunks]
+            )
+            sections = [s for s in sections if s in kept]
+        return sections
+
+    async def extract_chunks(self, chunks: list[str]) -> list[RecipeBase]:
+        """Extract `chunks` concurrently and merge the results.
+
+        Args:
+            chunks: Recipe sections, as returned by `split`.
+
+        Returns:
+            The distinct recipes, in page order (see `merge_recipes`).
+
+        Raises:
+            RuntimeError: If every chunk failed; the first failure is
+                chained. Failures of some chunks are logged and skipped.
+        """
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._timed_extract(chunk) for chunk in chunks), return_exceptions=True
+        )
+        recipes = []
+        errors = []
+        slowest = 0.0
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+                continue
+            recipe, seconds = result
+            recipes.append(recipe)
+            slowest = max(slowest, seconds)
+        self.pages += 1
+        self.chunks += len(chunks)
+        self.chunk_errors += len(errors)
+        for error in errors:
+            logger.warning("Extraction of a recipe section failed: %s", error)
+        if errors and not recipes:
+            self.failed_pages += 1
+            raise RuntimeError(
+                "Extraction failed for every recipe section."
+            ) from errors[0]
+        merged = merge_recipes(recipes)
+        self.recipes += len(merged)
+        wall_seconds = time.perf_counter() - started
+        self.wall_seconds += wall_seconds
+        self.slowest_chunk_seconds += slowest
+        logger.info(
+            "Extracted %d recipes from %d sections in %.2fs (slowest section %.2fs)",
+            len(merged),
+            len(chunks),
+            wall_seconds,
+            slowest,
+        )
+        return merged
+
+    async def _timed_extract(self, chunk: str) -> tuple[RecipeBase, float]:
+        started = time.perf_counter()
+        recipe = await self.extract(chunk)
+        return recipe, time.perf_counter() - started
+
+    def metrics(self) -> dict[str, Any]:
+        """Current counters, for the metrics registry."""
+        pages = self.pages - self.failed_pages
+        return {
+            "pages": self.pages,
+            "chunks": self.chunks,
+            "chunk_errors": self.chunk_errors,
+            "failed_pages": self.failed_pages,
+            "recipes": self.recipes,
+            "wall_seconds_avg": (round(self.wall_seconds / pages, 3) if pages else 0.0),
+            "slowest_chunk_seconds_avg": (
+                round(self.slowest_chunk_seconds / pages, 3) if pages else 0.0
+            ),
+        }
+
+
+multi_recipe_extractor = MultiRecipeExtractor()
@@ -0,0 +1,410 @@
+"""Reuse of recipe extractions for near-duplicate page text.
+
+Recipe pages are often syndicated, or fetched again with different ads and
+navigation, so their text differs slightly and the exact-hash LLM cache
+misses them. This module keeps a MinHash signature of the text each recipe
+was extracted from, indexed with locality-sensitive hashing (LSH), and
+returns the stored extraction when new text is at least `threshold` similar
+(estimated Jaccard similarity of word 5-shingles) to text extracted before
+with the same prompt template and has exactly the same numbers, so a page
+whose quantities differ is extracted afresh.
+
+Reuse is only allowed inside `allow_near_duplicate_reuse`, which callers
+enter for text fetched from a URL and not edited since: an edit the user
+made to the text must never be answered with an older extraction.
+
+Signatures use one-permutation hashing: each shingle is hashed once and
+kept as the minimum of one of `NUM_BINS` bins, and empty bins borrow from
+their next non-empty neighbour. This needs a single hash per shingle
+instead of one per permutation, which keeps pure-Python signatures cheap.
+The signatures and LSH buckets live in memory; signatures and extracted
+recipes are also stored in a table of the LLM cache database, so the index
+is reloaded after a restart.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from meal_planner.config import (
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    NEAR_DUPLICATE_ENABLED,
+    NEAR_DUPLICATE_MAX_ENTRIES,
+    NEAR_DUPLICATE_THRESHOLD,
+)
+from meal_planner.models import RecipeBase
+from meal_planner.services.llm_retry import LatencyTracker
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_WORDS = 5
+NUM_BINS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,/]\d+)*|[½⅓⅔¼¾⅛⅜⅝⅞]")
+_EMPTY_BIN = 2**64 - 1
+_MASK = 2**64 - 1
+# Added per bin skipped when densifying, so borrowed values stay distinct.
+_DENSIFY_OFFSET = 0x9E3779B97F4A7C15
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS near_duplicates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    template TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    recipe_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    numbers TEXT NOT NULL DEFAULT ''
+);
+"""
+
+_reuse_allowed: ContextVar[bool] = ContextVar(
+    "near_duplicate_reuse_allowed", default=False
+)
+
+
+@contextmanager
+def allow_near_duplicate_reuse(allowed: bool = True) -> Iterator[None]:
+    """Let `NearDuplicateIndex.find` return stored extractions in this context.
+
+    The setting is inherited by tasks started inside the block, such as a
+    speculative extraction or the sections of a multi-recipe page.
+
+    Args:
+        allowed: Whether reuse is allowed, e.g. whether the text being
+            extracted is unedited text fetched from a URL.
+    """
+    token = _reuse_allowed.set(allowed)
+    try:
+        yield
+    finally:
+        _reuse_allowed.reset(token)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[str]:
+    """Word n-grams of a text, ignoring case and punctuation.
+
+    Args:
+        text: Page text.
+        size: Words per shingle.
+
+    Returns:
+        The distinct shingles; a single shingle for texts shorter than
+        `size` words, and none for texts without words.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str, num_bins: int = NUM_BINS) -> array | None:
+    """One-permutation MinHash signature of a text's shingles.
+
+    Args:
+        text: Page text.
+        num_bins: Signature length.
+
+    Returns:
+        Array of `num_bins` unsigned 64-bit values, or None if the text has
+        no words.
+    """
+    bins = [_EMPTY_BIN] * num_bins
+    for shingle in shingles(text):
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        index, value = value % num_bins, value // num_bins
+        if value < bins[index]:
+            bins[index] = value
+    if all(value == _EMPTY_BIN for value in bins):
+        return None
+    # Densify: an empty bin takes the value of the next non-empty bin,
+    # offset by the distance, so that similar texts still agree on it.
+    filled = list(bins)
+    for i in range(num_bins):
+        if filled[i] != _EMPTY_BIN:
+            continue
+        distance = 1
+        while filled[(i + distance) % num_bins] == _EMPTY_BIN:
+            distance += 1
+        source = filled[(i + distance) % num_bins]
+        bins[i] = (source + distance * _DENSIFY_OFFSET) & _MASK
+    return array("Q", bins)
+
+
+def numbers_key(text: str) -> str:
+    """Hash of the numbers in a text, in order.
+
+    Args:
+        text: Page text.
+
+    Returns:
+        Hex digest identifying the sequence of quantities and other numbers.
+    """
+    numbers = " ".join(_NUMBER.findall(text))
+    return hashlib.blake2b(numbers.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def estimated_similarity(a: array, b: array) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / len(a)
+
+
+def _band_keys(signature: array) -> list[int]:
+    return [
+        hash(signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND].tobytes())
+        for band in range(BANDS)
+    ]
+
+
+class NearDuplicateIndex:
+    """LSH index from page-text signatures to the recipes extracted from them.
+
+    If the database cannot be opened, the index is disabled with a warning,
+    like the LLM cache. Methods block on the database; async callers run
+    them with `asyncio.to_thread`, and a lock serializes them.
+    """
+
+    def __init__(
+        self,
+        path: Path = LLM_CACHE_PATH,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        max_entries: int = NEAR_DUPLICATE_MAX_ENTRIES,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        enabled: bool = NEAR_DUPLICATE_ENABLED,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.lookups = 0
+        self.hits = 0
+        self.number_mismatches = 0
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # Entry ID -> (template, created_at, signature, numbers), oldest first.
+        self._entries: OrderedDict[int, tuple[str, float, array, str]] = OrderedDict()
+        # Per band: hash of the band's rows -> IDs of the entries sharing it.
+        # Lists, since most buckets hold a single entry.
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(BANDS)]
+        self.latencies = LatencyTracker()
+        if registry is not None:
+            registry.register("near_duplicates", self.metrics)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, text: str, template: str) -> RecipeBase | None:
+        """Look up the extraction of a near-duplicate of `text`.
+
+        Args:
+            text: Page text about to be extracted.
+            template: Name of the extraction prompt template that would be
+                used; only extractions made with the same template match.
+
+        Returns:
+            The recipe extracted from the most similar indexed text, if it
+            is at least `threshold` similar and has the same numbers as
+            `text`, otherwise None. Always None outside
+            `allow_near_duplicate_reuse`.
+        """
+        if not self.enabled or not _reuse_allowed.get():
+            return None
+        started = time.perf_counter()
+        try:
+            with self._lock:
+                return self._find(text, template)
+        finally:
+            self.latencies.record(time.perf_counter() - started)
+
+    def add(self, text: str, template: str, recipe: RecipeBase) -> None:
+        """Index the recipe extracted from `text`.
+
+        Args:
+            text: Page text the recipe was extracted from.
+            template: Name of the extraction prompt template used.
+            recipe: The extracted recipe.
+        """
+        signature = minhash_signature(text)
+        if signature is None:
+            return
+        numbers = numbers_key(text)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            now = time.time()
+            cursor = conn.execute(
+                "INSERT INTO near_duplicates "
+                "(template, signature, recipe_json, created_at, numbers) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (template, signature.tobytes(), recipe.model_dump_json(), now, numbers),
+            )
+            self._index(cursor.lastrowid, template, now, signature, numbers)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(next(iter(self._entries)))
+                self._unindex(evicted[-1])
+            if evicted:
+                conn.executemany(
+                    "DELETE FROM near_duplicates WHERE id = ?", [(i,) for i in evicted]
+                )
+            conn.commit()
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the in-memory signatures and buckets."""
+        total = sys.getsizeof(self._entries)
+        for _, _, signature, _ in self._entries.values():
+            total += sys.getsizeof(signature)
+        for buckets in self._buckets:
+            total += sys.getsizeof(buckets)
+            total += sum(sys.getsizeof(ids) for ids in buckets.values())
+        return total
+
+    def metrics(self) -> dict[str, Any]:
+        """Index size, hit rate and lookup latency, for the metrics registry."""
+        p50 = self.latencies.quantile(0.5)
+        p95 = self.latencies.quantile(0.95)
+        with self._lock:
+            enabled = self.enabled and self._connect() is not None
+            entries, memory_bytes = len(self._entries), self.memory_bytes()
+        return {
+            "enabled": enabled,
+            "entries": entries,
+            "memory_bytes": memory_bytes,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "number_mismatches": self.number_mismatches,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "lookup_p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+            "lookup_p95_ms": round(p95 * 1000, 3) if p95 is not None else None,
+        }
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _find(self, text: str, template: str) -> RecipeBase | None:
+        conn = self._connect()
+        signature = minhash_signature(text)
+        if conn is None or signature is None:
+            return None
+        self.lookups += 1
+        candidates: set[int] = set()
+        for buckets, key in zip(self._buckets, _band_keys(signature), strict=True):
+            candidates.update(buckets.get(key, ()))
+        expired_before = time.time() - self.ttl_seconds
+        numbers = numbers_key(text)
+        best_id, best_similarity = None, self.threshold
+        mismatched = False
+        for entry_id in candidates:
+            entry_template, created_at, entry_signature, entry_numbers = self._entries[
+                entry_id
+            ]
+            if entry_template != template or created_at < expired_before:
+                continue
+            similarity = estimated_similarity(signature, entry_signature)
+            if similarity < best_similarity:
+                continue
+            if entry_numbers != numbers:
+                mismatched = True
+                continue
+            best_id, best_similarity = entry_id, similarity
+        if best_id is None:
+            if mismatched:
+                self.number_mismatches += 1
+                logger.info("Near-duplicate page has different numbers, not reusing")
+            return None
+        row = conn.execute(
+            "SELECT recipe_json FROM near_duplicates WHERE id = ?", (best_id,)
+        ).fetchone()
+        if row is None:
+            self._unindex(best_id)
+            return None
+        self.hits += 1
+        logger.info(
+            "Reusing extraction of a near-duplicate page (%.0f%% similar)",
+            best_similarity * 100,
+        )
+        return RecipeBase.model_validate_json(row[0])
+
+    def _index(
+        self,
+        entry_id: int,
+        template: str,
+        created_at: float,
+        signature: array,
+        numbers: str,
+    ) -> None:
+        self._entries[entry_id] = (template, created_at, signature, numbers)
+        for buckets, key in zip(self._buckets, _band_keys(signature), strict=True):
+            buckets.setdefault(key, []).append(entry_id)
+
+    def _unindex(self, entry_id: int) -> None:
+        _, _, signature, _ = self._entries.pop(entry_id)
+        for buckets, key in zip(self._buckets, _band_keys(signature), strict=True):
+            ids = buckets[key]
+            ids.remove(entry_id)
+            if not ids:
+                del buckets[key]
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database and load the index on first use."""
+        if self._conn is None and self.enabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.executescript(_SCHEMA)
+                columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(near_duplicates)")
+                }
+                if "numbers" not in columns:
+                    # Entries from before numbers were stored never match.
+                    conn.execute(
+                        "ALTER TABLE near_duplicates "
+                        "ADD COLUMN numbers TEXT NOT NULL DEFAULT ''"
+                    )
+                conn.execute(
+                    "DELETE FROM near_duplicates WHERE created_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                )
+                conn.commit()
+                rows = conn.execute(
+                    "SELECT id, template, created_at, signature, numbers "
+                    "FROM near_duplicates ORDER BY id DESC LIMIT ?",
+                    (self.max_entries,),
+                ).fetchall()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(
+                    "Near-duplicate index unavailable at %s, disabling it: %s",
+                    self.path,
+                    e,
+                )
+                self.enabled = False
+                return None
+            for entry_id, template, created_at, blob, numbers in reversed(rows):
+                self._index(entry_id, template, created_at, array("Q", blob), numbers)
+            self._conn = conn
+        return self._conn
+
+
+near_duplicates = NearDuplicateIndex()
@@ -0,0 +1,207 @@
+"""In-memory registry of the LLM prompt templates under `prompt_templates/`.
+
+Templates live in one directory per category (e.g. `recipe_extraction/`),
+one file per version, with the file stem as the version name. The registry
+reads them all once and afterwards only re-stats the directory, at most once
+per `reload_check_seconds`, re-reading files whose mtime changed. This keeps
+template file reads off the request path while still picking up edited
+templates without a restart.
+"""
+
+import errno
+import hashlib
+import logging
+import re
+import string
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from meal_planner.config import PROMPT_DIR, PROMPT_RELOAD_CHECK_SECONDS
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_LEGACY_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+TEMPLATE_SUFFIX = ".txt"
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A loaded prompt template.
+
+    Attributes:
+        category: Directory the template belongs to, e.g. "recipe_extraction".
+        version: File stem identifying the template within its category.
+        path: File the template was loaded from.
+        template: Parsed template, rendered with `safe_substitute`.
+        content_hash: Hex SHA-256 of the template text.
+        mtime_ns: Modification time of `path` when it was loaded.
+    """
+
+    category: str
+    version: str
+    path: Path
+    template: string.Template
+    content_hash: str
+    mtime_ns: int
+
+    @property
+    def name(self) -> str:
+        """File name of the template."""
+        return self.path.name
+
+    def render(self, **values: str) -> str:
+        """Substitute `values` into the template.
+
+        Uses `string.Template.safe_substitute`, so placeholders without a
+        value and braces in the values are left untouched. Templates written
+        before the switch to `$` placeholders have none and use `{name}`
+        placeholders instead, which are substituted the same way.
+        """
+        if not self.template.get_identifiers():
+            return _LEGACY_PLACEHOLDER.sub(
+                lambda match: values.get(match[1], match[0]), self.template.template
+            )
+        return self.template.safe_substitute(**values)
+
+
+class PromptRegistry:
+    """Prompt templates indexed by category and version, reloaded on change.
+
+    The first lookup loads the templates if `load` has not been called yet.
+    """
+
+    def __init__(
+        self,
+        prompt_dir: Path = PROMPT_DIR,
+        reload_check_seconds: float = PROMPT_RELOAD_CHECK_SECONDS,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.prompt_dir = prompt_dir
+        self.reload_check_seconds = reload_check_seconds
+        self.reloads = 0
+        self._templates: dict[str, dict[str, PromptTemplate]] = {}
+        self._loaded = False
+        self._last_check = 0.0
+        if registry is not None:
+            registry.register("prompt_registry", self.metrics)
+
+    def load(self) -> None:
+        """Read every template under `prompt_dir`, replacing the current index."""
+        templates: dict[str, dict[str, PromptTemplate]] = {}
+        for path in self._template_paths():
+            template = _read_template(path)
+            templates.setdefault(template.category, {})[template.version] = template
+        self._templates = templates
+        self._loaded = True
+        self._last_check = time.monotonic()
+        logger.info(
+            "Loaded %d prompt templates from %s",
+            sum(len(versions) for versions in templates.values()),
+            self.prompt_dir,
+        )
+
+    def refresh(self) -> int:
+        """Re-read templates that were added, changed or removed since loading.
+
+        Returns:
+            Number of templates that were added, changed or removed.
+        """
+        if not self._loaded:
+            self.load()
+            return 0
+        previous = {
+            template.path: template
+            for versions in self._templates.values()
+            for template in versions.values()
+        }
+        templates: dict[str, dict[str, PromptTemplate]] = {}
+        changed = 0
+        for path in self._template_paths():
+            template = previous.pop(path, None)
+            if template is None or path.stat().st_mtime_ns != template.mtime_ns:
+                template = _read_template(path)
+                changed += 1
+                logger.info("Reloaded prompt template %s", path)
+            templates.setdefault(template.category, {})[template.version] = template
+        changed += len(previous)
+        self._templates = templates
+        self._last_check = time.monotonic()
+        self.reloads += changed
+        return changed
+
+    def get(self, category: str, version: str) -> PromptTemplate:
+        """Look up a template, reloading changed files if a check is due.
+
+        Args:
+            category: Template category, e.g. "recipe_extraction".
+            version: Template version (file stem). A trailing ".txt" is
+                ignored, so file names work too.
+
+        Returns:
+            The loaded template.
+
+        Raises:
+            FileNotFoundError: If there is no such template.
+        """
+        if not self._loaded:
+            self.load()
+        elif time.monotonic() - self._last_check >= self.reload_check_seconds:
+            self.refresh()
+        version = version.removesuffix(TEMPLATE_SUFFIX)
+        template = self._templates.get(category, {}).get(version)
+        if template is None:
+            path = self.prompt_dir / category / f"{version}{TEMPLATE_SUFFIX}"
+            raise FileNotFoundError(
+                errno.ENOENT, "Prompt template not found", str(path)
+            )
+        return template
+
+    def versions(self, category: str) -> list[str]:
+        """List the loaded versions of a category, oldest first.
+
+        Args:
+            category: Template category, e.g. "recipe_extraction".
+
+        Returns:
+            Version names sorted by name, which for the timestamped file
+            names used here is chronological.
+        """
+        if not self._loaded:
+            self.load()
+        return sorted(self._templates.get(category, {}))
+
+    def metrics(self) -> dict[str, Any]:
+        """Current counters, for the metrics registry."""
+        return {
+            "templates": {
+                category: {
+                    version: template.content_hash[:12]
+                    for version, template in sorted(versions.items())
+                }
+                for category, versions in sorted(self._templates.items())
+            },
+            "reloads": self.reloads,
+        }
+
+    def _template_paths(self) -> list[Path]:
+        return sorted(self.prompt_dir.glob(f"*/*{TEMPLATE_SUFFIX}"))
+
+
+def _read_template(path: Path) -> PromptTemplate:
+    mtime_ns = path.stat().st_mtime_ns
+    text = path.read_text(encoding="utf-8")
+    return PromptTemplate(
+        category=path.parent.name,
+        version=path.stem,
+        path=path,
+        template=string.Template(text),
+        content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        mtime_ns=mtime_ns,
+    )
+
+
+prompt_registry = PromptRegistry()
@@ -0,0 +1,89 @@
+"""In-process publish/subscribe channel for recipe change notifications."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+RecipeEventKind = Literal["created", "updated", "deleted"]
+
+
+@dataclass(frozen=True)
+class RecipeEvent:
+    """A change to a single recipe.
+
+    Attributes:
+        kind: What happened to the recipe ("created", "updated" or "deleted").
+        recipe_id: ID of the affected recipe.
+        name: Name of the recipe after the change (or before, for deletions).
+    """
+
+    kind: RecipeEventKind
+    recipe_id: str
+    name: str
+
+
+class RecipeEventBroker:
+    """Fan out recipe events to every open subscriber.
+
+    Each subscriber gets its own bounded queue so that a slow client cannot
+    block publishers. Events that do not fit in a full queue are dropped for
+    that subscriber only.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: set[asyncio.Queue[RecipeEvent]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of currently open subscriptions."""
+        return len(self._subscribers)
+
+    def publish(self, event: RecipeEvent) -> None:
+        """Deliver an event to all current subscribers without blocking.
+
+        Must be called from the event loop thread.
+
+        Args:
+            event: The recipe event to broadcast.
+        """
+        logger.debug(
+            "Publishing recipe event %s for %s to %d subscribers",
+            event.kind,
+            event.recipe_id,
+            len(self._subscribers),
+        )
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(
+                    "Dropping recipe event %s for %s: subscriber queue full",
+                    event.kind,
+                    event.recipe_id,
+                )
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[RecipeEvent]]:
+        """Open a subscription for the duration of the context.
+
+        Yields:
+            A queue that receives every event published while the context
+            is open.
+        """
+        queue: asyncio.Queue[RecipeEvent] = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+
+recipe_events = RecipeEventBroker()
@@ -0,0 +1,105 @@
+"""Apply LLM-proposed edits to a recipe instead of having it rewritten.
+
+In patch modification mode the LLM sees the recipe with every ingredient
+and instruction numbered (`indexed_markdown`) and answers with a
+`RecipePatch`: a new name or yield if those change, and replace, insert and
+delete operations on list indexes. A change to one ingredient then costs a
+few dozen completion tokens instead of the whole recipe. `apply_recipe_patch`
+applies the patch locally and rejects patches that do not fit the recipe,
+so the caller can fall back to a full rewrite.
+"""
+
+from pydantic import ValidationError
+
+from meal_planner.models import RecipeBase, RecipeEdit, RecipePatch
+
+SECTIONS = ("ingredients", "instructions")
+
+
+class RecipePatchError(ValueError):
+    """Raised when a patch cannot be applied to a recipe."""
+
+
+def indexed_markdown(recipe: RecipeBase) -> str:
+    """Markdown for a recipe with 0-based indexes on list items.
+
+    Args:
+        recipe: The recipe.
+
+    Returns:
+        `recipe.markdown` with each ingredient and instruction bullet
+        prefixed by its index in brackets, e.g. "- [0] 2 cups flour".
+    """
+    lines = []
+    section = None
+    index = 0
+    for line in recipe.markdown.splitlines():
+        if line.startswith("## "):
+            section = line
+            index = 0
+        elif section is not None and line.startswith("- "):
+            line = f"- [{index}] {line[2:]}"
+            index += 1
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def apply_recipe_patch(recipe: RecipeBase, patch: RecipePatch) -> RecipeBase:
+    """Apply a patch to a recipe.
+
+    Args:
+        recipe: The recipe the patch was made for.
+        patch: Changes to apply.
+
+    Returns:
+        A new, validated recipe with the changes applied.
+
+    Raises:
+        RecipePatchError: If an edit's index is out of range, an item is
+            edited twice, a replace or insert has no text, or the result is
+            not a valid recipe (e.g. all ingredients deleted).
+    """
+    edits: dict[str, list[RecipeEdit]] = {section: [] for section in SECTIONS}
+    for edit in patch.edits:
+        edits[edit.section].append(edit)
+    values = recipe.model_dump()
+    values["ingredients"] = _apply_edits(recipe.ingredients, edits["ingredients"])
+    values["instructions"] = _apply_edits(recipe.instructions, edits["instructions"])
+    for field in ("name", "makes_min", "makes_max", "makes_unit"):
+        value = getattr(patch, field)
+        if value is not None:
+            values[field] = value
+    try:
+        return RecipeBase.model_validate(values)
+    except (ValidationError, ValueError) as e:
+        raise RecipePatchError(f"Patched recipe is invalid: {e}") from e
+
+
+def _apply_edits(items: list[str], edits: list[RecipeEdit]) -> list[str]:
+    inserts: dict[int, list[str]] = {}
+    changes: dict[int, str | None] = {}
+    for edit in edits:
+        limit = len(items) if edit.op == "insert" else len(items) - 1
+        if edit.index > limit:
+            raise RecipePatchError(
+                f"{edit.op} at {edit.section}[{edit.index}] is out of range "
+                f"for {len(items)} items"
+            )
+        if edit.op != "delete" and not (edit.text or "").strip():
+            raise RecipePatchError(
+                f"{edit.op} at {edit.section}[{edit.index}] has no text"
+            )
+        if edit.op == "insert":
+            inserts.setdefault(edit.index, []).append(edit.text or "")
+            continue
+        if edit.index in changes:
+            raise RecipePatchError(f"{edit.section}[{edit.index}] is edited twice")
+        changes[edit.index] = edit.text if edit.op == "replace" else None
+    patched = []
+    for index in range(len(items) + 1):
+        patched.extend(inserts.get(index, []))
+        if index < len(items):
+            change = changes.get(index, items[index])
+            if change is not None:
+                patched.append(change)
+    return patched
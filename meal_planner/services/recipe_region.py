@@ -0,0 +1,297 @@
+"""Shrink page text to the region that holds the recipe before LLM extraction.
+
+Fetched pages are mostly navigation, comments, ads and related posts; the
+recipe itself is usually a short, dense run of ingredient lines and
+imperative steps under headings like "Ingredients" and "Directions". Each
+line is scored for how recipe-like it is, and the highest-scoring run of
+lines (a maximum-sum subarray, where unremarkable and repeated lines cost
+a little) is kept together with a margin of context on either side, the
+page's title and any yield or timing details found above it.
+The result is then capped at a token budget.
+"""
+
+import logging
+import re
+from typing import Any
+
+from meal_planner.config import (
+    RECIPE_REGION_ENABLED,
+    RECIPE_REGION_MARGIN_TOKENS,
+    RECIPE_REGION_MAX_TOKENS,
+)
+from meal_planner.services.llm_limiter import CHARS_PER_TOKEN, estimate_tokens
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+MIN_REDUCE_TOKENS = 500
+MIN_REGION_SCORE = 8.0
+MAX_HEADER_LINES = 8
+MAX_INGREDIENT_NAME_WORDS = 12
+MIN_REPEAT_WORDS = 4
+
+HEADING_SCORE = 6.0
+QUANTITY_UNIT_SCORE = 3.0
+QUANTITY_SCORE = 1.5
+IMPERATIVE_SCORE = 2.0
+IMPERATIVE_MIN_WORDS = 4
+OTHER_LINE_SCORE = -1.0
+
+_LIST_MARKER = re.compile(r"^(?:\s*(?:[*+\-•·]|\d+\\?[.)]|step\s*\d+:?)\s*)+", re.I)
+_EMPHASIS = re.compile(r"[*_]+")
+_HEADING = re.compile(
+    r"^\s*#*\s*(?:\*\*)?\s*(?:ingredients?|instructions?|directions?|method|"
+    r"steps|preparation|how to make it|step\s*\d+)\b[\s:*]*$",
+    re.IGNORECASE,
+)
+_FRACTION = "[½⅓⅔¼¾⅛⅜⅝⅞]"
+_NUMBER = rf"(?:\d+(?:\s+\d+/\d+|[.,/]\d+)?(?:\s*{_FRACTION})?|{_FRACTION})"
+_AMOUNT = rf"{_NUMBER}(?:\s*[-–]\s*{_NUMBER})?"
+_UNIT = (
+    r"(?:cups?|c\.|tablespoons?|tbsps?\.?|tbs\.?|teaspoons?|tsps?\.?|"
+    r"ounces?|oz\.?|pounds?|lbs?\.?|grams?|g|kg|kilograms?|ml|millilit(?:er|re)s?|"
+    r"l|lit(?:er|re)s?|pints?|quarts?|gallons?|cloves?|pinch(?:es)?|dash(?:es)?|"
+    r"cans?|packages?|sticks?|slices?|sprigs?|bunch(?:es)?|handfuls?|heads?|"
+    r"stalks?|pieces?|large|medium|small|whole)\b"
+)
+_BARE_AMOUNT = re.compile(rf"^{_AMOUNT}(?:\s*{_UNIT})?[\s.:]*$", re.IGNORECASE)
+_QUANTITY_UNIT = re.compile(rf"^{_AMOUNT}\s*{_UNIT}\.?\s*\S", re.IGNORECASE)
+_QUANTITY_START = re.compile(rf"^{_AMOUNT}\s+[a-zA-Z(]")
+_IMPERATIVE = re.compile(
+    r"^(?:add|arrange|bake|beat|blend|boil|bring|broil|brush|chill|chop|coat|"
+    r"combine|cook|cool|cover|crack|cut|dice|divide|drain|drizzle|fold|fry|"
+    r"garnish|grate|grease|grill|heat|knead|ladle|let|line|marinate|mash|melt|"
+    r"mince|mix|place|pour|preheat|puree|reduce|remove|repeat|return|roast|"
+    r"roll|rinse|saute|sauté|scatter|scoop|season|serve|set|shake|simmer|sift|"
+    r"slice|soak|spoon|spread|sprinkle|squeeze|stir|strain|taste|toast|top|"
+    r"toss|transfer|turn|wash|whisk|wrap)\b",
+    re.IGNORECASE,
+)
+_TITLE = re.compile(r"^#\s+\S")
+_DETAIL = re.compile(
+    r"^(?:yields?|serves|servings?|makes|prep time|cook time|total time)\b",
+    re.IGNORECASE,
+)
+
+
+def score_line(line: str) -> float:
+    """Score how much a line of page text looks like part of a recipe.
+
+    Args:
+        line: One line of html2text output.
+
+    Returns:
+        A positive score for section headings, ingredient-like lines
+        (a quantity, ideally with a unit, followed by an ingredient) and
+        imperative steps, 0 for blank lines and a small negative score for
+        anything else, including bare amounts such as "17 g".
+    """
+    stripped = line.strip()
+    if not stripped:
+        return 0.0
+    if _HEADING.match(stripped):
+        return HEADING_SCORE
+    content = _content(stripped)
+    if _BARE_AMOUNT.match(content):
+        return OTHER_LINE_SCORE
+    if _QUANTITY_UNIT.match(content):
+        return QUANTITY_UNIT_SCORE
+    if _IMPERATIVE.match(content) and len(content.split()) >= IMPERATIVE_MIN_WORDS:
+        return IMPERATIVE_SCORE
+    if _QUANTITY_START.match(content):
+        return QUANTITY_SCORE
+    return OTHER_LINE_SCORE
+
+
+def score_lines(lines: list[str]) -> list[float]:
+    """Score every line of a page with `score_line`, using its neighbours.
+
+    Many sites render an ingredient's amount and name as separate lines
+    ("1 cup" then "dried chickpeas"); such pairs are scored as one
+    ingredient line, carried by the amount line. Repeats of an earlier
+    positive line of `MIN_REPEAT_WORDS` or more words (schedules, sticky recipe cards,
+    repeated teasers) are page furniture and score as ordinary lines.
+
+    Args:
+        lines: Lines of html2text output.
+
+    Returns:
+        One score per line.
+    """
+    scores = [0.0] * len(lines)
+    seen: set[str] = set()
+    skip = -1
+    for i, line in enumerate(lines):
+        if i == skip or not line.strip():
+            continue
+        text = line
+        if _BARE_AMOUNT.match(_content(line.strip())):
+            j = next((j for j in range(i + 1, len(lines)) if lines[j].strip()), None)
+            name = _content(lines[j].strip()) if j is not None else ""
+            if (
+                not name
+                or _BARE_AMOUNT.match(name)
+                or len(name.split()) > MAX_INGREDIENT_NAME_WORDS
+            ):
+                scores[i] = OTHER_LINE_SCORE
+                continue
+            text = f"{_content(line.strip())} {name}"
+            skip = j
+        score = score_line(text)
+        key = " ".join(text.lower().split())
+        if score > 0 and len(key.split()) >= MIN_REPEAT_WORDS and key in seen:
+            score = OTHER_LINE_SCORE
+        seen.add(key)
+        scores[i] = score
+    return scores
+
+
+def best_region(scores: list[float]) -> tuple[float, int, int]:
+    """Find the run of lines with the highest total score.
+
+    Args:
+        scores: Line scores, as returned by `score_lines`.
+
+    Returns:
+        The run's total score and the indices of its first and last line.
+        If no line scores above 0, the score is 0 and the run is empty
+        (the last index is -1).
+    """
+    best_score, best_start, best_end = 0.0, 0, -1
+    score, start = 0.0, 0
+    for i, line_score in enumerate(scores):
+        if score <= 0:
+            score, start = 0.0, i
+        score += line_score
+        if score > best_score:
+            best_score, best_start, best_end = score, start, i
+    return best_score, best_start, best_end
+
+
+def _header_lines(lines: list[str]) -> list[str]:
+    """The first title line and any yield or timing details in `lines`.
+
+    Details are often split into a label and a value line ("Yields:" then
+    "20"); a label without digits is kept together with the next line.
+    """
+    header: list[str] = []
+    title_seen = False
+    for i, line in enumerate(lines):
+        content = _content(line.strip())
+        if _TITLE.match(line) and not title_seen:
+            title_seen = True
+            header.append(line.strip())
+        elif _DETAIL.match(content) and len(header) < MAX_HEADER_LINES:
+            header.append(content)
+            if not any(c.isdigit() for c in content):
+                value = next((v for v in lines[i + 1 : i + 3] if v.strip()), "")
+                header[-1] = f"{content} {_content(value.strip())}".strip()
+    return header
+
+
+def _content(line: str) -> str:
+    return _LIST_MARKER.sub("", _EMPHASIS.sub("", line)).strip()
+
+
+class RecipeRegionReducer:
+    """Reduces page text to its recipe region within a token budget.
+
+    Texts under `MIN_REDUCE_TOKENS` (e.g. a pasted recipe) are only
+    subject to the budget. If no region scores at least `MIN_REGION_SCORE`
+    the page is assumed not to contain an obvious recipe and is kept whole,
+    up to the budget, so the LLM can still try.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = RECIPE_REGION_MAX_TOKENS,
+        margin_tokens: int = RECIPE_REGION_MARGIN_TOKENS,
+        enabled: bool = RECIPE_REGION_ENABLED,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.max_tokens = max_tokens
+        self.margin_tokens = margin_tokens
+        self.enabled = enabled
+        self.texts = 0
+        self.reduced = 0
+        self.truncated = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        if registry is not None:
+            registry.register("recipe_region", self.metrics)
+
+    def reduce(self, text: str) -> str:
+        """Keep the part of `text` most likely to contain the recipe.
+
+        Args:
+            text: Page text, as produced by `clean_html_text`, or pasted text.
+
+        Returns:
+            The reduced text, or `text` unchanged if reduction is disabled.
+        """
+        if not self.enabled:
+            return text
+        self.texts += 1
+        tokens_in = estimate_tokens(text)
+        result = text
+        if tokens_in >= MIN_REDUCE_TOKENS:
+            region = self._find_region(text.splitlines())
+            if region is not None:
+                result = region
+                self.reduced += 1
+        result = self._truncate(result)
+        tokens_out = estimate_tokens(result)
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+        if tokens_out < tokens_in:
+            logger.info(
+                "Reduced recipe text from ~%d to ~%d tokens", tokens_in, tokens_out
+            )
+        return result
+
+    def metrics(self) -> dict[str, Any]:
+        """Current counters, for the metrics registry."""
+        return {
+            "texts": self.texts,
+            "reduced": self.reduced,
+            "truncated": self.truncated,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "token_reduction_ratio": (
+                round(1 - self.tokens_out / self.tokens_in, 3)
+                if self.tokens_in
+                else 0.0
+            ),
+        }
+
+    def _find_region(self, lines: list[str]) -> str | None:
+        best_score, best_start, best_end = best_region(score_lines(lines))
+        if best_score < MIN_REGION_SCORE:
+            return None
+
+        margin_chars = self.margin_tokens * CHARS_PER_TOKEN
+        start = best_start
+        budget = margin_chars
+        while start > 0 and budget > len(lines[start - 1]):
+            start -= 1
+            budget -= len(lines[start]) + 1
+        end = best_end
+        budget = margin_chars
+        while end < len(lines) - 1 and budget > len(lines[end + 1]):
+            end += 1
+            budget -= len(lines[end]) + 1
+
+        header = _header_lines(lines[:start])
+        kept = [*header, ""] if header else []
+        return "\n".join(kept + lines[start : end + 1]).strip()
+
+    def _truncate(self, text: str) -> str:
+        max_chars = self.max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        self.truncated += 1
+        cut = text.rfind("\n", 0, max_chars)
+        return text[: cut if cut > 0 else max_chars]
+
+
+recipe_region_reducer = RecipeRegionReducer()
@@ -0,0 +1,229 @@
+"""Scale a recipe to a new yield without a round trip to the LLM.
+
+The leading quantity of every ingredient ("2 cups flour", "1 1/2 tsp salt",
+"½ onion", "2-3 cloves garlic", "0.5 kg potatoes") is multiplied by the
+ratio of the new yield to the old one, in exact fractions, and written back
+in the ingredient's own style: decimals stay decimals, unicode fractions
+stay unicode and everything else becomes a whole number or a mixed number
+such as "1 1/2", keeping any thousands separators ("1,500 g"). Results are
+rounded to the nearest eighth or third below `WHOLE_NUMBER_THRESHOLD`, and
+to whole numbers above it. Quantities later
+in an ingredient, such as package sizes in "1 (14 oz) can tomatoes", sizes
+such as "2-inch piece ginger", and quantities mentioned in instructions are
+left alone.
+"""
+
+import re
+from fractions import Fraction
+
+from meal_planner.models import RecipeBase
+
+WHOLE_NUMBER_THRESHOLD = 10
+SMALLEST_QUANTITY = Fraction(1, 8)
+
+UNICODE_FRACTIONS = {
+    "½": Fraction(1, 2),
+    "⅓": Fraction(1, 3),
+    "⅔": Fraction(2, 3),
+    "¼": Fraction(1, 4),
+    "¾": Fraction(3, 4),
+    "⅕": Fraction(1, 5),
+    "⅖": Fraction(2, 5),
+    "⅗": Fraction(3, 5),
+    "⅘": Fraction(4, 5),
+    "⅙": Fraction(1, 6),
+    "⅚": Fraction(5, 6),
+    "⅛": Fraction(1, 8),
+    "⅜": Fraction(3, 8),
+    "⅝": Fraction(5, 8),
+    "⅞": Fraction(7, 8),
+}
+_UNICODE_BY_VALUE = {value: char for char, value in UNICODE_FRACTIONS.items()}
+_NICE_FRACTIONS = sorted(
+    {Fraction(n, 8) for n in range(9)} | {Fraction(n, 3) for n in range(4)}
+)
+
+_GLYPH = f"[{''.join(UNICODE_FRACTIONS)}]"
+NUMBER_PATTERN = (
+    rf"(?:\d{{1,3}}(?:,\d{{3}})+"  # 1,500
+    rf"|\d+\s+\d+\s*[/⁄]\s*\d+"  # 1 1/2
+    rf"|\d+\s*{_GLYPH}"  # 1½
+    rf"|\d+\s*[/⁄]\s*\d+"  # 1/2
+    rf"|\d+\.\d+"  # 1.5
+    rf"|\d+"  # 2
+    rf"|{_GLYPH})"  # ½
+)
+_QUANTITY = re.compile(
+    rf"^\s*(?P<low>{NUMBER_PATTERN})(?:(?P<sep>\s*(?:-|–|—|to)\s*)(?P<high>{NUMBER_PATTERN}))?"
+    r"(?![\d/⁄.]|,\d)"
+)
+
+
+class RecipeScalingError(ValueError):
+    """Raised when a recipe cannot be scaled."""
+
+
+def parse_number(text: str) -> Fraction:
+    """Parse one quantity written as an integer, decimal, fraction or mixed number.
+
+    Args:
+        text: e.g. "2", "1,500", "1.5", "3/4", "1 1/2", "1½" or "½".
+
+    Returns:
+        The exact value.
+
+    Raises:
+        ValueError: If `text` is not a number in one of these forms, or has
+            a zero denominator.
+    """
+    text = text.strip().replace("⁄", "/")
+    if re.fullmatch(r"\d{1,3}(?:,\d{3})+", text):
+        return Fraction(text.replace(",", ""))
+    whole = Fraction(0)
+    if text and text[-1] in UNICODE_FRACTIONS:
+        whole_text = text[:-1].strip()
+        return (Fraction(whole_text) if whole_text else whole) + UNICODE_FRACTIONS[
+            text[-1]
+        ]
+    parts = text.split()
+    if len(parts) == 2:
+        whole, text = Fraction(parts[0]), parts[1]
+    if "/" in text:
+        numerator, denominator = (part.strip() for part in text.split("/"))
+        if int(denominator) == 0:
+            raise ValueError(f"Zero denominator in {text!r}")
+        return whole + Fraction(int(numerator), int(denominator))
+    return whole + Fraction(text)
+
+
+def format_number(value: Fraction, style: str = "fraction") -> str:
+    """Write a quantity for display, rounded to a kitchen-friendly value.
+
+    Args:
+        value: The quantity.
+        style: "decimal" for up to two decimal places, "unicode" for mixed
+            numbers with unicode fraction characters where possible,
+            "grouped" for whole numbers with thousands separators like
+            "1,500" (and mixed numbers otherwise), or "fraction" for mixed
+            numbers like "1 1/2".
+
+    Returns:
+        The formatted quantity. Positive values never round to zero.
+    """
+    if style == "decimal":
+        rounded = round(float(value), 2) or float(SMALLEST_QUANTITY)
+        return f"{rounded:.2f}".rstrip("0").rstrip(".")
+    value = _round_quantity(value)
+    whole, fraction = divmod(value, 1)
+    if not fraction:
+        return f"{whole:,}" if style == "grouped" else str(whole)
+    if style == "unicode" and fraction in _UNICODE_BY_VALUE:
+        return f"{whole or ''}{_UNICODE_BY_VALUE[fraction]}"
+    fraction_text = f"{fraction.numerator}/{fraction.denominator}"
+    return f"{whole} {fraction_text}" if whole else fraction_text
+
+
+def _round_quantity(value: Fraction) -> Fraction:
+    if value <= 0:
+        return Fraction(0)
+    if value >= WHOLE_NUMBER_THRESHOLD:
+        return Fraction(round(value))
+    whole, fraction = divmod(value, 1)
+    nearest = min(_NICE_FRACTIONS, key=lambda nice: abs(nice - fraction))
+    return max(whole + nearest, SMALLEST_QUANTITY)
+
+
+def number_style(text: str) -> str:
+    """The notation a number is written in, as a `format_number` style."""
+    if any(char in UNICODE_FRACTIONS for char in text):
+        return "unicode"
+    if "," in text:
+        return "grouped"
+    if "." in text:
+        return "decimal"
+    return "fraction"
+
+
+def scale_ingredient(ingredient: str, factor: Fraction) -> str:
+    """Multiply the leading quantity of an ingredient by `factor`.
+
+    Args:
+        ingredient: Ingredient line, e.g. "1 1/2 cups flour".
+        factor: Scaling factor.
+
+    Returns:
+        The ingredient with its quantity (or both ends of a quantity range)
+        scaled, or unchanged if it does not start with a quantity or the
+        quantity is a size joined to its unit by a hyphen, as in
+        "2 1/2-inch piece ginger".
+    """
+    match = _QUANTITY.match(ingredient)
+    if match is None or ingredient[match.end() :].startswith(("-", "–")):
+        return ingredient
+    try:
+        low = parse_number(match["low"])
+        high = parse_number(match["high"]) if match["high"] else None
+    except ValueError:
+        return ingredient
+    quantity = format_number(low * factor, number_style(match["low"]))
+    if high is not None:
+        quantity += match["sep"] + format_number(
+            high * factor, number_style(match["high"])
+        )
+    leading = ingredient[: match.start("low")]
+    return f"{leading}{quantity}{ingredient[match.end() :]}"
+
+
+def scale_factor(makes_min: int | None, makes_max: int | None, target: int) -> Fraction:
+    """Ratio of a target yield to a recipe's current yield.
+
+    A yield range is represented by its midpoint.
+
+    Args:
+        makes_min: Current minimum yield.
+        makes_max: Current maximum yield.
+        target: Yield to scale to.
+
+    Returns:
+        The factor to multiply quantities by.
+
+    Raises:
+        RecipeScalingError: If the recipe has no yield or the target is not
+            positive.
+    """
+    if target < 1:
+        raise RecipeScalingError("Scale to a positive amount.")
+    known = [makes for makes in (makes_min, makes_max) if makes is not None]
+    if not known or min(known) < 1:
+        raise RecipeScalingError("Set how much the recipe makes before scaling it.")
+    return Fraction(target) / (Fraction(sum(known)) / len(known))
+
+
+def scale_recipe(recipe: RecipeBase, target: int) -> RecipeBase:
+    """Scale a recipe's ingredients and yield to make `target` instead.
+
+    Args:
+        recipe: Recipe with at least one of `makes_min` and `makes_max`.
+        target: Yield to scale to, in the recipe's `makes_unit`.
+
+    Returns:
+        A scaled copy. A single yield becomes `target`; a yield range is
+        scaled by the same factor as the ingredients, rounded to whole
+        numbers of at least 1.
+
+    Raises:
+        RecipeScalingError: If the recipe has no yield or the target is not
+            positive.
+    """
+    factor = scale_factor(recipe.makes_min, recipe.makes_max, target)
+    scaled = recipe.model_copy(deep=True)
+    scaled.ingredients = [scale_ingredient(ing, factor) for ing in recipe.ingredients]
+    if recipe.makes_min is None or recipe.makes_max is None:
+        known = "makes_min" if recipe.makes_min is not None else "makes_max"
+        setattr(scaled, known, target)
+    elif recipe.makes_min == recipe.makes_max:
+        scaled.makes_min = scaled.makes_max = target
+    else:
+        scaled.makes_min = max(1, round(recipe.makes_min * factor))
+        scaled.makes_max = max(scaled.makes_min, round(recipe.makes_max * factor))
+    return scaled
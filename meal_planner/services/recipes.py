@@ -0,0 +1,205 @@
+"""Recipe persistence shared by the REST API and the UI routers."""
+
+import logging
+from datetime import datetime, timezone
+
+from sqlmodel import Session, select
+
+from meal_planner.models import Recipe, RecipeBase
+from meal_planner.services.recipe_events import (
+    RecipeEvent,
+    RecipeEventBroker,
+    recipe_events,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeNotFoundError(LookupError):
+    """Raised when no recipe exists with the requested ID."""
+
+
+class RecipeStorageError(RuntimeError):
+    """Raised when the database fails to read or write recipes.
+
+    The message is safe to show to API clients; the underlying database
+    error is chained as the cause.
+    """
+
+
+class RecipeService:
+    """Create, read, update and delete recipes within a database session.
+
+    Successful writes publish a `RecipeEvent` so that open list views can
+    update themselves.
+    """
+
+    def __init__(self, session: Session, events: RecipeEventBroker = recipe_events):
+        self.session = session
+        self.events = events
+
+    def create(self, recipe_data: RecipeBase) -> Recipe:
+        """Persist a new recipe.
+
+        Args:
+            recipe_data: Recipe information to create.
+
+        Returns:
+            The created recipe with its database-assigned ID.
+
+        Raises:
+            RecipeStorageError: If the database operation fails.
+        """
+        recipe = Recipe.model_validate(recipe_data)
+
+        # Set timestamps for new recipes since SQLite doesn't auto-populate
+        # server defaults
+        now = datetime.now(timezone.utc)
+        recipe.created_at = now
+        recipe.updated_at = now
+
+        try:
+            self.session.add(recipe)
+            self.session.commit()
+            self.session.refresh(recipe)
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Database error inserting recipe: %s", e, exc_info=True)
+            raise RecipeStorageError("Database error creating recipe") from e
+
+        logger.info("Created recipe with ID: %s, Name: %s", recipe.id, recipe.name)
+        self.events.publish(RecipeEvent("created", recipe.id, recipe.name))
+        return recipe
+
+    def list_all(self) -> list[Recipe]:
+        """Fetch all recipes.
+
+        Returns:
+            Every recipe in the database, empty if there are none.
+
+        Raises:
+            RecipeStorageError: If the database query fails.
+        """
+        try:
+            return list(self.session.exec(select(Recipe)).all())
+        except Exception as e:
+            logger.error("Database error querying all recipes: %s", e, exc_info=True)
+            raise RecipeStorageError("Database error retrieving recipes") from e
+
+    def get(self, recipe_id: str) -> Recipe:
+        """Fetch a single recipe.
+
+        Args:
+            recipe_id: ID of the recipe to fetch.
+
+        Returns:
+            The requested recipe.
+
+        Raises:
+            RecipeNotFoundError: If the recipe does not exist.
+            RecipeStorageError: If the database query fails.
+        """
+        try:
+            recipe = self.session.exec(
+                select(Recipe).where(Recipe.id == recipe_id)
+            ).first()
+        except Exception as e:
+            logger.error(
+                "Database error fetching recipe ID %s: %s", recipe_id, e, exc_info=True
+            )
+            raise RecipeStorageError("Database error retrieving recipe") from e
+
+        if recipe is None:
+            logger.warning("Recipe with ID %s not found.", recipe_id)
+            raise RecipeNotFoundError(recipe_id)
+        return recipe
+
+    def update(self, recipe_id: str, recipe_data: RecipeBase) -> Recipe:
+        """Replace all fields of an existing recipe.
+
+        Args:
+            recipe_id: ID of the recipe to update.
+            recipe_data: New recipe data.
+
+        Returns:
+            The updated recipe with preserved created_at and a new updated_at.
+
+        Raises:
+            RecipeNotFoundError: If the recipe does not exist.
+            RecipeStorageError: If the database operation fails.
+        """
+        recipe = self._get_for_write(
+            recipe_id, "update", "Database error retrieving recipe"
+        )
+
+        recipe.name = recipe_data.name
+        recipe.ingredients = recipe_data.ingredients
+        recipe.instructions = recipe_data.instructions
+        recipe.makes_min = recipe_data.makes_min
+        recipe.makes_max = recipe_data.makes_max
+        recipe.makes_unit = recipe_data.makes_unit
+        recipe.updated_at = datetime.now(timezone.utc)
+
+        try:
+            self.session.add(recipe)
+            self.session.commit()
+            self.session.refresh(recipe)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(
+                "Database error updating recipe ID %s: %s", recipe_id, e, exc_info=True
+            )
+            raise RecipeStorageError("Database error updating recipe") from e
+
+        logger.info("Updated recipe with ID: %s, Name: %s", recipe.id, recipe.name)
+        self.events.publish(RecipeEvent("updated", recipe.id, recipe.name))
+        return recipe
+
+    def delete(self, recipe_id: str) -> None:
+        """Permanently remove a recipe.
+
+        Args:
+            recipe_id: ID of the recipe to delete.
+
+        Raises:
+            RecipeNotFoundError: If the recipe does not exist.
+            RecipeStorageError: If the database operation fails.
+        """
+        recipe = self._get_for_write(
+            recipe_id, "deletion", "Database error fetching recipe for deletion"
+        )
+        name = recipe.name
+
+        try:
+            self.session.delete(recipe)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(
+                "Database error deleting recipe ID %s: %s", recipe_id, e, exc_info=True
+            )
+            raise RecipeStorageError("Database error deleting recipe") from e
+
+        logger.info("Deleted recipe with ID: %s", recipe_id)
+        self.events.publish(RecipeEvent("deleted", recipe_id, name))
+
+    def _get_for_write(
+        self, recipe_id: str, operation: str, error_detail: str
+    ) -> Recipe:
+        """Load a recipe by primary key ahead of a write."""
+        try:
+            recipe = self.session.get(Recipe, recipe_id)
+        except Exception as e:
+            logger.error(
+                "Database error fetching recipe ID %s for %s: %s",
+                recipe_id,
+                operation,
+                e,
+                exc_info=True,
+            )
+            raise RecipeStorageError(error_detail) from e
+
+        if recipe is None:
+            logger.warning("Recipe with ID %s not found for %s.", recipe_id, operation)
+            raise RecipeNotFoundError(recipe_id)
+        return recipe
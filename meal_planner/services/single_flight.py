@@ -0,0 +1,88 @@
+"""Coalescing of concurrent identical reads into a single computation."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent callers with the same key.
+
+    The first caller for a key starts the computation; callers arriving
+    while it is still running wait for the same result (or exception)
+    instead of starting their own. Such callers get a result computed from
+    before they arrived, which may miss writes made in between. Once the
+    computation finishes the key is forgotten, so callers arriving after
+    that trigger a fresh one.
+
+    Every caller gets the same result object, so computations should return
+    detached data, such as `model_dump()` output, rather than objects tied
+    to the first caller's database session.
+
+    The computation runs as its own task, so a caller that is cancelled
+    (e.g. because its client disconnected) does not cancel it for the
+    others.
+    """
+
+    def __init__(self, name: str, registry: MetricsRegistry | None = metrics_registry):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        if registry is not None:
+            registry.register(f"single_flight.{name}", self.metrics)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `fn()`, sharing it with concurrent callers.
+
+        Args:
+            key: Identifies identical reads, e.g. a recipe ID.
+            fn: Zero-argument coroutine function performing the read. Only
+                called if no computation for `key` is in flight.
+
+        Returns:
+            The result of the shared computation.
+
+        Raises:
+            Exception: Whatever the shared computation raised.
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            logger.debug("Coalescing %s read for key %r", self.name, key)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled.
+            task.exception()
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """Fraction of calls served by another caller's computation."""
+        if not self.calls:
+            return 0.0
+        return (self.calls - self.executions) / self.calls
+
+    def metrics(self) -> dict[str, Any]:
+        """Current counters, for the metrics registry."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.calls - self.executions,
+            "coalescing_ratio": self.coalescing_ratio,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,169 @@
+"""Recipe extraction started before the user asks for it.
+
+When a URL is fetched, the user usually reads the fetched text for a while
+and then extracts it unchanged. Extraction of the fetched text is therefore
+started in the background as soon as the fetch succeeds, keyed by a hash of
+the text. When the user extracts, a pending extraction of the same text is
+awaited instead of starting a new LLM call, hiding most of its latency
+behind the user's think time. If the user edited the text first, the
+speculative extraction is cancelled.
+
+Two users fetching the same page share one speculative extraction, so one
+of them editing the text cancels it for both; the other then simply
+extracts as usual. Unclaimed extractions are cancelled after `ttl_seconds`,
+and at most `max_pending` are kept, oldest cancelled first.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+from meal_planner.config import (
+    SPECULATIVE_EXTRACTION_ENABLED,
+    SPECULATIVE_EXTRACTION_MAX_PENDING,
+    SPECULATIVE_EXTRACTION_TTL_SECONDS,
+)
+from meal_planner.services.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def text_key(text: str) -> str:
+    """Hash identifying a recipe text.
+
+    Line endings and surrounding whitespace are normalized first, because
+    browsers submit textarea content with CRLF line endings and may drop a
+    leading newline.
+
+    Args:
+        text: Recipe text.
+
+    Returns:
+        Hex SHA-256 of the normalized text.
+    """
+    normalized = "\n".join(text.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SpeculativeExtractions(Generic[T]):
+    """Background extractions of fetched texts, awaiting their first claim."""
+
+    def __init__(
+        self,
+        enabled: bool = SPECULATIVE_EXTRACTION_ENABLED,
+        ttl_seconds: float = SPECULATIVE_EXTRACTION_TTL_SECONDS,
+        max_pending: int = SPECULATIVE_EXTRACTION_MAX_PENDING,
+        registry: MetricsRegistry | None = metrics_registry,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_pending = max_pending
+        self.started = 0
+        self.hits = 0
+        self.cancelled = 0
+        self.expired = 0
+        self._pending: OrderedDict[str, tuple[float, asyncio.Task[T]]] = OrderedDict()
+        if registry is not None:
+            registry.register("speculative_extraction", self.metrics)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self, text: str, extract: Callable[[str], Awaitable[T]]) -> str | None:
+        """Start extracting `text` in the background.
+
+        Args:
+            text: Fetched recipe text.
+            extract: Coroutine function extracting a recipe from a text.
+
+        Returns:
+            The text's key, to send back with the extraction request, or
+            None if speculation is disabled. An extraction of the same text
+            that is already pending is reused.
+        """
+        if not self.enabled:
+            return None
+        self._expire()
+        key = text_key(text)
+        if key in self._pending:
+            return key
+        task = asyncio.ensure_future(extract(text))
+        task.add_done_callback(_retrieve_exception)
+        self._pending[key] = (time.monotonic(), task)
+        self.started += 1
+        while len(self._pending) > self.max_pending:
+            _, (_, oldest) = self._pending.popitem(last=False)
+            oldest.cancel()
+            self.expired += 1
+        logger.info("Started speculative extraction %s", key[:12])
+        return key
+
+    def discard_if_changed(self, key: str | None, text: str) -> None:
+        """Cancel the extraction under `key` if `text` is no longer its text.
+
+        Args:
+            key: Key returned by `start` for the text that was fetched, if
+                the extraction request carried one.
+            text: Text the user submitted for extraction.
+        """
+        if not key or key == text_key(text):
+            return
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            entry[1].cancel()
+            self.cancelled += 1
+            logger.info("Cancelled speculative extraction %s", key[:12])
+
+    def claim(self, text: str) -> asyncio.Task[T] | None:
+        """Take the pending extraction of `text`, if any.
+
+        Args:
+            text: Text the user submitted for extraction.
+
+        Returns:
+            The extraction task, which the caller should await, or None.
+        """
+        self._expire()
+        key = text_key(text)
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return None
+        self.hits += 1
+        logger.info("Using speculative extraction %s", key[:12])
+        return entry[1]
+
+    def metrics(self) -> dict[str, Any]:
+        """Speculation counters, for the metrics registry."""
+        return {
+            "enabled": self.enabled,
+            "started": self.started,
+            "hits": self.hits,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "pending": len(self._pending),
+        }
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._pending:
+            key, (created, task) = next(iter(self._pending.items()))
+            if created > cutoff:
+                break
+            del self._pending[key]
+            task.cancel()
+            self.expired += 1
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Mark the exception as retrieved in case the extraction is never claimed.
+    if not task.cancelled():
+        task.exception()
+
+
+speculative_extractions: SpeculativeExtractions = SpeculativeExtractions()
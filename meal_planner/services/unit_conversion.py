@@ -0,0 +1,555 @@
+"""Convert a recipe between metric and US customary units without the LLM.
+
+"Convert to metric" and its reverse are among the most common modification
+requests, and they are mechanical: every measurement ("1 1/2 cups flour",
+"2-3 lb potatoes", "1 (14 oz) can tomatoes", "500 ml stock") in the
+ingredients and instructions is converted, and oven temperatures such as
+"350°F" are converted in both directions. Volumes of ingredients that are
+usually weighed in metric kitchens (flour, sugar, butter, ...) become grams
+using `DENSITY_GRAMS_PER_CUP`, and grams of them become cups the other way.
+Teaspoons and tablespoons are standard metric measures too, so they are
+left alone when converting to metric.
+
+Results are rounded the way a cook would write them: grams and millilitres
+to the nearest 1, 5 or 10 depending on size, cups and ounces to the nearest
+eighth or third, and oven temperatures to the nearest 10°C or 25°F. Where an
+ingredient already gives the target measurement in parentheses, as in
+"1 cup (240 ml) milk", that measurement is used instead of a conversion;
+other parenthesised equivalents, as in "1 cup (8 fl oz) cream", are dropped.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+
+from meal_planner.models import RecipeBase
+from meal_planner.services.recipe_scaling import (
+    NUMBER_PATTERN,
+    format_number,
+    parse_number,
+)
+
+SYSTEMS = ("metric", "us")
+
+ML_PER_CUP = Fraction("236.588")
+
+
+@dataclass(frozen=True)
+class Unit:
+    """A unit of measurement.
+
+    Attributes:
+        symbol: How the unit is written in converted recipes.
+        plural: Plural of `symbol`.
+        dimension: "volume" or "weight".
+        base: Size in millilitres (volume) or grams (weight).
+        system: "metric" or "us".
+    """
+
+    symbol: str
+    plural: str
+    dimension: str
+    base: Fraction
+    system: str
+
+    def name(self, amount: Fraction) -> str:
+        """`symbol` or `plural`, to agree with `amount` as it is printed."""
+        return self.symbol if amount <= 1 else self.plural
+
+
+TSP = Unit("tsp", "tsp", "volume", Fraction("4.92892"), "us")
+TBSP = Unit("tbsp", "tbsp", "volume", Fraction("14.7868"), "us")
+FL_OZ = Unit("fl oz", "fl oz", "volume", Fraction("29.5735"), "us")
+CUP = Unit("cup", "cups", "volume", ML_PER_CUP, "us")
+PINT = Unit("pint", "pints", "volume", Fraction("473.176"), "us")
+QUART = Unit("quart", "quarts", "volume", Fraction("946.353"), "us")
+GALLON = Unit("gallon", "gallons", "volume", Fraction("3785.41"), "us")
+OZ = Unit("oz", "oz", "weight", Fraction("28.3495"), "us")
+LB = Unit("lb", "lb", "weight", Fraction("453.592"), "us")
+STICK = Unit("stick", "sticks", "weight", Fraction("113.398"), "us")
+ML = Unit("ml", "ml", "volume", Fraction(1), "metric")
+DL = Unit("dl", "dl", "volume", Fraction(100), "metric")
+LITRE = Unit("l", "l", "volume", Fraction(1000), "metric")
+GRAM = Unit("g", "g", "weight", Fraction(1), "metric")
+KG = Unit("kg", "kg", "weight", Fraction(1000), "metric")
+
+UNIT_ALIASES = {
+    "teaspoons": TSP,
+    "teaspoon": TSP,
+    "tsps": TSP,
+    "tsp": TSP,
+    "tablespoons": TBSP,
+    "tablespoon": TBSP,
+    "tbsps": TBSP,
+    "tbsp": TBSP,
+    "tbs": TBSP,
+    "fluid ounces": FL_OZ,
+    "fluid ounce": FL_OZ,
+    "fl. oz": FL_OZ,
+    "fl oz": FL_OZ,
+    "cups": CUP,
+    "cup": CUP,
+    "pints": PINT,
+    "pint": PINT,
+    "pt": PINT,
+    "quarts": QUART,
+    "quart": QUART,
+    "qt": QUART,
+    "gallons": GALLON,
+    "gallon": GALLON,
+    "gal": GALLON,
+    "ounces": OZ,
+    "ounce": OZ,
+    "oz": OZ,
+    "pounds": LB,
+    "pound": LB,
+    "lbs": LB,
+    "lb": LB,
+    "sticks": STICK,
+    "stick": STICK,
+    "millilitres": ML,
+    "milliliters": ML,
+    "millilitre": ML,
+    "milliliter": ML,
+    "ml": ML,
+    "decilitres": DL,
+    "deciliters": DL,
+    "dl": DL,
+    "litres": LITRE,
+    "liters": LITRE,
+    "litre": LITRE,
+    "liter": LITRE,
+    "l": LITRE,
+    "kilograms": KG,
+    "kilogram": KG,
+    "kilos": KG,
+    "kilo": KG,
+    "kg": KG,
+    "grams": GRAM,
+    "gram": GRAM,
+    "g": GRAM,
+}
+
+# Grams per US cup of ingredients that metric recipes weigh rather than
+# measure by volume. Liquids such as milk and stock are not listed: they
+# stay volumes.
+DENSITY_GRAMS_PER_CUP = {
+    "flour": 125,
+    "all-purpose flour": 125,
+    "plain flour": 125,
+    "bread flour": 130,
+    "cake flour": 115,
+    "self-raising flour": 125,
+    "self-rising flour": 125,
+    "whole wheat flour": 120,
+    "almond flour": 96,
+    "sugar": 200,
+    "granulated sugar": 200,
+    "caster sugar": 200,
+    "brown sugar": 220,
+    "powdered sugar": 120,
+    "icing sugar": 120,
+    "confectioners' sugar": 120,
+    "butter": 227,
+    "shortening": 190,
+    "peanut butter": 258,
+    "honey": 340,
+    "maple syrup": 315,
+    "molasses": 340,
+    "cocoa": 85,
+    "cocoa powder": 85,
+    "oats": 90,
+    "rolled oats": 90,
+    "rice": 185,
+    "quinoa": 170,
+    "lentils": 190,
+    "cornmeal": 150,
+    "cornstarch": 128,
+    "breadcrumbs": 110,
+    "panko": 60,
+    "chocolate chips": 170,
+    "raisins": 150,
+    "walnuts": 120,
+    "pecans": 110,
+    "almonds": 140,
+    "shredded coconut": 85,
+    "grated parmesan": 100,
+    "parmesan": 100,
+    "shredded cheese": 113,
+}
+
+_UNIT = "|".join(
+    re.escape(alias) for alias in sorted(UNIT_ALIASES, key=len, reverse=True)
+)
+_SEPARATOR = r"\s*(?:-|–|—|to)\s*"
+
+
+def _measure(prefix: str) -> str:
+    return (
+        rf"(?<![\w/.⁄])(?P<{prefix}low>{NUMBER_PATTERN})"
+        rf"(?:(?P<{prefix}sep>{_SEPARATOR})(?P<{prefix}high>{NUMBER_PATTERN}))?"
+        rf"(?:\s*-\s*|\s*)(?P<{prefix}unit>{_UNIT})\.?(?![\w/])"
+    )
+
+
+_MEASURE = re.compile(
+    rf"{_measure('')}(?P<alt>\s*\(\s*{_measure('alt_')}\s*\))?", re.IGNORECASE
+)
+# Two adjacent measures that make up one amount, as in "1 lb 4 oz" or
+# "1 cup plus 2 tbsp".
+_COMPOUND_MEASURE = re.compile(
+    rf"(?<![\w/.⁄])(?P<first>{NUMBER_PATTERN})\s*(?P<first_unit>{_UNIT})\.?"
+    rf"\s+(?:plus\s+)?(?P<second>{NUMBER_PATTERN})\s*(?P<second_unit>{_UNIT})\.?"
+    r"(?![\w/])",
+    re.IGNORECASE,
+)
+# Where the ingredient a measure applies to ends: at punctuation, a
+# conjunction or the next number, as in "1 cup milk with 2 cups flour".
+_INGREDIENT_END = re.compile(r"[,;.()]|\b(?:and|with|or)\b|\d", re.IGNORECASE)
+_DEGREES = r"(?:\s*(?:°|º|degrees?)\s*)"
+_TEMPERATURE = (
+    r"(?<![\w.])(?P<{p}value>\d{{2,3}})"
+    rf"(?:{_DEGREES}(?P<{{p}}scale>[FC])(?:ahrenheit|elsius)?"
+    r"|\s?(?P<{p}bare>[FC]))(?![\w])"
+)
+_TEMPERATURE_RE = re.compile(
+    _TEMPERATURE.format(p="")
+    + rf"(?P<alt>\s*\(\s*{_TEMPERATURE.format(p='alt_')}\s*\))?",
+    re.IGNORECASE,
+)
+_DENSITY_NAMES = re.compile(
+    r"\b(?:"
+    + "|".join(
+        re.escape(name) for name in sorted(DENSITY_GRAMS_PER_CUP, key=len, reverse=True)
+    )
+    + r")\b",
+    re.IGNORECASE,
+)
+
+_REQUEST_FILLER = frozenset(
+    [
+        "a",
+        "all",
+        "and",
+        "amounts",
+        "any",
+        "as",
+        "can",
+        "change",
+        "convert",
+        "could",
+        "do",
+        "everything",
+        "for",
+        "from",
+        "i",
+        "in",
+        "ingredients",
+        "instead",
+        "into",
+        "it",
+        "its",
+        "kindly",
+        "make",
+        "measurement",
+        "measurements",
+        "measures",
+        "me",
+        "my",
+        "of",
+        "oven",
+        "please",
+        "put",
+        "quantities",
+        "recipe",
+        "rewrite",
+        "show",
+        "switch",
+        "system",
+        "temperature",
+        "temperatures",
+        "that",
+        "the",
+        "these",
+        "this",
+        "to",
+        "translate",
+        "unit",
+        "units",
+        "using",
+        "use",
+        "want",
+        "with",
+        "would",
+        "you",
+    ]
+)
+_REQUEST_VOCABULARY = {
+    "metric": frozenset(
+        [
+            "metric",
+            "si",
+            "gram",
+            "grams",
+            "g",
+            "kilogram",
+            "kilograms",
+            "kg",
+            "millilitre",
+            "millilitres",
+            "milliliter",
+            "milliliters",
+            "ml",
+            "litre",
+            "litres",
+            "liter",
+            "liters",
+            "celsius",
+            "centigrade",
+        ]
+    ),
+    "us": frozenset(
+        [
+            "us",
+            "usa",
+            "american",
+            "imperial",
+            "customary",
+            "standard",
+            "cup",
+            "cups",
+            "ounce",
+            "ounces",
+            "oz",
+            "pound",
+            "pounds",
+            "lb",
+            "lbs",
+            "fahrenheit",
+        ]
+    ),
+}
+
+
+def detect_conversion_request(prompt: str) -> str | None:
+    """Recognise a modification request that only asks for a unit conversion.
+
+    Requests such as "Convert to metric", "use grams please" or "US units"
+    qualify; requests that ask for anything else as well, like "make it
+    vegan and metric", do not and go to the LLM.
+
+    Args:
+        prompt: The user's modification request.
+
+    Returns:
+        "metric" or "us" for a pure conversion request, otherwise None.
+    """
+    words = re.findall(r"[a-z]+", prompt.lower().replace("u.s.", "us"))
+    systems = set()
+    for word in words:
+        matched = [
+            system
+            for system, vocabulary in _REQUEST_VOCABULARY.items()
+            if word in vocabulary
+        ]
+        if matched:
+            systems.update(matched)
+        elif word not in _REQUEST_FILLER:
+            return None
+    return systems.pop() if len(systems) == 1 else None
+
+
+def convert_recipe(recipe: RecipeBase, system: str) -> RecipeBase:
+    """Convert a recipe's measurements and temperatures to `system`.
+
+    Args:
+        recipe: Recipe to convert.
+        system: "metric" or "us".
+
+    Returns:
+        A converted copy. The name and yield are unchanged, as are lines
+        without anything to convert.
+
+    Raises:
+        ValueError: If `system` is not one of `SYSTEMS`.
+    """
+    if system not in SYSTEMS:
+        raise ValueError(
+            f"Unknown unit system {system!r}; expected one of {', '.join(SYSTEMS)}"
+        )
+    converted = recipe.model_copy(deep=True)
+    converted.ingredients = [convert_text(line, system) for line in recipe.ingredients]
+    converted.instructions = [
+        convert_text(line, system) for line in recipe.instructions
+    ]
+    return converted
+
+
+def convert_text(text: str, system: str) -> str:
+    """Convert every measurement and temperature in `text` to `system`.
+
+    Adjacent measures of the same dimension, as in "1 lb 4 oz", are added
+    up and converted as one amount.
+
+    Args:
+        text: An ingredient or instruction.
+        system: "metric" or "us".
+
+    Returns:
+        The text with its measurements converted.
+    """
+    text = _COMPOUND_MEASURE.sub(lambda match: _convert_compound(match, system), text)
+    text = _MEASURE.sub(lambda match: _convert_measure(match, system), text)
+    return _TEMPERATURE_RE.sub(lambda match: _convert_temperature(match, system), text)
+
+
+def _convert_measure(match: re.Match[str], system: str) -> str:
+    unit = UNIT_ALIASES[match["unit"].lower()]
+    try:
+        amounts = [parse_number(match["low"]), *_high(match, "")]
+        if match["alt"]:
+            alt_unit = UNIT_ALIASES[match["alt_unit"].lower()]
+            if alt_unit.system == system and unit.system != system:
+                alt_amounts = [parse_number(match["alt_low"]), *_high(match, "alt_")]
+                return _format_measure(alt_amounts, match["alt_sep"], alt_unit)
+    except ValueError:
+        return match[0]
+    if unit.system == system or (system == "metric" and unit in (TSP, TBSP)):
+        return match[0]
+    text = _convert_amounts(
+        amounts, match["sep"], unit, match.string[match.end() :], system
+    )
+    return match[0] if text is None else text
+
+
+def _convert_compound(match: re.Match[str], system: str) -> str:
+    first_unit = UNIT_ALIASES[match["first_unit"].lower()]
+    second_unit = UNIT_ALIASES[match["second_unit"].lower()]
+    if (
+        first_unit.dimension != second_unit.dimension
+        or first_unit.system != second_unit.system
+        or first_unit.base <= second_unit.base
+        or first_unit.system == system
+    ):
+        return match[0]
+    try:
+        amount = (
+            parse_number(match["first"])
+            + parse_number(match["second"]) * second_unit.base / first_unit.base
+        )
+    except ValueError:
+        return match[0]
+    text = _convert_amounts(
+        [amount], None, first_unit, match.string[match.end() :], system
+    )
+    return match[0] if text is None else text
+
+
+def _convert_amounts(
+    amounts: list[Fraction],
+    separator: str | None,
+    unit: Unit,
+    rest: str,
+    system: str,
+) -> str | None:
+    """Write `amounts` of `unit`, followed by `rest`, in `system`.
+
+    Returns None if there is no sensible equivalent (see `_format_us`).
+    """
+    density = _density(rest)
+    converted = [amount * unit.base for amount in amounts]
+    if system == "metric":
+        target = GRAM if unit.dimension == "weight" else ML
+        if target is ML and unit is not FL_OZ and density is not None:
+            converted = [ml / ML_PER_CUP * density for ml in converted]
+            target = GRAM
+        return _format_metric(converted, separator, target)
+    return _format_us(converted, separator, unit, density)
+
+
+def _high(match: re.Match[str], prefix: str) -> list[Fraction]:
+    high = match[f"{prefix}high"]
+    return [parse_number(high)] if high else []
+
+
+def _density(rest: str) -> Fraction | None:
+    """Grams per cup of the ingredient named at the start of `rest`.
+
+    Only the words up to the next number, conjunction or punctuation are
+    read, so in "1 cup milk with 2 cups flour" the first measure is milk's.
+    """
+    ingredient = _INGREDIENT_END.split(rest, maxsplit=1)[0]
+    names = [name.lower() for name in _DENSITY_NAMES.findall(ingredient)]
+    if not names:
+        return None
+    return Fraction(DENSITY_GRAMS_PER_CUP[max(names, key=len)])
+
+
+def _format_measure(amounts: list[Fraction], separator: str | None, unit: Unit) -> str:
+    numbers = [format_number(amount) for amount in amounts]
+    return f"{(separator or '').join(numbers)} {unit.name(parse_number(numbers[-1]))}"
+
+
+def _format_metric(amounts: list[Fraction], separator: str | None, unit: Unit) -> str:
+    """Write grams or millilitres, switching to kg or l from 1000 up."""
+    large = KG if unit is GRAM else LITRE
+    if amounts[-1] >= 1000:
+        numbers = [f"{round(float(a) / 1000, 2):g}" for a in amounts]
+        unit = large
+    else:
+        numbers = [str(_round_metric(a)) for a in amounts]
+    return f"{(separator or '').join(numbers)} {unit.symbol}"
+
+
+def _round_metric(amount: Fraction) -> int:
+    step = 1 if amount < 10 else 5 if amount < 250 else 10
+    return max(1, int(amount / step + Fraction(1, 2)) * step)
+
+
+def _format_us(
+    amounts: list[Fraction],
+    separator: str | None,
+    unit: Unit,
+    density: Fraction | None,
+) -> str | None:
+    """Write metric amounts in the US unit a cook would use for them.
+
+    Returns None for weights of a few grams of an ingredient without a known
+    density, such as "3 g salt", which have no sensible US equivalent.
+    """
+    if unit.dimension == "weight" and density is not None:
+        amounts = [grams / density * ML_PER_CUP for grams in amounts]
+    elif unit.dimension == "weight":
+        if amounts[-1] < OZ.base / 2:
+            return None
+        target = OZ if amounts[-1] < LB.base else LB
+        return _format_measure([a / target.base for a in amounts], separator, target)
+    if amounts[-1] >= CUP.base / 4:
+        target = CUP
+    elif amounts[-1] >= TBSP.base:
+        target = TBSP
+    else:
+        target = TSP
+    return _format_measure([a / target.base for a in amounts], separator, target)
+
+
+def _convert_temperature(match: re.Match[str], system: str) -> str:
+    scale = (match["scale"] or match["bare"]).upper()
+    target = "C" if system == "metric" else "F"
+    if match["alt"]:
+        alt_scale = (match["alt_scale"] or match["alt_bare"]).upper()
+        if alt_scale == target and scale != target:
+            return f"{match['alt_value']}°{target}"
+    value = int(match["value"])
+    if scale == target or (match["bare"] and value < 100):
+        return match[0]
+    if target == "C":
+        converted = _round_to((value - 32) * 5 / 9, 10 if value >= 200 else 5)
+    else:
+        converted = _round_to(value * 9 / 5 + 32, 25 if value >= 100 else 5)
+    return f"{converted}°{target}" + (match["alt"] or "")
+
+
+def _round_to(value: float, step: int) -> int:
+    return math.floor(value / step + 0.5) * step
@@ -1,10 +1,15 @@
 """Common UI components and constants used across the Meal Planner application."""
 
+from fasthtml.common import *
 from monsterui.all import *
 
+from meal_planner.config import JOB_POLL_SECONDS
+
 CSS_ERROR_CLASS = str(TextT.error)
 CSS_SUCCESS_CLASS = str(TextT.success)
 
+JOBS_URL = "/recipes/jobs"
+
 ICON_DELETE = UkIcon("minus-circle", cls=CSS_ERROR_CLASS)
 ICON_ADD = UkIcon("plus-circle", cls=str(TextT.primary))
 DRAG_HANDLE_ICON = UkIcon(
@@ -25,3 +30,30 @@ def create_loading_indicator(indicator_id: str) -> Loading:
         Loading component with HTMX indicator class and styling.
     """
     return Loading(id=indicator_id, cls="htmx-indicator ml-2")
+
+
+def build_job_poller(job_id: str, target: str) -> FT:
+    """Create a placeholder that polls a background job until it finishes.
+
+    The job status endpoint answers 204 No Content while the job is pending
+    or running, which htmx ignores, and the job's rendered result once it
+    has finished, which is swapped over `target`.
+
+    Args:
+        job_id: ID of the submitted job.
+        target: CSS selector of the element the result replaces, or "this"
+            to replace the placeholder itself.
+
+    Returns:
+        Div with htmx polling attributes and a loading spinner.
+    """
+    return Div(
+        Loading(cls="mr-2"),
+        Span("Working on it…", cls=str(TextT.muted)),
+        id=f"job-{job_id}",
+        hx_get=f"{JOBS_URL}/{job_id}",
+        hx_trigger=f"every {JOB_POLL_SECONDS:g}s",
+        hx_target=target,
+        hx_swap="outerHTML",
+        cls="flex items-center mt-2",
+    )
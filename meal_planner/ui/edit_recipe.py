@@ -367,7 +367,8 @@ def build_makes_section(
     """Build the 'makes' section with min, max, and unit inputs.
 
     Handles creation of form fields for specifying recipe yield, including
-    automatic adjustment logic via HTMX to ensure min <= max.
+    automatic adjustment logic via HTMX to ensure min <= max, and a control
+    that scales the ingredients to a new yield locally, without the LLM.
 
     Args:
         makes_min: Current minimum quantity.
@@ -440,6 +441,7 @@ def build_makes_section(
                 Div(makes_unit_input, style="flex: 1; margin-left: 0.75rem;"),
                 cls="flex gap-3 items-end mb-2",
             ),
+            _build_scale_control(),
         ]
     )
 
@@ -450,6 +452,26 @@ def build_makes_section(
     )
 
 
+def _build_scale_control():
+    """Builds the input and button that scale the recipe to a new yield."""
+    return Div(
+        Div(
+            FormLabel("Scale to", for_="scale_to"),
+            Input(id="scale_to", name="scale_to", type="number", min="1"),
+            style="width: 6rem;",
+        ),
+        Button(
+            "Scale Ingredients",
+            hx_post="/recipes/ui/scale",
+            hx_target="#makes-section",
+            hx_swap="outerHTML",
+            hx_include="closest form",
+            cls=ButtonT.secondary,
+        ),
+        cls="flex gap-3 items-end mb-2",
+    )
+
+
 def render_ingredient_list_items(ingredients: list[str]) -> list[FT]:
     """Render draggable ingredient input fields as FastHTML components.
 
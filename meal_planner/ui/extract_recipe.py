@@ -1,10 +1,20 @@
 """Recipe extraction form components for the Meal Planner application."""
 
+import json
+
 from fasthtml.common import *
 from monsterui.all import *
 
+from meal_planner.config import JOB_QUEUE_ENABLED
+from meal_planner.models import RecipeBase
 from meal_planner.ui.common import create_loading_indicator
 
+EXTRACT_RUN_URL = "/recipes/extract/run"
+EXTRACT_STREAM_URL = "/recipes/extract/stream"
+EXTRACT_PICK_URL = "/recipes/extract/pick"
+EXTRACTION_PARTIAL_EVENT = "partial"
+EXTRACTION_DONE_EVENT = "done"
+
 
 def create_extraction_form() -> Card:
     """Create the main recipe extraction form interface.
@@ -15,6 +25,8 @@ def create_extraction_form() -> Card:
 
     The form includes loading indicators, error message placeholders,
     and HTMX attributes for dynamic content updates without page refresh.
+    "Extract Recipe" streams the extraction, or submits it as a background
+    job when the job queue is enabled.
 
     Returns:
         Card component containing the complete extraction form with all
@@ -67,7 +79,7 @@ def create_extraction_form() -> Card:
     extract_button_group = Div(
         Button(
             "Extract Recipe",
-            hx_post="/recipes/extract/run",
+            hx_post=EXTRACT_RUN_URL if JOB_QUEUE_ENABLED else EXTRACT_STREAM_URL,
             hx_target="#recipe-results",
             hx_swap="innerHTML",
             hx_include="#recipe_text_container",
@@ -97,3 +109,114 @@ def create_extraction_form() -> Card:
         disclaimer,
         results_div,
     )
+
+
+def build_extraction_stream(stream_url: str) -> FT:
+    """Create the element that receives a streamed recipe extraction.
+
+    The element opens a Server-Sent Events connection to `stream_url` and
+    applies each message through out-of-band swaps. It closes the connection
+    once the done event has arrived, so the browser does not reconnect.
+
+    Args:
+        stream_url: URL of the extraction's event stream.
+
+    Returns:
+        Div with htmx SSE attributes and a loading indicator.
+    """
+    return Div(
+        id="extraction-stream",
+        hx_ext="sse",
+        sse_connect=stream_url,
+        sse_swap=f"{EXTRACTION_PARTIAL_EVENT},{EXTRACTION_DONE_EVENT}",
+        sse_close=EXTRACTION_DONE_EVENT,
+        hx_swap="none",
+    )
+
+
+def build_extraction_preview(recipe: RecipeBase) -> FT:
+    """Build a read-only preview of a recipe that is still being extracted.
+
+    Fields the LLM has not produced yet are None and are left out or shown
+    as placeholders; the last ingredient or instruction may be incomplete.
+
+    Args:
+        recipe: Partial recipe from the extraction stream.
+
+    Returns:
+        MonsterUI Card showing the name, ingredients and instructions so far.
+    """
+    return Card(
+        H3(recipe.name or "Extracting recipe..."),
+        H4("Ingredients"),
+        Ul(*[Li(ing) for ing in recipe.ingredients or []], cls=ListT.bullet),
+        H4("Instructions"),
+        Ul(*[Li(inst) for inst in recipe.instructions or []], cls=ListT.bullet),
+        Div(
+            Loading(cls="mr-2"),
+            Span("Extracting...", cls=TextT.muted),
+            cls="flex items-center mt-4",
+        ),
+        id="extraction-preview",
+        cls=CardT.secondary,
+    )
+
+
+def build_multi_extraction_progress(count: int) -> FT:
+    """Build the placeholder shown while a page's recipes are extracted.
+
+    Args:
+        count: Number of recipe sections being extracted.
+
+    Returns:
+        MonsterUI Card with a loading indicator.
+    """
+    return Card(
+        H3(f"Extracting {count} recipes..."),
+        Div(
+            Loading(cls="mr-2"),
+            Span("Each recipe on the page is extracted separately.", cls=TextT.muted),
+            cls="flex items-center mt-4",
+        ),
+        id="extraction-preview",
+        cls=CardT.secondary,
+    )
+
+
+def build_recipe_picker(recipes: list[RecipeBase], selected: int = 0) -> FT:
+    """Build the list of recipes found on a page, to pick one to edit.
+
+    The recipes are carried in a hidden field, so picking one posts them
+    all back to `EXTRACT_PICK_URL` with its index and the edit form can be
+    re-rendered with the picker above it, without extracting again.
+
+    Args:
+        recipes: Recipes extracted from the page, in page order.
+        selected: Index of the recipe currently in the edit form.
+
+    Returns:
+        MonsterUI Card with one button per recipe.
+    """
+    return Card(
+        H3(f"{len(recipes)} recipes found"),
+        P("Choose the recipe to edit and save.", cls=TextT.muted),
+        Hidden(
+            name="recipes",
+            value=json.dumps([recipe.model_dump() for recipe in recipes]),
+        ),
+        Div(
+            *[
+                Button(
+                    recipe.name,
+                    hx_post=EXTRACT_PICK_URL,
+                    hx_vals={"choice": i},
+                    hx_include="#recipe-picker [name='recipes']",
+                    hx_swap="none",
+                    cls=ButtonT.primary if i == selected else ButtonT.default,
+                )
+                for i, recipe in enumerate(recipes)
+            ],
+            cls="flex flex-wrap gap-2",
+        ),
+        id="recipe-picker",
+    )
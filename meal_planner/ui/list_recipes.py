@@ -3,8 +3,12 @@
 from fasthtml.common import *
 from monsterui.all import *
 
+from meal_planner.services.recipe_events import RecipeEvent
 from meal_planner.ui.common import ICON_DELETE
 
+RECIPE_EVENTS_URL = "/recipes/ui/events"
+RECIPE_EVENT_NAME = "recipe"
+
 
 def format_recipe_list(recipes_data: list[dict]) -> FT:
     """Format a list of recipes as an interactive HTML list.
@@ -19,31 +23,102 @@ def format_recipe_list(recipes_data: list[dict]) -> FT:
 
     Returns:
         MonsterUI List component containing all recipe items with actions,
-        or a message if the list is empty.
+        or a message followed by an empty list if there are no recipes, so
+        that pushed "created" events have a list to append to.
     """
     if not recipes_data:
-        return P("No recipes found.")
+        return Div(
+            P("No recipes found.", id="recipe-list-empty"),
+            Ul(id="recipe-list-ul"),
+        )
     return Ul(
         *[
-            Li(
-                A(
-                    recipe["name"],
-                    href=f"/recipes/{recipe['id']}",
-                    hx_target="#content",
-                    hx_push_url="true",
-                    cls="mr-2",
-                ),
-                Button(
-                    ICON_DELETE,
-                    title="Delete",
-                    hx_post=f"/recipes/delete?id={recipe['id']}",
-                    hx_confirm=f"Are you sure you want to delete {recipe['name']}?",
-                    cls=f"{ButtonT.sm} p-1",
-                ),
-                id=f"recipe-item-{recipe['id']}",
-                cls="flex items-center justify-start gap-x-2 mb-1",
-            )
+            build_recipe_list_item(recipe["id"], recipe["name"])
             for recipe in recipes_data
         ],
         id="recipe-list-ul",
     )
+
+
+def build_recipe_list_item(recipe_id: str, name: str, **kwargs) -> FT:
+    """Build a single entry of the recipe list.
+
+    Args:
+        recipe_id: ID of the recipe, used for the link, delete action and
+            element ID (`recipe-item-{recipe_id}`).
+        name: Recipe name to display.
+        **kwargs: Extra attributes for the list item, e.g. `hx_swap_oob`.
+
+    Returns:
+        Li component with a link to the recipe and a delete button.
+    """
+    return Li(
+        A(
+            name,
+            href=f"/recipes/{recipe_id}",
+            hx_target="#content",
+            hx_push_url="true",
+            cls="mr-2",
+        ),
+        Button(
+            ICON_DELETE,
+            title="Delete",
+            hx_post=f"/recipes/delete?id={recipe_id}",
+            hx_confirm=f"Are you sure you want to delete {name}?",
+            cls=f"{ButtonT.sm} p-1",
+        ),
+        id=f"recipe-item-{recipe_id}",
+        cls="flex items-center justify-start gap-x-2 mb-1",
+        **kwargs,
+    )
+
+
+def build_recipe_event_fragment(event: RecipeEvent) -> tuple[FT, ...]:
+    """Render a recipe event as out-of-band swaps for an open recipe list.
+
+    Only the affected `recipe-item-{id}` element is touched: created recipes
+    are appended to the list, updated ones replace their existing entry and
+    deleted ones are removed.
+
+    Args:
+        event: The recipe event to render.
+
+    Returns:
+        Tuple of components carrying `hx-swap-oob` attributes.
+    """
+    if event.kind == "created":
+        return (
+            Div(
+                build_recipe_list_item(event.recipe_id, event.name),
+                hx_swap_oob="beforeend:#recipe-list-ul",
+            ),
+            P(id="recipe-list-empty", hx_swap_oob="delete"),
+        )
+    if event.kind == "updated":
+        return (
+            build_recipe_list_item(event.recipe_id, event.name, hx_swap_oob="true"),
+        )
+    return (Li(id=f"recipe-item-{event.recipe_id}", hx_swap_oob="delete"),)
+
+
+def recipe_list_area(content: FT) -> FT:
+    """Wrap recipe list content in a container subscribed to recipe events.
+
+    The container opens a Server-Sent Events connection and applies each
+    pushed fragment through out-of-band swaps, so the list itself is never
+    re-fetched.
+
+    Args:
+        content: The recipe list (or an error message) to display.
+
+    Returns:
+        Div with the `recipe-list-area` ID and htmx SSE attributes.
+    """
+    return Div(
+        content,
+        id="recipe-list-area",
+        hx_ext="sse",
+        sse_connect=RECIPE_EVENTS_URL,
+        sse_swap=RECIPE_EVENT_NAME,
+        hx_swap="none",
+    )
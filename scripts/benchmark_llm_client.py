@@ -0,0 +1,92 @@
+# scripts/benchmark_llm_client.py
+"""Compare first-call LLM latency with a cold and a pre-connected client.
+
+Each round builds a fresh pooled LLM HTTP client, as after a cold start, and
+times one small chat completion: once straight away ("cold", paying for the
+TCP and TLS handshake) and once after `preconnect` ("warm"). It reports the
+median and p95 first-call latency per mode and the median pre-connect time.
+It uses the app's configured LLM endpoint unless --base-url is given; the
+handshake is what differs, so a remote HTTPS endpoint shows the gap best.
+
+Usage:
+    python scripts/benchmark_llm_client.py [--rounds N] [--base-url URL]
+        [--model MODEL]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--model", default=None)
+    return parser.parse_args()
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def first_call_seconds(warm: bool) -> tuple[float, float | None]:
+    """Latency of the first call on a new client, and its pre-connect time."""
+    # Imported here so the environment above is in place before config loads.
+    from openai import AsyncOpenAI
+
+    from meal_planner.config import LLM_BASE_URL, LLM_MODEL
+    from meal_planner.services.llm_client import LLMHTTPClient
+
+    http_client = LLMHTTPClient(registry=None)
+    if warm:
+        await http_client.preconnect()
+    client = AsyncOpenAI(
+        api_key=os.environ.get("MEAL_PLANNER_LLM_API_KEY")
+        or os.environ["GOOGLE_API_KEY"],
+        base_url=LLM_BASE_URL,
+        max_retries=0,
+        http_client=http_client.get(),
+    )
+    started = time.perf_counter()
+    await client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=[{"role": "user", "content": "Reply with OK."}],
+        max_tokens=5,
+    )
+    elapsed = time.perf_counter() - started
+    await http_client.close()
+    return elapsed, http_client.preconnect_seconds
+
+
+async def main(args: argparse.Namespace) -> None:
+    results: dict[str, list[float]] = {"cold": [], "warm": []}
+    preconnects = []
+    for _ in range(args.rounds):
+        for mode in results:
+            elapsed, preconnect = await first_call_seconds(warm=mode == "warm")
+            results[mode].append(elapsed)
+            if preconnect is not None:
+                preconnects.append(preconnect)
+    print(f"{'mode':6} {'calls':>5} {'p50':>8} {'p95':>8}")
+    for mode, latencies in results.items():
+        print(
+            f"{mode:6} {len(latencies):5} "
+            f"{statistics.median(latencies) * 1000:6.0f}ms "
+            f"{percentile(latencies, 0.95) * 1000:6.0f}ms"
+        )
+    if preconnects:
+        print(f"pre-connect p50: {statistics.median(preconnects) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.base_url:
+        os.environ["MEAL_PLANNER_LLM_BASE_URL"] = args.base_url
+        os.environ.setdefault("MEAL_PLANNER_LLM_API_KEY", "fake")
+    if args.model:
+        os.environ["MEAL_PLANNER_LLM_MODEL"] = args.model
+    asyncio.run(main(args))
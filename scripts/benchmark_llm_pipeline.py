@@ -0,0 +1,112 @@
+# scripts/benchmark_llm_pipeline.py
+"""Benchmark recipe extraction and modification against an LLM endpoint.
+
+Runs the app's extract and modify pipelines (region reduction, limiter,
+retries, telemetry) over the eval pages in tests/data/recipes with the
+given concurrency, then reports latency percentiles, throughput and the
+app's LLM metrics. The LLM cache is disabled so every request reaches the
+endpoint. By default it targets the local fake LLM server, so start that
+first:
+
+    python -m meal_planner.fake_llm --fixtures tests/data/recipes/processed \\
+        --port 8001 --rate-limit-rate 0.05
+
+Usage:
+    python scripts/benchmark_llm_pipeline.py [--requests N] [--concurrency N]
+        [--base-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / "tests/data/recipes/processed"
+MODIFICATION = "Make it vegetarian and halve the recipe."
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001/v1/")
+    parser.add_argument("--model", default="fake")
+    return parser.parse_args()
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Imported here so the environment above is in place before config loads.
+    from meal_planner.services.call_llm import (
+        generate_modified_recipe,
+        generate_recipe_from_text,
+    )
+    from meal_planner.services.extract_webpage_text import clean_html_text
+    from meal_planner.services.metrics import metrics_registry
+    from meal_planner.services.process_recipe import postprocess_recipe
+
+    pages = [
+        clean_html_text(
+            (path.parent / json.loads(path.read_text())["html_file"]).read_text()
+        )
+        for path in sorted(DATA_DIR.glob("*.json"))
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: dict[str, list[float]] = {"extract": [], "modify": []}
+    failures = {"extract": 0, "modify": 0}
+
+    async def run(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                recipe = postprocess_recipe(
+                    await generate_recipe_from_text(pages[i % len(pages)])
+                )
+            except RuntimeError:
+                failures["extract"] += 1
+                return
+            latencies["extract"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            try:
+                await generate_modified_recipe(recipe, f"{MODIFICATION} (#{i})")
+            except RuntimeError:
+                failures["modify"] += 1
+                return
+            latencies["modify"].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.requests} pipelines in {elapsed:.1f}s ", end="")
+    print(f"({args.requests / elapsed:.1f}/s, concurrency {args.concurrency})")
+    for stage, values in latencies.items():
+        if values:
+            print(
+                f"{stage:8} ok {len(values):4}  failed {failures[stage]:4}  "
+                f"p50 {statistics.median(values):6.2f}s  "
+                f"p95 {percentile(values, 0.95):6.2f}s  "
+                f"max {max(values):6.2f}s"
+            )
+        else:
+            print(f"{stage:8} ok    0  failed {failures[stage]:4}")
+    snapshot = metrics_registry.snapshot()
+    for name in sorted(snapshot):
+        if name.startswith(("llm_limiter", "llm_retry", "llm_calls")):
+            print(f"\n{name}: {json.dumps(snapshot[name], indent=2)}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ["MEAL_PLANNER_LLM_BASE_URL"] = args.base_url
+    os.environ["MEAL_PLANNER_LLM_MODEL"] = args.model
+    os.environ["MEAL_PLANNER_LLM_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("MEAL_PLANNER_LLM_API_KEY", "fake")
+    asyncio.run(main(args))
@@ -0,0 +1,118 @@
+# scripts/benchmark_modification_modes.py
+"""Compare completion tokens and latency of rewrite and patch modification.
+
+Modifies each eval fixture recipe in tests/data/recipes with a few typical
+requests, once with the full-rewrite prompt and once with the patch prompt,
+one call at a time, and reports per mode the completion tokens per call (from
+the LLM call telemetry), latency percentiles and how often a patch could not
+be applied and fell back to a rewrite. The LLM cache is disabled so every
+request reaches the endpoint. It uses the app's configured LLM endpoint
+unless --base-url is given; against the local fake LLM server, pass
+--completion-token-seconds to it so that latency grows with output length:
+
+    python -m meal_planner.fake_llm --fixtures tests/data/recipes/processed \\
+        --port 8001 --latency-median 0.3 --completion-token-seconds 0.005
+
+Usage:
+    python scripts/benchmark_modification_modes.py [--recipes N]
+        [--base-url URL] [--model MODEL] [--fixtures DIR]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+
+FIXTURE_DIR = Path(__file__).parent.parent / "tests" / "data" / "recipes" / "processed"
+MODIFICATIONS = (
+    "Use butter instead of oil.",
+    "Make it spicier.",
+    "Add a step to let it rest for 10 minutes before serving.",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=5)
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_DIR)
+    return parser.parse_args()
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class FallbackCounter(logging.Handler):
+    """Counts patches that could not be applied."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.getMessage().startswith("Could not apply LLM patch"):
+            self.count += 1
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Imported here so the environment above is in place before config loads.
+    from meal_planner.fake_llm import load_fixture_recipes
+    from meal_planner.services.call_llm import generate_modified_recipe, logger
+    from meal_planner.services.llm_telemetry import llm_telemetry
+
+    fixtures = load_fixture_recipes(args.fixtures)[: args.recipes]
+    recipes = [fixture.recipe for fixture in fixtures]
+    fallbacks = FallbackCounter()
+    logger.addHandler(fallbacks)
+    print(f"{'mode':8} {'calls':>5} {'failed':>6} {'out tok/call':>12} ", end="")
+    print(f"{'p50':>7} {'p95':>7} {'fallbacks':>9}")
+    for mode in ("rewrite", "patch"):
+        before = llm_telemetry.metrics()
+        fallbacks.count = 0
+        latencies = []
+        failed = 0
+        for recipe in recipes:
+            for request in MODIFICATIONS:
+                started = time.perf_counter()
+                try:
+                    await generate_modified_recipe(recipe, request, mode=mode)
+                except RuntimeError:
+                    failed += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+        calls, tokens = _modification_totals(llm_telemetry.metrics(), before)
+        print(
+            f"{mode:8} {len(latencies):5} {failed:6} "
+            f"{tokens / max(calls, 1):12.0f} "
+            f"{statistics.median(latencies) if latencies else 0:6.2f}s "
+            f"{percentile(latencies, 0.95) if latencies else 0:6.2f}s "
+            f"{fallbacks.count:9}"
+        )
+
+
+def _modification_totals(after: dict, before: dict) -> tuple[int, int]:
+    """LLM calls and completion tokens for modification between snapshots."""
+    calls = tokens = 0
+    for key, totals in after.items():
+        if key.startswith("recipe_modification/"):
+            previous = before.get(key, {"calls": 0, "completion_tokens": 0})
+            calls += totals["calls"] - previous["calls"]
+            tokens += totals["completion_tokens"] - previous["completion_tokens"]
+    return calls, tokens
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.base_url:
+        os.environ["MEAL_PLANNER_LLM_BASE_URL"] = args.base_url
+        os.environ.setdefault("MEAL_PLANNER_LLM_API_KEY", "fake")
+    if args.model:
+        os.environ["MEAL_PLANNER_LLM_MODEL"] = args.model
+    os.environ["MEAL_PLANNER_LLM_CACHE_ENABLED"] = "false"
+    asyncio.run(main(args))
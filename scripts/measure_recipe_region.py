@@ -0,0 +1,87 @@
+# scripts/measure_recipe_region.py
+"""Measure how recipe-region reduction changes LLM extraction prompts.
+
+Reports estimated prompt tokens for every eval page in tests/data/recipes,
+with and without reduction. With --llm (needs GOOGLE_API_KEY), it also
+extracts each page both ways, bypassing the LLM cache, and reports latency
+and how many pages match the eval expectations.
+
+Usage:
+    python scripts/measure_recipe_region.py [--llm]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from meal_planner.config import RECIPE_EXTRACTION_PROMPT
+from meal_planner.models import RecipeBase
+from meal_planner.services.call_llm import get_structured_llm_response
+from meal_planner.services.extract_webpage_text import clean_html_text
+from meal_planner.services.llm_limiter import estimate_tokens
+from meal_planner.services.process_recipe import postprocess_recipe
+from meal_planner.services.prompt_registry import prompt_registry
+from meal_planner.services.recipe_region import RecipeRegionReducer
+
+DATA_DIR = Path(__file__).parent.parent / "tests/data/recipes/processed"
+
+
+def matches(recipe: RecipeBase, expected: dict) -> bool:
+    return (
+        recipe.name in expected["expected_names"]
+        and sorted(i.lower() for i in recipe.ingredients)
+        == sorted(i.lower() for i in expected["expected_ingredients"])
+        and recipe.instructions == expected["expected_instructions"]
+    )
+
+
+async def extract(prompt: str) -> tuple[RecipeBase | None, float]:
+    started = time.monotonic()
+    try:
+        recipe = await get_structured_llm_response(prompt, RecipeBase)
+        recipe = postprocess_recipe(recipe)
+    except Exception as e:
+        print(f"    extraction failed: {e}")
+        recipe = None
+    return recipe, time.monotonic() - started
+
+
+async def main(use_llm: bool) -> None:
+    reducer = RecipeRegionReducer(registry=None)
+    template = prompt_registry.get("recipe_extraction", RECIPE_EXTRACTION_PROMPT)
+    totals = {"full": [0, 0.0, 0], "reduced": [0, 0.0, 0]}
+
+    for json_file in sorted(DATA_DIR.glob("*.json")):
+        expected = json.loads(json_file.read_text())
+        page = clean_html_text((json_file.parent / expected["html_file"]).read_text())
+        prompts = {
+            "full": template.render(page_text=page),
+            "reduced": template.render(page_text=reducer.reduce(page)),
+        }
+        line = f"{json_file.name[:45]:45}"
+        for variant, prompt in prompts.items():
+            tokens = estimate_tokens(prompt)
+            totals[variant][0] += tokens
+            line += f"  {variant} {tokens:6} tok"
+            if use_llm:
+                recipe, seconds = await extract(prompt)
+                ok = recipe is not None and matches(recipe, expected)
+                totals[variant][1] += seconds
+                totals[variant][2] += ok
+                line += f" {seconds:5.1f}s {'pass' if ok else 'FAIL'}"
+        print(line)
+
+    full, reduced = totals["full"], totals["reduced"]
+    saved = 1 - reduced[0] / full[0]
+    print(f"\nPrompt tokens: {full[0]} -> {reduced[0]} ({saved:.0%} less)")
+    if use_llm:
+        print(f"LLM time: {full[1]:.1f}s -> {reduced[1]:.1f}s")
+        print(f"Eval passes: {full[2]} -> {reduced[2]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm", action="store_true", help="also call the LLM")
+    asyncio.run(main(parser.parse_args().llm))
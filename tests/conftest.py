@@ -13,12 +13,48 @@ from alembic.config import Config
 from meal_planner.database import get_session
 from meal_planner.main import api_app, app
 from meal_planner.models import RecipeBase
+from meal_planner.services.llm_cache import LLMCache
+from meal_planner.services.near_duplicates import NearDuplicateIndex
+from meal_planner.services.speculative_extraction import SpeculativeExtractions
 
 logger = logging.getLogger(__name__)
 
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Give each test an empty LLM cache outside the data volume."""
+    cache = LLMCache(tmp_path / "llm_cache.db", registry=None)
+    monkeypatch.setattr("meal_planner.services.call_llm.llm_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_near_duplicates(tmp_path, monkeypatch):
+    """Give each test an empty near-duplicate index outside the data volume."""
+    index = NearDuplicateIndex(tmp_path / "llm_cache.db", enabled=True, registry=None)
+    monkeypatch.setattr("meal_planner.services.call_llm.near_duplicates", index)
+    yield index
+    index.close()
+
+
+@pytest.fixture(autouse=True)
+def speculative_extractions(monkeypatch):
+    """Give each test its own speculative extractions, disabled by default.
+
+    Enable them with `speculative_extractions.enabled = True`; otherwise
+    fetching a URL in a test would start a background LLM call.
+    """
+    store = SpeculativeExtractions(enabled=False, registry=None)
+    monkeypatch.setattr("meal_planner.routers.actions.speculative_extractions", store)
+    monkeypatch.setattr(
+        "meal_planner.routers.ui_fragments.speculative_extractions", store
+    )
+    return store
+
+
 @pytest.fixture(scope="function")
 def test_engine():
     """Creates an in-memory SQLite engine for each test function."""
@@ -60,11 +96,16 @@ def dbsession(test_engine):
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(dbsession: SQLModelSession) -> AsyncGenerator[AsyncClient, None]:
+async def client(
+    dbsession: SQLModelSession, monkeypatch
+) -> AsyncGenerator[AsyncClient, None]:
     def override_get_session():
         return dbsession
 
     api_app.dependency_overrides[get_session] = override_get_session
+    # UI routers open their own sessions via session_scope(); bind them to the
+    # same test connection so both see the same data.
+    monkeypatch.setattr("meal_planner.database.ENGINE", dbsession.bind)
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -1,8 +1,15 @@
+from pathlib import Path
+
+# Eval fixtures
+EVAL_FIXTURE_DIR = Path(__file__).parent / "data" / "recipes" / "processed"
+
 # Test URLs
 RECIPES_LIST_PATH = "/recipes"
 RECIPES_EXTRACT_URL = "/recipes/extract"
 RECIPES_FETCH_TEXT_URL = "/recipes/ui/fetch-text"
 RECIPES_EXTRACT_RUN_URL = "/recipes/extract/run"
+RECIPES_EXTRACT_STREAM_URL = "/recipes/extract/stream"
+RECIPES_EXTRACT_PICK_URL = "/recipes/extract/pick"
 RECIPES_MODIFY_URL = "/recipes/modify"
 RECIPES_SAVE_URL = "/recipes/save"
 RECIPES_DELETE_URL = "/recipes/delete"
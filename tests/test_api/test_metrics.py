@@ -0,0 +1,76 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from meal_planner.api.recipes import recipe_reads
+from meal_planner.routers.pages import recipe_list_flight
+from meal_planner.services.recipes import RecipeService
+from tests.constants import RECIPES_LIST_PATH
+
+
+def _slow_list_all():
+    calls = []
+    original = RecipeService.list_all
+
+    def slow_list_all(self):
+        calls.append(1)
+        time.sleep(0.05)
+        return original(self)
+
+    return slow_list_all, calls
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_reports_single_flight_groups(client: AsyncClient):
+    response = await client.get("/api/v0/metrics")
+
+    assert response.status_code == 200
+    metrics = response.json()
+    assert "single_flight.recipe_api_reads" in metrics
+    assert "single_flight.recipe_list_page" in metrics
+    assert set(metrics["single_flight.recipe_list_page"]) == {
+        "calls",
+        "executions",
+        "coalesced",
+        "coalescing_ratio",
+        "in_flight",
+    }
+
+
+@pytest.mark.anyio
+async def test_concurrent_api_list_reads_share_one_query(client: AsyncClient):
+    slow_list_all, calls = _slow_list_all()
+    coalesced_before = recipe_reads.metrics()["coalesced"]
+
+    with patch.object(RecipeService, "list_all", slow_list_all):
+        responses = await asyncio.gather(
+            *[client.get("/api/v0/recipes") for _ in range(4)]
+        )
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert len(calls) == 1
+    assert recipe_reads.metrics()["coalesced"] - coalesced_before == 3
+
+
+@pytest.mark.anyio
+async def test_concurrent_list_pages_share_one_render(client: AsyncClient):
+    await client.post(
+        "/api/v0/recipes",
+        json={"name": "Shared", "ingredients": ["i"], "instructions": ["s"]},
+    )
+    slow_list_all, calls = _slow_list_all()
+
+    with patch.object(RecipeService, "list_all", slow_list_all):
+        responses = await asyncio.gather(
+            *[
+                client.get(RECIPES_LIST_PATH, headers={"HX-Request": "true"})
+                for _ in range(4)
+            ]
+        )
+
+    assert len(calls) == 1
+    assert all("Shared" in response.text for response in responses)
+    assert recipe_list_flight.metrics()["in_flight"] == 0
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from unittest.mock import patch
 
@@ -6,7 +7,9 @@ import pytest_asyncio
 from httpx import AsyncClient, Response
 from sqlmodel import Session as SQLModelSession
 
-from meal_planner.models import Recipe
+from meal_planner.api.recipes import recipe_reads
+from meal_planner.models import Recipe, RecipeBase
+from meal_planner.services.recipe_events import RecipeEvent, recipe_events
 
 pytestmark = pytest.mark.asyncio
 
@@ -316,6 +319,25 @@ class TestGetRecipeById:
             "Detail instruction 2",
         ]
 
+    async def test_get_recipe_shares_detached_data(
+        self, client: AsyncClient, setup_recipe: str
+    ):
+        shared = []
+        do = recipe_reads.do
+
+        async def record_shared_result(key, fn):
+            result = await do(key, fn)
+            shared.append(result)
+            return result
+
+        with patch.object(recipe_reads, "do", record_shared_result):
+            await client.get(f"/api/v0/recipes/{setup_recipe}")
+            await client.get("/api/v0/recipes")
+
+        assert not any(isinstance(result, Recipe) for result in shared)
+        assert shared[0]["id"] == setup_recipe
+        assert [recipe["id"] for recipe in shared[1]] == [setup_recipe]
+
     async def test_get_recipe_not_found(self, client: AsyncClient):
         """Test GET /api/recipes/{recipe_id} returns 404 for a non-existent ID."""
         non_existent_id = "12345678-1234-1234-1234-123456789012"
@@ -401,6 +423,43 @@ class TestDeleteRecipe:
             mock_commit.assert_called_once()
 
 
+@pytest.mark.anyio
+class TestRecipeEventsPublished:
+    async def test_create_update_delete_publish_events(
+        self, client: AsyncClient, valid_recipe_payload: dict
+    ):
+        async with recipe_events.subscribe() as queue:
+            create_response = await client.post(
+                "/api/v0/recipes", json=valid_recipe_payload
+            )
+            recipe_id = create_response.json()["id"]
+            await client.put(
+                f"/api/v0/recipes/{recipe_id}",
+                json={**valid_recipe_payload, "name": "Renamed Recipe"},
+            )
+            await client.delete(f"/api/v0/recipes/{recipe_id}")
+
+            assert queue.get_nowait() == RecipeEvent(
+                "created", recipe_id, "Test Recipe"
+            )
+            assert queue.get_nowait() == RecipeEvent(
+                "updated", recipe_id, "Renamed Recipe"
+            )
+            assert queue.get_nowait() == RecipeEvent(
+                "deleted", recipe_id, "Renamed Recipe"
+            )
+            assert queue.empty()
+
+    async def test_failed_delete_publishes_nothing(self, client: AsyncClient):
+        async with recipe_events.subscribe() as queue:
+            response = await client.delete(
+                "/api/v0/recipes/12345678-1234-1234-1234-123456789012"
+            )
+
+            assert response.status_code == 404
+            assert queue.empty()
+
+
 @pytest.mark.anyio
 class TestRecipeTimestamps:
     """Test timestamp functionality for recipe creation and retrieval."""
@@ -851,3 +910,88 @@ class TestUpdateRecipeIntegration:
         update_updated_at = update_response.json()["updated_at"]
         final_updated_at = final_recipe["updated_at"]
         assert final_updated_at == update_updated_at  # updated_at matches
+
+
+def _ndjson(response: Response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+class TestBulkExtractRecipes:
+    URL = "/api/v0/recipes/extract"
+
+    @pytest.fixture
+    def mock_llm(self):
+        async def extract(text):
+            if text == "broken":
+                raise RuntimeError("LLM down")
+            return RecipeBase(
+                name=text, ingredients=["1 cup flour"], instructions=["Mix."]
+            )
+
+        with patch(
+            "meal_planner.services.bulk_extract.generate_recipe_from_text",
+            side_effect=extract,
+        ) as llm:
+            yield llm
+
+    async def test_streams_one_result_per_item(self, client: AsyncClient, mock_llm):
+        response = await client.post(
+            self.URL, json={"items": [{"text": "soup"}, {"text": "broken"}]}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = sorted(_ndjson(response), key=lambda r: r["index"])
+        assert results[0] == {
+            "index": 0,
+            "url": None,
+            "recipe_id": None,
+            "stage": None,
+            "error": None,
+            "recipe": {
+                "name": "Soup",
+                "ingredients": ["1 cup flour"],
+                "instructions": ["Mix."],
+                "makes_min": None,
+                "makes_max": None,
+                "makes_unit": None,
+            },
+        }
+        assert results[1] == {
+            "index": 1,
+            "url": None,
+            "recipe": None,
+            "recipe_id": None,
+            "stage": "extract",
+            "error": "Recipe extraction failed",
+        }
+
+    async def test_save_creates_recipes(self, client: AsyncClient, mock_llm):
+        response = await client.post(
+            self.URL,
+            json={"items": [{"text": "soup"}, {"text": "stew"}], "save": True},
+        )
+
+        for result in _ndjson(response):
+            saved = await client.get(f"/api/v0/recipes/{result['recipe_id']}")
+            assert saved.json()["name"] == result["recipe"]["name"]
+
+    async def test_does_not_save_by_default(self, client: AsyncClient, mock_llm):
+        response = await client.post(self.URL, json={"items": [{"text": "soup"}]})
+
+        assert _ndjson(response)[0]["recipe_id"] is None
+        assert (await client.get("/api/v0/recipes")).json() == []
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"items": []},
+            {"items": [{}]},
+            {"items": [{"text": "t", "url": "https://example.com"}]},
+            {"items": [{"text": "t"}] * 501},
+        ],
+    )
+    async def test_rejects_invalid_requests(self, client: AsyncClient, payload):
+        response = await client.post(self.URL, json=payload)
+
+        assert response.status_code == 422
@@ -0,0 +1,261 @@
+import asyncio
+import dataclasses
+import json
+
+import pytest
+
+from meal_planner.config import (
+    LLM_INPUT_COST_PER_MILLION_TOKENS,
+    LLM_OUTPUT_COST_PER_MILLION_TOKENS,
+)
+from meal_planner.evals import (
+    NOT_RECORDED_MESSAGE,
+    EvalCase,
+    EvalResult,
+    EvalRunner,
+    TemplateSummary,
+    check_recipe,
+    format_comparison,
+    format_report,
+    load_eval_cases,
+)
+from meal_planner.models import RecipeBase
+from meal_planner.services.llm_telemetry import llm_telemetry
+from meal_planner.services.prompt_registry import PromptTemplate, _read_template
+from tests.constants import EVAL_FIXTURE_DIR
+
+CASES = load_eval_cases(EVAL_FIXTURE_DIR)
+
+
+def _expected_recipe(case: EvalCase) -> RecipeBase:
+    units = case.expected.get("expected_makes_units") or [None]
+    return RecipeBase(
+        name=case.expected["expected_names"][0],
+        ingredients=case.expected["expected_ingredients"],
+        instructions=case.expected["expected_instructions"],
+        makes_min=case.expected.get("expected_makes_min"),
+        makes_max=case.expected.get("expected_makes_max"),
+        makes_unit=units[0],
+    )
+
+
+class _Extractor:
+    """Answers with each page's expected recipe, tracking concurrency."""
+
+    def __init__(self, wrong: set[str] = frozenset()):
+        self.wrong = wrong
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, text: str) -> RecipeBase:
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            with llm_telemetry.record_call("test-model", "RecipeBase") as record:
+                record.prompt_tokens, record.completion_tokens = 100, 20
+                await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+        case = next(case for case in CASES if case.page_text == text)
+        recipe = _expected_recipe(case)
+        if case.name in self.wrong:
+            recipe.name = "Something else"
+        return recipe
+
+
+@pytest.fixture
+def template(tmp_path) -> PromptTemplate:
+    path = tmp_path / "v1.txt"
+    path.write_text("Extract the recipe:\n$page_text")
+    return _read_template(path)
+
+
+def _runner(template, tmp_path, extract, **kwargs) -> EvalRunner:
+    return EvalRunner(
+        template,
+        cache_path=tmp_path / "cache" / "extraction.json",
+        extract=extract,
+        model="test-model",
+        **kwargs,
+    )
+
+
+def test_load_eval_cases():
+    assert len(CASES) == 11
+    assert len({case.fixture_hash for case in CASES}) == len(CASES)
+    assert all(case.page_text for case in CASES)
+    assert CASES[0].name == CASES[0].expected["html_file"].rsplit("/", 1)[-1]
+
+
+def test_check_recipe():
+    case = CASES[0]
+    recipe = _expected_recipe(case)
+
+    assert check_recipe(recipe, case.expected) == []
+
+    recipe.name = "Wrong"
+    recipe.ingredients = list(reversed(recipe.ingredients))
+    recipe.makes_max = 99
+    failures = check_recipe(recipe, case.expected)
+    assert len(failures) == 2
+    assert failures[0].startswith("Recipe name 'Wrong' not in expected names")
+    assert failures[1].startswith("makes_max doesn't match")
+
+
+@pytest.mark.anyio
+class TestEvalRunner:
+    async def test_runs_cases_concurrently_and_reports_usage(self, template, tmp_path):
+        extract = _Extractor(wrong={CASES[1].name})
+        runner = _runner(template, tmp_path, extract, concurrency=3)
+
+        results = await runner.run(CASES)
+
+        assert extract.max_running == 3
+        assert [result.case for result in results] == [case.name for case in CASES]
+        assert [result.passed for result in results].count(False) == 1
+        assert not results[1].passed
+        assert results[1].failures[0].startswith("Recipe name 'Something Else'")
+        assert results[0].cached is False
+        assert (results[0].prompt_tokens, results[0].completion_tokens) == (100, 20)
+        assert results[0].latency_seconds > 0
+
+    async def test_unchanged_cases_are_cached(self, template, tmp_path):
+        await _runner(template, tmp_path, _Extractor()).run(CASES)
+        extract = _Extractor()
+
+        results = await _runner(template, tmp_path, extract).run(CASES)
+
+        assert extract.calls == 0
+        assert all(result.cached and result.passed for result in results)
+        assert results[0].prompt_tokens == 100
+
+    async def test_changed_template_or_fixture_is_rerun(self, template, tmp_path):
+        await _runner(template, tmp_path, _Extractor()).run(CASES)
+        edited = dataclasses.replace(template, content_hash="edited")
+        changed = dataclasses.replace(CASES[0], fixture_hash="changed")
+
+        extract = _Extractor()
+        await _runner(edited, tmp_path, extract).run(CASES[1:3])
+        assert extract.calls == 2
+
+        extract = _Extractor()
+        await _runner(template, tmp_path, extract).run([changed, *CASES[1:3]])
+        assert extract.calls == 1
+
+    async def test_retry_failed(self, template, tmp_path):
+        await _runner(template, tmp_path, _Extractor(wrong={CASES[0].name})).run(
+            CASES[:2]
+        )
+        extract = _Extractor()
+
+        results = await _runner(template, tmp_path, extract, retry_failed=True).run(
+            CASES[:2]
+        )
+
+        assert extract.calls == 1
+        assert [result.passed for result in results] == [True, True]
+        assert [result.cached for result in results] == [False, True]
+
+    async def test_errors_are_reported_and_not_cached(self, template, tmp_path):
+        async def failing(text: str) -> RecipeBase:
+            raise RuntimeError("LLM down")
+
+        results = await _runner(template, tmp_path, failing).run(CASES[:1])
+        extract = _Extractor()
+        rerun = await _runner(template, tmp_path, extract).run(CASES[:1])
+
+        assert (results[0].passed, results[0].error) == (False, "LLM down")
+        assert extract.calls == 1
+        assert rerun[0].passed
+
+    async def test_replay_never_calls_the_llm(self, template, tmp_path):
+        await _runner(template, tmp_path, _Extractor()).run(CASES[:1])
+        extract = _Extractor()
+
+        results = await _runner(template, tmp_path, extract, replay=True).run(CASES[:2])
+
+        assert extract.calls == 0
+        assert results[0].passed and results[0].cached
+        assert (results[1].passed, results[1].error) == (False, NOT_RECORDED_MESSAGE)
+
+    async def test_unreadable_cache_is_ignored(self, template, tmp_path):
+        cache_path = tmp_path / "cache" / "extraction.json"
+        cache_path.parent.mkdir()
+        cache_path.write_text("{not json")
+
+        results = await _runner(template, tmp_path, _Extractor()).run(CASES[:1])
+
+        assert results[0].passed
+        assert len(json.loads(cache_path.read_text())) == 1
+
+
+def test_cache_key_defaults_to_routed_model(template):
+    runner = EvalRunner(template, cache_path=None)
+    pinned = EvalRunner(template, cache_path=None, model="other-model")
+
+    assert runner.cache_key(CASES[0]) == runner.cache_key(CASES[0])
+    assert runner.cache_key(CASES[0]) != pinned.cache_key(CASES[0])
+
+
+@pytest.mark.anyio
+async def test_format_report(template, tmp_path):
+    results = await _runner(template, tmp_path, _Extractor(wrong={CASES[0].name})).run(
+        CASES[:2]
+    )
+
+    report = format_report(results, wall_seconds=1.5)
+
+    lines = report.splitlines()
+    assert lines[0].split()[:4] == ["case", "result", "source", "latency"]
+    assert lines[1].split()[:3] == [CASES[0].name, "FAIL", "llm"]
+    assert lines[2].split()[1] == "pass"
+    assert "1/2 passed; 2 run, 0 cached, 1.5s wall" in report
+    assert "Recipe name 'Something Else'" in report
+
+
+def test_template_summary():
+    results = [
+        EvalResult("a", True, [], False, 1.0, 1000, 100),
+        EvalResult("b", False, ["Wrong name"], True, 3.0, 3000, 300),
+        EvalResult("c", False, [], False, 0.5, error="LLM down"),
+        EvalResult("d", False, [], False, error=NOT_RECORDED_MESSAGE),
+    ]
+
+    summary = TemplateSummary.from_results("v1", results)
+
+    assert (summary.cases, summary.passed, summary.errors, summary.missing) == (
+        4,
+        1,
+        1,
+        1,
+    )
+    assert summary.accuracy == pytest.approx(1 / 3)
+    assert (summary.prompt_tokens_avg, summary.completion_tokens_avg) == (2000, 200)
+    assert summary.cost_usd_avg == pytest.approx(
+        (
+            2000 * LLM_INPUT_COST_PER_MILLION_TOKENS
+            + 200 * LLM_OUTPUT_COST_PER_MILLION_TOKENS
+        )
+        / 1e6
+    )
+    assert (summary.latency_p50_seconds, summary.latency_p95_seconds) == (3.0, 3.0)
+
+
+def test_format_comparison():
+    summaries = [
+        TemplateSummary.from_results(
+            "v1", [EvalResult("a", True, [], False, 1.0, 1000, 100)]
+        ),
+        TemplateSummary.from_results(
+            "v2", [EvalResult("a", False, [], False, error=NOT_RECORDED_MESSAGE)]
+        ),
+    ]
+
+    lines = format_comparison(summaries, active="v2").splitlines()
+
+    assert lines[0].split()[:2] == ["template", "accuracy"]
+    assert lines[1].split()[:5] == ["v1", "1/1", "100%", "0", "0"]
+    assert lines[2].startswith("*v2")
+    assert lines[2].split()[1:4] == ["-", "0", "1"]
@@ -0,0 +1,237 @@
+import random
+from unittest.mock import patch
+
+import httpx
+import instructor
+import pytest
+from openai import AsyncOpenAI
+
+from meal_planner.fake_llm import (
+    FakeLLMSettings,
+    create_app,
+    load_fixture_recipes,
+    pick_recipe,
+)
+from meal_planner.models import RecipeBase, RecipePatch
+from meal_planner.services import call_llm
+from meal_planner.services.llm_retry import RetryPolicy
+from tests.constants import EVAL_FIXTURE_DIR
+
+RECIPES = load_fixture_recipes(EVAL_FIXTURE_DIR)
+FAST = {"latency_distribution": "constant", "latency_median_seconds": 0}
+
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)  # noqa: S311 - simulation, not security
+
+
+def _http_client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://fake-llm"
+    )
+
+
+def _instructor_client(app):
+    openai_client = AsyncOpenAI(
+        api_key="fake",
+        base_url="http://fake-llm/v1/",
+        max_retries=0,
+        http_client=_http_client(app),
+    )
+    return instructor.from_openai(openai_client)
+
+
+def _request(**body) -> dict:
+    body.setdefault("model", "fake")
+    body.setdefault("messages", [{"role": "user", "content": "hello"}])
+    return body
+
+
+class TestSettings:
+    def test_constant_latency(self):
+        settings = FakeLLMSettings(latency_distribution="constant")
+
+        assert settings.sample_latency(_rng(0)) == 1.0
+
+    @pytest.mark.parametrize("distribution", ["uniform", "lognormal"])
+    def test_latency_is_spread_around_median(self, distribution):
+        settings = FakeLLMSettings(
+            latency_distribution=distribution, latency_median_seconds=2
+        )
+        rng = _rng(0)
+
+        samples = sorted(settings.sample_latency(rng) for _ in range(2001))
+
+        assert samples[0] < samples[-1]
+        assert samples[1000] == pytest.approx(2, rel=0.1)
+        assert samples[0] >= 0
+
+    def test_seeded_latency_is_reproducible(self):
+        settings = FakeLLMSettings()
+
+        first = [settings.sample_latency(_rng(7)) for _ in range(3)]
+        second = [settings.sample_latency(_rng(7)) for _ in range(3)]
+
+        assert first == second
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"latency_distribution": "pareto"},
+            {"error_rate": 0.6, "rate_limit_rate": 0.6},
+        ],
+    )
+    def test_invalid_settings(self, kwargs):
+        with pytest.raises(ValueError):
+            FakeLLMSettings(**kwargs)
+
+
+class TestFixtureRecipes:
+    def test_loads_every_fixture(self):
+        assert len(RECIPES) >= 10
+        assert all(isinstance(f.recipe, RecipeBase) for f in RECIPES)
+        assert all(f.recipe.name == f.names[0] for f in RECIPES)
+
+    def test_missing_fixtures(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_fixture_recipes(tmp_path)
+
+    def test_picks_recipe_named_in_prompt(self):
+        fixture = RECIPES[3]
+
+        recipe = pick_recipe(f"Extract this: {fixture.names[-1].upper()}!", RECIPES)
+
+        assert recipe == fixture.recipe
+
+    def test_unmatched_prompt_is_deterministic(self):
+        first = pick_recipe("no recipe mentioned here", RECIPES)
+
+        assert pick_recipe("no recipe mentioned here", RECIPES) == first
+        assert first in [f.recipe for f in RECIPES]
+
+
+@pytest.mark.anyio
+class TestServer:
+    async def test_tool_call_response(self):
+        app = create_app(FakeLLMSettings(**FAST), RECIPES)
+        body = _request(
+            tools=[{"type": "function", "function": {"name": "RecipeBase"}}],
+            tool_choice={"type": "function", "function": {"name": "RecipeBase"}},
+        )
+
+        async with _http_client(app) as client:
+            response = await client.post("/v1/chat/completions", json=body)
+
+        assert response.status_code == 200
+        completion = response.json()
+        [call] = completion["choices"][0]["message"]["tool_calls"]
+        assert call["function"]["name"] == "RecipeBase"
+        RecipeBase.model_validate_json(call["function"]["arguments"])
+        assert completion["usage"]["prompt_tokens"] > 0
+
+    async def test_patch_tool_call_response(self):
+        app = create_app(FakeLLMSettings(**FAST), RECIPES)
+        tool = {"type": "function", "function": {"name": "RecipePatch"}}
+
+        async with _http_client(app) as client:
+            response = await client.post(
+                "/v1/chat/completions", json=_request(tools=[tool])
+            )
+
+        [call] = response.json()["choices"][0]["message"]["tool_calls"]
+        patch = RecipePatch.model_validate_json(call["function"]["arguments"])
+        assert [(e.op, e.index) for e in patch.edits] == [("replace", 0)]
+
+    async def test_json_content_response(self):
+        app = create_app(FakeLLMSettings(**FAST), RECIPES)
+
+        async with _http_client(app) as client:
+            response = await client.post("/v1/chat/completions", json=_request())
+
+        content = response.json()["choices"][0]["message"]["content"]
+        RecipeBase.model_validate_json(content)
+
+    async def test_injected_rate_limits(self):
+        app = create_app(
+            FakeLLMSettings(rate_limit_rate=1, retry_after_seconds=2, **FAST), RECIPES
+        )
+
+        async with _http_client(app) as client:
+            response = await client.post("/v1/chat/completions", json=_request())
+            stats = (await client.get("/stats")).json()
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        assert stats == {"requests": 1, "ok": 0, "errors": 0, "rate_limited": 1}
+
+    async def test_injected_errors(self):
+        app = create_app(FakeLLMSettings(error_rate=1, **FAST), RECIPES)
+
+        async with _http_client(app) as client:
+            response = await client.post("/v1/chat/completions", json=_request())
+
+        assert response.status_code == 500
+
+    async def test_error_rate_is_applied_per_request(self):
+        app = create_app(FakeLLMSettings(error_rate=0.5, seed=1, **FAST), RECIPES)
+
+        async with _http_client(app) as client:
+            for _ in range(200):
+                await client.post("/v1/chat/completions", json=_request())
+            stats = (await client.get("/stats")).json()
+
+        assert 60 < stats["errors"] < 140
+        assert stats["ok"] + stats["errors"] == 200
+
+
+@pytest.mark.anyio
+class TestPipelineAgainstFakeServer:
+    async def test_structured_response(self):
+        app = create_app(FakeLLMSettings(**FAST), RECIPES)
+        fixture = RECIPES[0]
+
+        with patch.object(
+            call_llm, "_get_aclient", return_value=_instructor_client(app)
+        ):
+            recipe = await call_llm.generate_recipe_from_text(
+                f"{fixture.names[0]}\n1 cup flour"
+            )
+
+        assert recipe.model_dump() == fixture.recipe.model_dump()
+
+    async def test_streamed_response(self):
+        app = create_app(FakeLLMSettings(**FAST), RECIPES)
+        fixture = RECIPES[1]
+
+        with patch.object(
+            call_llm, "_get_aclient", return_value=_instructor_client(app)
+        ):
+            partials = [
+                partial
+                async for partial in call_llm.stream_recipe_from_text(
+                    f"{fixture.names[0]}\n1 cup flour"
+                )
+            ]
+
+        assert len(partials) > 2
+        assert partials[-1] == fixture.recipe
+
+    async def test_rate_limits_are_retried(self, monkeypatch):
+        app = create_app(FakeLLMSettings(rate_limit_rate=0.5, seed=3, **FAST), RECIPES)
+        policy = RetryPolicy(
+            "fake",
+            max_attempts=10,
+            base_delay_seconds=0,
+            max_delay_seconds=0,
+            hedge=False,
+            registry=None,
+        )
+        monkeypatch.setattr(call_llm, "llm_retry_policy", policy)
+
+        with patch.object(
+            call_llm, "_get_aclient", return_value=_instructor_client(app)
+        ):
+            for i in range(5):
+                await call_llm.get_structured_llm_response(f"prompt {i}", RecipeBase)
+
+        assert policy.retries > 0
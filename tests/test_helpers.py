@@ -1,11 +1,9 @@
 """Test utilities and helper functions for the meal planner test suite."""
 
 from typing import Any, cast
-from unittest.mock import AsyncMock, MagicMock
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
-from httpx import Response
 
 from tests.constants import (
     FIELD_INGREDIENTS,
@@ -145,22 +143,3 @@ def extract_current_recipe_data_from_html(html_content: str) -> dict[str, Any]:
         FIELD_INGREDIENTS: _extract_input_list_values(form, FIELD_INGREDIENTS),
         FIELD_INSTRUCTIONS: _extract_textarea_list_values(form, FIELD_INSTRUCTIONS),
     }
-
-
-def create_mock_api_response(
-    status_code: int,
-    json_data: list | dict | None = None,
-    error_to_raise: Exception | None = None,
-) -> AsyncMock:
-    mock_resp = AsyncMock(spec=Response)
-    mock_resp.status_code = status_code
-    if json_data is not None:
-        mock_resp.json = MagicMock(return_value=json_data)
-    else:
-        mock_resp.json = MagicMock(return_value={})
-
-    if error_to_raise:
-        mock_resp.raise_for_status = MagicMock(side_effect=error_to_raise)
-    else:
-        mock_resp.raise_for_status = MagicMock()
-    return mock_resp
@@ -1,15 +1,19 @@
 """Tests for route handlers defined in meal_planner.routers.actions."""
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID
 
-import httpx
 import pytest
 from bs4 import BeautifulSoup, Tag
 from httpx import AsyncClient
 from pydantic import ValidationError
 
 from meal_planner.models import RecipeBase
+from meal_planner.services.job_queue import job_queue
+from meal_planner.services.near_duplicates import _reuse_allowed
+from meal_planner.services.recipes import RecipeStorageError
+from meal_planner.services.speculative_extraction import text_key
 from meal_planner.ui.common import CSS_ERROR_CLASS
 from tests.constants import (
     FIELD_INGREDIENTS,
@@ -20,12 +24,13 @@ from tests.constants import (
     FIELD_ORIGINAL_INSTRUCTIONS,
     FIELD_ORIGINAL_NAME,
     FIELD_RECIPE_TEXT,
+    RECIPES_EXTRACT_PICK_URL,
     RECIPES_EXTRACT_RUN_URL,
+    RECIPES_EXTRACT_STREAM_URL,
     RECIPES_MODIFY_URL,
     RECIPES_SAVE_URL,
 )
 from tests.test_helpers import (
-    create_mock_api_response,
     extract_current_recipe_data_from_html,
     extract_full_edit_form_data,
 )
@@ -114,29 +119,24 @@ class TestSaveRecipeEndpoint:
         assert error_span.get_text(strip=True) == expected_error_message
 
     @pytest.mark.anyio
-    async def test_save_recipe_api_call_error(self, client: AsyncClient, monkeypatch):
-        """Test error handling when the internal API call fails."""
-        mock_post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "API Error",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=httpx.Response(500, content=b"Internal Server Error"),
-            )
+    async def test_save_recipe_storage_error(self, client: AsyncClient, monkeypatch):
+        """Test error handling when the recipe service fails to store the recipe."""
+        mock_create = MagicMock(
+            side_effect=RecipeStorageError("Database error creating recipe")
         )
         monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
+            "meal_planner.routers.actions.RecipeService.create", mock_create
         )
 
         form_data = {
-            FIELD_NAME: "API Error Test",
+            FIELD_NAME: "Storage Error Test",
             FIELD_INGREDIENTS: ["ingredient"],
             FIELD_INSTRUCTIONS: ["instruction"],
         }
         response = await client.post(RECIPES_SAVE_URL, data=form_data)
         assert response.status_code == 200
-        assert (
-            "Could not save recipe. Please check input and try again." in response.text
-        )
+        assert "Could not save recipe. Please try again." in response.text
+        mock_create.assert_called_once()
 
     @pytest.mark.anyio
     @pytest.mark.parametrize(
@@ -199,17 +199,15 @@ class TestSaveRecipeEndpoint:
         mock_form_processing.assert_called_once()
 
     @pytest.mark.anyio
-    async def test_save_recipe_api_call_generic_error(
-        self, client: AsyncClient, monkeypatch
-    ):
-        """Test error handling when the internal API call raises a generic exception."""
-        mock_post = AsyncMock(side_effect=Exception("Unexpected network issue"))
+    async def test_save_recipe_generic_error(self, client: AsyncClient, monkeypatch):
+        """Test error handling when saving raises an unexpected exception."""
         monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
+            "meal_planner.routers.actions.RecipeService.create",
+            MagicMock(side_effect=Exception("Unexpected issue")),
         )
 
         form_data = {
-            FIELD_NAME: "Generic API Error Test",
+            FIELD_NAME: "Generic Error Test",
             FIELD_INGREDIENTS: ["ingredient"],
             FIELD_INSTRUCTIONS: ["instruction"],
         }
@@ -218,195 +216,11 @@ class TestSaveRecipeEndpoint:
         assert "An unexpected error occurred while saving the recipe." in response.text
 
     @pytest.mark.anyio
-    async def test_save_recipe_api_call_request_error(
-        self, client: AsyncClient, monkeypatch
-    ):
-        """Test error handling when the internal API call raises a RequestError."""
-        mock_post = AsyncMock(side_effect=httpx.RequestError("Network issue"))
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
-        )
-
-        form_data = {
-            FIELD_NAME: "Request Error Test",
-            FIELD_INGREDIENTS: ["ingredient"],
-            FIELD_INSTRUCTIONS: ["instruction"],
-        }
-        response = await client.post(RECIPES_SAVE_URL, data=form_data)
-        assert response.status_code == 200
-        assert (
-            "Could not save recipe due to a network issue. Please try again."
-            in response.text
-        )
-
-    @pytest.mark.anyio
-    async def test_save_recipe_api_call_non_json_error_response(
-        self, client: AsyncClient, monkeypatch
-    ):
-        """Test error handling when the API returns a non-JSON error response."""
-        mock_response = httpx.Response(
-            status_code=500,
-            content=b"<html><body>Internal Server Error</body></html>",
-            headers={"content-type": "text/html"},
-        )
-        mock_post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "Server Error",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=mock_response,
-            )
-        )
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
-        )
-
-        form_data = {
-            FIELD_NAME: "Non-JSON Error Test",
-            FIELD_INGREDIENTS: ["ingredient"],
-            FIELD_INSTRUCTIONS: ["instruction"],
-        }
-        response = await client.post(RECIPES_SAVE_URL, data=form_data)
-        assert response.status_code == 200
-        assert (
-            "Could not save recipe. Please check input and try again." in response.text
-        )
-
-    @pytest.mark.anyio
-    async def test_save_recipe_api_call_422_error(
-        self, client: AsyncClient, monkeypatch
-    ):
-        """Test error handling when the API returns a 422 Unprocessable Entity error."""
-        mock_response = httpx.Response(
-            status_code=422,
-            json={"detail": "Validation error"},
-        )
-        mock_post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "Validation Error",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=mock_response,
-            )
-        )
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
-        )
-
-        form_data = {
-            FIELD_NAME: "422 Error Test",
-            FIELD_INGREDIENTS: ["ingredient"],
-            FIELD_INSTRUCTIONS: ["instruction"],
-        }
-        response = await client.post(RECIPES_SAVE_URL, data=form_data)
-        assert response.status_code == 200
-        assert "Could not save recipe: Invalid data for some fields." in response.text
-
-    @pytest.mark.anyio
-    @patch("meal_planner.routers.actions.logger.debug")
-    async def test_save_recipe_api_call_json_error_with_detail(
-        self, mock_logger_debug: MagicMock, client: AsyncClient, monkeypatch
-    ):
-        """Test error handling when the API returns a JSON error response with
-        detail."""
-        error_detail = "Specific validation error message"
-        mock_response = httpx.Response(
-            status_code=400,
-            json={"detail": error_detail},
-        )
-        mock_post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                "Bad Request",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=mock_response,
-            )
-        )
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
-        )
-
-        form_data = {
-            FIELD_NAME: "JSON Error Test",
-            FIELD_INGREDIENTS: ["ingredient"],
-            FIELD_INSTRUCTIONS: ["instruction"],
-        }
-        response = await client.post(RECIPES_SAVE_URL, data=form_data)
-        assert response.status_code == 200
-        assert (
-            "Could not save recipe. Please check input and try again." in response.text
-        )
-
-    @pytest.mark.anyio
-    async def test_save_recipe_api_call_422_too_short_instructions(
-        self, client: AsyncClient, monkeypatch
-    ):
-        """Test 422 error from API when instructions are missing/too short."""
-        error_detail = [
-            {
-                "type": "too_short",
-                "loc": ["body", "instructions"],
-                "msg": "List should have at least 1 item after validation, not 0",
-                "input": {"name": "Test", "ingredients": ["i1"], "instructions": []},
-            }
-        ]
-        mock_response = httpx.Response(
-            status_code=422,
-            json={"detail": error_detail},
-            request=httpx.Request("POST", "/api/v0/recipes"),
-        )
-        mock_post = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                message="Unprocessable Entity",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=mock_response,
-            )
-        )
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post
-        )
-
+    async def test_save_recipe_missing_instructions(self, client: AsyncClient):
+        """Test the specific message when only the instructions are missing."""
         form_data = {
             FIELD_NAME: "Recipe Missing Instructions",
             FIELD_INGREDIENTS: ["ingredient1"],
-            FIELD_INSTRUCTIONS: ["Actual instruction provided"],
-        }
-        response = await client.post(RECIPES_SAVE_URL, data=form_data)
-        assert response.status_code == 200  # Action route itself returns 200
-        soup = BeautifulSoup(response.text, "html.parser")
-        error_span = soup.find("span", id="save-button-container")
-        assert error_span is not None
-        assert CSS_ERROR_CLASS in error_span.get("class", [])
-        assert (
-            "Please add at least one instruction to the recipe."
-            in error_span.get_text(strip=True)
-        )
-        mock_post.assert_called_once()
-
-    @pytest.mark.anyio
-    async def test_save_recipe_api_call_422_malformed_detail(
-        self, client: AsyncClient, monkeypatch
-    ):
-        """Test 422 error from API with malformed/unexpected detail structure."""
-        # Scenario 1: Detail is a string, not a list of dicts
-        mock_response_string_detail = httpx.Response(
-            status_code=422,
-            json={"detail": "A simple error string, not a list of error objects"},
-            request=httpx.Request("POST", "/api/v0/recipes"),
-        )
-        mock_post_string_detail = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                message="Unprocessable Entity",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=mock_response_string_detail,
-            )
-        )
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post",
-            mock_post_string_detail,
-        )
-
-        form_data = {
-            FIELD_NAME: "Malformed Detail Test 1",
-            FIELD_INGREDIENTS: ["ingredient1"],
-            FIELD_INSTRUCTIONS: ["instruction1"],
         }
         response = await client.post(RECIPES_SAVE_URL, data=form_data)
         assert response.status_code == 200
@@ -415,44 +229,9 @@ class TestSaveRecipeEndpoint:
         assert error_span is not None
         assert CSS_ERROR_CLASS in error_span.get("class", [])
         assert (
-            "Could not save recipe: Invalid data for some fields."
+            "Please add at least one instruction to the recipe."
             in error_span.get_text(strip=True)
         )
-        mock_post_string_detail.assert_called_once()
-
-        # Scenario 2: Response is not JSON
-        mock_response_non_json = httpx.Response(
-            status_code=422,
-            content=b"This is not JSON content",
-            request=httpx.Request("POST", "/api/v0/recipes"),
-        )
-        mock_post_non_json = AsyncMock(
-            side_effect=httpx.HTTPStatusError(
-                message="Unprocessable Entity",
-                request=httpx.Request("POST", "/api/v0/recipes"),
-                response=mock_response_non_json,
-            )
-        )
-        monkeypatch.setattr(
-            "meal_planner.routers.actions.internal_api_client.post", mock_post_non_json
-        )
-
-        form_data_2 = {
-            FIELD_NAME: "Malformed Detail Test 2",
-            FIELD_INGREDIENTS: ["ingredient1"],
-            FIELD_INSTRUCTIONS: ["instruction1"],
-        }
-        response_2 = await client.post(RECIPES_SAVE_URL, data=form_data_2)
-        assert response_2.status_code == 200
-        soup_2 = BeautifulSoup(response_2.text, "html.parser")
-        error_span_2 = soup_2.find("span", id="save-button-container")
-        assert error_span_2 is not None
-        assert CSS_ERROR_CLASS in error_span_2.get("class", [])
-        assert (
-            "Could not save recipe: Invalid data for some fields."
-            in error_span_2.get_text(strip=True)
-        )
-        mock_post_non_json.assert_called_once()
 
 
 # Fixtures for TestModifyRecipeEndpoint
@@ -909,6 +688,43 @@ class TestModifyRecipeEndpoint:
         assert form_data_from_html[FIELD_INGREDIENTS] == current_recipe.ingredients
         assert form_data_from_html[FIELD_MODIFICATION_PROMPT] == modification_prompt
 
+    @patch(
+        "meal_planner.routers.actions.generate_modified_recipe", new_callable=AsyncMock
+    )
+    async def test_modify_recipe_unit_conversion_skips_llm(
+        self, mock_llm_modify: AsyncMock, client: AsyncClient
+    ):
+        """Test that unit conversion requests are answered without the LLM."""
+        recipe = RecipeBase(
+            name="Pancakes",
+            ingredients=["1 1/2 cups flour", "1 1/4 cups milk"],
+            instructions=["Mix.", "Bake at 400°F for 10 minutes."],
+        )
+        form_data = {
+            FIELD_NAME: recipe.name,
+            FIELD_INGREDIENTS: recipe.ingredients,
+            FIELD_INSTRUCTIONS: recipe.instructions,
+            FIELD_ORIGINAL_NAME: recipe.name,
+            FIELD_ORIGINAL_INGREDIENTS: recipe.ingredients,
+            FIELD_ORIGINAL_INSTRUCTIONS: recipe.instructions,
+            FIELD_MODIFICATION_PROMPT: "Convert to metric please",
+        }
+
+        response = await client.post(RECIPES_MODIFY_URL, data=form_data)
+        assert response.status_code == 200
+
+        mock_llm_modify.assert_not_called()
+        current_data_from_html = extract_current_recipe_data_from_html(response.text)
+        assert current_data_from_html["ingredients"] == ["190 g flour", "300 ml milk"]
+        assert current_data_from_html["instructions"] == [
+            "Mix.",
+            "Bake at 200°C for 10 minutes.",
+        ]
+        full_form_data_from_html = extract_full_edit_form_data(response.text)
+        assert (
+            full_form_data_from_html[FIELD_ORIGINAL_INGREDIENTS] == recipe.ingredients
+        )
+
 
 @pytest.mark.anyio
 class TestExtractRecipeEndpoint:
@@ -1251,6 +1067,129 @@ class TestExtractRecipeEndpoint:
         assert soup.find("div", id="edit-form-target") is None
 
 
+@pytest.mark.anyio
+class TestSpeculativeExtraction:
+    RECIPE = RecipeBase.model_construct(
+        name="Speculated", ingredients=["i"], instructions=[]
+    )
+
+    async def _run(self, client: AsyncClient, text: str, key: str | None):
+        return await client.post(
+            RECIPES_EXTRACT_RUN_URL,
+            data={FIELD_RECIPE_TEXT: text, "speculation_key": key or ""},
+        )
+
+    async def test_unchanged_text_uses_speculative_extraction(
+        self, client: AsyncClient, speculative_extractions
+    ):
+        speculative_extractions.enabled = True
+        key = speculative_extractions.start(
+            "Fetched text", AsyncMock(return_value=self.RECIPE)
+        )
+
+        with patch(
+            "meal_planner.routers.actions.generate_recipe_from_text",
+            new_callable=AsyncMock,
+        ) as mock_generate:
+            response = await self._run(client, "Fetched text\r\n", key)
+
+        mock_generate.assert_not_called()
+        assert "Recipe extraction resulted in missing instructions." in response.text
+        assert speculative_extractions.metrics()["hits"] == 1
+
+    async def test_edited_text_cancels_speculative_extraction(
+        self, client: AsyncClient, speculative_extractions
+    ):
+        speculative_extractions.enabled = True
+        key = speculative_extractions.start(
+            "Fetched text", AsyncMock(return_value=self.RECIPE)
+        )
+
+        with patch(
+            "meal_planner.routers.actions.generate_recipe_from_text",
+            new_callable=AsyncMock,
+            return_value=self.RECIPE,
+        ) as mock_generate:
+            await self._run(client, "Fetched text, edited", key)
+
+        mock_generate.assert_called_once_with(text="Fetched text, edited")
+        assert speculative_extractions.metrics()["cancelled"] == 1
+        assert len(speculative_extractions) == 0
+
+    async def test_failed_speculative_extraction_extracts_again(
+        self, client: AsyncClient, speculative_extractions
+    ):
+        speculative_extractions.enabled = True
+        key = speculative_extractions.start(
+            "Fetched text", AsyncMock(side_effect=RuntimeError("LLM down"))
+        )
+
+        with patch(
+            "meal_planner.routers.actions.generate_recipe_from_text",
+            new_callable=AsyncMock,
+            return_value=self.RECIPE,
+        ) as mock_generate:
+            response = await self._run(client, "Fetched text", key)
+
+        mock_generate.assert_called_once_with(text="Fetched text")
+        assert "Recipe extraction resulted in missing instructions." in response.text
+
+
+@pytest.mark.anyio
+class TestNearDuplicateReuse:
+    RECIPE = RecipeBase(name="R", ingredients=["i"], instructions=["s."])
+
+    @pytest.mark.parametrize(
+        "text, allowed", [("Fetched text\r\n", True), ("Fetched, edited", False)]
+    )
+    async def test_run_allows_reuse_for_unedited_fetched_text(
+        self, client: AsyncClient, text: str, allowed: bool
+    ):
+        reuse_allowed = []
+
+        async def extract(text: str) -> RecipeBase:
+            reuse_allowed.append(_reuse_allowed.get())
+            return self.RECIPE
+
+        with patch("meal_planner.routers.actions.generate_recipe_from_text", extract):
+            await client.post(
+                RECIPES_EXTRACT_RUN_URL,
+                data={
+                    FIELD_RECIPE_TEXT: text,
+                    "fetched_text_key": text_key("Fetched text"),
+                },
+            )
+
+        assert reuse_allowed == [allowed]
+
+    @pytest.mark.parametrize(
+        "text, allowed", [("Fetched text", True), ("Fetched, edited", False)]
+    )
+    async def test_stream_allows_reuse_for_unedited_fetched_text(
+        self, client: AsyncClient, text: str, allowed: bool
+    ):
+        reuse_allowed = []
+
+        async def stream(text: str):
+            reuse_allowed.append(_reuse_allowed.get())
+            yield self.RECIPE
+
+        response = await client.post(
+            RECIPES_EXTRACT_STREAM_URL,
+            data={
+                FIELD_RECIPE_TEXT: text,
+                "fetched_text_key": text_key("Fetched text"),
+            },
+        )
+        stream_url = BeautifulSoup(response.text, "html.parser").find(
+            "div", id="extraction-stream"
+        )["sse-connect"]
+        with patch("meal_planner.routers.actions.stream_recipe_from_text", stream):
+            await client.get(stream_url)
+
+        assert reuse_allowed == [allowed]
+
+
 @pytest.mark.anyio
 async def test_extract_run_returns_save_form(
     client: AsyncClient, monkeypatch, mock_recipe_data_fixture: RecipeBase
@@ -1333,79 +1272,449 @@ class TestDeleteRecipeEndpoint:
     TEST_UUID = "12345678-1234-1234-1234-123456789012"
     NOT_FOUND_UUID = "99999999-9999-9999-9999-999999999999"
 
-    @patch("meal_planner.routers.actions.internal_api_client", autospec=True)
-    async def test_delete_recipe_success(
+    async def test_delete_recipe_success(self, client: AsyncClient):
+        """Test successful recipe deletion."""
+        create_resp = await client.post(
+            "/api/v0/recipes",
+            json={"name": "To Delete", "ingredients": ["i"], "instructions": ["s"]},
+        )
+        recipe_id = create_resp.json()["id"]
+
+        response = await client.post(self.DELETE_PATH, params={"recipe_id": recipe_id})
+        assert response.status_code == 200
+        assert response.headers.get("HX-Trigger") == "recipeListChanged"
+
+        get_response = await client.get(f"/api/v0/recipes/{recipe_id}")
+        assert get_response.status_code == 404
+
+    async def test_delete_recipe_not_found(self, client: AsyncClient):
+        """Test deletion of non-existent recipe."""
+        response = await client.post(
+            self.DELETE_PATH, params={"recipe_id": self.NOT_FOUND_UUID}
+        )
+        assert response.status_code == 404
+
+    @patch(
+        "meal_planner.routers.actions.RecipeService.delete",
+        side_effect=RecipeStorageError("Database error deleting recipe"),
+    )
+    async def test_delete_recipe_storage_error(
         self,
-        mock_api_client: AsyncMock,
+        mock_delete: MagicMock,
         client: AsyncClient,
     ):
-        """Test successful recipe deletion."""
-        mock_api_client.delete.return_value = create_mock_api_response(status_code=204)
+        """Test storage error during deletion."""
+        response = await client.post(
+            self.DELETE_PATH, params={"recipe_id": self.TEST_UUID}
+        )
+        assert response.status_code == 500
+        mock_delete.assert_called_once_with(self.TEST_UUID)
 
+    @patch(
+        "meal_planner.routers.actions.RecipeService.delete",
+        side_effect=Exception("Generic failure"),
+    )
+    async def test_delete_recipe_generic_error(
+        self,
+        mock_delete: MagicMock,
+        client: AsyncClient,
+    ):
+        """Test generic error during deletion."""
         response = await client.post(
             self.DELETE_PATH, params={"recipe_id": self.TEST_UUID}
         )
-        assert response.status_code == 200
-        assert response.headers.get("HX-Trigger") == "recipeListChanged"
-        mock_api_client.delete.assert_called_once_with(f"/v0/recipes/{self.TEST_UUID}")
+        assert response.status_code == 500
+        mock_delete.assert_called_once_with(self.TEST_UUID)
 
-    @patch("meal_planner.routers.actions.internal_api_client", autospec=True)
-    async def test_delete_recipe_not_found(
+
+@pytest.mark.anyio
+class TestJobQueueMode:
+    @pytest.fixture(autouse=True)
+    def enable_job_queue(self, monkeypatch):
+        monkeypatch.setattr("meal_planner.routers.actions.JOB_QUEUE_ENABLED", True)
+
+    def _poller(self, response) -> tuple[str, Tag]:
+        poller = BeautifulSoup(response.text, "html.parser").find(
+            "div", id=lambda value: value and value.startswith("job-")
+        )
+        assert poller is not None
+        assert poller["hx-trigger"].startswith("every ")
+        return poller["hx-get"], poller
+
+    async def test_modification_runs_as_job(
         self,
-        mock_api_client: AsyncMock,
         client: AsyncClient,
+        mock_original_recipe_fixture: RecipeBase,
+        mock_llm_modified_recipe_fixture: RecipeBase,
     ):
-        """Test deletion of non-existent recipe."""
-        http_error = httpx.HTTPStatusError(
-            "Not Found",
-            request=httpx.Request("DELETE", f"/v0/recipes/{self.NOT_FOUND_UUID}"),
-            response=httpx.Response(404),
+        recipe = mock_original_recipe_fixture
+        form_data = {
+            FIELD_NAME: recipe.name,
+            FIELD_INGREDIENTS: recipe.ingredients,
+            FIELD_INSTRUCTIONS: recipe.instructions,
+            FIELD_ORIGINAL_NAME: recipe.name,
+            FIELD_ORIGINAL_INGREDIENTS: recipe.ingredients,
+            FIELD_ORIGINAL_INSTRUCTIONS: recipe.instructions,
+            FIELD_MODIFICATION_PROMPT: "Make it spicier",
+        }
+
+        with patch(
+            "meal_planner.routers.actions.generate_modified_recipe",
+            new_callable=AsyncMock,
+            return_value=mock_llm_modified_recipe_fixture,
+        ) as mock_llm_modify:
+            response = await client.post(RECIPES_MODIFY_URL, data=form_data)
+            job_url, poller = self._poller(response)
+            assert poller["hx-target"] == "#edit-form-target"
+            mock_llm_modify.assert_not_called()
+
+            assert (await client.get(job_url)).status_code == 204
+            assert await job_queue.run_next() is True
+
+        mock_llm_modify.assert_called_once_with(
+            current_recipe=recipe, modification_request="Make it spicier"
+        )
+        response = await client.get(job_url)
+        assert response.status_code == 200
+        current = extract_current_recipe_data_from_html(response.text)
+        assert current["name"] == mock_llm_modified_recipe_fixture.name
+        full_form = extract_full_edit_form_data(response.text)
+        assert full_form[FIELD_ORIGINAL_NAME] == recipe.name
+        assert full_form[FIELD_MODIFICATION_PROMPT] == "Make it spicier"
+
+    async def test_modification_job_error_keeps_recipe(
+        self, client: AsyncClient, mock_original_recipe_fixture: RecipeBase
+    ):
+        recipe = mock_original_recipe_fixture
+        form_data = {
+            FIELD_NAME: recipe.name,
+            FIELD_INGREDIENTS: recipe.ingredients,
+            FIELD_INSTRUCTIONS: recipe.instructions,
+            FIELD_ORIGINAL_NAME: recipe.name,
+            FIELD_ORIGINAL_INGREDIENTS: recipe.ingredients,
+            FIELD_ORIGINAL_INSTRUCTIONS: recipe.instructions,
+            FIELD_MODIFICATION_PROMPT: "Make it spicier",
+        }
+
+        with patch(
+            "meal_planner.routers.actions.generate_modified_recipe",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("LLM Service Error: quota exceeded"),
+        ):
+            response = await client.post(RECIPES_MODIFY_URL, data=form_data)
+            job_url, _ = self._poller(response)
+            await job_queue.run_next()
+
+        response = await client.get(job_url)
+        assert "LLM Service Error: quota exceeded" in response.text
+        current = extract_current_recipe_data_from_html(response.text)
+        assert current["name"] == recipe.name
+
+    async def test_extraction_job_failure(self, client: AsyncClient):
+        response = await client.post(
+            RECIPES_EXTRACT_RUN_URL, data={FIELD_RECIPE_TEXT: "Some recipe text"}
         )
-        mock_api_client.delete.return_value = create_mock_api_response(
-            status_code=404, error_to_raise=http_error
+        job_url, poller = self._poller(response)
+        assert poller["hx-target"] == "this"
+
+        with patch(
+            "meal_planner.routers.actions.generate_recipe_from_text",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("LLM down"),
+        ) as mock_generate:
+            await job_queue.run_next()
+
+        mock_generate.assert_called_once_with(text="Some recipe text")
+        response = await client.get(job_url)
+        error_div = BeautifulSoup(response.text, "html.parser").find(
+            "div", id="error-message-container"
         )
+        assert "Recipe extraction failed" in error_div.get_text()
+
+    async def test_unknown_job(self, client: AsyncClient):
+        response = await client.get("/recipes/jobs/missing")
+
+        assert response.headers["HX-Retarget"] == "#job-missing"
+        assert "This job has expired" in response.text
+
+
+def _parse_sse(body: str) -> list[tuple[str, str]]:
+    """Split an event-stream body into (event, data) pairs."""
+    messages = []
+    for block in body.strip().split("\n\n"):
+        lines = block.split("\n")
+        event = next(line[7:] for line in lines if line.startswith("event: "))
+        data = "\n".join(line[6:] for line in lines if line.startswith("data: "))
+        messages.append((event, data))
+    return messages
 
+
+def _partial_stream(*items: RecipeBase):
+    async def stream(text: str):
+        for item in items:
+            yield item
+
+    return stream
+
+
+@pytest.mark.anyio
+class TestExtractRecipeStreamEndpoint:
+    async def _start(self, client: AsyncClient, text: str = "Some recipe text") -> str:
         response = await client.post(
-            self.DELETE_PATH, params={"recipe_id": self.NOT_FOUND_UUID}
+            RECIPES_EXTRACT_STREAM_URL, data={FIELD_RECIPE_TEXT: text}
         )
-        assert response.status_code == 404
-        mock_api_client.delete.assert_called_once_with(
-            f"/v0/recipes/{self.NOT_FOUND_UUID}"
+        assert response.status_code == 200
+        soup = BeautifulSoup(response.text, "html.parser")
+        stream_div = soup.find("div", id="extraction-stream")
+        assert stream_div is not None
+        assert stream_div.get("hx-ext") == "sse"
+        assert stream_div.get("sse-close") == "done"
+        return stream_div["sse-connect"]
+
+    async def test_streams_previews_then_edit_form(self, client: AsyncClient):
+        complete = RecipeBase(
+            name="Pancakes", ingredients=["1 cup flour"], instructions=["Mix."]
+        )
+        partials = (
+            RecipeBase.model_construct(
+                name="Panc", ingredients=None, instructions=None
+            ),
+            RecipeBase.model_construct(
+                name="Pancakes", ingredients=["1 cup flour"], instructions=None
+            ),
+            RecipeBase.model_construct(
+                name="Pancakes", ingredients=["1 cup flour"], instructions=None
+            ),
+            complete,
+        )
+        stream_url = await self._start(client)
+
+        with patch(
+            "meal_planner.routers.actions.stream_recipe_from_text",
+            _partial_stream(*partials),
+        ):
+            response = await client.get(stream_url)
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = _parse_sse(response.text)
+        assert [event for event, _ in messages] == [
+            "partial",
+            "partial",
+            "partial",
+            "done",
+        ]
+
+        first_preview = BeautifulSoup(messages[0][1], "html.parser")
+        target = first_preview.find("div", id="edit-form-target")
+        assert target.get("hx-swap-oob") == "innerHTML"
+        assert "Panc" in target.get_text()
+        assert target.find("li") is None
+
+        second_preview = BeautifulSoup(messages[1][1], "html.parser")
+        assert [li.get_text() for li in second_preview.find_all("li")] == [
+            "1 cup flour"
+        ]
+
+        done = BeautifulSoup(messages[-1][1], "html.parser")
+        edit_form = done.find("div", id="edit-form-target")
+        assert edit_form.find("input", {"name": "name"})["value"] == "Pancakes"
+        assert done.find("div", id="review-section-target") is not None
+
+    async def test_stream_id_is_single_use(self, client: AsyncClient):
+        stream_url = await self._start(client)
+        recipe = RecipeBase(name="R", ingredients=["i"], instructions=["s."])
+
+        with patch(
+            "meal_planner.routers.actions.stream_recipe_from_text",
+            _partial_stream(recipe),
+        ):
+            await client.get(stream_url)
+            response = await client.get(stream_url)
+
+        [(event, data)] = _parse_sse(response.text)
+        assert event == "done"
+        assert "This extraction has expired" in data
+
+    async def test_llm_failure_replaces_preview_with_error(self, client: AsyncClient):
+        async def failing_stream(text: str):
+            yield RecipeBase.model_construct(
+                name="Half", ingredients=None, instructions=None
+            )
+            raise RuntimeError("LLM down")
+
+        stream_url = await self._start(client)
+        with (
+            patch(
+                "meal_planner.routers.actions.stream_recipe_from_text", failing_stream
+            ),
+            patch("meal_planner.routers.actions.logger.error") as mock_logger_error,
+        ):
+            response = await client.get(stream_url)
+
+        event, data = _parse_sse(response.text)[-1]
+        assert event == "done"
+        target = BeautifulSoup(data, "html.parser").find("div", id="edit-form-target")
+        assert "Recipe extraction failed" in target.get_text()
+        assert CSS_ERROR_CLASS in target.find("p").get("class", [])
+        mock_logger_error.assert_called_once()
+
+    async def test_missing_instructions_error(self, client: AsyncClient):
+        recipe = RecipeBase.model_construct(
+            name="No Steps", ingredients=["i"], instructions=[]
         )
+        stream_url = await self._start(client)
 
-    @patch("meal_planner.routers.actions.internal_api_client", autospec=True)
-    async def test_delete_recipe_api_error(
-        self,
-        mock_api_client: AsyncMock,
-        client: AsyncClient,
+        with patch(
+            "meal_planner.routers.actions.stream_recipe_from_text",
+            _partial_stream(recipe),
+        ):
+            response = await client.get(stream_url)
+
+        event, data = _parse_sse(response.text)[-1]
+        assert event == "done"
+        assert "Recipe extraction resulted in missing instructions." in data
+        assert 'id="edit-form-target"' in data
+
+    async def test_uses_speculative_extraction(
+        self, client: AsyncClient, speculative_extractions
     ):
-        """Test API error during deletion."""
-        http_error = httpx.HTTPStatusError(
-            "Internal Server Error",
-            request=httpx.Request("DELETE", f"/v0/recipes/{self.TEST_UUID}"),
-            response=httpx.Response(500),
+        speculative_extractions.enabled = True
+        recipe = RecipeBase.model_construct(
+            name="Speculated", ingredients=["i"], instructions=[]
+        )
+        key = speculative_extractions.start(
+            "Some recipe text", AsyncMock(return_value=recipe)
         )
-        mock_api_client.delete.return_value = create_mock_api_response(
-            status_code=500, error_to_raise=http_error
+        response = await client.post(
+            RECIPES_EXTRACT_STREAM_URL,
+            data={FIELD_RECIPE_TEXT: "Some recipe text", "speculation_key": key},
         )
+        stream_url = BeautifulSoup(response.text, "html.parser").find(
+            "div", id="extraction-stream"
+        )["sse-connect"]
+
+        with patch(
+            "meal_planner.routers.actions.stream_recipe_from_text"
+        ) as mock_stream:
+            response = await client.get(stream_url)
+
+        mock_stream.assert_not_called()
+        [(event, data)] = _parse_sse(response.text)
+        assert event == "done"
+        assert "Recipe extraction resulted in missing instructions." in data
+        assert speculative_extractions.metrics()["hits"] == 1
 
+    async def test_no_text_returns_error(self, client: AsyncClient):
         response = await client.post(
-            self.DELETE_PATH, params={"recipe_id": self.TEST_UUID}
+            RECIPES_EXTRACT_STREAM_URL, data={FIELD_RECIPE_TEXT: ""}
         )
-        assert response.status_code == 500
-        mock_api_client.delete.assert_called_once_with(f"/v0/recipes/{self.TEST_UUID}")
 
-    @patch("meal_planner.routers.actions.internal_api_client", autospec=True)
-    async def test_delete_recipe_generic_error(
-        self,
-        mock_api_client: AsyncMock,
-        client: AsyncClient,
+        assert response.status_code == 200
+        assert "No text content provided for extraction." in response.text
+        assert "sse-connect" not in response.text
+
+
+def _roundup(*names: str) -> str:
+    sections = [
+        f"## {name}\n\n  * 1 cup rice\n  * 200 g {name.lower()}\n\n"
+        f"  1. Bring the rice and water to a boil, then simmer.\n"
+        f"  2. Stir in the {name.lower()} and cook through."
+        for name in names
+    ]
+    return "\n\n".join(["# Weeknight Dinners", *sections])
+
+
+@pytest.mark.anyio
+class TestMultiRecipeExtraction:
+    TEXT = _roundup("Chicken", "Tofu")
+    RECIPES = [
+        RecipeBase(name="Chicken", ingredients=["1 cup rice"], instructions=["Boil."]),
+        RecipeBase(name="Tofu", ingredients=["200 g tofu"], instructions=["Fry."]),
+    ]
+
+    @pytest.fixture(autouse=True)
+    def mock_extract(self, monkeypatch):
+        extract = AsyncMock(side_effect=self.RECIPES)
+        monkeypatch.setattr(
+            "meal_planner.routers.actions.multi_recipe_extractor.extract", extract
+        )
+        return extract
+
+    def _picker(self, html: str) -> Tag:
+        picker = BeautifulSoup(html, "html.parser").find(id="recipe-picker")
+        assert picker is not None
+        return picker
+
+    async def test_run_shows_picker_and_first_recipe(
+        self, client: AsyncClient, mock_extract: AsyncMock
     ):
-        """Test generic error during deletion."""
-        mock_api_client.delete.side_effect = Exception("Generic API failure")
+        with patch(
+            "meal_planner.routers.actions.generate_recipe_from_text"
+        ) as mock_generate:
+            response = await client.post(
+                RECIPES_EXTRACT_RUN_URL, data={FIELD_RECIPE_TEXT: self.TEXT}
+            )
+
+        mock_generate.assert_not_called()
+        assert mock_extract.await_count == 2
+        picker = self._picker(response.text)
+        assert [button.get_text() for button in picker.find_all("button")] == [
+            "Chicken",
+            "Tofu",
+        ]
+        assert extract_current_recipe_data_from_html(response.text)["name"] == (
+            "Chicken"
+        )
+
+    async def test_pick_renders_chosen_recipe(self, client: AsyncClient):
+        recipes = json.dumps([recipe.model_dump() for recipe in self.RECIPES])
 
         response = await client.post(
-            self.DELETE_PATH, params={"recipe_id": self.TEST_UUID}
+            RECIPES_EXTRACT_PICK_URL, data={"recipes": recipes, "choice": "1"}
         )
-        assert response.status_code == 500
-        mock_api_client.delete.assert_called_once_with(f"/v0/recipes/{self.TEST_UUID}")
+
+        assert extract_current_recipe_data_from_html(response.text)["name"] == "Tofu"
+        selected = self._picker(response.text).find_all("button")[1]
+        assert selected["hx-vals"] == '{"choice": 1}'
+
+    @pytest.mark.parametrize(
+        "recipes, choice", [("[]", "0"), ("not json", "0"), ('[{"name": "X"}]', "0")]
+    )
+    async def test_pick_invalid_recipes(self, client: AsyncClient, recipes, choice):
+        response = await client.post(
+            RECIPES_EXTRACT_PICK_URL, data={"recipes": recipes, "choice": choice}
+        )
+
+        error_div = BeautifulSoup(response.text, "html.parser").find(
+            "div", id="error-message-container"
+        )
+        assert "Invalid recipe choice" in error_div.get_text()
+
+    async def test_stream_sends_progress_then_picker(self, client: AsyncClient):
+        response = await client.post(
+            RECIPES_EXTRACT_STREAM_URL, data={FIELD_RECIPE_TEXT: self.TEXT}
+        )
+        stream_url = BeautifulSoup(response.text, "html.parser").find(
+            "div", id="extraction-stream"
+        )["sse-connect"]
+
+        response = await client.get(stream_url)
+
+        messages = _parse_sse(response.text)
+        assert [event for event, _ in messages] == ["partial", "done"]
+        assert "Extracting 2 recipes..." in messages[0][1]
+        assert len(self._picker(messages[1][1]).find_all("button")) == 2
+
+    async def test_job_stores_every_recipe(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr("meal_planner.routers.actions.JOB_QUEUE_ENABLED", True)
+        response = await client.post(
+            RECIPES_EXTRACT_RUN_URL, data={FIELD_RECIPE_TEXT: self.TEXT}
+        )
+        job_id = BeautifulSoup(response.text, "html.parser").find(
+            "div", id=lambda value: value and value.startswith("job-")
+        )["id"][len("job-") :]
+
+        await job_queue.run_next()
+
+        result = job_queue.get(job_id).result
+        assert [recipe["name"] for recipe in result["recipes"]] == ["Chicken", "Tofu"]
@@ -1,11 +1,10 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import MagicMock, patch
 
-import httpx
 import pytest
-from httpx import AsyncClient, Request, Response
+from httpx import AsyncClient
 
+from meal_planner.services.recipes import RecipeStorageError
 from tests.constants import RECIPES_LIST_PATH
-from tests.test_helpers import create_mock_api_response
 
 
 @pytest.mark.anyio
@@ -17,77 +16,67 @@ async def test_root(client: AsyncClient):
 
 @pytest.mark.anyio
 class TestGetRecipeListPage:
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_api_status_error(
+    @patch(
+        "meal_planner.routers.pages.RecipeService.list_all",
+        side_effect=RecipeStorageError("Database error retrieving recipes"),
+    )
+    async def test_get_recipes_page_storage_error(
         self,
-        mock_api_client: AsyncMock,
+        mock_list_all: MagicMock,
         client: AsyncClient,
     ):
-        http_error = httpx.HTTPStatusError(
-            "Internal Server Error",
-            request=Request("GET", "/v0/recipes"),
-            response=Response(500, request=Request("GET", "/v0/recipes")),
-        )
-        mock_api_client.get.return_value = create_mock_api_response(
-            status_code=500, error_to_raise=http_error
-        )
-
         response = await client.get(RECIPES_LIST_PATH)
         assert response.status_code == 200
         assert "<title>Error</title>" in response.text
-        assert "Error fetching recipes from API." in response.text
+        assert "Error fetching recipes." in response.text
         assert 'id="recipe-list-area"' in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
+        mock_list_all.assert_called_once_with()
 
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_api_error_htmx(
+    @patch(
+        "meal_planner.routers.pages.RecipeService.list_all",
+        side_effect=RecipeStorageError("Database error retrieving recipes"),
+    )
+    async def test_get_recipes_page_storage_error_htmx(
         self,
-        mock_api_client: AsyncMock,
+        mock_list_all: MagicMock,
         client: AsyncClient,
     ):
-        """Test API error handling via HTMX request."""
-        http_error = httpx.HTTPStatusError(
-            "Internal Server Error",
-            request=Request("GET", "/v0/recipes"),
-            response=Response(500, request=Request("GET", "/v0/recipes")),
-        )
-        mock_api_client.get.return_value = create_mock_api_response(
-            status_code=500, error_to_raise=http_error
-        )
-
+        """Test storage error handling via HTMX request."""
         headers = {"HX-Request": "true"}
         response = await client.get(RECIPES_LIST_PATH, headers=headers)
 
         assert response.status_code == 200
         assert "<title>" not in response.text
         assert 'id="recipe-list-area"' in response.text
-        assert "Error fetching recipes from API." in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
-
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_api_generic_error(
+        assert "Error fetching recipes." in response.text
+        mock_list_all.assert_called_once_with()
+
+    @patch(
+        "meal_planner.routers.pages.RecipeService.list_all",
+        side_effect=Exception("Generic failure"),
+    )
+    async def test_get_recipes_page_generic_error(
         self,
-        mock_api_client: AsyncMock,
+        mock_list_all: MagicMock,
         client: AsyncClient,
     ):
-        mock_api_client.get.side_effect = Exception("Generic API failure")
-
         response = await client.get(RECIPES_LIST_PATH)
         assert response.status_code == 200
         assert "<title>Error</title>" in response.text
         assert "An unexpected error occurred while fetching recipes." in response.text
         assert 'id="recipe-list-area"' in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
+        mock_list_all.assert_called_once_with()
 
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_api_generic_error_htmx(
+    @patch(
+        "meal_planner.routers.pages.RecipeService.list_all",
+        side_effect=Exception("Generic failure"),
+    )
+    async def test_get_recipes_page_generic_error_htmx(
         self,
-        mock_api_client: AsyncMock,
+        mock_list_all: MagicMock,
         client: AsyncClient,
     ):
         """Test generic error handling via HTMX request."""
-        mock_api_client.get.side_effect = Exception("Generic API failure")
-
         headers = {"HX-Request": "true"}
         response = await client.get(RECIPES_LIST_PATH, headers=headers)
 
@@ -95,20 +84,14 @@ class TestGetRecipeListPage:
         assert "<title>" not in response.text
         assert 'id="recipe-list-area"' in response.text
         assert "An unexpected error occurred while fetching recipes." in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
+        mock_list_all.assert_called_once_with()
 
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_success_with_data(
-        self,
-        mock_api_client: AsyncMock,
-        client: AsyncClient,
-    ):
-        mock_api_client.get.return_value = create_mock_api_response(
-            status_code=200,
-            json_data=[
-                {"id": "7dfc4e17-5b0c-4e08-8de1-8db9e7321711", "name": "Recipe One"}
-            ],
+    async def test_get_recipes_page_success_with_data(self, client: AsyncClient):
+        create_resp = await client.post(
+            "/api/v0/recipes",
+            json={"name": "Recipe One", "ingredients": ["i"], "instructions": ["s"]},
         )
+        recipe_id = create_resp.json()["id"]
 
         response = await client.get(RECIPES_LIST_PATH)
         assert response.status_code == 200
@@ -116,25 +99,19 @@ class TestGetRecipeListPage:
         assert 'id="recipe-list-area"' in response.text
         assert '<ul id="recipe-list-ul">' in response.text
         assert "Recipe One" in response.text
-        assert 'id="recipe-item-7dfc4e17-5b0c-4e08-8de1-8db9e7321711"' in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
+        assert f'id="recipe-item-{recipe_id}"' in response.text
 
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_success_htmx(
-        self,
-        mock_api_client: AsyncMock,
-        client: AsyncClient,
-    ):
+    async def test_get_recipes_page_success_htmx(self, client: AsyncClient):
         """Test successful recipe list retrieval via HTMX request."""
-        mock_api_client.get.return_value = create_mock_api_response(
-            status_code=200,
-            json_data=[
-                {
-                    "id": "7dfc4e17-5b0c-4e08-8de1-8db9e7321711",
-                    "name": "Recipe One HTMX",
-                }
-            ],
+        create_resp = await client.post(
+            "/api/v0/recipes",
+            json={
+                "name": "Recipe One HTMX",
+                "ingredients": ["i"],
+                "instructions": ["s"],
+            },
         )
+        recipe_id = create_resp.json()["id"]
 
         headers = {"HX-Request": "true"}
         response = await client.get(RECIPES_LIST_PATH, headers=headers)
@@ -144,74 +121,49 @@ class TestGetRecipeListPage:
         assert 'id="recipe-list-area"' in response.text
         assert '<ul id="recipe-list-ul">' in response.text
         assert "Recipe One HTMX" in response.text
-        assert 'id="recipe-item-7dfc4e17-5b0c-4e08-8de1-8db9e7321711"' in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
-
-    @patch("meal_planner.routers.pages.internal_api_client", autospec=True)
-    async def test_get_recipes_page_success_no_data(
-        self,
-        mock_api_client: AsyncMock,
-        client: AsyncClient,
-    ):
-        mock_api_client.get.return_value = create_mock_api_response(
-            status_code=200, json_data=[]
-        )
+        assert f'id="recipe-item-{recipe_id}"' in response.text
 
+    async def test_get_recipes_page_success_no_data(self, client: AsyncClient):
         response = await client.get(RECIPES_LIST_PATH)
         assert response.status_code == 200
         assert "<title>All Recipes</title>" in response.text
         assert "No recipes found." in response.text
         assert 'id="recipe-list-area"' in response.text
-        mock_api_client.get.assert_called_once_with("/v0/recipes")
 
 
 @pytest.mark.anyio
 class TestGetSingleRecipePage:
     RECIPE_ID = "12345678-1234-1234-1234-123456789012"
-    API_URL = f"/v0/recipes/{RECIPE_ID}"
     PAGE_URL = f"/recipes/{RECIPE_ID}"
 
-    @patch("meal_planner.routers.pages.internal_api_client.get")
-    async def test_get_single_recipe_page_api_404(
-        self, mock_api_get, client: AsyncClient
-    ):
-        """Test handling when the API returns 404 for the recipe ID."""
-        mock_api_get.side_effect = httpx.HTTPStatusError(
-            "Not Found",
-            request=Request("GET", self.API_URL),
-            response=Response(404, request=Request("GET", self.API_URL)),
-        )
+    async def test_get_single_recipe_page_not_found(self, client: AsyncClient):
         response = await client.get(self.PAGE_URL)
         assert response.status_code == 200
         assert "Recipe Not Found" in response.text
-        mock_api_get.assert_awaited_once_with(self.API_URL)
 
-    @patch("meal_planner.routers.pages.internal_api_client.get")
-    async def test_get_single_recipe_page_api_other_status_error(
-        self, mock_api_get, client: AsyncClient
+    @patch(
+        "meal_planner.routers.pages.RecipeService.get",
+        side_effect=RecipeStorageError("Database error retrieving recipe"),
+    )
+    async def test_get_single_recipe_page_storage_error(
+        self, mock_get: MagicMock, client: AsyncClient
     ):
-        """Test handling when the API returns a non-404 status error."""
-        mock_api_get.side_effect = httpx.HTTPStatusError(
-            "Server Error",
-            request=Request("GET", self.API_URL),
-            response=Response(500, request=Request("GET", self.API_URL)),
-        )
         response = await client.get(self.PAGE_URL)
         assert response.status_code == 200
-        assert "Error fetching recipe from API." in response.text
-        assert "Error" in response.text
-        mock_api_get.assert_awaited_once_with(self.API_URL)
-
-    @patch("meal_planner.routers.pages.internal_api_client.get")
-    async def test_get_single_recipe_page_api_generic_error(
-        self, mock_api_get, client: AsyncClient
+        assert "Error fetching recipe." in response.text
+        mock_get.assert_called_once_with(self.RECIPE_ID)
+
+    @patch(
+        "meal_planner.routers.pages.RecipeService.get",
+        side_effect=Exception("Unexpected failure"),
+    )
+    async def test_get_single_recipe_page_generic_error(
+        self, mock_get: MagicMock, client: AsyncClient
     ):
-        """Test handling when the API call raises a generic exception."""
-        mock_api_get.side_effect = Exception("Unexpected API failure")
         response = await client.get(self.PAGE_URL)
         assert response.status_code == 200
         assert "An unexpected error occurred." in response.text
-        mock_api_get.assert_awaited_once_with(self.API_URL)
+        mock_get.assert_called_once_with(self.RECIPE_ID)
 
     async def test_get_single_recipe_page_success(self, client: AsyncClient):
         recipe_payload = {
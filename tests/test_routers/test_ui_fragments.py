@@ -1,5 +1,6 @@
 """Tests for route handlers defined in meal_planner.routers.ui_fragments."""
 
+import asyncio
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -11,7 +12,12 @@ from httpx import AsyncClient
 from pydantic import ValidationError
 
 from meal_planner.models import RecipeBase
-from meal_planner.routers.ui_fragments import _get_http_error_message
+from meal_planner.routers.ui_fragments import (
+    _get_http_error_message,
+    _recipe_event_stream,
+)
+from meal_planner.services.recipe_events import RecipeEvent, RecipeEventBroker
+from meal_planner.services.speculative_extraction import text_key
 from meal_planner.ui.common import CSS_ERROR_CLASS
 from tests.constants import (
     FIELD_INGREDIENTS,
@@ -994,6 +1000,34 @@ class TestFetchTextEndpoint:
         assert f'name="{FIELD_RECIPE_TEXT}"' in response.text
         assert f">{mock_text}</textarea>" in response.text
 
+    async def test_success_starts_speculative_extraction(
+        self, client: AsyncClient, speculative_extractions
+    ):
+        speculative_extractions.enabled = True
+        mock_text = "Fetched and cleaned recipe text."
+
+        with (
+            patch(
+                "meal_planner.routers.ui_fragments.fetch_and_clean_text_from_url",
+                new_callable=AsyncMock,
+                return_value=mock_text,
+            ),
+            patch(
+                "meal_planner.routers.ui_fragments.generate_recipe_from_text",
+                new_callable=AsyncMock,
+            ) as mock_generate,
+        ):
+            response = await client.post(
+                RECIPES_FETCH_TEXT_URL, data={FIELD_RECIPE_URL: self.TEST_URL}
+            )
+            task = speculative_extractions.claim(mock_text)
+            await task
+
+        mock_generate.assert_called_once_with(mock_text)
+        soup = BeautifulSoup(response.text, "html.parser")
+        key_input = soup.find("input", {"name": "speculation_key"})
+        assert key_input["value"] == text_key(mock_text)
+
     async def test_missing_url(self, client: AsyncClient):
         response = await client.post(RECIPES_FETCH_TEXT_URL, data={})
         assert response.status_code == 200
@@ -1694,3 +1728,110 @@ class TestMakesValidationErrorHandling:
 
         # Should return generic error message (not makes-specific)
         assert "Please check your recipe fields" in response.text
+
+
+@pytest.mark.anyio
+class TestRecipeEventStream:
+    async def test_stream_renders_published_event(self):
+        broker = RecipeEventBroker()
+        stream = _recipe_event_stream(broker=broker)
+        next_message = asyncio.ensure_future(anext(stream))
+        while broker.subscriber_count == 0:
+            await asyncio.sleep(0)
+
+        broker.publish(RecipeEvent("deleted", "abc", "Soup"))
+        message = await next_message
+        await stream.aclose()
+
+        assert message.startswith("event: recipe\n")
+        assert 'id="recipe-item-abc"' in message
+        assert 'hx-swap-oob="delete"' in message
+        assert broker.subscriber_count == 0
+
+    async def test_stream_sends_keepalive_when_idle(self):
+        broker = RecipeEventBroker()
+        stream = _recipe_event_stream(broker=broker, keepalive_seconds=0.01)
+
+        message = await anext(stream)
+        await stream.aclose()
+
+        assert message == ": keepalive\n\n"
+
+    async def test_endpoint_returns_event_stream(self, client: AsyncClient):
+        async def finite_stream():
+            yield ": keepalive\n\n"
+
+        with patch(
+            "meal_planner.routers.ui_fragments._recipe_event_stream",
+            return_value=finite_stream(),
+        ):
+            response = await client.get("/recipes/ui/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == ": keepalive\n\n"
+
+
+@pytest.mark.anyio
+class TestScaleRecipeEndpoint:
+    SCALE_URL = "/recipes/ui/scale"
+
+    def _form_data(self, scale_to="12", makes_min="4", makes_max="4") -> dict:
+        form_data = _build_ui_fragment_form_data(
+            ingredients=["1 1/2 cups flour", "2 eggs"]
+        )
+        form_data.update(
+            scale_to=scale_to,
+            makes_min=makes_min,
+            makes_max=makes_max,
+            makes_unit="servings",
+            original_makes_min="4",
+            original_makes_max="4",
+        )
+        return form_data
+
+    async def test_scales_ingredients_without_llm(self, client: AsyncClient):
+        with patch(
+            "meal_planner.services.call_llm.generate_modified_recipe"
+        ) as mock_modify:
+            response = await client.post(self.SCALE_URL, data=self._form_data())
+
+        assert response.status_code == 200
+        mock_modify.assert_not_called()
+        soup = BeautifulSoup(response.text, "html.parser")
+        assert soup.find("div", id="makes-section")
+        assert soup.find("input", {"name": "makes_min"})["value"] == "12"
+        assert soup.find("input", {"name": "makes_max"})["value"] == "12"
+        ingredients_list = soup.find("div", id="ingredients-list")
+        assert ingredients_list["hx-swap-oob"] == "true"
+        values = [i["value"] for i in ingredients_list.find_all("input")]
+        assert "4 1/2 cups flour" in values
+        assert "6 eggs" in values
+        diff = soup.find(
+            "div", attrs={"hx-swap-oob": "innerHTML:#diff-content-wrapper"}
+        )
+        assert "4 1/2 cups flour" in diff.text
+
+    @pytest.mark.parametrize("scale_to", ["", "abc"])
+    async def test_missing_target(self, client: AsyncClient, scale_to):
+        response = await client.post(
+            self.SCALE_URL, data=self._form_data(scale_to=scale_to)
+        )
+
+        assert "Enter the amount to scale the recipe to" in response.text
+        assert 'id="ingredients-list"' not in response.text
+
+    async def test_recipe_without_yield(self, client: AsyncClient):
+        response = await client.post(
+            self.SCALE_URL, data=self._form_data(makes_min="", makes_max="")
+        )
+
+        assert "Set how much the recipe makes before scaling it." in response.text
+        assert 'id="ingredients-list"' not in response.text
+
+    async def test_invalid_recipe_fields(self, client: AsyncClient):
+        form_data = self._form_data()
+        form_data["name"] = ""
+
+        response = await client.post(self.SCALE_URL, data=form_data)
+
+        assert "Please check your recipe fields" in response.text
@@ -0,0 +1,222 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from meal_planner.models import RecipeBase
+from meal_planner.services.bulk_extract import (
+    BulkExtractItem,
+    extract_recipes,
+)
+from meal_planner.services.recipes import RecipeStorageError
+
+pytestmark = pytest.mark.anyio
+
+MODULE = "meal_planner.services.bulk_extract"
+
+
+def _recipe(name: str = "pancakes") -> RecipeBase:
+    return RecipeBase(name=name, ingredients=["1 cup flour"], instructions=["Mix."])
+
+
+async def _collect(*args, **kwargs):
+    return [result async for result in extract_recipes(*args, **kwargs)]
+
+
+@pytest.fixture
+def mock_llm():
+    with patch(f"{MODULE}.generate_recipe_from_text", new_callable=AsyncMock) as llm:
+        llm.side_effect = lambda text: _recipe(text)
+        yield llm
+
+
+@pytest.fixture
+def mock_fetch():
+    with patch(
+        f"{MODULE}.fetch_and_clean_text_from_url", new_callable=AsyncMock
+    ) as fetch:
+        fetch.return_value = "fetched"
+        yield fetch
+
+
+class TestBulkExtractItem:
+    def test_accepts_text_or_url(self):
+        assert BulkExtractItem(text="t").text == "t"
+        assert BulkExtractItem(url="https://example.com").url == "https://example.com"
+
+    @pytest.mark.parametrize("fields", [{}, {"text": "t", "url": "https://x.com"}])
+    def test_requires_exactly_one_source(self, fields):
+        with pytest.raises(ValidationError, match="exactly one"):
+            BulkExtractItem(**fields)
+
+
+async def test_extracts_texts_and_urls(mock_llm, mock_fetch):
+    items = [BulkExtractItem(text="soup"), BulkExtractItem(url="https://x.com/r")]
+
+    results = sorted(await _collect(items), key=lambda r: r.index)
+
+    assert [r.ok for r in results] == [True, True]
+    assert results[0].recipe.name == "Soup"
+    assert results[0].url is None
+    assert results[1].recipe.name == "Fetched"
+    assert results[1].url == "https://x.com/r"
+    mock_fetch.assert_awaited_once_with("https://x.com/r")
+
+
+async def test_results_arrive_in_completion_order(mock_llm):
+    async def slow_first(text):
+        await asyncio.sleep(0.05 if text == "slow" else 0)
+        return _recipe(text)
+
+    mock_llm.side_effect = slow_first
+    items = [BulkExtractItem(text="slow"), BulkExtractItem(text="fast")]
+
+    results = await _collect(items, concurrency=2)
+
+    assert [r.index for r in results] == [1, 0]
+
+
+async def test_concurrency_is_bounded(mock_llm):
+    in_flight = 0
+    peak = 0
+
+    async def tracked(text):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _recipe(text)
+
+    mock_llm.side_effect = tracked
+    items = [BulkExtractItem(text=f"recipe {i}") for i in range(10)]
+
+    results = await _collect(items, concurrency=3)
+
+    assert peak == 3
+    assert sorted(r.index for r in results) == list(range(10))
+
+
+async def test_unsafe_url_is_rejected_without_fetching(mock_llm, mock_fetch):
+    results = await _collect([BulkExtractItem(url="http://127.0.0.1/admin")])
+
+    assert results[0].stage == "fetch"
+    assert results[0].error == "Invalid URL: Loopback addresses are not allowed"
+    mock_fetch.assert_not_awaited()
+    mock_llm.assert_not_awaited()
+
+
+async def test_per_item_errors_do_not_abort_batch(mock_llm, mock_fetch):
+    mock_fetch.side_effect = httpx.ConnectError("refused")
+    mock_llm.side_effect = [RuntimeError("LLM down"), _recipe()]
+    items = [
+        BulkExtractItem(url="https://x.com/r"),
+        BulkExtractItem(text="a"),
+        BulkExtractItem(text="b"),
+    ]
+
+    results = sorted(await _collect(items, concurrency=1), key=lambda r: r.index)
+
+    assert [r.stage for r in results] == ["fetch", "extract", None]
+    assert results[0].error == "Failed to fetch URL: refused"
+    assert results[1].error == "Recipe extraction failed"
+    assert results[2].ok
+
+
+async def test_blank_text_is_an_error(mock_llm):
+    results = await _collect([BulkExtractItem(text="  ")])
+
+    assert results[0].stage == "extract"
+    mock_llm.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "extracted, error",
+    [
+        (
+            RecipeBase.model_construct(
+                name="r", ingredients=["flour"], instructions=[]
+            ),
+            "No instructions found in the recipe text",
+        ),
+        (
+            RecipeBase(name="r", ingredients=["  "], instructions=["Mix."]),
+            "Recipe must have at least one valid ingredient after processing.",
+        ),
+    ],
+)
+async def test_invalid_recipe_is_a_postprocess_error(mock_llm, extracted, error):
+    mock_llm.side_effect = None
+    mock_llm.return_value = extracted
+
+    results = await _collect([BulkExtractItem(text="t")])
+
+    assert results[0].stage == "postprocess"
+    assert results[0].error == error
+
+
+async def test_unexpected_fetch_error_is_reported(mock_llm, mock_fetch):
+    items = [BulkExtractItem(url="https://x.com/r"), BulkExtractItem(text="soup")]
+
+    with patch(f"{MODULE}.validate_url_for_ssrf", side_effect=TypeError("boom")):
+        results = await asyncio.wait_for(_collect(items, concurrency=1), timeout=5)
+
+    assert (results[0].stage, results[0].error) == ("fetch", "Unexpected error: boom")
+    assert results[1].ok
+
+
+async def test_unexpected_postprocess_error_is_reported(mock_llm):
+    items = [BulkExtractItem(text="a"), BulkExtractItem(text="b")]
+
+    with patch(f"{MODULE}.postprocess_recipe", side_effect=RuntimeError("boom")):
+        results = await asyncio.wait_for(_collect(items, concurrency=1), timeout=5)
+
+    assert [(r.stage, r.error) for r in results] == [
+        ("postprocess", "Unexpected error: boom")
+    ] * 2
+
+
+async def test_saves_extracted_recipes(mock_llm):
+    saved = MagicMock()
+    saved.id = "2fea1bd1-f9b8-42db-a942-3d36b600ab43"
+    save = MagicMock(return_value=saved)
+
+    results = await _collect([BulkExtractItem(text="soup")], save=save)
+
+    save.assert_called_once_with(results[0].recipe)
+    assert str(results[0].recipe_id) == saved.id
+
+
+async def test_save_failure_is_reported(mock_llm):
+    save = MagicMock(side_effect=RecipeStorageError("disk full"))
+
+    results = await _collect([BulkExtractItem(text="soup")], save=save)
+
+    assert results[0].stage == "save"
+    assert results[0].error == "Failed to save recipe"
+
+
+async def test_closing_stream_cancels_workers(mock_llm):
+    cancelled = asyncio.Event()
+
+    async def hang(text):
+        if text == "hang":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return _recipe(text)
+
+    mock_llm.side_effect = hang
+    stream = extract_recipes(
+        [BulkExtractItem(text="fast"), BulkExtractItem(text="hang")], concurrency=2
+    )
+
+    first = await anext(stream)
+    await stream.aclose()
+
+    assert first.index == 0
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
@@ -1,20 +1,50 @@
-from pathlib import Path
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from meal_planner.models import RecipeBase
+from meal_planner.config import (
+    RECIPE_EXTRACTION_PROMPT,
+    RECIPE_MODIFICATION_PROMPT,
+    RECIPE_PATCH_PROMPT,
+)
+from meal_planner.models import RecipeBase, RecipeEdit, RecipePatch
 from meal_planner.services.call_llm import (
-    ACTIVE_RECIPE_EXTRACTION_PROMPT_FILE,
-    ACTIVE_RECIPE_MODIFICATION_PROMPT_FILE,
     MODEL_NAME,
     _get_aclient,
-    _get_llm_prompt_path,
     generate_modified_recipe,
     generate_recipe_from_text,
     get_structured_llm_response,
+    stream_recipe_from_text,
 )
 from meal_planner.services.call_llm import logger as llm_service_logger
+from meal_planner.services.llm_client import llm_http_client
+from meal_planner.services.llm_limiter import AdaptiveLimiter
+from meal_planner.services.near_duplicates import allow_near_duplicate_reuse
+from meal_planner.services.prompt_registry import PromptRegistry
+
+ACTIVE_PROMPTS = {
+    "recipe_extraction": RECIPE_EXTRACTION_PROMPT,
+    "recipe_modification": RECIPE_MODIFICATION_PROMPT,
+    "recipe_patch": RECIPE_PATCH_PROMPT,
+}
+
+
+@pytest.fixture
+def prompts(tmp_path, monkeypatch):
+    """Serve prompt templates from a temporary directory.
+
+    Returns a function that writes the active template of a category.
+    """
+    registry = PromptRegistry(tmp_path, registry=None)
+    monkeypatch.setattr("meal_planner.services.call_llm.prompt_registry", registry)
+
+    def write(category: str, content: str) -> None:
+        path = tmp_path / category / f"{ACTIVE_PROMPTS[category]}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    return write
 
 
 @pytest.mark.anyio
@@ -74,23 +104,19 @@ async def test_get_structured_llm_response_generic_exception_explicitly(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch(
     "meal_planner.services.call_llm.get_structured_llm_response",
     new_callable=AsyncMock,
 )
 @patch.object(llm_service_logger, "info")
 async def test_generate_recipe_from_text_success(
-    mock_logger_info, mock_get_structured_response, mock_get_prompt_path
+    mock_logger_info,
+    mock_get_structured_response,
+    prompts,
 ):
     """Test successful recipe generation from text."""
     test_text = "Some recipe text"
-    from unittest.mock import MagicMock
-
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "Prompt template: $page_text"
-    mock_prompt_file.name = "test_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_extraction", "Prompt template: $page_text")
 
     expected_recipe = RecipeBase(
         name="Generated Recipe", ingredients=["ing1"], instructions=["step1"]
@@ -100,17 +126,14 @@ async def test_generate_recipe_from_text_success(
     result = await generate_recipe_from_text(text=test_text)
 
     assert result == expected_recipe
-    mock_get_prompt_path.assert_called_once_with(
-        "recipe_extraction", ACTIVE_RECIPE_EXTRACTION_PROMPT_FILE
-    )
-    mock_prompt_file.read_text.assert_called_once()
     mock_get_structured_response.assert_called_once_with(
         prompt="Prompt template: Some recipe text",
         response_model=RecipeBase,
+        task="recipe_extraction",
     )
     mock_logger_info.assert_any_call("Starting recipe generation from text.")
     mock_logger_info.assert_any_call(
-        "Using extraction prompt file: %s", "test_prompt.txt"
+        "Using extraction prompt file: %s", f"{RECIPE_EXTRACTION_PROMPT}.txt"
     )
     mock_logger_info.assert_any_call(
         "LLM successfully generated recipe: %s", "Generated Recipe"
@@ -118,45 +141,39 @@ async def test_generate_recipe_from_text_success(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch.object(llm_service_logger, "error")
 async def test_generate_recipe_from_text_prompt_file_not_found(
-    mock_logger_error, mock_get_prompt_path
+    mock_logger_error,
+    prompts,
 ):
     """Test FileNotFoundError when prompt file is missing for recipe generation."""
     test_text = "Some recipe text"
-    mock_get_prompt_path.return_value.read_text.side_effect = FileNotFoundError(
-        2, "No such file or directory", "non_existent_prompt.txt"
-    )
-    mock_get_prompt_path.return_value.name = "non_existent_prompt.txt"
+    prompts("recipe_modification", "Unrelated template")
 
     with pytest.raises(FileNotFoundError) as excinfo:
         await generate_recipe_from_text(text=test_text)
 
-    assert excinfo.value.filename == "non_existent_prompt.txt"
+    assert excinfo.value.filename.endswith(f"{RECIPE_EXTRACTION_PROMPT}.txt")
     args, kwargs = mock_logger_error.call_args
     assert args[0] == "Prompt file not found: %s"
-    assert isinstance(args[1], FileNotFoundError)
-    assert args[1].filename == "non_existent_prompt.txt"
+    assert args[1] is excinfo.value
     assert kwargs.get("exc_info") is True
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch(
     "meal_planner.services.call_llm.get_structured_llm_response",
     new_callable=AsyncMock,
 )
 @patch.object(llm_service_logger, "error")
 async def test_generate_recipe_from_text_generic_exception(
-    mock_logger_error, mock_get_structured_response, mock_get_prompt_path
+    mock_logger_error,
+    mock_get_structured_response,
+    prompts,
 ):
     """Test generic Exception during recipe generation from text."""
     test_text = "Some recipe text"
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "Prompt: $page_text"
-    mock_prompt_file.name = "test_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_extraction", "Prompt: $page_text")
 
     generic_exception = ValueError("LLM call failed unexpectedly")
     mock_get_structured_response.side_effect = generic_exception
@@ -175,14 +192,15 @@ async def test_generate_recipe_from_text_generic_exception(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch(
     "meal_planner.services.call_llm.get_structured_llm_response",
     new_callable=AsyncMock,
 )
 @patch.object(llm_service_logger, "info")
 async def test_generate_modified_recipe_success(
-    mock_logger_info, mock_get_structured_response, mock_get_prompt_path
+    mock_logger_info,
+    mock_get_structured_response,
+    prompts,
 ):
     """Test successful recipe modification."""
     current_recipe = RecipeBase(
@@ -190,12 +208,10 @@ async def test_generate_modified_recipe_success(
     )
     modification_request = "Make it vegan"
 
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = (
-        "Mod Prompt: $current_recipe_markdown $modification_prompt"
+    prompts(
+        "recipe_modification",
+        ("Mod Prompt: $current_recipe_markdown $modification_prompt"),
     )
-    mock_prompt_file.name = "mod_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
 
     expected_modified_recipe = RecipeBase(
         name="Vegan Recipe", ingredients=["vegan_ing"], instructions=["vegan_step"]
@@ -205,15 +221,13 @@ async def test_generate_modified_recipe_success(
     result = await generate_modified_recipe(current_recipe, modification_request)
 
     assert result == expected_modified_recipe
-    mock_get_prompt_path.assert_called_once_with(
-        "recipe_modification", ACTIVE_RECIPE_MODIFICATION_PROMPT_FILE
-    )
-    mock_prompt_file.read_text.assert_called_once()
     expected_formatted_prompt = (
         f"Mod Prompt: {current_recipe.markdown} {modification_request}"
     )
     mock_get_structured_response.assert_called_once_with(
-        prompt=expected_formatted_prompt, response_model=RecipeBase
+        prompt=expected_formatted_prompt,
+        response_model=RecipeBase,
+        task="recipe_modification",
     )
     mock_logger_info.assert_any_call(
         "Starting recipe modification. Original: %s, Request: %s",
@@ -221,7 +235,8 @@ async def test_generate_modified_recipe_success(
         modification_request,
     )
     mock_logger_info.assert_any_call(
-        "Using modification prompt file: %s", "mod_prompt.txt"
+        "Using modification prompt file: %s",
+        f"{RECIPE_MODIFICATION_PROMPT}.txt",
     )
     mock_logger_info.assert_any_call(
         "LLM successfully generated modified recipe: %s", "Vegan Recipe"
@@ -229,10 +244,10 @@ async def test_generate_modified_recipe_success(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch.object(llm_service_logger, "error")
 async def test_generate_modified_recipe_prompt_file_not_found(
-    mock_logger_error, mock_get_prompt_path
+    mock_logger_error,
+    prompts,
 ):
     """Test FileNotFoundError when prompt file is missing for recipe modification."""
     current_recipe = RecipeBase(
@@ -240,31 +255,28 @@ async def test_generate_modified_recipe_prompt_file_not_found(
     )
     modification_request = "Make it spicier"
 
-    mock_get_prompt_path.return_value.read_text.side_effect = FileNotFoundError(
-        2, "No such file for mod", "non_existent_mod_prompt.txt"
-    )
-    mock_get_prompt_path.return_value.name = "non_existent_mod_prompt.txt"
+    prompts("recipe_extraction", "Unrelated template")
 
     with pytest.raises(FileNotFoundError) as excinfo:
         await generate_modified_recipe(current_recipe, modification_request)
 
-    assert excinfo.value.filename == "non_existent_mod_prompt.txt"
+    assert excinfo.value.filename.endswith(f"{RECIPE_MODIFICATION_PROMPT}.txt")
     args, kwargs = mock_logger_error.call_args
     assert args[0] == "Prompt file not found: %s"
-    assert isinstance(args[1], FileNotFoundError)
-    assert args[1].filename == "non_existent_mod_prompt.txt"
+    assert args[1] is excinfo.value
     assert kwargs.get("exc_info") is True
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch(
     "meal_planner.services.call_llm.get_structured_llm_response",
     new_callable=AsyncMock,
 )
 @patch.object(llm_service_logger, "error")
 async def test_generate_modified_recipe_generic_exception(
-    mock_logger_error, mock_get_structured_response, mock_get_prompt_path
+    mock_logger_error,
+    mock_get_structured_response,
+    prompts,
 ):
     """Test generic Exception during recipe modification."""
     current_recipe = RecipeBase(
@@ -272,10 +284,7 @@ async def test_generate_modified_recipe_generic_exception(
     )
     modification_request = "Another mod request"
 
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "Mod Prompt: ..."
-    mock_prompt_file.name = "mod_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_modification", "Mod Prompt: ...")
 
     generic_exception = TypeError("LLM modification failed unexpectedly")
     mock_get_structured_response.side_effect = generic_exception
@@ -293,6 +302,79 @@ async def test_generate_modified_recipe_generic_exception(
     )
 
 
+@pytest.mark.anyio
+class TestPatchModification:
+    RECIPE = RecipeBase(
+        name="Pancakes", ingredients=["1 cup flour", "1 egg"], instructions=["Fry."]
+    )
+
+    async def test_applies_patch(self, prompts):
+        prompts("recipe_patch", "Patch: $current_recipe_markdown $modification_prompt")
+        patch_response = RecipePatch(
+            edits=[
+                RecipeEdit(
+                    op="replace", section="ingredients", index=1, text="1 flax egg"
+                )
+            ]
+        )
+
+        with patch(
+            "meal_planner.services.call_llm.get_structured_llm_response",
+            new_callable=AsyncMock,
+            return_value=patch_response,
+        ) as mock_response:
+            result = await generate_modified_recipe(
+                self.RECIPE, "Make it vegan", mode="patch"
+            )
+
+        assert result.ingredients == ["1 cup flour", "1 flax egg"]
+        assert result.instructions == ["Fry."]
+        mock_response.assert_awaited_once()
+        call = mock_response.await_args
+        assert call.kwargs["response_model"] is RecipePatch
+        assert "- [1] 1 egg" in call.kwargs["prompt"]
+        assert call.kwargs["prompt"].endswith("Make it vegan")
+
+    async def test_falls_back_to_rewrite_when_patch_does_not_fit(self, prompts):
+        prompts("recipe_patch", "Patch: $current_recipe_markdown")
+        prompts("recipe_modification", "Rewrite: $current_recipe_markdown")
+        bad_patch = RecipePatch(
+            edits=[RecipeEdit(op="delete", section="ingredients", index=5)]
+        )
+        rewritten = RecipeBase(
+            name="Vegan Pancakes", ingredients=["flour"], instructions=["Fry."]
+        )
+
+        with patch(
+            "meal_planner.services.call_llm.get_structured_llm_response",
+            new_callable=AsyncMock,
+            side_effect=[bad_patch, rewritten],
+        ) as mock_response:
+            result = await generate_modified_recipe(
+                self.RECIPE, "Make it vegan", mode="patch"
+            )
+
+        assert result == rewritten
+        models = [c.kwargs["response_model"] for c in mock_response.await_args_list]
+        assert models == [RecipePatch, RecipeBase]
+
+    async def test_rewrite_mode_does_not_ask_for_patch(self, prompts):
+        prompts("recipe_modification", "Rewrite: $current_recipe_markdown")
+
+        with patch(
+            "meal_planner.services.call_llm.get_structured_llm_response",
+            new_callable=AsyncMock,
+            return_value=self.RECIPE,
+        ) as mock_response:
+            await generate_modified_recipe(self.RECIPE, "Make it vegan", mode="rewrite")
+
+        assert mock_response.await_args.kwargs["response_model"] is RecipeBase
+
+    async def test_unknown_mode(self):
+        with pytest.raises(ValueError, match="Unknown modification mode"):
+            await generate_modified_recipe(self.RECIPE, "Make it vegan", mode="diff")
+
+
 @pytest.mark.anyio
 @patch("meal_planner.services.call_llm._get_aclient")
 @patch.object(llm_service_logger, "debug")
@@ -332,23 +414,20 @@ async def test_get_structured_llm_response_success(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 @patch(
     "meal_planner.services.call_llm.get_structured_llm_response",
     new_callable=AsyncMock,
 )
 async def test_generate_recipe_from_text_with_braces_vulnerability(
-    mock_get_structured_response, mock_get_prompt_path
+    mock_get_structured_response,
+    prompts,
 ):
     """Test that text containing braces is handled safely without format injection."""
     text_with_braces = (
         'Recipe: {"ingredients": ["flour", "sugar"]} and some {placeholder} text'
     )
 
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "Extract recipe from: $page_text"
-    mock_prompt_file.name = "test_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_extraction", "Extract recipe from: $page_text")
 
     mock_get_structured_response.return_value = RecipeBase(
         name="Test Recipe", ingredients=["test"], instructions=["test"]
@@ -366,17 +445,13 @@ async def test_generate_recipe_from_text_with_braces_vulnerability(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 async def test_generate_recipe_from_text_format_string_injection_protection(
-    mock_get_prompt_path,
+    prompts,
 ):
     """Test protection against format string injection attacks."""
     malicious_text = "Recipe: {__import__('os').system('rm -rf /')}"
 
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "Process this: $page_text"
-    mock_prompt_file.name = "test_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_extraction", "Process this: $page_text")
 
     try:
         await generate_recipe_from_text(text=malicious_text)
@@ -387,17 +462,13 @@ async def test_generate_recipe_from_text_format_string_injection_protection(
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
-async def test_generate_recipe_from_text_with_format_placeholders(mock_get_prompt_path):
+async def test_generate_recipe_from_text_with_format_placeholders(prompts):
     """Test that user input containing format placeholders is handled safely."""
     text_with_placeholders = (
         "Recipe: Mix {ingredient1} with {ingredient2} and {missing_key}"
     )
 
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "Extract recipe from: $page_text"
-    mock_prompt_file.name = "test_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_extraction", "Extract recipe from: $page_text")
 
     try:
         await generate_recipe_from_text(text=text_with_placeholders)
@@ -406,17 +477,13 @@ async def test_generate_recipe_from_text_with_format_placeholders(mock_get_promp
 
 
 @pytest.mark.anyio
-@patch("meal_planner.services.call_llm._get_llm_prompt_path")
 async def test_generate_recipe_from_text_demonstrates_format_vulnerability(
-    mock_get_prompt_path,
+    prompts,
 ):
     """Test that demonstrates why str.format() could be problematic."""
     text_with_braces = "Recipe: Use {amount} of flour"
 
-    mock_prompt_file = MagicMock(spec=Path)
-    mock_prompt_file.read_text.return_value = "$page_text"
-    mock_prompt_file.name = "test_prompt.txt"
-    mock_get_prompt_path.return_value = mock_prompt_file
+    prompts("recipe_extraction", "$page_text")
 
     try:
         await generate_recipe_from_text(text=text_with_braces)
@@ -424,14 +491,6 @@ async def test_generate_recipe_from_text_demonstrates_format_vulnerability(
         assert not isinstance(e, (KeyError, ValueError))
 
 
-def test_get_llm_prompt_path():
-    """Test the _get_llm_prompt_path helper function."""
-    result = _get_llm_prompt_path("recipe_extraction", "test_prompt.txt")
-    assert "recipe_extraction" in str(result)
-    assert "test_prompt.txt" in str(result)
-    assert result.name == "test_prompt.txt"
-
-
 @pytest.mark.anyio
 @patch.dict("os.environ", {"GOOGLE_API_KEY": "test_api_key"})
 @patch("meal_planner.services.call_llm.AsyncOpenAI")
@@ -456,6 +515,8 @@ async def test_get_aclient_creates_instructor_client(
     mock_async_openai.assert_called_once_with(
         api_key="test_api_key",
         base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        max_retries=0,
+        http_client=llm_http_client.get(),
     )
 
     # Verify instructor client was created from OpenAI client
@@ -463,3 +524,230 @@ async def test_get_aclient_creates_instructor_client(
 
     # Verify the function returns the instructor client
     assert result is mock_instructor_instance
+    assert await _get_aclient() is result
+
+    # A replaced HTTP client (e.g. after the app restarted) rebuilds it
+    await llm_http_client.close()
+    await _get_aclient()
+    assert mock_async_openai.call_count == 2
+
+
+def _mock_partial_client(*partials):
+    async def create_partial(**kwargs):
+        for partial in partials:
+            yield partial
+
+    mock_aclient = MagicMock()
+    mock_aclient.chat.completions.create_partial = MagicMock(side_effect=create_partial)
+    return mock_aclient
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+@pytest.mark.anyio
+class TestStreamRecipeFromText:
+    async def test_yields_partials_then_complete_recipe(self, prompts):
+        prompts("recipe_extraction", "Extract: $page_text")
+        partials = [
+            RecipeBase.model_construct(name="Pan", ingredients=None, instructions=None),
+            RecipeBase.model_construct(
+                name="Pancakes", ingredients=["flour"], instructions=["Mix."]
+            ),
+        ]
+        mock_aclient = _mock_partial_client(*partials)
+
+        with patch(
+            "meal_planner.services.call_llm._get_aclient", return_value=mock_aclient
+        ):
+            items = await _collect(stream_recipe_from_text("pancake text"))
+
+        assert items[:2] == partials
+        assert type(items[-1]) is RecipeBase
+        assert items[-1] == RecipeBase(
+            name="Pancakes", ingredients=["flour"], instructions=["Mix."]
+        )
+        kwargs = mock_aclient.chat.completions.create_partial.call_args.kwargs
+        assert kwargs["messages"] == [
+            {"role": "user", "content": "Extract: pancake text"}
+        ]
+        assert kwargs["response_model"] is RecipeBase
+
+    async def test_shares_cache_with_generate_recipe_from_text(self, prompts):
+        prompts("recipe_extraction", "Extract: $page_text")
+        complete = RecipeBase(name="Cached", ingredients=["i"], instructions=["s."])
+        mock_aclient = _mock_partial_client(complete)
+
+        with patch(
+            "meal_planner.services.call_llm._get_aclient", return_value=mock_aclient
+        ):
+            await _collect(stream_recipe_from_text("text"))
+            cached_stream = await _collect(stream_recipe_from_text("text"))
+            with patch(
+                "meal_planner.services.call_llm.get_structured_llm_response",
+                new_callable=AsyncMock,
+            ) as mock_llm:
+                generated = await generate_recipe_from_text("text")
+
+        assert cached_stream == [complete]
+        assert generated == complete
+        mock_aclient.chat.completions.create_partial.assert_called_once()
+        mock_llm.assert_not_awaited()
+
+    async def test_incomplete_output_raises_runtime_error(self, prompts):
+        prompts("recipe_extraction", "Extract: $page_text")
+        mock_aclient = _mock_partial_client(
+            RecipeBase.model_construct(name="Half", ingredients=None, instructions=None)
+        )
+
+        with (
+            patch(
+                "meal_planner.services.call_llm._get_aclient",
+                return_value=mock_aclient,
+            ),
+            patch.object(llm_service_logger, "error"),
+            pytest.raises(RuntimeError, match="streaming recipe generation"),
+        ):
+            await _collect(stream_recipe_from_text("text"))
+
+    async def test_empty_stream_raises_runtime_error(self, prompts):
+        prompts("recipe_extraction", "Extract: $page_text")
+
+        with (
+            patch(
+                "meal_planner.services.call_llm._get_aclient",
+                return_value=_mock_partial_client(),
+            ),
+            patch.object(llm_service_logger, "error"),
+            pytest.raises(RuntimeError),
+        ):
+            await _collect(stream_recipe_from_text("text"))
+
+    async def test_slot_is_released_when_upstream_ends(self, prompts):
+        prompts("recipe_extraction", "Extract: $page_text")
+        limiter = AdaptiveLimiter("test", registry=None)
+        complete = RecipeBase(name="R", ingredients=["i"], instructions=["s."])
+        mock_aclient = _mock_partial_client(
+            RecipeBase.model_construct(name="R", ingredients=None, instructions=None),
+            complete,
+        )
+
+        with (
+            patch("meal_planner.services.call_llm.llm_limiter", limiter),
+            patch(
+                "meal_planner.services.call_llm._get_aclient",
+                return_value=mock_aclient,
+            ),
+        ):
+            stream = stream_recipe_from_text("text")
+            await anext(stream)
+            await asyncio.sleep(0)
+
+            assert limiter.in_flight == 0
+            assert [item async for item in stream][-1] == complete
+
+    async def test_closing_stream_cancels_upstream(self, prompts):
+        prompts("recipe_extraction", "Extract: $page_text")
+        limiter = AdaptiveLimiter("test", registry=None)
+        cancelled = asyncio.Event()
+
+        async def create_partial(**kwargs):
+            yield RecipeBase.model_construct(
+                name="R", ingredients=None, instructions=None
+            )
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        mock_aclient = MagicMock()
+        mock_aclient.chat.completions.create_partial = MagicMock(
+            side_effect=create_partial
+        )
+
+        with (
+            patch("meal_planner.services.call_llm.llm_limiter", limiter),
+            patch(
+                "meal_planner.services.call_llm._get_aclient",
+                return_value=mock_aclient,
+            ),
+        ):
+            stream = stream_recipe_from_text("text")
+            await anext(stream)
+            assert limiter.in_flight == 1
+            await stream.aclose()
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+            await asyncio.sleep(0)
+
+        assert limiter.in_flight == 0
+
+    async def test_missing_prompt_raises_file_not_found(self, prompts):
+        with (
+            patch.object(llm_service_logger, "error"),
+            pytest.raises(FileNotFoundError),
+        ):
+            await _collect(stream_recipe_from_text("text"))
+
+
+@pytest.mark.anyio
+async def test_extraction_prompt_uses_reduced_text(prompts):
+    prompts("recipe_extraction", "Extract: $page_text")
+    reducer = MagicMock()
+    reducer.reduce.return_value = "recipe region"
+    recipe = RecipeBase(name="R", ingredients=["i"], instructions=["s"])
+
+    with (
+        patch("meal_planner.services.call_llm.recipe_region_reducer", reducer),
+        patch(
+            "meal_planner.services.call_llm.get_structured_llm_response",
+            new_callable=AsyncMock,
+            return_value=recipe,
+        ) as mock_llm,
+    ):
+        await generate_recipe_from_text("whole page")
+
+    reducer.reduce.assert_called_once_with("whole page")
+    assert mock_llm.await_args.kwargs["prompt"] == "Extract: recipe region"
+
+
+@pytest.mark.anyio
+async def test_near_duplicate_text_reuses_extraction(prompts):
+    prompts("recipe_extraction", "Extract: $page_text")
+    page = " ".join(f"step {i} of the pancake recipe" for i in range(60))
+    recipe = RecipeBase(name="Pancakes", ingredients=["flour"], instructions=["Mix."])
+
+    with (
+        patch(
+            "meal_planner.services.call_llm.get_structured_llm_response",
+            new_callable=AsyncMock,
+            return_value=recipe,
+        ) as mock_llm,
+        allow_near_duplicate_reuse(),
+    ):
+        first = await generate_recipe_from_text(page)
+        reused = await generate_recipe_from_text(page + " Advertisement.")
+        streamed = await _collect(stream_recipe_from_text("Subscribe! " + page))
+
+    assert first == reused == recipe
+    assert streamed == [recipe]
+    mock_llm.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_near_duplicate_reuse_needs_unedited_text(prompts):
+    prompts("recipe_extraction", "Extract: $page_text")
+    page = " ".join(f"step {i} of the pancake recipe" for i in range(60))
+    recipe = RecipeBase(name="Pancakes", ingredients=["flour"], instructions=["Mix."])
+
+    with patch(
+        "meal_planner.services.call_llm.get_structured_llm_response",
+        new_callable=AsyncMock,
+        return_value=recipe,
+    ) as mock_llm:
+        with allow_near_duplicate_reuse():
+            await generate_recipe_from_text(page)
+        await generate_recipe_from_text(page + " Advertisement.")
+
+    assert mock_llm.await_count == 2
@@ -0,0 +1,163 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+import zstandard
+
+from meal_planner.services import db_backup
+from meal_planner.services.db_backup import (
+    backup_database,
+    list_snapshots,
+    main,
+    prune_snapshots,
+)
+
+
+@pytest.fixture
+def source_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "source.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE recipes (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany(
+        "INSERT INTO recipes (name) VALUES (?)",
+        [(f"Recipe {i} " + "x" * 500,) for i in range(200)],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _count_recipes(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_uncompressed_backup_is_complete_copy(source_db: Path, tmp_path: Path):
+    backup_dir = tmp_path / "backups"
+
+    result = backup_database(
+        source_db, backup_dir, pages_per_step=4, step_pause_seconds=0, compress=False
+    )
+
+    assert result.path.parent == backup_dir
+    assert result.path.name.endswith(".db")
+    assert not result.compressed
+    assert _count_recipes(result.path) == 200
+    assert result.steps > 1
+    assert result.pages > 0
+    assert 0 < result.longest_writer_stall_seconds <= result.duration_seconds
+    assert result.size_bytes == result.path.stat().st_size
+    assert not list(backup_dir.glob("*.partial"))
+
+
+def test_compressed_backup_round_trips(source_db: Path, tmp_path: Path):
+    backup_dir = tmp_path / "backups"
+
+    result = backup_database(source_db, backup_dir, compress=True)
+
+    assert result.compressed
+    assert result.path.name.endswith(".db.zst")
+    restored = tmp_path / "restored.db"
+    with result.path.open("rb") as reader, restored.open("wb") as writer:
+        zstandard.ZstdDecompressor().copy_stream(reader, writer)
+    assert _count_recipes(restored) == 200
+    assert result.size_bytes < source_db.stat().st_size
+
+
+def _record_then_write(monkeypatch, source_db: Path, max_writes: int) -> list[int]:
+    writer = sqlite3.connect(source_db)
+    writes: list[int] = []
+    original_record = db_backup._StepTimings.record
+
+    def record(self, status, remaining, total):
+        original_record(self, status, remaining, total)
+        if remaining and len(writes) < max_writes:
+            writer.execute("INSERT INTO recipes (name) VALUES ('concurrent')")
+            writer.commit()
+            writes.append(remaining)
+
+    monkeypatch.setattr(db_backup._StepTimings, "record", record)
+    return writes
+
+
+def test_writers_proceed_between_steps(
+    source_db: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    writes = _record_then_write(monkeypatch, source_db, max_writes=1)
+
+    result = backup_database(
+        source_db, tmp_path / "backups", pages_per_step=8, compress=False
+    )
+
+    assert writes
+    assert result.restarts == 1
+    assert _count_recipes(result.path) == 201
+
+
+def test_constant_writes_fall_back_to_single_step(
+    source_db: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    writes = _record_then_write(monkeypatch, source_db, max_writes=1000)
+
+    result = backup_database(
+        source_db,
+        tmp_path / "backups",
+        pages_per_step=8,
+        compress=False,
+        max_restarts=2,
+    )
+
+    assert result.restarts == 3
+    assert _count_recipes(result.path) == 200 + len(writes)
+
+
+def test_missing_source_raises(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        backup_database(tmp_path / "missing.db", tmp_path / "backups")
+
+
+def test_retention_keeps_most_recent_snapshots(tmp_path: Path):
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    names = [
+        "meal_planner-20260101T000000Z.db.zst",
+        "meal_planner-20260102T000000Z.db",
+        "meal_planner-20260103T000000Z.db.zst",
+        "meal_planner-20260104T000000Z.db.partial",
+        "unrelated.db",
+    ]
+    for name in names:
+        (backup_dir / name).write_bytes(b"")
+
+    removed = prune_snapshots(backup_dir, retention=2)
+
+    assert [p.name for p in removed] == ["meal_planner-20260101T000000Z.db.zst"]
+    assert [p.name for p in list_snapshots(backup_dir)] == [
+        "meal_planner-20260102T000000Z.db",
+        "meal_planner-20260103T000000Z.db.zst",
+    ]
+    assert (backup_dir / "unrelated.db").exists()
+    assert (backup_dir / "meal_planner-20260104T000000Z.db.partial").exists()
+
+
+def test_list_snapshots_missing_dir(tmp_path: Path):
+    assert list_snapshots(tmp_path / "missing") == []
+
+
+def test_cli_runs_backup_and_prints_summary(
+    source_db: Path, tmp_path: Path, capsys: pytest.CaptureFixture
+):
+    backup_dir = tmp_path / "backups"
+
+    result = main(
+        ["--source", str(source_db), "--dest", str(backup_dir), "--no-compress"]
+    )
+
+    assert result.path.exists()
+    assert not result.compressed
+    output = capsys.readouterr().out
+    assert f"Snapshot: {result.path}" in output
+    assert "Longest writer stall:" in output
@@ -0,0 +1,309 @@
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from alembic.config import Config
+from httpx import AsyncClient
+
+from alembic import command
+from meal_planner.services import db_maintenance
+from meal_planner.services.db_maintenance import (
+    ActivityTracker,
+    MaintenanceScheduler,
+    app_activity,
+    run_maintenance,
+    run_maintenance_if_idle,
+)
+
+
+@pytest.fixture
+def fragmented_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "fragmented.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("CREATE TABLE recipes (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany(
+        "INSERT INTO recipes (name) VALUES (?)",
+        [(f"Recipe {i} " + "x" * 2000,) for i in range(300)],
+    )
+    conn.commit()
+    conn.execute("DELETE FROM recipes")
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _freelist_count(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_migration_enables_incremental_auto_vacuum(tmp_path: Path):
+    db_path = tmp_path / "migrated.db"
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    command.upgrade(alembic_cfg, "head")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+def test_run_maintenance_reclaims_free_pages(fragmented_db: Path):
+    free_pages_before = _freelist_count(fragmented_db)
+    size_before = fragmented_db.stat().st_size
+    assert free_pages_before > 0
+
+    result = run_maintenance(fragmented_db, budget_seconds=10)
+
+    assert result.completed == ["optimize", "analyze", "incremental_vacuum"]
+    assert result.skipped == []
+    assert result.pages_reclaimed == free_pages_before
+    assert result.free_pages_remaining == 0
+    assert result.bytes_reclaimed == free_pages_before * 4096
+    assert fragmented_db.stat().st_size < size_before - result.bytes_reclaimed / 2
+    assert _freelist_count(fragmented_db) == 0
+
+
+def test_run_maintenance_stops_when_budget_is_spent(fragmented_db: Path):
+    free_pages_before = _freelist_count(fragmented_db)
+
+    result = run_maintenance(fragmented_db, budget_seconds=0)
+
+    assert result.completed == ["optimize"]
+    assert result.skipped == ["analyze", "incremental_vacuum"]
+    assert result.pages_reclaimed == 0
+    assert result.free_pages_remaining == free_pages_before
+
+
+def test_run_maintenance_vacuums_in_steps(fragmented_db: Path):
+    free_pages_before = _freelist_count(fragmented_db)
+
+    result = run_maintenance(fragmented_db, budget_seconds=10, vacuum_pages_per_step=1)
+
+    assert result.pages_reclaimed == free_pages_before
+    assert result.skipped == []
+
+
+def test_run_maintenance_raises_when_database_is_locked(fragmented_db: Path):
+    writer = sqlite3.connect(fragmented_db, isolation_level=None)
+    writer.execute("BEGIN EXCLUSIVE")
+    try:
+        with (
+            patch.object(db_maintenance, "LOCK_TIMEOUT_SECONDS", 0.01),
+            pytest.raises(sqlite3.OperationalError),
+        ):
+            run_maintenance(fragmented_db, budget_seconds=10)
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_run_maintenance_reports_interrupted_steps(fragmented_db: Path):
+    writer = sqlite3.connect(fragmented_db, isolation_level=None)
+    try:
+        with patch.object(db_maintenance, "LOCK_TIMEOUT_SECONDS", 0.01):
+            original_connect = sqlite3.connect
+
+            def connect_then_lock(*args, **kwargs):
+                conn = original_connect(*args, **kwargs)
+                conn.execute("PRAGMA page_size").fetchone()
+                writer.execute("BEGIN IMMEDIATE")
+                return conn
+
+            with patch.object(db_maintenance.sqlite3, "connect", connect_then_lock):
+                result = run_maintenance(fragmented_db, budget_seconds=10)
+    finally:
+        if writer.in_transaction:
+            writer.execute("ROLLBACK")
+        writer.close()
+
+    assert "incremental_vacuum" in result.skipped
+    assert result.pages_reclaimed == 0
+
+
+def test_run_maintenance_survives_lock_after_interrupted_steps(fragmented_db: Path):
+    free_pages_before = _freelist_count(fragmented_db)
+    writer = sqlite3.connect(fragmented_db, isolation_level=None)
+    original_connect = sqlite3.connect
+
+    class LockedBeforeOptimize:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def execute(self, sql):
+            if sql == "PRAGMA optimize":
+                writer.execute("BEGIN EXCLUSIVE")
+            return self.conn.execute(sql)
+
+        def close(self):
+            self.conn.close()
+
+    try:
+        with (
+            patch.object(db_maintenance, "LOCK_TIMEOUT_SECONDS", 0.01),
+            patch.object(
+                db_maintenance.sqlite3,
+                "connect",
+                lambda *args, **kwargs: LockedBeforeOptimize(
+                    original_connect(*args, **kwargs)
+                ),
+            ),
+        ):
+            result = run_maintenance(fragmented_db, budget_seconds=10)
+    finally:
+        if writer.in_transaction:
+            writer.execute("ROLLBACK")
+        writer.close()
+
+    assert result.completed == []
+    assert result.skipped == ["optimize", "analyze", "incremental_vacuum"]
+    assert result.free_pages_remaining == free_pages_before
+
+
+class TestRunMaintenanceIfIdle:
+    @pytest.fixture
+    def db_with_jobs(self, fragmented_db: Path) -> Path:
+        conn = sqlite3.connect(fragmented_db)
+        conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT)")
+        conn.commit()
+        conn.close()
+        return fragmented_db
+
+    def _add_job(self, db_path: Path, status: str) -> None:
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO jobs VALUES (?, ?)", (status, status))
+        conn.commit()
+        conn.close()
+
+    def test_runs_when_idle(self, db_with_jobs: Path):
+        self._add_job(db_with_jobs, "succeeded")
+
+        result = run_maintenance_if_idle(db_with_jobs, budget_seconds=10)
+
+        assert result is not None
+        assert result.free_pages_remaining == 0
+
+    @pytest.mark.parametrize("status", ["pending", "running"])
+    def test_skips_while_jobs_are_active(self, db_with_jobs: Path, status: str):
+        self._add_job(db_with_jobs, status)
+
+        assert run_maintenance_if_idle(db_with_jobs, budget_seconds=10) is None
+        assert _freelist_count(db_with_jobs) > 0
+
+    def test_skips_while_database_is_written(self, db_with_jobs: Path):
+        writer = sqlite3.connect(db_with_jobs, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            with patch.object(db_maintenance, "LOCK_TIMEOUT_SECONDS", 0.01):
+                assert run_maintenance_if_idle(db_with_jobs) is None
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+        assert _freelist_count(db_with_jobs) > 0
+
+    def test_skips_missing_database(self, tmp_path: Path):
+        assert run_maintenance_if_idle(tmp_path / "missing.db") is None
+
+
+def test_activity_tracker_measures_idle_time():
+    tracker = ActivityTracker()
+    with patch.object(db_maintenance.time, "monotonic", return_value=1000.0):
+        tracker.touch()
+    with patch.object(db_maintenance.time, "monotonic", return_value=1042.5):
+        assert tracker.idle_seconds() == 42.5
+
+
+@pytest.mark.anyio
+async def test_requests_are_recorded_as_activity(client: AsyncClient):
+    with patch.object(db_maintenance.time, "monotonic", return_value=0.0):
+        app_activity.touch()
+
+    await client.get("/recipes/extract")
+
+    assert app_activity.idle_seconds() < 60
+
+
+class TestMaintenanceScheduler:
+    def _scheduler(
+        self, db_path: Path, idle_seconds: float = 0
+    ) -> MaintenanceScheduler:
+        return MaintenanceScheduler(
+            ActivityTracker(),
+            db_path=db_path,
+            idle_seconds=idle_seconds,
+            interval_seconds=3600,
+            budget_seconds=10,
+            check_seconds=0,
+        )
+
+    @pytest.mark.anyio
+    async def test_runs_when_idle(self, fragmented_db: Path):
+        scheduler = self._scheduler(fragmented_db)
+
+        result = await scheduler.maybe_run()
+
+        assert result is not None
+        assert result.free_pages_remaining == 0
+
+    @pytest.mark.anyio
+    async def test_skips_while_busy(self, fragmented_db: Path):
+        scheduler = self._scheduler(fragmented_db, idle_seconds=3600)
+
+        assert await scheduler.maybe_run() is None
+        assert _freelist_count(fragmented_db) > 0
+
+    @pytest.mark.anyio
+    async def test_runs_at_most_once_per_interval(self, fragmented_db: Path):
+        scheduler = self._scheduler(fragmented_db)
+
+        assert await scheduler.maybe_run() is not None
+        assert await scheduler.maybe_run() is None
+
+    @pytest.mark.anyio
+    async def test_skips_missing_database(self, tmp_path: Path):
+        scheduler = self._scheduler(tmp_path / "missing.db")
+
+        assert await scheduler.maybe_run() is None
+
+    @pytest.mark.anyio
+    async def test_logs_failures(self, fragmented_db: Path):
+        scheduler = self._scheduler(fragmented_db)
+
+        with (
+            patch.object(
+                db_maintenance,
+                "run_maintenance",
+                side_effect=sqlite3.DatabaseError("bad"),
+            ),
+            patch.object(db_maintenance.logger, "error") as mock_logger_error,
+        ):
+            assert await scheduler.maybe_run() is None
+
+        mock_logger_error.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_run_forever_checks_repeatedly(self, fragmented_db: Path):
+        scheduler = self._scheduler(fragmented_db)
+        calls = 0
+
+        async def fake_maybe_run():
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise RuntimeError("stop")
+
+        with (
+            patch.object(scheduler, "maybe_run", fake_maybe_run),
+            pytest.raises(RuntimeError, match="stop"),
+        ):
+            await scheduler.run_forever()
+
+        assert calls == 3
@@ -7,6 +7,7 @@ from meal_planner.services.extract_webpage_text import (
     clean_html_text,
     fetch_and_clean_text_from_url,
     fetch_page_text,
+    validate_url_for_ssrf,
 )
 
 TEST_URL = "http://test-recipe.com"
@@ -226,3 +227,25 @@ class TestCleanHtmlText:
         assert "Title" in result
         assert "Paragraph one." in result
         assert "Paragraph two." in result
+
+
+@pytest.mark.parametrize(
+    "url", ["https://example.com/recipe", "http://93.184.216.34/pancakes"]
+)
+def test_validate_url_for_ssrf_allows_public_urls(url):
+    assert validate_url_for_ssrf(url) == (True, "")
+
+
+@pytest.mark.parametrize(
+    "url, error",
+    [
+        ("ftp://example.com/recipe", "Only HTTP and HTTPS URLs are allowed"),
+        ("https://", "Invalid URL: missing domain"),
+        ("http://127.0.0.1/", "Loopback addresses are not allowed"),
+        ("http://169.254.169.254/latest", "Link-local addresses are not allowed"),
+        ("http://10.0.0.5/", "Private IP addresses are not allowed"),
+        ("http://metadata.google.internal/", "Internal hostnames are not allowed"),
+    ],
+)
+def test_validate_url_for_ssrf_blocks_unsafe_urls(url, error):
+    assert validate_url_for_ssrf(url) == (False, error)
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from meal_planner.services import extraction_streams as extraction_streams_module
+from meal_planner.services.extraction_streams import ExtractionStreamStore
+
+
+def test_claim_returns_text_once():
+    store = ExtractionStreamStore()
+    stream_id = store.add("recipe text")
+
+    assert store.claim(stream_id) == "recipe text"
+    assert store.claim(stream_id) is None
+    assert len(store) == 0
+
+
+def test_ids_are_unique():
+    store = ExtractionStreamStore()
+
+    assert len({store.add("text") for _ in range(50)}) == 50
+
+
+def test_unknown_id():
+    assert ExtractionStreamStore().claim("nope") is None
+
+
+def test_entries_expire():
+    store = ExtractionStreamStore(ttl_seconds=60)
+    with patch.object(extraction_streams_module.time, "monotonic", return_value=0.0):
+        stream_id = store.add("text")
+
+    with patch.object(extraction_streams_module.time, "monotonic", return_value=61.0):
+        assert store.claim(stream_id) is None
+
+
+def test_oldest_entries_dropped_beyond_limit():
+    store = ExtractionStreamStore(max_pending=2)
+    first = store.add("first")
+    second = store.add("second")
+    third = store.add("third")
+
+    assert store.claim(first) is None
+    assert store.claim(second) == "second"
+    assert store.claim(third) == "third"
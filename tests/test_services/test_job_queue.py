@@ -0,0 +1,211 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlmodel import Session
+
+from meal_planner.models import Job
+from meal_planner.services.job_queue import (
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    UNEXPECTED_ERROR_MESSAGE,
+    JobError,
+    JobQueue,
+)
+
+
+@pytest.fixture
+def queue(dbsession: Session, monkeypatch) -> JobQueue:
+    """A job queue storing its jobs in the test database."""
+    monkeypatch.setattr("meal_planner.database.ENGINE", dbsession.bind)
+    return JobQueue(concurrency=2, max_attempts=2, registry=None)
+
+
+def _store(dbsession: Session, **fields) -> str:
+    job = Job(kind="echo", **fields)
+    dbsession.add(job)
+    dbsession.commit()
+    return job.id
+
+
+@pytest.mark.anyio
+class TestRunNext:
+    async def test_runs_job_and_stores_result(self, queue: JobQueue):
+        handler = AsyncMock(return_value={"doubled": 4})
+        queue.register("echo", handler)
+
+        job_id = queue.submit("echo", {"value": 2})
+        assert queue.get(job_id).status == PENDING
+
+        assert await queue.run_next() is True
+
+        handler.assert_awaited_once_with({"value": 2})
+        job = queue.get(job_id)
+        assert (job.status, job.result, job.error, job.attempts) == (
+            SUCCEEDED,
+            {"doubled": 4},
+            None,
+            1,
+        )
+        assert queue.metrics()["succeeded"] == 1
+
+    async def test_nothing_pending(self, queue: JobQueue):
+        assert await queue.run_next() is False
+
+    async def test_runs_oldest_first(self, queue: JobQueue):
+        seen = []
+
+        async def handler(payload):
+            seen.append(payload["n"])
+            return {}
+
+        queue.register("echo", handler)
+        for n in range(3):
+            queue.submit("echo", {"n": n})
+
+        while await queue.run_next():
+            pass
+
+        assert seen == [0, 1, 2]
+
+    async def test_job_error_message_is_kept(self, queue: JobQueue):
+        queue.register("echo", AsyncMock(side_effect=JobError("LLM is down")))
+        job_id = queue.submit("echo", {})
+
+        await queue.run_next()
+
+        job = queue.get(job_id)
+        assert (job.status, job.error, job.result) == (FAILED, "LLM is down", None)
+        assert queue.metrics()["failed"] == 1
+
+    async def test_unexpected_error_is_hidden(self, queue: JobQueue):
+        queue.register("echo", AsyncMock(side_effect=KeyError("secret")))
+        job_id = queue.submit("echo", {})
+
+        await queue.run_next()
+
+        assert queue.get(job_id).error == UNEXPECTED_ERROR_MESSAGE
+
+    async def test_unknown_kind_fails(self, queue: JobQueue, dbsession: Session):
+        job_id = _store(dbsession, payload={})
+
+        assert await queue.run_next() is False
+
+        assert queue.get(job_id).status == FAILED
+
+    async def test_workers_never_share_a_job(self, queue: JobQueue):
+        release = asyncio.Event()
+        calls = []
+
+        async def handler(payload):
+            calls.append(payload["n"])
+            await release.wait()
+            return {}
+
+        queue.register("echo", handler)
+        queue.submit("echo", {"n": 0})
+        queue.submit("echo", {"n": 1})
+
+        workers = asyncio.gather(queue.run_next(), queue.run_next())
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await workers == [True, True]
+        assert sorted(calls) == [0, 1]
+
+
+def test_submit_unknown_kind(queue: JobQueue):
+    with pytest.raises(ValueError, match="No handler"):
+        queue.submit("nope", {})
+
+
+def test_recover_resumes_interrupted_jobs(queue: JobQueue, dbsession: Session):
+    stale = datetime.now(timezone.utc) - timedelta(seconds=queue.stale_seconds + 1)
+    resumable = _store(dbsession, status=RUNNING, attempts=1, updated_at=stale)
+    exhausted = _store(dbsession, status=RUNNING, attempts=2, updated_at=stale)
+    live = _store(dbsession, status=RUNNING, attempts=1, owner="other")
+    pending = _store(dbsession, status=PENDING)
+
+    assert queue.recover() == 1
+
+    assert queue.get(resumable).status == PENDING
+    assert queue.get(exhausted).status == FAILED
+    assert queue.get(exhausted).error == "The job was interrupted too many times."
+    assert queue.get(live).status == RUNNING
+    assert queue.get(pending).status == PENDING
+    assert queue.metrics()["resumed"] == 1
+
+
+@pytest.mark.anyio
+async def test_heartbeat_keeps_running_job_from_being_resumed(
+    queue: JobQueue, dbsession: Session
+):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler(payload):
+        started.set()
+        await release.wait()
+        return {}
+
+    queue.register("echo", handler)
+    job_id = queue.submit("echo", {})
+    worker = asyncio.create_task(queue.run_next())
+    await started.wait()
+    stale = datetime.now(timezone.utc) - timedelta(seconds=queue.stale_seconds + 1)
+    dbsession.get(Job, job_id).updated_at = stale
+    dbsession.commit()
+
+    assert queue.heartbeat() == 1
+    assert queue.recover() == 0
+
+    release.set()
+    await worker
+    assert queue.get(job_id).status == SUCCEEDED
+
+
+@pytest.mark.anyio
+async def test_result_of_taken_over_job_is_dropped(queue: JobQueue, dbsession: Session):
+    release = asyncio.Event()
+
+    async def handler(payload):
+        await release.wait()
+        return {}
+
+    queue.register("echo", handler)
+    job_id = queue.submit("echo", {})
+    worker = asyncio.create_task(queue.run_next())
+    await asyncio.sleep(0.01)
+    job = dbsession.get(Job, job_id)
+    job.owner = "other"
+    dbsession.commit()
+
+    release.set()
+    await worker
+
+    assert queue.get(job_id).status == RUNNING
+    assert queue.metrics()["succeeded"] == 0
+
+
+def test_prune_deletes_old_finished_jobs(queue: JobQueue, dbsession: Session):
+    old = datetime.now(timezone.utc) - timedelta(seconds=queue.retention_seconds + 1)
+    expired = _store(dbsession, status=SUCCEEDED, updated_at=old)
+    old_pending = _store(dbsession, status=PENDING, updated_at=old)
+    recent = _store(dbsession, status=FAILED)
+
+    assert queue.prune() == 1
+
+    assert queue.get(expired) is None
+    assert queue.get(old_pending) is not None
+    assert queue.get(recent) is not None
+
+
+def test_registration():
+    registry = MagicMock()
+
+    queue = JobQueue(registry=registry)
+
+    registry.register.assert_called_once_with("job_queue", queue.metrics)
@@ -0,0 +1,204 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from meal_planner.models import RecipeBase
+from meal_planner.services import llm_cache as llm_cache_module
+from meal_planner.services.call_llm import generate_recipe_from_text
+from meal_planner.services.llm_cache import LLMCache, llm_cache_key
+
+RECIPE = RecipeBase(name="Cached", ingredients=["flour"], instructions=["Bake."])
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    cache = LLMCache(tmp_path / "cache.db", registry=None)
+    yield cache
+    cache.close()
+
+
+def _compute(result: BaseModel = RECIPE, gate: asyncio.Event | None = None):
+    async def compute():
+        if gate is not None:
+            await gate.wait()
+        return result
+
+    return AsyncMock(side_effect=compute)
+
+
+class TestLLMCacheKey:
+    def test_is_stable(self):
+        assert llm_cache_key("m", "t.txt", "p", RecipeBase) == llm_cache_key(
+            "m", "t.txt", "p", RecipeBase
+        )
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ("other-model", "t.txt", "p", RecipeBase),
+            ("m", "other.txt", "p", RecipeBase),
+            ("m", "t.txt", "other prompt", RecipeBase),
+        ],
+    )
+    def test_changes_with_each_input(self, args):
+        assert llm_cache_key(*args) != llm_cache_key("m", "t.txt", "p", RecipeBase)
+
+    def test_changes_with_response_schema(self):
+        class OtherModel(BaseModel):
+            name: str
+
+        assert llm_cache_key("m", "t.txt", "p", OtherModel) != llm_cache_key(
+            "m", "t.txt", "p", RecipeBase
+        )
+
+
+@pytest.mark.anyio
+class TestGetOrCompute:
+    async def test_miss_then_hit(self, cache: LLMCache):
+        compute = _compute()
+
+        first = await cache.get_or_compute("k", RecipeBase, compute)
+        second = await cache.get_or_compute("k", RecipeBase, compute)
+
+        assert first == RECIPE
+        assert second == RECIPE
+        assert second is not first
+        compute.assert_awaited_once()
+        assert cache.metrics()["hits"] == 1
+        assert cache.metrics()["misses"] == 1
+        assert cache.hit_rate == 0.5
+
+    async def test_persists_across_instances(self, tmp_path: Path):
+        first_cache = LLMCache(tmp_path / "cache.db", registry=None)
+        await first_cache.get_or_compute("k", RecipeBase, _compute())
+        first_cache.close()
+
+        second_cache = LLMCache(tmp_path / "cache.db", registry=None)
+        compute = _compute()
+        assert await second_cache.get_or_compute("k", RecipeBase, compute) == RECIPE
+        compute.assert_not_awaited()
+        second_cache.close()
+
+    async def test_concurrent_misses_share_one_call(self, cache: LLMCache):
+        gate = asyncio.Event()
+        compute = _compute(gate=gate)
+
+        waiters = [
+            asyncio.create_task(cache.get_or_compute("k", RecipeBase, compute))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == [RECIPE] * 3
+        assert len({id(result) for result in results}) == 3
+        compute.assert_awaited_once()
+
+    async def test_failures_are_not_cached(self, cache: LLMCache):
+        failing = AsyncMock(side_effect=RuntimeError("LLM down"))
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("k", RecipeBase, failing)
+
+        compute = _compute()
+        assert await cache.get_or_compute("k", RecipeBase, compute) == RECIPE
+        compute.assert_awaited_once()
+
+    async def test_store_can_skip_caching(self, cache: LLMCache):
+        store = MagicMock(return_value=False)
+        await cache.get_or_compute("k", RecipeBase, _compute(), store=store)
+
+        compute = _compute()
+        await cache.get_or_compute("k", RecipeBase, compute)
+
+        store.assert_called_once_with(RECIPE)
+        compute.assert_awaited_once()
+
+    async def test_expired_entries_are_recomputed(self, cache: LLMCache):
+        cache.ttl_seconds = 60
+        with patch.object(llm_cache_module.time, "time", return_value=1000.0):
+            await cache.get_or_compute("k", RecipeBase, _compute())
+
+        compute = _compute()
+        with patch.object(llm_cache_module.time, "time", return_value=1061.0):
+            await cache.get_or_compute("k", RecipeBase, compute)
+
+        compute.assert_awaited_once()
+
+    async def test_disabled_cache_always_computes(self, tmp_path: Path):
+        cache = LLMCache(tmp_path / "cache.db", enabled=False, registry=None)
+        compute = _compute()
+
+        await cache.get_or_compute("k", RecipeBase, compute)
+        await cache.get_or_compute("k", RecipeBase, compute)
+
+        assert compute.await_count == 2
+        assert not (tmp_path / "cache.db").exists()
+
+    async def test_unavailable_cache_disables_itself(self, tmp_path: Path):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        cache = LLMCache(blocker / "cache.db", registry=None)
+        compute = _compute()
+
+        assert await cache.get_or_compute("k", RecipeBase, compute) == RECIPE
+        assert cache.enabled is False
+        assert cache.metrics()["enabled"] is False
+
+
+class TestEvictionAndMetrics:
+    def test_evicts_least_recently_used(self, cache: LLMCache):
+        cache.max_entries = 2
+        with patch.object(llm_cache_module.time, "time", return_value=1.0):
+            cache.put("a", "{}", 1.0)
+        with patch.object(llm_cache_module.time, "time", return_value=2.0):
+            cache.put("b", "{}", 1.0)
+        with patch.object(llm_cache_module.time, "time", return_value=3.0):
+            assert cache.get("a") == "{}"
+        with patch.object(llm_cache_module.time, "time", return_value=4.0):
+            cache.put("c", "{}", 1.0)
+        with patch.object(llm_cache_module.time, "time", return_value=5.0):
+            assert cache.get("a") == "{}"
+            assert cache.get("b") is None
+            assert cache.get("c") == "{}"
+
+    def test_reports_latency_saved(self, cache: LLMCache):
+        cache.put("k", "{}", 2.5)
+        cache.get("k")
+        cache.get("k")
+        cache.get("missing")
+
+        assert cache.metrics() == {
+            "enabled": True,
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": pytest.approx(2 / 3),
+            "latency_saved_seconds": 5.0,
+        }
+
+    def test_registers_metrics_sources(self, tmp_path: Path):
+        registry = MagicMock()
+
+        LLMCache(tmp_path / "cache.db", registry=registry)
+
+        registered = [call.args[0] for call in registry.register.call_args_list]
+        assert registered == ["single_flight.llm_cache", "llm_cache"]
+
+
+@pytest.mark.anyio
+async def test_generate_recipe_from_text_uses_cache():
+    with patch(
+        "meal_planner.services.call_llm.get_structured_llm_response",
+        new_callable=AsyncMock,
+        return_value=RECIPE,
+    ) as mock_llm:
+        first = await generate_recipe_from_text("Some recipe text")
+        second = await generate_recipe_from_text("Some recipe text")
+        await generate_recipe_from_text("Different text")
+
+    assert first == second == RECIPE
+    assert mock_llm.await_count == 2
@@ -0,0 +1,116 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from meal_planner.services.llm_client import LLMHTTPClient
+
+
+class _KeepAliveServer:
+    """Local HTTP/1.1 server answering every request with an empty 200."""
+
+    def __init__(self):
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1/"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":")[1])
+                await reader.readexactly(length)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def server():
+    server = _KeepAliveServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+def _client(server: _KeepAliveServer, **kwargs) -> LLMHTTPClient:
+    return LLMHTTPClient(base_url=server.url, http2=False, registry=None, **kwargs)
+
+
+@pytest.mark.anyio
+class TestLLMHTTPClient:
+    async def test_preconnect_warms_first_call(self, server: _KeepAliveServer):
+        client = _client(server)
+
+        assert await client.preconnect() is True
+        await client.get().post(server.url + "chat/completions", json={})
+        await client.get().post(server.url + "chat/completions", json={})
+        await client.close()
+
+        metrics = client.metrics()
+        assert server.connections == 1
+        assert metrics["connections_opened"] == 1
+        assert metrics["preconnect_ms"] >= 0
+        assert metrics["first_call_warm"] is True
+        assert (metrics["cold_calls"], metrics["warm_calls"]) == (0, 2)
+        assert metrics["warm_call_p50_ms"] >= 0
+
+    async def test_first_call_is_cold_without_preconnect(
+        self, server: _KeepAliveServer
+    ):
+        client = _client(server, preconnect_enabled=False)
+
+        assert await client.preconnect() is False
+        await client.get().post(server.url + "chat/completions", json={})
+        await client.get().post(server.url + "chat/completions", json={})
+        await client.close()
+
+        metrics = client.metrics()
+        assert server.connections == 1
+        assert metrics["preconnect_ms"] is None
+        assert metrics["first_call_warm"] is False
+        assert (metrics["cold_calls"], metrics["warm_calls"]) == (1, 1)
+        assert metrics["first_call_ms"] == metrics["cold_call_p50_ms"]
+
+    async def test_preconnect_failure_is_not_raised(self, server: _KeepAliveServer):
+        client = _client(server)
+        await server.stop()
+
+        assert await client.preconnect() is False
+        assert client.metrics()["preconnect_ms"] is None
+        await client.close()
+
+    async def test_closed_client_is_replaced(self, server: _KeepAliveServer):
+        client = _client(server)
+        first = client.get()
+
+        await client.close()
+
+        assert first.is_closed
+        assert client.get() is not first
+        await client.close()
+
+
+def test_registration():
+    registry = MagicMock()
+
+    client = LLMHTTPClient(registry=registry)
+
+    registry.register.assert_called_once_with("llm_http_client", client.metrics)
@@ -0,0 +1,226 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from meal_planner.models import RecipeBase
+from meal_planner.services import llm_limiter as llm_limiter_module
+from meal_planner.services.call_llm import get_structured_llm_response
+from meal_planner.services.llm_limiter import (
+    AdaptiveLimiter,
+    TokenBucket,
+    estimate_tokens,
+    is_overload_error,
+)
+from meal_planner.services.llm_retry import RetryPolicy
+
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+def _limiter(**kwargs) -> AdaptiveLimiter:
+    kwargs.setdefault("max_concurrency", 4)
+    kwargs.setdefault("requests_per_minute", 0)
+    kwargs.setdefault("tokens_per_minute", 0)
+    return AdaptiveLimiter("test", registry=None, **kwargs)
+
+
+class TestHelpers:
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 1
+        assert estimate_tokens("x" * 400) == 100
+
+    @pytest.mark.parametrize("status_code", [429, 500, 503])
+    def test_overload_statuses(self, status_code):
+        assert is_overload_error(_status_error(status_code))
+
+    @pytest.mark.parametrize("status_code", [400, 401, 404])
+    def test_client_errors_are_not_overload(self, status_code):
+        assert not is_overload_error(_status_error(status_code))
+
+    def test_finds_wrapped_overload(self):
+        try:
+            try:
+                raise _status_error(429)
+            except openai.APIStatusError as e:
+                raise RuntimeError("retries exhausted") from e
+        except RuntimeError as wrapped:
+            assert is_overload_error(wrapped)
+
+    def test_plain_errors_are_not_overload(self):
+        assert not is_overload_error(ValueError("bad output"))
+
+
+@pytest.mark.anyio
+class TestTokenBucket:
+    async def test_disabled_bucket_never_waits(self):
+        bucket = TokenBucket(0)
+        with patch.object(llm_limiter_module.asyncio, "sleep") as sleep:
+            for _ in range(100):
+                await bucket.acquire(10)
+        sleep.assert_not_called()
+
+    async def test_waits_for_refill(self):
+        bucket = TokenBucket(60)
+        await bucket.acquire(60)
+        sleeps: list[float] = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            bucket._updated -= seconds
+
+        with patch.object(llm_limiter_module.asyncio, "sleep", fake_sleep):
+            await bucket.acquire(2)
+
+        assert sleeps == [pytest.approx(2, abs=0.01)]
+        assert bucket.available == pytest.approx(0, abs=0.01)
+
+    async def test_caps_oversized_requests_at_capacity(self):
+        bucket = TokenBucket(10)
+
+        await asyncio.wait_for(bucket.acquire(1000), timeout=1)
+
+        assert bucket.available == pytest.approx(0, abs=0.01)
+
+
+@pytest.mark.anyio
+class TestAdaptiveLimiter:
+    async def test_bounds_in_flight_calls(self):
+        limiter = _limiter(max_concurrency=2)
+        gate = asyncio.Event()
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await gate.wait()
+
+        tasks = [asyncio.create_task(call()) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert limiter.in_flight == 2
+        assert limiter.queued == 3
+
+        gate.set()
+        await asyncio.gather(*tasks)
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+        assert limiter.metrics()["acquired"] == 5
+        assert limiter.metrics()["queue_wait_seconds_max"] >= 0
+
+    async def test_overload_halves_limit_once_per_wave(self):
+        limiter = _limiter(max_concurrency=8)
+
+        async def overloaded_call():
+            async with limiter.slot():
+                await asyncio.sleep(0)
+                raise _status_error(429)
+
+        results = await asyncio.gather(
+            *(overloaded_call() for _ in range(4)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, openai.APIStatusError) for r in results)
+        assert limiter.limit == 4
+        assert limiter.overloads == 4
+
+    async def test_limit_never_drops_below_minimum(self):
+        limiter = _limiter(max_concurrency=4, min_concurrency=2)
+
+        for _ in range(5):
+            with pytest.raises(openai.APIStatusError):
+                async with limiter.slot():
+                    raise _status_error(503)
+
+        assert limiter.limit == 2
+
+    async def test_success_increases_limit_additively(self):
+        limiter = _limiter(max_concurrency=4)
+        limiter.limit = 2.0
+
+        for _ in range(2):
+            async with limiter.slot():
+                pass
+
+        assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+        for _ in range(20):
+            async with limiter.slot():
+                pass
+        assert limiter.limit == 4
+
+    async def test_non_overload_errors_do_not_change_limit(self):
+        limiter = _limiter()
+
+        with pytest.raises(ValueError):
+            async with limiter.slot():
+                raise ValueError("bad output")
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        limiter = _limiter(max_concurrency=1)
+        gate = asyncio.Event()
+
+        async def call():
+            async with limiter.slot():
+                await gate.wait()
+
+        holder = asyncio.create_task(call())
+        waiter = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.queued == 0
+        gate.set()
+        await holder
+        assert limiter.in_flight == 0
+
+    async def test_consumes_token_budget(self):
+        limiter = _limiter(requests_per_minute=100, tokens_per_minute=1000)
+
+        async with limiter.slot(estimated_tokens=250):
+            pass
+
+        assert limiter.request_bucket.available == pytest.approx(99, abs=0.1)
+        assert limiter.token_bucket.available == pytest.approx(750, abs=1)
+
+    def test_registers_metrics_source(self):
+        registry = MagicMock()
+
+        AdaptiveLimiter("gemini", registry=registry)
+
+        registry.register.assert_called_once()
+        assert registry.register.call_args.args[0] == "llm_limiter.gemini"
+
+
+@pytest.mark.anyio
+async def test_llm_calls_go_through_limiter(monkeypatch):
+    limiter = _limiter()
+    monkeypatch.setattr("meal_planner.services.call_llm.llm_limiter", limiter)
+    monkeypatch.setattr(
+        "meal_planner.services.call_llm.llm_retry_policy",
+        RetryPolicy("test", max_attempts=1, registry=None),
+    )
+    recipe = RecipeBase(name="R", ingredients=["i"], instructions=["s"])
+    mock_aclient = AsyncMock()
+    mock_aclient.chat.completions.create.side_effect = [_status_error(429), recipe]
+
+    with patch(
+        "meal_planner.services.call_llm._get_aclient", return_value=mock_aclient
+    ):
+        with pytest.raises(openai.APIStatusError):
+            await get_structured_llm_response("prompt", RecipeBase)
+        assert await get_structured_llm_response("prompt", RecipeBase) == recipe
+
+    assert limiter.overloads == 1
+    assert limiter.acquired == 2
+    assert limiter.in_flight == 0
@@ -0,0 +1,259 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from meal_planner.models import RecipeBase
+from meal_planner.services import llm_retry as llm_retry_module
+from meal_planner.services.call_llm import get_structured_llm_response
+from meal_planner.services.llm_retry import (
+    HEDGE_MIN_SAMPLES,
+    LatencyTracker,
+    RetryPolicy,
+    is_retryable_error,
+)
+
+RECIPE = RecipeBase(name="R", ingredients=["i"], instructions=["s"])
+REQUEST = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    response = httpx.Response(status_code, request=REQUEST)
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("base_delay_seconds", 0.01)
+    kwargs.setdefault("max_delay_seconds", 0.01)
+    kwargs.setdefault("deadline_seconds", 5)
+    kwargs.setdefault("hedge", False)
+    return RetryPolicy("test", registry=None, **kwargs)
+
+
+def _warm_up(policy: RetryPolicy, latency: float) -> None:
+    for _ in range(HEDGE_MIN_SAMPLES):
+        policy.latencies.record(latency)
+
+
+class TestIsRetryableError:
+    @pytest.mark.parametrize(
+        "error",
+        [
+            _status_error(429),
+            _status_error(502),
+            openai.APITimeoutError(request=REQUEST),
+            openai.APIConnectionError(request=REQUEST),
+        ],
+    )
+    def test_transient_errors(self, error):
+        assert is_retryable_error(error)
+
+    @pytest.mark.parametrize(
+        "error", [_status_error(400), ValueError("bad"), KeyError("GOOGLE_API_KEY")]
+    )
+    def test_permanent_errors(self, error):
+        assert not is_retryable_error(error)
+
+
+def test_latency_tracker_quantiles():
+    tracker = LatencyTracker(window=100)
+    assert tracker.quantile(0.95) is None
+
+    for latency in range(1, 101):
+        tracker.record(float(latency))
+
+    assert tracker.quantile(0.5) == 51
+    assert tracker.quantile(0.95) == 96
+    tracker.record(1000.0)
+    assert len(tracker) == 100
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = _policy(base_delay_seconds=1, max_delay_seconds=3)
+
+    with patch.object(llm_retry_module.random, "uniform", return_value=0.5) as uniform:
+        assert policy.backoff_seconds(1) == 0.5
+        policy.backoff_seconds(2)
+        policy.backoff_seconds(5)
+
+    assert [call.args for call in uniform.call_args_list] == [(0, 1), (0, 2), (0, 3)]
+
+
+@pytest.mark.anyio
+class TestRetries:
+    async def test_success_on_first_attempt(self):
+        policy = _policy()
+        fn = AsyncMock(return_value=RECIPE)
+
+        assert await policy.run(fn) == RECIPE
+
+        fn.assert_awaited_once()
+        assert policy.wins == {"primary": 1, "hedge": 0, "retry": 0}
+        assert len(policy.latencies) == 1
+
+    async def test_retries_transient_errors(self):
+        policy = _policy()
+        fn = AsyncMock(side_effect=[_status_error(429), _status_error(503), RECIPE])
+
+        assert await policy.run(fn) == RECIPE
+
+        assert fn.await_count == 3
+        assert policy.retries == 2
+        assert policy.wins["retry"] == 1
+
+    async def test_does_not_retry_permanent_errors(self):
+        policy = _policy()
+        fn = AsyncMock(side_effect=_status_error(400))
+
+        with pytest.raises(openai.APIStatusError):
+            await policy.run(fn)
+
+        fn.assert_awaited_once()
+        assert policy.failures == 1
+
+    async def test_gives_up_after_max_attempts(self):
+        policy = _policy(max_attempts=2)
+        fn = AsyncMock(side_effect=_status_error(429))
+
+        with pytest.raises(openai.APIStatusError):
+            await policy.run(fn)
+
+        assert fn.await_count == 2
+        assert policy.failures == 1
+
+    async def test_skips_retry_that_would_end_past_deadline(self):
+        policy = _policy(
+            deadline_seconds=1, base_delay_seconds=10, max_delay_seconds=10
+        )
+        fn = AsyncMock(side_effect=_status_error(429))
+
+        with (
+            patch.object(llm_retry_module.random, "uniform", return_value=5),
+            pytest.raises(openai.APIStatusError),
+        ):
+            await policy.run(fn)
+
+        fn.assert_awaited_once()
+        assert policy.deadline_exceeded == 1
+
+    async def test_cancels_attempt_at_deadline(self):
+        policy = _policy(deadline_seconds=0.05)
+        cancelled = asyncio.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            await policy.run(hang)
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert policy.deadline_exceeded == 1
+
+
+@pytest.mark.anyio
+class TestHedging:
+    async def test_no_hedge_without_enough_samples(self):
+        policy = _policy(hedge=True, hedge_min_delay_seconds=0)
+
+        assert policy.hedge_delay_seconds() is None
+        _warm_up(policy, 0.2)
+        assert policy.hedge_delay_seconds() == 0.2
+
+    async def test_hedge_wins_when_primary_is_slow(self):
+        policy = _policy(hedge=True, hedge_min_delay_seconds=0)
+        _warm_up(policy, 0.01)
+        primary_cancelled = asyncio.Event()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    primary_cancelled.set()
+                    raise
+            return RECIPE
+
+        assert await policy.run(fn) == RECIPE
+
+        await asyncio.wait_for(primary_cancelled.wait(), timeout=1)
+        assert policy.hedges_sent == 1
+        assert policy.wins == {"primary": 0, "hedge": 1, "retry": 0}
+
+    async def test_fast_primary_is_not_hedged(self):
+        policy = _policy(hedge=True, hedge_min_delay_seconds=0)
+        _warm_up(policy, 1.0)
+        fn = AsyncMock(return_value=RECIPE)
+
+        assert await policy.run(fn) == RECIPE
+
+        fn.assert_awaited_once()
+        assert policy.hedges_sent == 0
+        assert policy.wins["primary"] == 1
+
+    async def test_primary_failure_waits_for_hedge(self):
+        policy = _policy(hedge=True, hedge_min_delay_seconds=0)
+        _warm_up(policy, 0.01)
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                raise _status_error(400)
+            await asyncio.sleep(0.1)
+            return RECIPE
+
+        assert await policy.run(fn) == RECIPE
+        assert policy.wins["hedge"] == 1
+
+    async def test_disabled_hedging_never_hedges(self):
+        policy = _policy(hedge=False)
+        _warm_up(policy, 0.0)
+
+        assert policy.hedge_delay_seconds() is None
+
+
+def test_metrics_and_registration():
+    registry = MagicMock()
+    policy = RetryPolicy("gemini", registry=registry)
+
+    registry.register.assert_called_once()
+    assert registry.register.call_args.args[0] == "llm_retry.gemini"
+    assert policy.metrics() == {
+        "calls": 0,
+        "attempts": 0,
+        "retries": 0,
+        "hedges_sent": 0,
+        "wins": {"primary": 0, "hedge": 0, "retry": 0},
+        "failures": 0,
+        "deadline_exceeded": 0,
+        "latency_p50_seconds": None,
+        "latency_p95_seconds": None,
+    }
+
+
+@pytest.mark.anyio
+async def test_llm_calls_are_retried(monkeypatch):
+    policy = _policy()
+    monkeypatch.setattr("meal_planner.services.call_llm.llm_retry_policy", policy)
+    mock_aclient = AsyncMock()
+    mock_aclient.chat.completions.create.side_effect = [_status_error(503), RECIPE]
+
+    with patch(
+        "meal_planner.services.call_llm._get_aclient", return_value=mock_aclient
+    ):
+        assert await get_structured_llm_response("prompt", RecipeBase) == RECIPE
+
+    assert mock_aclient.chat.completions.create.await_count == 2
+    assert policy.wins["retry"] == 1
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import instructor
+import pytest
+from openai import AsyncOpenAI
+
+from meal_planner.models import RecipeBase
+from meal_planner.services import call_llm
+from meal_planner.services import llm_telemetry as llm_telemetry_module
+from meal_planner.services.llm_telemetry import (
+    UNLABELLED,
+    LLMTelemetry,
+    llm_call_labels,
+)
+
+RECIPE = RecipeBase(name="R", ingredients=["i"], instructions=["s"])
+
+
+def _telemetry(**kwargs) -> LLMTelemetry:
+    kwargs.setdefault("log_path", None)
+    kwargs.setdefault("input_cost_per_million_tokens", 1.0)
+    kwargs.setdefault("output_cost_per_million_tokens", 4.0)
+    return LLMTelemetry(registry=None, **kwargs)
+
+
+def _completion(content: str, prompt_tokens: int, completion_tokens: int) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-model",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _instrumented_client(telemetry: LLMTelemetry, contents: list[str]):
+    responses = iter(contents)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_completion(next(responses), 100, 20))
+
+    openai_client = AsyncOpenAI(
+        api_key="test",
+        base_url="https://llm.example/v1/",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    client = instructor.from_openai(openai_client, mode=instructor.Mode.JSON)
+    telemetry.instrument(client)
+    return client
+
+
+async def _create(client, **kwargs) -> dict:
+    recipe = await client.chat.completions.create(
+        model="test-model",
+        messages=[{"role": "user", "content": "prompt"}],
+        response_model=RecipeBase,
+        **kwargs,
+    )
+    return recipe.model_dump()
+
+
+class TestRecordCall:
+    def test_records_labels_and_outcome(self):
+        telemetry = _telemetry()
+
+        with (
+            llm_call_labels("recipe_extraction", "v2"),
+            telemetry.record_call("model", "RecipeBase") as record,
+        ):
+            pass
+
+        assert record.operation == "recipe_extraction"
+        assert record.template == "v2"
+        assert record.outcome == "success"
+        assert record.wall_seconds >= 0
+        assert list(telemetry.metrics()) == ["recipe_extraction/v2"]
+
+    def test_unlabelled_calls(self):
+        telemetry = _telemetry()
+
+        with telemetry.record_call("model", "RecipeBase") as record:
+            pass
+
+        assert record.operation == UNLABELLED
+        assert list(telemetry.metrics()) == [f"{UNLABELLED}/-"]
+
+    def test_explicit_labels_override_context(self):
+        telemetry = _telemetry()
+
+        with (
+            llm_call_labels("recipe_modification", "v1"),
+            telemetry.record_call(
+                "model", "RecipeBase", operation="recipe_extraction", template="v3"
+            ) as record,
+        ):
+            pass
+
+        assert (record.operation, record.template) == ("recipe_extraction", "v3")
+
+    def test_records_errors(self):
+        telemetry = _telemetry()
+
+        with (
+            pytest.raises(TimeoutError),
+            telemetry.record_call("model", "RecipeBase") as record,
+        ):
+            raise TimeoutError
+
+        assert record.outcome == "error"
+        assert record.error == "TimeoutError"
+        totals = telemetry.metrics()[f"{UNLABELLED}/-"]
+        assert totals["calls"] == 1
+        assert totals["errors"] == 1
+
+    @pytest.mark.anyio
+    async def test_collects_calls_per_task(self):
+        telemetry = _telemetry()
+
+        async def calls(n: int) -> list:
+            with telemetry.collect_calls() as records:
+                for _ in range(n):
+                    await asyncio.sleep(0)
+                    with telemetry.record_call(f"model-{n}", "RecipeBase"):
+                        pass
+            return records
+
+        one, two = await asyncio.gather(calls(1), calls(2))
+        with telemetry.record_call("model", "RecipeBase"):
+            pass
+
+        assert [record.model for record in one] == ["model-1"]
+        assert [record.model for record in two] == ["model-2", "model-2"]
+
+    def test_cost_from_usage(self):
+        telemetry = _telemetry()
+
+        with telemetry.record_call("model", "RecipeBase") as record:
+            record.add_usage(MagicMock(prompt_tokens=1_000, completion_tokens=500))
+            record.add_usage(MagicMock(prompt_tokens=1_000, completion_tokens=None))
+
+        assert record.prompt_tokens == 2_000
+        assert record.completion_tokens == 500
+        assert record.cost_usd == pytest.approx(2_000 * 1e-6 + 500 * 4e-6)
+        totals = telemetry.metrics()[f"{UNLABELLED}/-"]
+        assert totals["prompt_tokens"] == 2_000
+        assert totals["cost_usd"] == pytest.approx(0.004)
+
+    def test_no_cost_without_usage(self):
+        telemetry = _telemetry()
+
+        with telemetry.record_call("model", "RecipeBase") as record:
+            pass
+
+        assert record.prompt_tokens is None
+        assert record.cost_usd is None
+
+    def test_writes_jsonl_log(self, tmp_path):
+        log_path = tmp_path / "logs" / "llm_calls.jsonl"
+        telemetry = _telemetry(log_path=log_path)
+
+        for template in ("v1", "v2"):
+            with (
+                llm_call_labels("recipe_extraction", template),
+                telemetry.record_call("model", "RecipeBase"),
+            ):
+                pass
+        telemetry.flush_log()
+
+        lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert [line["template"] for line in lines] == ["v1", "v2"]
+        assert lines[0]["operation"] == "recipe_extraction"
+        assert lines[0]["response_model"] == "RecipeBase"
+        assert lines[0]["outcome"] == "success"
+
+    def test_unwritable_log_is_not_fatal(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        telemetry = _telemetry(log_path=blocker / "llm_calls.jsonl")
+
+        with patch.object(llm_telemetry_module.logger, "warning") as mock_warning:
+            with telemetry.record_call("model", "RecipeBase"):
+                pass
+            telemetry.flush_log()
+
+        assert telemetry.metrics()[f"{UNLABELLED}/-"]["calls"] == 1
+        mock_warning.assert_called_once()
+
+    def test_writes_log_off_the_calling_thread(self, tmp_path):
+        telemetry = _telemetry(log_path=tmp_path / "llm_calls.jsonl")
+        writers = []
+
+        with patch.object(
+            llm_telemetry_module,
+            "_append_line",
+            lambda *args: writers.append(threading.current_thread()),
+        ):
+            with telemetry.record_call("model", "RecipeBase"):
+                pass
+            telemetry.flush_log()
+
+        assert writers
+        assert writers[0] is not threading.current_thread()
+
+
+def test_metrics_and_registration():
+    registry = MagicMock()
+    telemetry = LLMTelemetry(log_path=None, registry=registry)
+
+    registry.register.assert_called_once_with("llm_calls", telemetry.metrics)
+    assert telemetry.metrics() == {}
+
+    with telemetry.record_call("model", "RecipeBase"):
+        pass
+
+    totals = telemetry.metrics()[f"{UNLABELLED}/-"]
+    assert totals["calls"] == 1
+    assert totals["errors"] == 0
+    assert set(totals) >= {"wall_seconds_avg", "wall_seconds_max"}
+
+
+@pytest.mark.anyio
+class TestInstructorHooks:
+    async def test_counts_attempts_and_tokens(self):
+        telemetry = _telemetry()
+        client = _instrumented_client(telemetry, [RECIPE.model_dump_json()])
+
+        with telemetry.record_call("test-model", "RecipeBase") as record:
+            assert await _create(client) == RECIPE.model_dump()
+
+        assert record.attempts == 1
+        assert record.validation_errors == 0
+        assert (record.prompt_tokens, record.completion_tokens) == (100, 20)
+        assert record.cost_usd == pytest.approx(100 * 1e-6 + 20 * 4e-6)
+
+    async def test_counts_validation_reasks(self):
+        telemetry = _telemetry()
+        client = _instrumented_client(
+            telemetry, ['{"name": "R"}', RECIPE.model_dump_json()]
+        )
+
+        with telemetry.record_call("test-model", "RecipeBase") as record:
+            assert await _create(client, max_retries=2) == RECIPE.model_dump()
+
+        assert record.attempts == 2
+        assert record.validation_errors == 1
+        assert record.prompt_tokens == 200
+
+    async def test_requests_outside_a_record_are_ignored(self):
+        telemetry = _telemetry()
+        client = _instrumented_client(telemetry, [RECIPE.model_dump_json()])
+
+        assert await _create(client) == RECIPE.model_dump()
+
+        assert telemetry.metrics() == {}
+
+
+@pytest.mark.anyio
+async def test_extraction_calls_are_labelled(monkeypatch):
+    telemetry = _telemetry()
+    monkeypatch.setattr(call_llm, "llm_telemetry", telemetry)
+    mock_aclient = AsyncMock()
+    mock_aclient.chat.completions.create.return_value = RECIPE
+
+    with patch.object(call_llm, "_get_aclient", return_value=mock_aclient):
+        await call_llm.generate_recipe_from_text("1 cup flour")
+
+    [key] = telemetry.metrics()
+    assert key.startswith("recipe_extraction/")
+    assert telemetry.metrics()[key]["calls"] == 1
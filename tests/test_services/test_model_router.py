@@ -0,0 +1,256 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pydantic
+import pytest
+
+from meal_planner.models import RecipeBase
+from meal_planner.services import call_llm
+from meal_planner.services.llm_cache import LLMCache
+from meal_planner.services.model_router import (
+    ModelRoute,
+    ModelRouter,
+    fallback_reason,
+)
+
+RECIPE = RecipeBase(name="R", ingredients=["i"], instructions=["s"])
+REQUEST = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+
+
+def _router(**kwargs) -> ModelRouter:
+    kwargs.setdefault("default_model", "default-model")
+    kwargs.setdefault("small_model", "small-model")
+    kwargs.setdefault("large_model", "large-model")
+    kwargs.setdefault("small_max_tokens", 100)
+    kwargs.setdefault("large_min_tokens", 1000)
+    kwargs.setdefault("enabled", True)
+    return ModelRouter(registry=None, **kwargs)
+
+
+def _validation_error() -> pydantic.ValidationError:
+    try:
+        RecipeBase.model_validate({})
+    except pydantic.ValidationError as e:
+        return e
+    raise AssertionError("expected a validation error")
+
+
+class TestRoute:
+    @pytest.mark.parametrize(
+        ("tokens", "tier", "model", "fallback"),
+        [
+            (50, "small", "small-model", "default-model"),
+            (100, "small", "small-model", "default-model"),
+            (500, "default", "default-model", "large-model"),
+            (1000, "large", "large-model", "default-model"),
+        ],
+    )
+    def test_extraction_is_routed_by_size(self, tokens, tier, model, fallback):
+        route = _router().route("recipe_extraction", tokens)
+
+        assert route == ModelRoute("recipe_extraction", tier, model, fallback)
+
+    @pytest.mark.parametrize("task", ["recipe_modification", None])
+    @pytest.mark.parametrize("tokens", [10, 5000])
+    def test_other_tasks_use_default_model(self, task, tokens):
+        route = _router().route(task, tokens)
+
+        assert route.tier == "default"
+        assert route.model == "default-model"
+        assert route.fallback_model == "large-model"
+
+    def test_disabled_router_uses_default_model_without_fallback(self):
+        route = _router(enabled=False).route("recipe_extraction", 10)
+
+        assert route == ModelRoute(
+            "recipe_extraction", "default", "default-model", None
+        )
+
+    def test_no_fallback_to_the_same_model(self):
+        router = _router(large_model="default-model")
+
+        assert router.route("recipe_modification", 10).fallback_model is None
+
+    def test_routing_has_no_side_effects(self):
+        router = _router()
+
+        router.route("recipe_extraction", 10)
+
+        assert router.metrics()["routed"] == {}
+
+
+class TestFallbackReason:
+    @pytest.mark.parametrize(
+        ("error", "reason"),
+        [
+            (TimeoutError(), "timeout"),
+            (openai.APITimeoutError(request=REQUEST), "timeout"),
+            (_validation_error(), "validation"),
+            (ValueError("bad"), None),
+            (
+                openai.AuthenticationError(
+                    "no", response=httpx.Response(401, request=REQUEST), body=None
+                ),
+                None,
+            ),
+        ],
+    )
+    def test_reasons(self, error, reason):
+        assert fallback_reason(error) == reason
+
+    def test_wrapped_errors(self):
+        try:
+            try:
+                raise _validation_error()
+            except pydantic.ValidationError as e:
+                raise RuntimeError("wrapped") from e
+        except RuntimeError as wrapped:
+            assert fallback_reason(wrapped) == "validation"
+
+
+@pytest.mark.anyio
+class TestRun:
+    async def test_success_without_fallback(self):
+        router = _router()
+        call = AsyncMock(return_value=RECIPE)
+
+        result = await router.run(router.route("recipe_extraction", 10), call)
+
+        assert result == RECIPE
+        call.assert_awaited_once_with("small-model")
+        assert router.metrics()["routed"] == {
+            "recipe_extraction": {"small": 1, "default": 0, "large": 0}
+        }
+
+    @pytest.mark.parametrize(
+        ("error", "reason"),
+        [(TimeoutError(), "timeout"), (_validation_error(), "validation")],
+    )
+    async def test_falls_back(self, error, reason):
+        router = _router()
+        call = AsyncMock(side_effect=[error, RECIPE])
+
+        result = await router.run(router.route("recipe_extraction", 10), call)
+
+        assert result == RECIPE
+        assert [c.args for c in call.await_args_list] == [
+            ("small-model",),
+            ("default-model",),
+        ]
+        assert router.fallbacks[reason] == 1
+        assert router.fallback_successes == 1
+
+    async def test_other_errors_do_not_fall_back(self):
+        router = _router()
+        call = AsyncMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            await router.run(router.route("recipe_extraction", 10), call)
+
+        call.assert_awaited_once()
+        assert router.fallbacks == {"timeout": 0, "validation": 0}
+
+    async def test_fallback_failure_raises_fallback_error(self):
+        router = _router()
+        fallback_error = ValueError("fallback failed")
+        call = AsyncMock(side_effect=[TimeoutError(), fallback_error])
+
+        with pytest.raises(ValueError) as excinfo:
+            await router.run(router.route("recipe_extraction", 10), call)
+
+        assert excinfo.value is fallback_error
+        assert router.fallback_failures == 1
+
+    async def test_no_fallback_model(self):
+        router = _router(enabled=False)
+        call = AsyncMock(side_effect=TimeoutError())
+
+        with pytest.raises(TimeoutError):
+            await router.run(router.route("recipe_extraction", 10), call)
+
+        call.assert_awaited_once()
+
+
+def test_metrics_and_registration():
+    registry = MagicMock()
+    router = ModelRouter(default_model="m", registry=registry)
+
+    registry.register.assert_called_once_with("llm_router", router.metrics)
+    metrics = router.metrics()
+    assert metrics["models"]["default"] == "m"
+    assert metrics["routed"] == {}
+    assert metrics["fallbacks"] == {"timeout": 0, "validation": 0}
+    assert metrics["fallback_successes"] == metrics["fallback_failures"] == 0
+
+
+@pytest.mark.anyio
+class TestRoutedLLMCalls:
+    async def test_short_extraction_uses_small_model(self, monkeypatch):
+        monkeypatch.setattr(call_llm, "model_router", _router())
+        mock_aclient = AsyncMock()
+        mock_aclient.chat.completions.create.return_value = RECIPE
+
+        with patch.object(call_llm, "_get_aclient", return_value=mock_aclient):
+            await call_llm.get_structured_llm_response(
+                "short prompt", RecipeBase, task="recipe_extraction"
+            )
+
+        call = mock_aclient.chat.completions.create.await_args
+        assert call.kwargs["model"] == "small-model"
+
+    async def test_validation_failure_falls_back(self, monkeypatch):
+        router = _router()
+        monkeypatch.setattr(call_llm, "model_router", router)
+        mock_aclient = AsyncMock()
+        mock_aclient.chat.completions.create.side_effect = [_validation_error(), RECIPE]
+
+        with patch.object(call_llm, "_get_aclient", return_value=mock_aclient):
+            result = await call_llm.get_structured_llm_response(
+                "short prompt", RecipeBase, task="recipe_extraction"
+            )
+
+        assert result == RECIPE
+        models = [
+            c.kwargs["model"]
+            for c in mock_aclient.chat.completions.create.await_args_list
+        ]
+        assert models == ["small-model", "default-model"]
+        assert router.fallback_successes == 1
+
+    async def test_cache_key_uses_routed_model(self, monkeypatch):
+        monkeypatch.setattr(call_llm, "model_router", _router())
+        cache = MagicMock()
+        cache.get_or_compute = AsyncMock(return_value=RECIPE)
+        monkeypatch.setattr(call_llm, "llm_cache", cache)
+
+        with patch.object(call_llm, "llm_cache_key", return_value="key") as cache_key:
+            await call_llm.get_cached_structured_llm_response(
+                "short prompt", RecipeBase, "template.txt", task="recipe_extraction"
+            )
+
+        assert cache_key.call_args.args[0] == "small-model"
+
+    async def test_fallback_response_is_not_cached(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(call_llm, "model_router", _router())
+        monkeypatch.setattr(
+            call_llm, "llm_cache", LLMCache(tmp_path / "cache.db", registry=None)
+        )
+        mock_aclient = AsyncMock()
+        mock_aclient.chat.completions.create.side_effect = [
+            _validation_error(),
+            RECIPE,
+            RECIPE,
+        ]
+
+        with patch.object(call_llm, "_get_aclient", return_value=mock_aclient):
+            for _ in range(2):
+                await call_llm.get_cached_structured_llm_response(
+                    "short prompt", RecipeBase, "template.txt", task="recipe_extraction"
+                )
+
+        models = [
+            c.kwargs["model"]
+            for c in mock_aclient.chat.completions.create.await_args_list
+        ]
+        assert models == ["small-model", "default-model", "small-model"]
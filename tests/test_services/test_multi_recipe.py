@@ -0,0 +1,217 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from meal_planner.evals import load_eval_cases
+from meal_planner.models import RecipeBase
+from meal_planner.services.multi_recipe import (
+    MultiRecipeExtractor,
+    is_recipe_section,
+    merge_recipes,
+    split_sections,
+)
+from tests.constants import EVAL_FIXTURE_DIR
+
+
+def _recipe_section(name: str, level: str = "##") -> str:
+    return f"""\
+{level} {name}
+
+A quick weeknight favourite.
+
+### Ingredients
+
+  * 1 cup rice
+  * 2 tablespoons soy sauce
+  * 200 g {name.lower()}
+
+### Instructions
+
+  1. Bring the rice and water to a boil, then simmer.
+  2. Stir in the soy sauce and {name.lower()} and cook through."""
+
+
+ROUNDUP = "\n\n".join(
+    [
+        "# 3 Weeknight Dinners\n\nOur favourite quick dinners.",
+        _recipe_section("Chicken"),
+        _recipe_section("Tofu"),
+        "## Related posts\n\n  * More dinners\n  * Even more dinners",
+        _recipe_section("Prawns"),
+    ]
+)
+
+
+def _extractor(extract, **kwargs) -> MultiRecipeExtractor:
+    kwargs.setdefault("enabled", True)
+    return MultiRecipeExtractor(extract=extract, registry=None, **kwargs)
+
+
+async def _extract_by_heading(text: str) -> RecipeBase:
+    name = text.splitlines()[0].lstrip("# ")
+    await asyncio.sleep(0.05)
+    return RecipeBase(name=name, ingredients=["i"], instructions=["s"])
+
+
+def _recipe(name: str, ingredients=("i",), instructions=("s",)) -> RecipeBase:
+    return RecipeBase.model_construct(
+        name=name,
+        ingredients=list(ingredients),
+        instructions=list(instructions),
+        makes_min=None,
+        makes_max=None,
+        makes_unit=None,
+    )
+
+
+class TestSplitSections:
+    def test_splits_on_recipe_headings(self):
+        sections = split_sections(ROUNDUP)
+
+        assert [section.splitlines()[0] for section in sections] == [
+            "# 3 Weeknight Dinners",
+            "## Chicken",
+            "## Tofu",
+            "## Related posts",
+            "## Prawns",
+        ]
+        assert [is_recipe_section(section) for section in sections] == [
+            False,
+            True,
+            True,
+            False,
+            True,
+        ]
+
+    def test_ignores_ingredient_and_instruction_headings(self):
+        text = _recipe_section("Chicken", level="#")
+
+        assert split_sections(text) == [text]
+
+    def test_nutrition_table_is_not_a_recipe(self):
+        section = "## Nutrition\n\nServing Size\n1 cup\nFat\n17 g\nCarbs\n4 g\nPlace"
+
+        assert not is_recipe_section(section)
+
+
+class TestSplit:
+    def test_returns_recipe_sections(self):
+        chunks = _extractor(_extract_by_heading).split(ROUNDUP)
+
+        assert [chunk.splitlines()[0] for chunk in chunks] == [
+            "## Chicken",
+            "## Tofu",
+            "## Prawns",
+        ]
+
+    @pytest.mark.parametrize(
+        "text", ["1 cup rice\nBoil the rice.", _recipe_section("A")]
+    )
+    def test_single_recipes_are_not_split(self, text):
+        assert _extractor(_extract_by_heading).split(text) == []
+
+    def test_eval_pages_are_not_split(self):
+        extractor = _extractor(_extract_by_heading)
+
+        assert all(
+            not extractor.split(case.page_text)
+            for case in load_eval_cases(EVAL_FIXTURE_DIR)
+        )
+
+    def test_disabled(self):
+        assert _extractor(_extract_by_heading, enabled=False).split(ROUNDUP) == []
+
+    def test_keeps_best_sections_in_page_order(self):
+        short = _recipe_section("Short").replace("  * 1 cup rice\n", "")
+
+        chunks = _extractor(_extract_by_heading, max_chunks=2).split(
+            "\n\n".join([_recipe_section("Long"), short, _recipe_section("Last")])
+        )
+
+        assert [chunk.splitlines()[0] for chunk in chunks] == ["## Long", "## Last"]
+
+
+class TestMergeRecipes:
+    def test_keeps_distinct_recipes_in_order(self):
+        recipes = [_recipe("Chicken"), _recipe("Tofu")]
+
+        assert merge_recipes(recipes) == recipes
+
+    def test_merges_repeated_names(self):
+        merged = merge_recipes(
+            [_recipe("Chicken Curry", instructions=()), _recipe("chicken curry!")]
+        )
+
+        assert [recipe.name for recipe in merged] == ["Chicken Curry"]
+        assert merged[0].instructions == ["s"]
+
+    def test_merges_partial_recipes(self):
+        merged = merge_recipes(
+            [
+                _recipe("Cake", instructions=()),
+                _recipe("Frosting", ingredients=(), instructions=("Ice the cake.",)),
+                _recipe("Bread"),
+            ]
+        )
+
+        assert [recipe.name for recipe in merged] == ["Cake", "Bread"]
+        assert merged[0].ingredients == ["i"]
+        assert merged[0].instructions == ["Ice the cake."]
+
+    def test_drops_recipes_without_instructions(self):
+        assert merge_recipes([_recipe("A"), _recipe("B", instructions=())]) == [
+            _recipe("A")
+        ]
+        assert merge_recipes([_recipe("B", instructions=())]) == [
+            _recipe("B", instructions=())
+        ]
+
+
+@pytest.mark.anyio
+class TestExtractChunks:
+    async def test_extracts_chunks_in_parallel(self):
+        extractor = _extractor(_extract_by_heading)
+        chunks = extractor.split(ROUNDUP)
+
+        started = time.perf_counter()
+        recipes = await extractor.extract_chunks(chunks)
+        elapsed = time.perf_counter() - started
+
+        assert [recipe.name for recipe in recipes] == ["Chicken", "Tofu", "Prawns"]
+        assert elapsed < 0.05 * len(chunks)
+        metrics = extractor.metrics()
+        assert (metrics["pages"], metrics["chunks"], metrics["recipes"]) == (1, 3, 3)
+        assert metrics["slowest_chunk_seconds_avg"] >= 0.05
+
+    async def test_skips_failed_chunks(self):
+        async def extract(text: str) -> RecipeBase:
+            if "Tofu" in text:
+                raise RuntimeError("LLM down")
+            return await _extract_by_heading(text)
+
+        extractor = _extractor(extract)
+
+        recipes = await extractor.extract_chunks(extractor.split(ROUNDUP))
+
+        assert [recipe.name for recipe in recipes] == ["Chicken", "Prawns"]
+        assert extractor.metrics()["chunk_errors"] == 1
+
+    async def test_raises_if_every_chunk_fails(self):
+        error = RuntimeError("LLM down")
+        extractor = _extractor(MagicMock(side_effect=error))
+
+        with pytest.raises(RuntimeError) as excinfo:
+            await extractor.extract_chunks(extractor.split(ROUNDUP))
+
+        assert excinfo.value.__cause__ is error
+        assert extractor.metrics()["failed_pages"] == 1
+
+
+def test_registers_metrics_source():
+    registry = MagicMock()
+
+    extractor = MultiRecipeExtractor(registry=registry)
+
+    registry.register.assert_called_once_with("multi_recipe", extractor.metrics)
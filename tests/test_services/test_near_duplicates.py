@@ -0,0 +1,223 @@
+import sqlite3
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from meal_planner.models import RecipeBase
+from meal_planner.services.near_duplicates import (
+    NUM_BINS,
+    NearDuplicateIndex,
+    allow_near_duplicate_reuse,
+    estimated_similarity,
+    minhash_signature,
+    shingles,
+)
+
+RECIPE_TEXT = "\n".join(
+    [
+        "Good Old-Fashioned Pancakes",
+        "Prep time 5 minutes, cook time 15 minutes, makes 8 pancakes.",
+        "Ingredients",
+        "1 1/2 cups all-purpose flour",
+        "3 1/2 teaspoons baking powder",
+        "1 tablespoon white sugar",
+        "1/4 teaspoon salt, or more to taste",
+        "1 1/4 cups milk",
+        "3 tablespoons butter, melted",
+        "1 large egg",
+        "Directions",
+        "Sift flour, baking powder, sugar, and salt together in a large bowl.",
+        "Make a well in the center and add milk, melted butter, and egg; "
+        "mix until smooth.",
+        "Heat a lightly oiled griddle or pan over medium-high heat.",
+        "Pour or scoop the batter onto the griddle, using approximately 1/4 cup "
+        "for each pancake; cook until bubbles form and the edges are dry, "
+        "about 2 to 3 minutes.",
+        "Flip and cook until browned on the other side, about 2 minutes more.",
+        "Repeat with remaining batter and serve warm with maple syrup.",
+    ]
+)
+SYNDICATED_TEXT = (
+    "Subscribe to our newsletter\n" + RECIPE_TEXT + "\nAdvertisement\nShare this"
+)
+OTHER_TEXT = (
+    "Weeknight Honey Garlic Shrimp\nIngredients\n1 pound large shrimp, peeled\n"
+    "3 tablespoons honey\n2 tablespoons soy sauce\n4 cloves garlic, minced\n"
+    "Instructions\nWhisk the honey, soy sauce and garlic together in a bowl.\n"
+    "Cook the shrimp in a hot skillet until pink, then pour in the sauce and "
+    "simmer until glossy. Serve over rice with sliced green onions."
+)
+RECIPE = RecipeBase(
+    name="Good Old-Fashioned Pancakes",
+    ingredients=["1 1/2 cups all-purpose flour"],
+    instructions=["Mix and cook."],
+)
+
+
+@pytest.fixture(autouse=True)
+def allow_reuse():
+    with allow_near_duplicate_reuse():
+        yield
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = NearDuplicateIndex(tmp_path / "cache.db", enabled=True, registry=None)
+    yield index
+    index.close()
+
+
+def test_shingles():
+    assert shingles("One, two three FOUR five six.") == {
+        "one two three four five",
+        "two three four five six",
+    }
+    assert shingles("Too short") == {"too short"}
+    assert shingles("  ...  ") == set()
+
+
+def test_signature_estimates_similarity():
+    original = minhash_signature(RECIPE_TEXT)
+    syndicated = minhash_signature(SYNDICATED_TEXT)
+    other = minhash_signature(OTHER_TEXT)
+
+    assert len(original) == NUM_BINS
+    assert minhash_signature(RECIPE_TEXT.upper()) == original
+    exact = len(shingles(RECIPE_TEXT) & shingles(SYNDICATED_TEXT)) / len(
+        shingles(RECIPE_TEXT) | shingles(SYNDICATED_TEXT)
+    )
+    assert estimated_similarity(original, syndicated) == pytest.approx(exact, abs=0.1)
+    assert estimated_similarity(original, other) < 0.1
+    assert minhash_signature("!!!") is None
+
+
+def test_finds_extraction_of_near_duplicate(index: NearDuplicateIndex):
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    assert index.find(SYNDICATED_TEXT, "extract.txt") == RECIPE
+    assert index.find(OTHER_TEXT, "extract.txt") is None
+    assert index.find(SYNDICATED_TEXT, "other_template.txt") is None
+
+    metrics = index.metrics()
+    assert (metrics["entries"], metrics["lookups"], metrics["hits"]) == (1, 3, 1)
+    assert metrics["memory_bytes"] > 0
+    assert metrics["lookup_p95_ms"] >= metrics["lookup_p50_ms"] >= 0
+
+
+def test_different_numbers_are_not_reused(index: NearDuplicateIndex):
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+    edited = RECIPE_TEXT.replace("3 1/2 teaspoons", "4 1/2 teaspoons")
+
+    assert index.find(edited, "extract.txt") is None
+    assert index.metrics()["number_mismatches"] == 1
+
+
+def test_reuse_must_be_allowed(index: NearDuplicateIndex):
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    with allow_near_duplicate_reuse(False):
+        assert index.find(SYNDICATED_TEXT, "extract.txt") is None
+    assert index.metrics()["lookups"] == 0
+
+
+def test_entries_without_numbers_are_migrated(tmp_path):
+    conn = sqlite3.connect(tmp_path / "cache.db")
+    conn.execute(
+        "CREATE TABLE near_duplicates (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "template TEXT NOT NULL, signature BLOB NOT NULL, "
+        "recipe_json TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO near_duplicates (template, signature, recipe_json, created_at) "
+        "VALUES (?, ?, ?, ?)",
+        (
+            "extract.txt",
+            minhash_signature(RECIPE_TEXT).tobytes(),
+            RECIPE.model_dump_json(),
+            time.time(),
+        ),
+    )
+    conn.commit()
+    conn.close()
+    index = NearDuplicateIndex(tmp_path / "cache.db", enabled=True, registry=None)
+
+    assert index.find(SYNDICATED_TEXT, "extract.txt") is None
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    assert index.find(SYNDICATED_TEXT, "extract.txt") == RECIPE
+    index.close()
+
+
+def test_threshold(tmp_path):
+    index = NearDuplicateIndex(
+        tmp_path / "cache.db", threshold=1.0, enabled=True, registry=None
+    )
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    assert index.find(SYNDICATED_TEXT, "extract.txt") is None
+    assert index.find(RECIPE_TEXT, "extract.txt") == RECIPE
+    index.close()
+
+
+def test_entries_survive_restart(tmp_path, index: NearDuplicateIndex):
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+    index.close()
+
+    reopened = NearDuplicateIndex(tmp_path / "cache.db", enabled=True, registry=None)
+
+    assert reopened.find(SYNDICATED_TEXT, "extract.txt") == RECIPE
+    reopened.close()
+
+
+def test_oldest_entries_are_evicted(tmp_path):
+    index = NearDuplicateIndex(
+        tmp_path / "cache.db", max_entries=1, enabled=True, registry=None
+    )
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+    index.add(OTHER_TEXT, "extract.txt", RECIPE)
+
+    assert len(index) == 1
+    assert index.find(RECIPE_TEXT, "extract.txt") is None
+    assert index._conn.execute("SELECT COUNT(*) FROM near_duplicates").fetchone() == (
+        1,
+    )
+    index.close()
+
+
+def test_expired_entries_are_ignored(index: NearDuplicateIndex):
+    with patch(
+        "meal_planner.services.near_duplicates.time.time",
+        return_value=1000.0,
+    ):
+        index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    assert index.find(RECIPE_TEXT, "extract.txt") is None
+
+
+def test_disabled(tmp_path):
+    index = NearDuplicateIndex(tmp_path / "cache.db", enabled=False, registry=None)
+
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    assert index.find(RECIPE_TEXT, "extract.txt") is None
+    assert not (tmp_path / "cache.db").exists()
+
+
+def test_unavailable_database_disables_index(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    index = NearDuplicateIndex(blocker / "cache.db", enabled=True, registry=None)
+
+    index.add(RECIPE_TEXT, "extract.txt", RECIPE)
+
+    assert index.find(RECIPE_TEXT, "extract.txt") is None
+    assert index.metrics()["enabled"] is False
+
+
+def test_registration(tmp_path):
+    registry = MagicMock()
+
+    index = NearDuplicateIndex(tmp_path / "cache.db", registry=registry)
+
+    registry.register.assert_called_once_with("near_duplicates", index.metrics)
@@ -0,0 +1,185 @@
+import hashlib
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from meal_planner.config import (
+    PROMPT_DIR,
+    RECIPE_EXTRACTION_PROMPT,
+    RECIPE_MODIFICATION_PROMPT,
+)
+from meal_planner.services import prompt_registry as prompt_registry_module
+from meal_planner.services.prompt_registry import PromptRegistry
+
+
+def _write(prompt_dir: Path, category: str, version: str, text: str) -> Path:
+    path = prompt_dir / category / f"{version}.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def prompt_dir(tmp_path: Path) -> Path:
+    _write(tmp_path, "recipe_extraction", "20250101_old", "Old: $page_text")
+    _write(tmp_path, "recipe_extraction", "20250202_new", "New: $page_text")
+    _write(tmp_path, "recipe_modification", "20250101_initial", "Mod: $request")
+    return tmp_path
+
+
+@pytest.fixture
+def registry(prompt_dir: Path) -> PromptRegistry:
+    registry = PromptRegistry(prompt_dir, reload_check_seconds=0, registry=None)
+    registry.load()
+    return registry
+
+
+class TestLookup:
+    def test_indexes_by_category_and_version(self, registry: PromptRegistry):
+        template = registry.get("recipe_extraction", "20250202_new")
+
+        assert template.category == "recipe_extraction"
+        assert template.version == "20250202_new"
+        assert template.name == "20250202_new.txt"
+        assert template.content_hash == hashlib.sha256(b"New: $page_text").hexdigest()
+        assert registry.versions("recipe_extraction") == [
+            "20250101_old",
+            "20250202_new",
+        ]
+        assert registry.versions("recipe_modification") == ["20250101_initial"]
+        assert registry.versions("unknown") == []
+
+    def test_accepts_file_names(self, registry: PromptRegistry):
+        assert (
+            registry.get("recipe_extraction", "20250101_old.txt").version
+            == "20250101_old"
+        )
+
+    def test_render_substitutes_safely(self, registry: PromptRegistry):
+        template = registry.get("recipe_extraction", "20250202_new")
+
+        assert template.render(page_text="{x} $y") == "New: {x} $y"
+        assert template.render() == "New: $page_text"
+
+    def test_render_legacy_placeholders(self, prompt_dir: Path):
+        _write(
+            prompt_dir, "recipe_extraction", "20240101_legacy", "Old: {page_text} {x}"
+        )
+        registry = PromptRegistry(prompt_dir, registry=None)
+
+        template = registry.get("recipe_extraction", "20240101_legacy")
+
+        assert template.render(page_text="{x} $y") == "Old: {x} $y {x}"
+
+    @pytest.mark.parametrize(
+        "category, version",
+        [("recipe_extraction", "missing"), ("missing", "20250202_new")],
+    )
+    def test_missing_template_raises(self, registry, category, version):
+        with pytest.raises(FileNotFoundError) as excinfo:
+            registry.get(category, version)
+
+        assert excinfo.value.filename == str(
+            registry.prompt_dir / category / f"{version}.txt"
+        )
+
+    def test_loads_lazily_on_first_lookup(self, prompt_dir: Path):
+        registry = PromptRegistry(prompt_dir, registry=None)
+
+        template = registry.get("recipe_modification", "20250101_initial")
+
+        assert template.render(request="x") == "Mod: x"
+
+    def test_does_not_read_files_after_loading(self, registry: PromptRegistry):
+        registry.reload_check_seconds = 3600
+        with patch.object(Path, "read_text") as read_text:
+            registry.get("recipe_extraction", "20250202_new")
+            registry.get("recipe_extraction", "20250101_old")
+
+        read_text.assert_not_called()
+
+
+class TestReload:
+    def test_reloads_changed_files(self, registry: PromptRegistry, prompt_dir: Path):
+        path = _write(prompt_dir, "recipe_extraction", "20250202_new", "Edited")
+        _bump_mtime(path)
+
+        template = registry.get("recipe_extraction", "20250202_new")
+
+        assert template.render() == "Edited"
+        assert registry.reloads == 1
+
+    def test_only_rereads_changed_files(
+        self, registry: PromptRegistry, prompt_dir: Path
+    ):
+        unchanged = registry.get("recipe_extraction", "20250101_old")
+        path = _write(prompt_dir, "recipe_extraction", "20250202_new", "Edited")
+        _bump_mtime(path)
+
+        assert registry.refresh() == 1
+        assert registry.get("recipe_extraction", "20250101_old") is unchanged
+
+    def test_picks_up_added_and_removed_files(
+        self, registry: PromptRegistry, prompt_dir: Path
+    ):
+        _write(prompt_dir, "recipe_extraction", "20250303_newer", "Newer")
+        (prompt_dir / "recipe_extraction" / "20250101_old.txt").unlink()
+
+        assert registry.refresh() == 2
+        assert registry.versions("recipe_extraction") == [
+            "20250202_new",
+            "20250303_newer",
+        ]
+
+    def test_checks_at_most_once_per_interval(
+        self, registry: PromptRegistry, prompt_dir: Path
+    ):
+        registry.reload_check_seconds = 5
+        path = _write(prompt_dir, "recipe_extraction", "20250202_new", "Edited")
+        _bump_mtime(path)
+        last_check = registry._last_check
+
+        with patch.object(
+            prompt_registry_module.time, "monotonic", return_value=last_check + 4
+        ):
+            assert registry.get("recipe_extraction", "20250202_new").render() == (
+                "New: $page_text"
+            )
+        with patch.object(
+            prompt_registry_module.time, "monotonic", return_value=last_check + 5
+        ):
+            assert registry.get("recipe_extraction", "20250202_new").render() == (
+                "Edited"
+            )
+
+
+class TestMetrics:
+    def test_reports_template_hashes_and_reloads(self, registry: PromptRegistry):
+        metrics = registry.metrics()
+
+        assert metrics["reloads"] == 0
+        assert metrics["templates"]["recipe_modification"] == {
+            "20250101_initial": hashlib.sha256(b"Mod: $request").hexdigest()[:12]
+        }
+
+    def test_registers_metrics_source(self, prompt_dir: Path):
+        metrics = MagicMock()
+
+        PromptRegistry(prompt_dir, registry=metrics)
+
+        metrics.register.assert_called_once()
+        assert metrics.register.call_args.args[0] == "prompt_registry"
+
+
+def test_configured_active_templates_exist():
+    registry = PromptRegistry(PROMPT_DIR, registry=None)
+
+    assert registry.get("recipe_extraction", RECIPE_EXTRACTION_PROMPT)
+    assert registry.get("recipe_modification", RECIPE_MODIFICATION_PROMPT)
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from meal_planner.services.recipe_events import RecipeEvent, RecipeEventBroker
+
+
+@pytest.mark.anyio
+class TestRecipeEventBroker:
+    async def test_publish_reaches_all_subscribers(self):
+        broker = RecipeEventBroker()
+        event = RecipeEvent("created", "id-1", "Soup")
+
+        async with broker.subscribe() as first, broker.subscribe() as second:
+            broker.publish(event)
+
+            assert first.get_nowait() == event
+            assert second.get_nowait() == event
+
+    async def test_subscription_removed_on_exit(self):
+        broker = RecipeEventBroker()
+
+        async with broker.subscribe():
+            assert broker.subscriber_count == 1
+
+        assert broker.subscriber_count == 0
+        broker.publish(RecipeEvent("deleted", "id-1", "Soup"))
+
+    async def test_full_queue_drops_event_for_that_subscriber_only(self):
+        broker = RecipeEventBroker(queue_size=1)
+        first_event = RecipeEvent("created", "id-1", "Soup")
+        second_event = RecipeEvent("updated", "id-1", "Better Soup")
+
+        async with broker.subscribe() as slow:
+            broker.publish(first_event)
+            async with broker.subscribe() as fresh:
+                broker.publish(second_event)
+
+                assert slow.get_nowait() == first_event
+                with pytest.raises(asyncio.QueueEmpty):
+                    slow.get_nowait()
+                assert fresh.get_nowait() == second_event
@@ -0,0 +1,109 @@
+import pytest
+
+from meal_planner.models import RecipeBase, RecipeEdit, RecipePatch
+from meal_planner.services.recipe_patch import (
+    RecipePatchError,
+    apply_recipe_patch,
+    indexed_markdown,
+)
+
+RECIPE = RecipeBase(
+    name="Pancakes",
+    ingredients=["1 cup flour", "1 egg", "1 cup milk"],
+    instructions=["Mix.", "Fry."],
+    makes_min=4,
+    makes_max=4,
+    makes_unit="pancakes",
+)
+
+
+def _edit(op, index, text=None, section="ingredients") -> RecipeEdit:
+    return RecipeEdit(op=op, section=section, index=index, text=text)
+
+
+def test_indexed_markdown():
+    assert indexed_markdown(RECIPE) == (
+        "# Pancakes\n\n"
+        "**Makes:** 4 pancakes\n\n"
+        "## Ingredients\n"
+        "- [0] 1 cup flour\n"
+        "- [1] 1 egg\n"
+        "- [2] 1 cup milk\n\n"
+        "## Instructions\n"
+        "- [0] Mix.\n"
+        "- [1] Fry.\n"
+    )
+
+
+def test_empty_patch_keeps_recipe():
+    assert apply_recipe_patch(RECIPE, RecipePatch()) == RECIPE
+
+
+def test_edits_use_original_indexes():
+    patch = RecipePatch(
+        edits=[
+            _edit("delete", 0),
+            _edit("replace", 2, "1 cup oat milk"),
+            _edit("insert", 1, "1 tbsp sugar"),
+            _edit("insert", 3, "pinch of salt"),
+            _edit("insert", 0, "Whisk the egg.", section="instructions"),
+        ]
+    )
+
+    patched = apply_recipe_patch(RECIPE, patch)
+
+    assert patched.ingredients == [
+        "1 tbsp sugar",
+        "1 egg",
+        "1 cup oat milk",
+        "pinch of salt",
+    ]
+    assert patched.instructions == ["Whisk the egg.", "Mix.", "Fry."]
+    assert RECIPE.ingredients == ["1 cup flour", "1 egg", "1 cup milk"]
+
+
+def test_inserts_at_the_same_index_keep_their_order():
+    patch = RecipePatch(edits=[_edit("insert", 1, "a"), _edit("insert", 1, "b")])
+
+    assert apply_recipe_patch(RECIPE, patch).ingredients == [
+        "1 cup flour",
+        "a",
+        "b",
+        "1 egg",
+        "1 cup milk",
+    ]
+
+
+def test_name_and_makes_changes():
+    patch = RecipePatch(name="Big Pancakes", makes_min=8, makes_max=10)
+
+    patched = apply_recipe_patch(RECIPE, patch)
+
+    assert (patched.name, patched.makes_min, patched.makes_max) == (
+        "Big Pancakes",
+        8,
+        10,
+    )
+    assert patched.makes_unit == "pancakes"
+
+
+@pytest.mark.parametrize(
+    ("edits", "message"),
+    [
+        ([_edit("replace", 3, "x")], "out of range"),
+        ([_edit("delete", 3)], "out of range"),
+        ([_edit("insert", 4, "x")], "out of range"),
+        ([_edit("replace", 0, " ")], "has no text"),
+        ([_edit("insert", 0)], "has no text"),
+        ([_edit("replace", 1, "x"), _edit("delete", 1)], "edited twice"),
+        ([_edit("delete", 0), _edit("delete", 1), _edit("delete", 2)], "invalid"),
+    ],
+)
+def test_rejects_patches_that_do_not_fit(edits, message):
+    with pytest.raises(RecipePatchError, match=message):
+        apply_recipe_patch(RECIPE, RecipePatch(edits=edits))
+
+
+def test_rejects_invalid_makes_range():
+    with pytest.raises(RecipePatchError, match="invalid"):
+        apply_recipe_patch(RECIPE, RecipePatch(makes_max=2))
@@ -0,0 +1,198 @@
+import json
+import re
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from meal_planner.services.extract_webpage_text import clean_html_text
+from meal_planner.services.llm_limiter import estimate_tokens
+from meal_planner.services.recipe_region import (
+    HEADING_SCORE,
+    IMPERATIVE_SCORE,
+    OTHER_LINE_SCORE,
+    QUANTITY_SCORE,
+    QUANTITY_UNIT_SCORE,
+    RecipeRegionReducer,
+    best_region,
+    score_line,
+    score_lines,
+)
+
+TEST_DATA_DIR = Path(__file__).parent.parent / "data/recipes/processed"
+
+NAVIGATION = "\n\n".join(f"  * Menu link {i}" for i in range(300))
+RECIPE = """\
+## Ingredients
+
+  * 1 ½ cups all-purpose flour
+  * 3 ½ teaspoons baking powder
+  * 1 large egg
+  * 1 ¼ cups milk
+
+## Directions
+
+  1. Sift flour and baking powder together in a large bowl.
+  2. Whisk in the milk and egg until smooth.
+  3. Cook on a hot griddle until bubbles form, then flip."""
+COMMENTS = "\n\n".join(f"Great recipe, comment number {i}!" for i in range(300))
+PAGE = f"""\
+{NAVIGATION}
+
+# Good Old-Fashioned Pancakes
+
+Servings:
+
+8
+
+{"A long story about grandma. " * 200}
+
+{RECIPE}
+
+{COMMENTS}"""
+
+
+def _reducer(**kwargs) -> RecipeRegionReducer:
+    kwargs.setdefault("margin_tokens", 0)
+    return RecipeRegionReducer(registry=None, **kwargs)
+
+
+class TestScoreLine:
+    @pytest.mark.parametrize(
+        "line, score",
+        [
+            ("", 0.0),
+            ("## Ingredients", HEADING_SCORE),
+            ("**DIRECTIONS**", HEADING_SCORE),
+            ("#### Step 2", HEADING_SCORE),
+            ("  * 1 ½ cups all-purpose flour", QUANTITY_UNIT_SCORE),
+            ("  * **1** **1/2** **tsp.** kosher salt", QUANTITY_UNIT_SCORE),
+            ("200g butter, softened", QUANTITY_UNIT_SCORE),
+            ("  2. Whisk in the milk and egg until smooth.", IMPERATIVE_SCORE),
+            ("Step 4Transfer bok choy to a platter.", IMPERATIVE_SCORE),
+            ("2 eggs", QUANTITY_SCORE),
+            ("Beat Bobby Flay", OTHER_LINE_SCORE),
+            ("17 g", OTHER_LINE_SCORE),
+            ("8am | 7c", OTHER_LINE_SCORE),
+            ("Subscribe to our newsletter", OTHER_LINE_SCORE),
+        ],
+    )
+    def test_scores(self, line, score):
+        assert score_line(line) == score
+
+
+class TestScoreLines:
+    def test_joins_amount_with_ingredient_on_next_line(self):
+        lines = ["  * **1** **cup**", "", "dried chickpeas"]
+
+        assert score_lines(lines) == [QUANTITY_UNIT_SCORE, 0.0, 0.0]
+
+    def test_bare_amounts_in_a_row_are_not_ingredients(self):
+        assert score_lines(["17 g", "", "4 g"]) == [
+            OTHER_LINE_SCORE,
+            0.0,
+            OTHER_LINE_SCORE,
+        ]
+
+    def test_repeated_lines_score_as_furniture(self):
+        line = "Heat the oil in a large pan."
+
+        assert score_lines([line, line]) == [IMPERATIVE_SCORE, OTHER_LINE_SCORE]
+
+    def test_short_repeated_amounts_still_count(self):
+        lines = ["1 tsp. cumin", "1 tsp. cumin"]
+
+        assert score_lines(lines) == [QUANTITY_UNIT_SCORE, QUANTITY_UNIT_SCORE]
+
+
+def test_best_region():
+    assert best_region([-1.0, 3.0, -1.0, 2.0, -5.0, 1.0]) == (4.0, 1, 3)
+    assert best_region([-1.0, 0.0]) == (0.0, 0, -1)
+
+
+class TestRecipeRegionReducer:
+    def test_keeps_recipe_title_and_details(self):
+        reduced = _reducer().reduce(PAGE)
+
+        assert reduced.startswith("# Good Old-Fashioned Pancakes\nServings: 8\n")
+        assert RECIPE in reduced
+        assert "Menu link" not in reduced
+        assert "comment number" not in reduced
+        assert "grandma" not in reduced
+
+    def test_margin_keeps_nearby_context(self):
+        reduced = _reducer(margin_tokens=20).reduce(PAGE)
+
+        assert "comment number 0!" in reduced
+        assert "comment number 299!" not in reduced
+
+    def test_short_text_is_unchanged(self):
+        text = f"Pancakes\n\n{RECIPE}"
+
+        assert _reducer().reduce(text) == text
+
+    def test_text_without_recipe_is_kept(self):
+        text = NAVIGATION
+
+        assert _reducer().reduce(text) == text
+
+    def test_enforces_token_budget(self):
+        reducer = _reducer(max_tokens=100)
+
+        reduced = reducer.reduce(NAVIGATION)
+
+        assert estimate_tokens(reduced) <= 100
+        assert NAVIGATION.startswith(reduced)
+        assert reducer.truncated == 1
+
+    def test_disabled(self):
+        reducer = _reducer(enabled=False, max_tokens=10)
+
+        assert reducer.reduce(PAGE) == PAGE
+        assert reducer.texts == 0
+
+    def test_metrics_and_registration(self):
+        registry = MagicMock()
+        reducer = RecipeRegionReducer(margin_tokens=0, registry=registry)
+
+        reducer.reduce(PAGE)
+
+        registry.register.assert_called_once_with("recipe_region", reducer.metrics)
+        metrics = reducer.metrics()
+        assert metrics["texts"] == metrics["reduced"] == 1
+        assert metrics["tokens_in"] == estimate_tokens(PAGE)
+        assert metrics["tokens_out"] < metrics["tokens_in"]
+        assert 0 < metrics["token_reduction_ratio"] < 1
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9½¼¾⅓⅔]+", " ", text.lower()).strip()
+
+
+def _contains(text: str, item: str) -> bool:
+    return " ".join(_normalize(item).split()[:6]) in text
+
+
+def test_eval_pages_keep_expected_content_in_fewer_tokens():
+    reducer = _reducer(margin_tokens=300)
+    tokens_in = tokens_out = 0
+    for json_file in sorted(TEST_DATA_DIR.glob("*.json")):
+        expected = json.loads(json_file.read_text())
+        page = clean_html_text((json_file.parent / expected["html_file"]).read_text())
+        reduced = reducer.reduce(page)
+        tokens_in += estimate_tokens(page)
+        tokens_out += estimate_tokens(reduced)
+
+        full_text, reduced_text = _normalize(page), _normalize(reduced)
+        items = expected["expected_ingredients"] + expected["expected_instructions"]
+        lost = [
+            item
+            for item in items
+            if _contains(full_text, item) and not _contains(reduced_text, item)
+        ]
+        assert not lost, f"{json_file.name} lost {lost}"
+        assert any(
+            _normalize(name) in reduced_text for name in expected["expected_names"]
+        ), json_file.name
+
+    assert tokens_out < tokens_in * 0.5
@@ -0,0 +1,142 @@
+from fractions import Fraction
+
+import pytest
+
+from meal_planner.models import RecipeBase
+from meal_planner.services.recipe_scaling import (
+    RecipeScalingError,
+    format_number,
+    parse_number,
+    scale_factor,
+    scale_ingredient,
+    scale_recipe,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "value"),
+    [
+        ("2", Fraction(2)),
+        ("1.5", Fraction(3, 2)),
+        ("3/4", Fraction(3, 4)),
+        ("1 1/2", Fraction(3, 2)),
+        ("1⁄2", Fraction(1, 2)),
+        ("½", Fraction(1, 2)),
+        ("1½", Fraction(3, 2)),
+        ("2 ¾", Fraction(11, 4)),
+        ("1,500", Fraction(1500)),
+    ],
+)
+def test_parse_number(text, value):
+    assert parse_number(text) == value
+
+
+@pytest.mark.parametrize("text", ["1/0", "abc", ""])
+def test_parse_number_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_number(text)
+
+
+@pytest.mark.parametrize(
+    ("value", "style", "text"),
+    [
+        (Fraction(3), "fraction", "3"),
+        (Fraction(3, 2), "fraction", "1 1/2"),
+        (Fraction(1, 3), "fraction", "1/3"),
+        (Fraction(3, 2), "unicode", "1½"),
+        (Fraction(1, 4), "unicode", "¼"),
+        (Fraction(3, 2), "decimal", "1.5"),
+        (Fraction(1, 3), "decimal", "0.33"),
+        (Fraction(2), "decimal", "2"),
+        (Fraction(7, 10), "fraction", "2/3"),
+        (Fraction(1, 100), "fraction", "1/8"),
+        (Fraction(1, 1000), "decimal", "0.12"),
+        (Fraction(25, 2), "fraction", "12"),
+        (Fraction(103, 4), "fraction", "26"),
+        (Fraction(4500), "grouped", "4,500"),
+        (Fraction(3, 2), "grouped", "1 1/2"),
+    ],
+)
+def test_format_number(value, style, text):
+    assert format_number(value, style) == text
+
+
+@pytest.mark.parametrize(
+    ("ingredient", "factor", "scaled"),
+    [
+        ("2 cups flour", Fraction(3), "6 cups flour"),
+        ("1 1/2 tsp salt", Fraction(2), "3 tsp salt"),
+        ("3/4 cup sugar", Fraction(3), "2 1/4 cup sugar"),
+        ("½ onion, diced", Fraction(3), "1½ onion, diced"),
+        ("1½ cups milk", Fraction(1, 2), "¾ cups milk"),
+        ("0.5 kg potatoes", Fraction(3), "1.5 kg potatoes"),
+        ("2-3 cloves garlic", Fraction(2), "4-6 cloves garlic"),
+        ("2 to 3 tbsp oil", Fraction(1, 2), "1 to 1 1/2 tbsp oil"),
+        ("10–12 oz pasta", Fraction(1, 2), "5–6 oz pasta"),
+        ("100g butter", Fraction(3, 2), "150g butter"),
+        ("1 (14 oz) can tomatoes", Fraction(2), "2 (14 oz) can tomatoes"),
+        ("2 1/2-inch piece ginger", Fraction(2), "2 1/2-inch piece ginger"),
+        ("2-3-inch chunks squash", Fraction(2), "2-3-inch chunks squash"),
+        ("1,500 g flour", Fraction(3), "4,500 g flour"),
+        ("1,000 g flour", Fraction(1, 3), "333 g flour"),
+        ("1,5 kg potatoes", Fraction(2), "1,5 kg potatoes"),
+        ("Salt and pepper to taste", Fraction(2), "Salt and pepper to taste"),
+        ("Juice of 1 lemon", Fraction(2), "Juice of 1 lemon"),
+    ],
+)
+def test_scale_ingredient(ingredient, factor, scaled):
+    assert scale_ingredient(ingredient, factor) == scaled
+
+
+class TestScaleFactor:
+    def test_single_yield(self):
+        assert scale_factor(4, 4, 12) == 3
+
+    def test_range_uses_midpoint(self):
+        assert scale_factor(4, 6, 10) == 2
+
+    @pytest.mark.parametrize(("makes_min", "makes_max"), [(4, None), (None, 4)])
+    def test_one_sided_yield(self, makes_min, makes_max):
+        assert scale_factor(makes_min, makes_max, 2) == Fraction(1, 2)
+
+    def test_requires_yield(self):
+        with pytest.raises(RecipeScalingError, match="makes"):
+            scale_factor(None, None, 4)
+
+    def test_requires_positive_target(self):
+        with pytest.raises(RecipeScalingError):
+            scale_factor(4, 4, 0)
+
+
+class TestScaleRecipe:
+    def _recipe(self, **kwargs) -> RecipeBase:
+        kwargs.setdefault("name", "Pancakes")
+        kwargs.setdefault("ingredients", ["1 1/2 cups flour", "2 eggs", "Salt"])
+        kwargs.setdefault("instructions", ["Mix 2 cups of the batter."])
+        return RecipeBase(**kwargs)
+
+    def test_scales_ingredients_and_yield(self):
+        recipe = self._recipe(makes_min=4, makes_max=4, makes_unit="servings")
+
+        scaled = scale_recipe(recipe, 12)
+
+        assert scaled.ingredients == ["4 1/2 cups flour", "6 eggs", "Salt"]
+        assert (scaled.makes_min, scaled.makes_max) == (12, 12)
+        assert scaled.makes_unit == "servings"
+        assert scaled.instructions == recipe.instructions
+        assert recipe.ingredients[0] == "1 1/2 cups flour"
+
+    def test_scales_yield_range(self):
+        scaled = scale_recipe(self._recipe(makes_min=4, makes_max=6), 10)
+
+        assert (scaled.makes_min, scaled.makes_max) == (8, 12)
+        assert scaled.ingredients[1] == "4 eggs"
+
+    def test_one_sided_yield(self):
+        scaled = scale_recipe(self._recipe(makes_max=2), 4)
+
+        assert (scaled.makes_min, scaled.makes_max) == (None, 4)
+
+    def test_requires_yield(self):
+        with pytest.raises(RecipeScalingError):
+            scale_recipe(self._recipe(), 4)
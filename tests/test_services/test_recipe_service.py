@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Session
+
+from meal_planner.models import RecipeBase
+from meal_planner.services.recipe_events import RecipeEvent, RecipeEventBroker
+from meal_planner.services.recipes import (
+    RecipeNotFoundError,
+    RecipeService,
+    RecipeStorageError,
+)
+
+MISSING_ID = "99999999-9999-9999-9999-999999999999"
+
+
+@pytest.fixture
+def broker() -> RecipeEventBroker:
+    return RecipeEventBroker()
+
+
+@pytest.fixture
+def service(dbsession: Session, broker: RecipeEventBroker) -> RecipeService:
+    return RecipeService(dbsession, events=broker)
+
+
+def _recipe_data(name: str = "Service Recipe") -> RecipeBase:
+    return RecipeBase(name=name, ingredients=["flour"], instructions=["Bake."])
+
+
+async def _drain(broker: RecipeEventBroker, action) -> list[RecipeEvent]:
+    async with broker.subscribe() as queue:
+        action()
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+
+
+def test_create_assigns_id_and_timestamps(service: RecipeService):
+    recipe = service.create(_recipe_data())
+
+    assert recipe.id is not None
+    assert recipe.created_at is not None
+    assert recipe.created_at == recipe.updated_at
+
+
+def test_list_all_and_get(service: RecipeService):
+    assert service.list_all() == []
+
+    created = service.create(_recipe_data())
+
+    assert [recipe.id for recipe in service.list_all()] == [created.id]
+    assert service.get(str(created.id)).name == "Service Recipe"
+
+
+def test_update_replaces_fields(service: RecipeService):
+    created = service.create(_recipe_data())
+    created_at = created.created_at
+
+    updated = service.update(
+        str(created.id),
+        RecipeBase(
+            name="Updated",
+            ingredients=["sugar"],
+            instructions=["Stir."],
+            makes_min=2,
+            makes_max=4,
+            makes_unit="cookies",
+        ),
+    )
+
+    assert updated.name == "Updated"
+    assert updated.ingredients == ["sugar"]
+    assert updated.makes_unit == "cookies"
+    assert updated.created_at == created_at
+    assert updated.updated_at >= created_at
+
+
+def test_delete_removes_recipe(service: RecipeService):
+    created = service.create(_recipe_data())
+
+    service.delete(str(created.id))
+
+    with pytest.raises(RecipeNotFoundError):
+        service.get(str(created.id))
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda service: service.get(MISSING_ID),
+        lambda service: service.update(MISSING_ID, _recipe_data()),
+        lambda service: service.delete(MISSING_ID),
+    ],
+    ids=["get", "update", "delete"],
+)
+def test_missing_recipe_raises_not_found(service: RecipeService, call):
+    with pytest.raises(RecipeNotFoundError):
+        call(service)
+
+
+@pytest.mark.parametrize(
+    "method, call, detail",
+    [
+        ("commit", lambda s: s.create(_recipe_data()), "creating recipe"),
+        ("exec", lambda s: s.list_all(), "retrieving recipes"),
+        ("exec", lambda s: s.get(MISSING_ID), "retrieving recipe"),
+        ("get", lambda s: s.update(MISSING_ID, _recipe_data()), "retrieving recipe"),
+        ("get", lambda s: s.delete(MISSING_ID), "fetching recipe for deletion"),
+    ],
+    ids=["create", "list_all", "get", "update", "delete"],
+)
+def test_database_errors_raise_storage_error(
+    service: RecipeService, method: str, call, detail: str
+):
+    with (
+        patch(f"sqlmodel.Session.{method}", side_effect=Exception("db down")),
+        pytest.raises(RecipeStorageError, match=detail),
+    ):
+        call(service)
+
+
+def test_failed_write_rolls_back(service: RecipeService):
+    created = service.create(_recipe_data())
+
+    with (
+        patch("sqlmodel.Session.commit", side_effect=Exception("db down")),
+        patch("sqlmodel.Session.rollback") as mock_rollback,
+        pytest.raises(RecipeStorageError, match="updating recipe"),
+    ):
+        service.update(str(created.id), _recipe_data("New name"))
+    mock_rollback.assert_called_once()
+
+    with (
+        patch("sqlmodel.Session.commit", side_effect=Exception("db down")),
+        patch("sqlmodel.Session.rollback") as mock_rollback,
+        pytest.raises(RecipeStorageError, match="deleting recipe"),
+    ):
+        service.delete(str(created.id))
+    mock_rollback.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_writes_publish_events(service: RecipeService, broker):
+    created_events = await _drain(broker, lambda: service.create(_recipe_data()))
+    recipe_id = created_events[0].recipe_id
+
+    updated_events = await _drain(
+        broker, lambda: service.update(str(recipe_id), _recipe_data("Renamed"))
+    )
+    deleted_events = await _drain(broker, lambda: service.delete(str(recipe_id)))
+
+    assert created_events == [RecipeEvent("created", recipe_id, "Service Recipe")]
+    assert updated_events == [RecipeEvent("updated", recipe_id, "Renamed")]
+    assert deleted_events == [RecipeEvent("deleted", str(recipe_id), "Renamed")]
+
+
+@pytest.mark.anyio
+async def test_failed_writes_publish_nothing(service: RecipeService, broker):
+    def failing_create():
+        with (
+            patch("sqlmodel.Session.commit", side_effect=Exception("db down")),
+            pytest.raises(RecipeStorageError),
+        ):
+            service.create(_recipe_data())
+
+    assert await _drain(broker, failing_create) == []
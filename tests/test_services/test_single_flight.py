@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from meal_planner.services.metrics import MetricsRegistry
+from meal_planner.services.single_flight import SingleFlight
+
+
+def _counting(result="value", gate: asyncio.Event | None = None):
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        if gate is not None:
+            await gate.wait()
+        return result
+
+    return fn, lambda: calls
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test", registry=None)
+    gate = asyncio.Event()
+    fn, call_count = _counting(gate=gate)
+
+    waiters = [asyncio.create_task(flight.do("key", fn)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters)
+
+    assert results == ["value"] * 5
+    assert call_count() == 1
+    assert flight.metrics() == {
+        "calls": 5,
+        "executions": 1,
+        "coalesced": 4,
+        "coalescing_ratio": 0.8,
+        "in_flight": 0,
+    }
+
+
+@pytest.mark.anyio
+async def test_different_keys_do_not_share():
+    flight = SingleFlight("test", registry=None)
+    gate = asyncio.Event()
+    fn, call_count = _counting(gate=gate)
+
+    waiters = [asyncio.create_task(flight.do(key, fn)) for key in ("a", "b")]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*waiters)
+
+    assert call_count() == 2
+    assert flight.coalescing_ratio == 0.0
+
+
+@pytest.mark.anyio
+async def test_sequential_calls_execute_again():
+    flight = SingleFlight("test", registry=None)
+    fn, call_count = _counting()
+
+    await flight.do("key", fn)
+    await flight.do("key", fn)
+
+    assert call_count() == 2
+
+
+@pytest.mark.anyio
+async def test_exception_is_shared_and_key_released():
+    flight = SingleFlight("test", registry=None)
+    gate = asyncio.Event()
+
+    async def failing():
+        await gate.wait()
+        raise ValueError("boom")
+
+    waiters = [asyncio.create_task(flight.do("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.metrics()["in_flight"] == 0
+    fn, _ = _counting(result="recovered")
+    assert await flight.do("key", fn) == "recovered"
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight("test", registry=None)
+    gate = asyncio.Event()
+    fn, call_count = _counting(gate=gate)
+
+    first = asyncio.create_task(flight.do("key", fn))
+    second = asyncio.create_task(flight.do("key", fn))
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+
+    assert await second == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert call_count() == 1
+
+
+def test_registers_metrics_source():
+    registry = MetricsRegistry()
+    SingleFlight("recipes", registry=registry)
+
+    assert registry.snapshot() == {
+        "single_flight.recipes": {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "coalescing_ratio": 0.0,
+            "in_flight": 0,
+        }
+    }
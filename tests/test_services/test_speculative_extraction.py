@@ -0,0 +1,146 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from meal_planner.services.speculative_extraction import (
+    SpeculativeExtractions,
+    text_key,
+)
+
+TEXT = "Pancakes\n1 cup flour\nMix and fry."
+
+
+def _store(**kwargs) -> SpeculativeExtractions:
+    kwargs.setdefault("enabled", True)
+    return SpeculativeExtractions(registry=None, **kwargs)
+
+
+class _Extractor:
+    """Extraction that runs until released, recording the texts it got."""
+
+    def __init__(self):
+        self.texts: list[str] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, text: str) -> str:
+        self.texts.append(text)
+        await self.release.wait()
+        return f"recipe from {text[:8]}"
+
+
+def test_text_key_ignores_line_endings_and_surrounding_whitespace():
+    assert text_key(TEXT) == text_key("\n" + TEXT.replace("\n", "\r\n") + "  ")
+    assert text_key(TEXT) != text_key(TEXT + " edited")
+
+
+@pytest.mark.anyio
+class TestSpeculativeExtractions:
+    async def test_unchanged_text_claims_the_extraction(self):
+        store = _store()
+        extract = _Extractor()
+
+        key = store.start(TEXT, extract)
+        store.discard_if_changed(key, TEXT.replace("\n", "\r\n"))
+        task = store.claim(TEXT.replace("\n", "\r\n"))
+        extract.release.set()
+
+        assert key == text_key(TEXT)
+        assert await task == "recipe from Pancakes"
+        assert extract.texts == [TEXT]
+        assert store.metrics()["hits"] == 1
+        assert len(store) == 0
+
+    async def test_claim_is_single_use(self):
+        store = _store()
+        store.start(TEXT, _Extractor())
+
+        first = store.claim(TEXT)
+        first.cancel()
+
+        assert store.claim(TEXT) is None
+
+    async def test_changed_text_cancels_the_extraction(self):
+        store = _store()
+        key = store.start(TEXT, _Extractor())
+        task = store._pending[key][1]
+
+        store.discard_if_changed(key, TEXT + " with more butter")
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert store.claim(TEXT) is None
+        assert store.metrics()["cancelled"] == 1
+
+    async def test_same_text_is_extracted_once(self):
+        store = _store()
+        extract = _Extractor()
+
+        assert store.start(TEXT, extract) == store.start(TEXT, extract)
+        await asyncio.sleep(0)
+
+        assert extract.texts == [TEXT]
+        assert store.metrics()["started"] == 1
+        store.claim(TEXT).cancel()
+
+    async def test_disabled(self):
+        store = _store(enabled=False)
+        extract = MagicMock()
+
+        assert store.start(TEXT, extract) is None
+        extract.assert_not_called()
+        assert store.claim(TEXT) is None
+
+    async def test_oldest_is_cancelled_beyond_max_pending(self):
+        store = _store(max_pending=1)
+        store.start("first", _Extractor())
+        first = store._pending[text_key("first")][1]
+
+        store.start("second", _Extractor())
+        await asyncio.sleep(0)
+
+        assert first.cancelled()
+        assert store.claim("first") is None
+        assert store.metrics()["expired"] == 1
+        store.claim("second").cancel()
+
+    async def test_unclaimed_extractions_expire(self):
+        store = _store(ttl_seconds=10)
+        with patch(
+            "meal_planner.services.speculative_extraction.time.monotonic",
+            return_value=100.0,
+        ):
+            store.start(TEXT, _Extractor())
+        task = store._pending[text_key(TEXT)][1]
+
+        with patch(
+            "meal_planner.services.speculative_extraction.time.monotonic",
+            return_value=111.0,
+        ):
+            assert store.claim(TEXT) is None
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert store.metrics()["expired"] == 1
+
+    async def test_unclaimed_failure_is_not_reported_as_unretrieved(self):
+        store = _store()
+
+        async def failing(text: str) -> str:
+            raise RuntimeError("LLM down")
+
+        store.start(TEXT, failing)
+        await asyncio.sleep(0)
+
+        task = store.claim(TEXT)
+        assert task.done()
+        with pytest.raises(RuntimeError):
+            await task
+
+
+def test_registration():
+    registry = MagicMock()
+
+    store = SpeculativeExtractions(registry=registry)
+
+    registry.register.assert_called_once_with("speculative_extraction", store.metrics)
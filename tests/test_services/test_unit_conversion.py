@@ -0,0 +1,136 @@
+import pytest
+
+from meal_planner.models import RecipeBase
+from meal_planner.services.unit_conversion import (
+    convert_recipe,
+    convert_text,
+    detect_conversion_request,
+)
+
+
+@pytest.mark.parametrize(
+    ("prompt", "system"),
+    [
+        ("Convert to metric", "metric"),
+        ("convert this recipe to metric units please", "metric"),
+        ("Use grams", "metric"),
+        ("Can you put the temperatures in Celsius?", "metric"),
+        ("US units", "us"),
+        ("Convert it to U.S. measurements.", "us"),
+        ("convert to imperial", "us"),
+        ("use cups and ounces", "us"),
+    ],
+)
+def test_detects_conversion_requests(prompt, system):
+    assert detect_conversion_request(prompt) == system
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "",
+        "Make it vegan",
+        "make it vegan and metric",
+        "convert to metric and halve it",
+        "metric and imperial",
+        "use fewer cups of sugar",
+    ],
+)
+def test_other_requests_are_not_conversions(prompt):
+    assert detect_conversion_request(prompt) is None
+
+
+@pytest.mark.parametrize(
+    ("text", "converted"),
+    [
+        ("1 1/2 cups all-purpose flour, sifted", "190 g all-purpose flour, sifted"),
+        ("½ cup brown sugar, packed", "110 g brown sugar, packed"),
+        ("1 stick butter, softened", "115 g butter, softened"),
+        ("2 cups milk", "470 ml milk"),
+        ("1 cup (240 ml) milk", "240 ml milk"),
+        ("1 cup (8 fl oz) cream", "235 ml cream"),
+        ("4 quarts water", "3.79 l water"),
+        ("2-3 lb potatoes", "0.91-1.36 kg potatoes"),
+        ("3 lbs. chicken thighs", "1.36 kg chicken thighs"),
+        ("1 (14 oz) can tomatoes", "1 (400 g) can tomatoes"),
+        ("2 tbsp olive oil", "2 tbsp olive oil"),
+        ("200 g spaghetti", "200 g spaghetti"),
+        ("1 large egg", "1 large egg"),
+        ("Add 2 cups of the stock.", "Add 470 ml of the stock."),
+        ("Preheat the oven to 350°F.", "Preheat the oven to 180°C."),
+        ("Bake at 425 degrees F for 20 minutes.", "Bake at 220°C for 20 minutes."),
+        ("Bake at 400F (200°C).", "Bake at 200°C."),
+        ("Chill to 40°F.", "Chill to 5°C."),
+        ("Bake at 180°C.", "Bake at 180°C."),
+        ("Whisk 1 cup milk with 2 cups flour", "Whisk 235 ml milk with 250 g flour"),
+        ("Stir in 1/2 cup water and the sugar", "Stir in 120 ml water and the sugar"),
+        ("1 cup chicken stock or butter", "235 ml chicken stock or butter"),
+        ("1 lb 4 oz beef", "570 g beef"),
+        ("1 cup plus 2 tbsp flour", "140 g flour"),
+    ],
+)
+def test_convert_to_metric(text, converted):
+    assert convert_text(text, "metric") == converted
+
+
+@pytest.mark.parametrize(
+    ("text", "converted"),
+    [
+        ("250 g flour", "2 cups flour"),
+        ("100g butter", "1/2 cup butter"),
+        ("500 g minced beef", "1 1/8 lb minced beef"),
+        ("200 g chicken", "7 oz chicken"),
+        ("1.5 kg potatoes", "3 1/3 lb potatoes"),
+        ("200 ml milk", "7/8 cup milk"),
+        ("1 l stock", "4 1/4 cups stock"),
+        ("30 ml soy sauce", "2 tbsp soy sauce"),
+        ("10 ml vanilla extract", "2 tsp vanilla extract"),
+        ("2-3 g salt", "2-3 g salt"),
+        ("240 ml (1 cup) milk", "1 cup milk"),
+        ("Bake at 180°C for 30 minutes.", "Bake at 350°F for 30 minutes."),
+        ("Bake at 200 C.", "Bake at 400°F."),
+        ("2 cups flour", "2 cups flour"),
+        ("250 ml milk", "1 cup milk"),
+        ("1 kg 200 g potatoes", "2 5/8 lb potatoes"),
+    ],
+)
+def test_convert_to_us(text, converted):
+    assert convert_text(text, "us") == converted
+
+
+def test_bare_letters_after_small_numbers_are_not_temperatures():
+    assert convert_text("Simmer for 10 min at 90 F.", "metric") == (
+        "Simmer for 10 min at 90 F."
+    )
+
+
+def test_convert_recipe():
+    recipe = RecipeBase(
+        name="Shortbread",
+        ingredients=["1 cup butter", "1/2 cup sugar", "2 cups flour"],
+        instructions=["Mix everything.", "Bake at 325°F for 20 minutes."],
+        makes_min=24,
+        makes_max=24,
+        makes_unit="cookies",
+    )
+
+    converted = convert_recipe(recipe, "metric")
+
+    assert converted.ingredients == ["225 g butter", "100 g sugar", "250 g flour"]
+    assert converted.instructions == [
+        "Mix everything.",
+        "Bake at 160°C for 20 minutes.",
+    ]
+    assert (converted.name, converted.makes_min, converted.makes_unit) == (
+        "Shortbread",
+        24,
+        "cookies",
+    )
+    assert recipe.ingredients[0] == "1 cup butter"
+
+
+def test_unknown_system():
+    recipe = RecipeBase(name="R", ingredients=["i"], instructions=["s"])
+
+    with pytest.raises(ValueError, match="Unknown unit system"):
+        convert_recipe(recipe, "nautical")
@@ -0,0 +1,58 @@
+from bs4 import BeautifulSoup
+from fasthtml.common import to_xml
+
+from meal_planner.services.recipe_events import RecipeEvent
+from meal_planner.ui.list_recipes import (
+    build_recipe_event_fragment,
+    format_recipe_list,
+    recipe_list_area,
+)
+
+
+def _soup(component) -> BeautifulSoup:
+    return BeautifulSoup(to_xml(component), "html.parser")
+
+
+def test_empty_list_keeps_target_for_created_events():
+    soup = _soup(format_recipe_list([]))
+
+    assert soup.find(id="recipe-list-empty").text == "No recipes found."
+    assert soup.find("ul", id="recipe-list-ul") is not None
+
+
+def test_recipe_list_area_subscribes_to_events():
+    area = _soup(recipe_list_area(format_recipe_list([]))).find(id="recipe-list-area")
+
+    assert area["hx-ext"] == "sse"
+    assert area["sse-connect"] == "/recipes/ui/events"
+    assert area["sse-swap"] == "recipe"
+    assert area["hx-swap"] == "none"
+    assert not area.has_attr("hx-get")
+
+
+def test_created_event_appends_item_and_removes_empty_message():
+    soup = _soup(build_recipe_event_fragment(RecipeEvent("created", "abc", "Soup")))
+
+    append = soup.find(attrs={"hx-swap-oob": "beforeend:#recipe-list-ul"})
+    item = append.find("li", id="recipe-item-abc")
+    assert item.a.text == "Soup"
+    assert item.a["href"] == "/recipes/abc"
+    removal = soup.find(id="recipe-list-empty")
+    assert removal["hx-swap-oob"] == "delete"
+
+
+def test_updated_event_replaces_item():
+    soup = _soup(build_recipe_event_fragment(RecipeEvent("updated", "abc", "Stew")))
+
+    item = soup.find("li", id="recipe-item-abc")
+    assert item["hx-swap-oob"] == "true"
+    assert item.a.text == "Stew"
+    assert item.button["hx-confirm"] == "Are you sure you want to delete Stew?"
+
+
+def test_deleted_event_removes_item():
+    soup = _soup(build_recipe_event_fragment(RecipeEvent("deleted", "abc", "Stew")))
+
+    item = soup.find("li", id="recipe-item-abc")
+    assert item["hx-swap-oob"] == "delete"
+    assert item.text == ""
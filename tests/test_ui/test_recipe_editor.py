@@ -338,3 +338,11 @@ class TestMakesUIEditSection:
         assert result is not None
         assert hasattr(result, "id")
         assert result.id == "makes-section"
+
+    def test_build_makes_section_has_scale_control(self):
+        """Test makes section offers local scaling to a new yield."""
+        html = to_xml(build_makes_section(4, 4, "servings"))
+
+        assert 'name="scale_to"' in html
+        assert 'hx-post="/recipes/ui/scale"' in html
+        assert "Scale Ingredients" in html
@@ -3,7 +3,7 @@ from httpx import ASGITransport, AsyncClient
 
 from meal_planner.main import app
 from tests.constants import (
-    RECIPES_EXTRACT_RUN_URL,
+    RECIPES_EXTRACT_STREAM_URL,
     RECIPES_EXTRACT_URL,
     RECIPES_FETCH_TEXT_URL,
 )
@@ -28,6 +28,6 @@ async def test_extract_recipe_page_loads(
         'placeholder="Paste full recipe text here, or fetch from URL above."'
         in response.text
     )
-    assert f'hx-post="{RECIPES_EXTRACT_RUN_URL}"' in response.text
+    assert f'hx-post="{RECIPES_EXTRACT_STREAM_URL}"' in response.text
     assert "Extract Recipe" in response.text
     assert 'id="recipe-results"' in response.text